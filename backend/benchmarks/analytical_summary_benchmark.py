@@ -0,0 +1,75 @@
+"""Compare AnalyticalSummaryBuilder with the frozen row-by-row baseline.
+
+Run from the backend folder:
+
+    python -m benchmarks.analytical_summary_benchmark
+    python -m benchmarks.analytical_summary_benchmark --sizes 1000 100000 --repeat 3
+"""
+
+import argparse
+import random
+import time
+from datetime import date
+from datetime import timedelta
+from typing import Any
+from typing import Callable
+
+from benchmarks.rowwise_summary_builder import RowWiseSummaryBuilder
+from src.agents.response_agent.analysis import AnalyticalSummaryBuilder
+
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+CATEGORIES = ("Hotel", "Food", "Taxi", "Air", "Other")
+
+
+def build_rows(row_count: int, seed: int = 7) -> list[dict[str, Any]]:
+    """Return expense-like rows with a date, a category and two metrics."""
+    generator = random.Random(seed)
+    start_date = date(2025, 1, 1)
+    return [
+        {
+            "company_id": 1,
+            "expense_date": (start_date + timedelta(days=index % 365)).isoformat(),
+            "category": CATEGORIES[generator.randrange(len(CATEGORIES))],
+            "amount": round(generator.lognormvariate(4, 1), 2),
+            "quantity": generator.randint(1, 10),
+        }
+        for index in range(row_count)
+    ]
+
+
+def time_call(function: Callable[[], object], repeat: int) -> float:
+    """Return the best wall-clock time in seconds over the repetitions."""
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=1)
+    arguments = parser.parse_args()
+
+    baseline = RowWiseSummaryBuilder()
+    builder = AnalyticalSummaryBuilder()
+
+    print(f"{'rows':>10} {'row-wise (s)':>14} {'builder (s)':>16} {'speedup':>9}")
+    for row_count in arguments.sizes:
+        rows = build_rows(row_count)
+        baseline_seconds = time_call(lambda: baseline.build_summary(rows), arguments.repeat)
+        builder_seconds = time_call(
+            lambda: builder.build_summary(rows),
+            arguments.repeat,
+        )
+        print(
+            f"{row_count:>10} {baseline_seconds:>14.3f} {builder_seconds:>16.3f} "
+            f"{baseline_seconds / builder_seconds:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Measure graph render time with and without the reduction stage as rows grow.
+
+Run from the backend folder:
+
+    python -m benchmarks.graph_reduction_benchmark
+    python -m benchmarks.graph_reduction_benchmark --sizes 1000 100000 --patterns line scatter
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.agents.graph_agent.reduction import GraphDataReducer
+from src.agents.graph_agent.renderer import GraphRenderPayload
+from src.agents.graph_agent.renderer import initialize_render_worker
+from src.agents.graph_agent.renderer import render_graph_png
+
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+GRAPH_PATTERNS = {
+    "bar_vertical": {"id": "bar_vertical", "x_field": "category", "y_field": "amount"},
+    "line": {"id": "line", "x_field": "expense_date", "y_field": "amount"},
+    "scatter": {"id": "scatter", "x_field": "amount", "y_field": "quantity"},
+    "histogram": {"id": "histogram", "x_field": "amount"},
+}
+
+
+def build_frame(row_count: int, seed: int = 7) -> pd.DataFrame:
+    """Return typed expense-like columns, as the graph agent hands them over."""
+    generator = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "expense_date": pd.Timestamp("2025-01-01")
+            + pd.to_timedelta(generator.integers(0, 365, row_count), unit="D"),
+            "category": generator.choice(
+                [f"Category {index}" for index in range(40)],
+                row_count,
+            ),
+            "amount": generator.lognormal(4, 1, row_count).round(2),
+            "quantity": generator.integers(1, 10, row_count),
+        }
+    )
+
+
+def build_raw_payload(frame: pd.DataFrame, graph_pattern: dict[str, str]) -> GraphRenderPayload:
+    fields = [
+        graph_pattern[key]
+        for key in ("x_field", "y_field")
+        if graph_pattern.get(key)
+    ]
+    return GraphRenderPayload(
+        graph_id=graph_pattern["id"],
+        x_field=graph_pattern["x_field"],
+        y_field=graph_pattern.get("y_field", ""),
+        columns={field: frame[field].to_numpy() for field in fields},
+    )
+
+
+def time_render(build_payload, repeat: int) -> float:
+    """Return the best wall-clock seconds to build the payload and render it."""
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        render_graph_png(build_payload())
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument(
+        "--patterns",
+        nargs="+",
+        choices=sorted(GRAPH_PATTERNS),
+        default=list(GRAPH_PATTERNS),
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--skip-raw",
+        action="store_true",
+        help="Only time the reduced renders; raw renders of large results are slow.",
+    )
+    arguments = parser.parse_args()
+
+    initialize_render_worker()
+    reducer = GraphDataReducer()
+
+    print(f"{'pattern':>13} {'rows':>10} {'raw (s)':>9} {'reduced (s)':>12}")
+    for pattern_name in arguments.patterns:
+        graph_pattern = GRAPH_PATTERNS[pattern_name]
+        for row_count in arguments.sizes:
+            frame = build_frame(row_count)
+            reduced_seconds = time_render(
+                lambda: reducer.reduce(frame, graph_pattern),
+                arguments.repeat,
+            )
+            raw_text = "-"
+            if not arguments.skip_raw:
+                raw_seconds = time_render(
+                    lambda: build_raw_payload(frame, graph_pattern),
+                    arguments.repeat,
+                )
+                raw_text = f"{raw_seconds:.3f}"
+            print(
+                f"{pattern_name:>13} {row_count:>10} {raw_text:>9} {reduced_seconds:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
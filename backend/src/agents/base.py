@@ -1,19 +1,17 @@
 import os
 import re
-from typing import Dict
-from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_google_genai import ChatGoogleGenerativeAI
+from src.infra.chat_history import BoundedChatMessageHistory
+from src.infra.chat_history import build_chat_history_backend
 from src.infra.config import settings
 from src.infra.logging_utils import LoggedComponent
 
 
-SESSION_STORE: Dict[str, ChatMessageHistory] = {}
+chat_history_backend = build_chat_history_backend()
 
 
-def get_session_history(session_id: str) -> ChatMessageHistory:
-    if session_id not in SESSION_STORE:
-        SESSION_STORE[session_id] = ChatMessageHistory()
-    return SESSION_STORE[session_id]
+def get_session_history(session_id: str) -> BoundedChatMessageHistory:
+    return BoundedChatMessageHistory(session_id, chat_history_backend)
 
 
 class BaseAgent(LoggedComponent):
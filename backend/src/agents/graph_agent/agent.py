@@ -1,49 +1,63 @@
 from __future__ import annotations
 
-from io import BytesIO
-from datetime import date
-from datetime import datetime
 from typing import Any
 from typing import Optional
 
-import matplotlib
-
-matplotlib.use("Agg")
-
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 
+from src.agents.graph_agent.reduction import GraphDataReducer
+from src.agents.graph_agent.render_cache import RENDER_KEY_PATTERN
+from src.agents.graph_agent.render_cache import build_render_key
+from src.agents.graph_agent.renderer import GraphRenderPayload
+from src.agents.graph_agent.renderer import GraphRenderPool
+from src.agents.graph_agent.renderer import graph_render_pool
+from src.agents.graph_agent.spec import GraphSpecBuilder
+from src.infra.column_profile import ColumnProfile
+from src.infra.column_profile import ColumnProfiler
 from src.infra.config.config_google.storage_manager import StorageManager
 from src.infra.logging_utils import LoggedComponent
 
 
-PRIMARY_COLOR = "#009EFB"
-SECONDARY_COLOR = "#006B99"
-BACKGROUND_COLOR = "#FFFFFF"
-
-
 class GraphAgent(LoggedComponent):
     """Build graph suggestions and render selected graphs."""
 
-    def __init__(self, storage_manager: Optional[StorageManager] = None) -> None:
+    def __init__(
+        self,
+        storage_manager: Optional[StorageManager] = None,
+        render_pool: Optional[GraphRenderPool] = None,
+    ) -> None:
         super().__init__()
         self._storage_manager = storage_manager
-        sns.set_theme(style="whitegrid")
+        self._column_profiler = ColumnProfiler()
+        self._render_pool = render_pool
+        self._data_reducer = GraphDataReducer()
+        self._spec_builder = GraphSpecBuilder()
 
-    def suggest_graphs(self, response_data: list[dict[str, Any]]) -> list[dict[str, str]]:
-        """Return deterministic graph suggestions for the given response rows."""
-        dataframe = self._build_dataframe(response_data)
-        if dataframe is None:
+    def build_column_profile(self, response_data: list[dict[str, Any]]) -> ColumnProfile:
+        """Return the column profile that suggestions and rendering are based on."""
+        return self._get_column_profiler().profile(response_data)
+
+    def suggest_graphs(
+        self,
+        response_data: list[dict[str, Any]],
+        column_profile: Optional[ColumnProfile] = None,
+    ) -> list[dict[str, str]]:
+        """Return deterministic graph suggestions for the given response rows.
+
+        When the column profile of the rows is already known the suggestions
+        are derived from it alone, without building a dataframe.
+        """
+        if column_profile is None:
+            if not response_data:
+                return []
+            column_profile = self.build_column_profile(response_data)
+
+        if column_profile.row_count == 0 or not column_profile.columns:
             return []
 
-        numeric_columns = self._numeric_columns(dataframe)
-        datetime_columns = self._datetime_columns(dataframe)
-        categorical_columns = self._categorical_columns(
-            dataframe,
-            numeric_columns=numeric_columns,
-            datetime_columns=datetime_columns,
-        )
+        numeric_columns = list(column_profile.numeric_columns)
+        datetime_columns = list(column_profile.datetime_columns)
+        categorical_columns = list(column_profile.categorical_columns)
 
         suggestions: list[dict[str, str]] = []
 
@@ -81,7 +95,7 @@ class GraphAgent(LoggedComponent):
                     y_field=y_field,
                 )
             )
-            if len(dataframe.index) > 5:
+            if column_profile.row_count > 5:
                 suggestions.append(
                     self._build_suggestion(
                         graph_id="bar_horizontal",
@@ -119,10 +133,11 @@ class GraphAgent(LoggedComponent):
         self,
         response_data: list[dict[str, Any]],
         graph_pattern_id: str,
+        column_profile: Optional[ColumnProfile] = None,
     ) -> Optional[dict[str, str]]:
         """Return the selected graph suggestion when it is valid for the data."""
         normalized_pattern_id = str(graph_pattern_id).strip()
-        for suggestion in self.suggest_graphs(response_data):
+        for suggestion in self.suggest_graphs(response_data, column_profile):
             if suggestion["id"] == normalized_pattern_id:
                 return suggestion
         return None
@@ -134,204 +149,196 @@ class GraphAgent(LoggedComponent):
         user_email: str,
         chat_id: str,
         question_id: str,
+        column_profile: Optional[ColumnProfile] = None,
+        data_version: str = "",
     ) -> str:
-        """Render the selected graph and return the public storage path."""
+        """Render the selected graph and return the public storage path.
+
+        With a ``data_version`` the image is saved under its render key, so a
+        later request for the same data and pattern is served by
+        ``find_rendered_graph`` without rendering again.
+        """
         if self._storage_manager is None:
             raise RuntimeError("GraphAgent requires a storage manager to render files.")
 
-        dataframe = self._build_dataframe(response_data)
+        dataframe = self._build_dataframe(response_data, column_profile)
         if dataframe is None:
             raise ValueError("Graph rendering requires non-empty tabular data.")
 
-        graph_id = graph_pattern["id"]
-        x_field = graph_pattern["x_field"]
-        y_field = graph_pattern["y_field"]
-        hue_field = graph_pattern["hue_field"] or None
-
-        figure, axis = plt.subplots(figsize=(8, 4.8), facecolor=BACKGROUND_COLOR)
-        axis.set_facecolor(BACKGROUND_COLOR)
-
-        palette = [PRIMARY_COLOR, SECONDARY_COLOR]
-        if graph_id == "bar_vertical":
-            sns.barplot(
-                data=dataframe,
-                x=x_field,
-                y=y_field,
-                hue=hue_field,
-                ax=axis,
-                palette=palette if hue_field else None,
-                color=PRIMARY_COLOR if not hue_field else None,
-            )
-        elif graph_id == "bar_horizontal":
-            sns.barplot(
-                data=dataframe,
-                x=y_field,
-                y=x_field,
-                hue=hue_field,
-                ax=axis,
-                palette=palette if hue_field else None,
-                color=PRIMARY_COLOR if not hue_field else None,
-                orient="h",
-            )
-        elif graph_id == "line":
-            plot_frame = dataframe.sort_values(by=x_field)
-            sns.lineplot(
-                data=plot_frame,
-                x=x_field,
-                y=y_field,
-                hue=hue_field,
-                ax=axis,
-                palette=palette if hue_field else None,
-                color=PRIMARY_COLOR if not hue_field else None,
-            )
-        elif graph_id == "scatter":
-            sns.scatterplot(
-                data=dataframe,
-                x=x_field,
-                y=y_field,
-                hue=hue_field,
-                ax=axis,
-                palette=palette if hue_field else None,
-                color=PRIMARY_COLOR if not hue_field else None,
-            )
-        elif graph_id == "histogram":
-            sns.histplot(
-                data=dataframe,
-                x=x_field,
-                ax=axis,
-                color=PRIMARY_COLOR,
-            )
-        else:
-            plt.close(figure)
-            raise ValueError(f"Unsupported graph pattern: {graph_id}")
-
-        axis.tick_params(colors=SECONDARY_COLOR)
-        axis.xaxis.label.set_color(SECONDARY_COLOR)
-        axis.yaxis.label.set_color(SECONDARY_COLOR)
-        axis.title.set_color(SECONDARY_COLOR)
-        legend = axis.get_legend()
-        if legend is not None:
-            legend.get_frame().set_facecolor(BACKGROUND_COLOR)
-
-        figure.tight_layout()
-
-        image_buffer = BytesIO()
-        figure.savefig(
-            image_buffer,
-            format="png",
-            facecolor=figure.get_facecolor(),
-            bbox_inches="tight",
+        render_payload = self._build_render_payload(dataframe, graph_pattern)
+        render_result = self._get_render_pool().render(render_payload)
+        timings = render_result.timings
+        plotted_count = len(next(iter(render_payload.columns.values()), ()))
+        self.log_info(
+            f"Rendered graph '{graph_pattern['id']}' from {len(dataframe.index)} rows "
+            f"reduced to {plotted_count} plotted values in {timings['total_ms']} ms (queue {timings['queue_ms']} ms, "
+            f"plot {timings['plot_ms']} ms, encode {timings['encode_ms']} ms).",
+            user_email=user_email,
+            chat_id=chat_id,
+            question_id=question_id,
         )
-        plt.close(figure)
 
-        return self._storage_manager.save_graph_image(
+        if not data_version:
+            return self._storage_manager.save_graph_image(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=question_id,
+                image_bytes=render_result.image_bytes,
+            )
+
+        return self._storage_manager.save_graph_render(
             user_email=user_email,
             chat_id=chat_id,
             message_id=question_id,
-            image_bytes=image_buffer.getvalue(),
+            render_key=build_render_key(data_version, graph_pattern),
+            image_bytes=render_result.image_bytes,
         )
 
-    def _build_dataframe(
+    def build_graph_spec(
         self,
         response_data: list[dict[str, Any]],
-    ) -> Optional[pd.DataFrame]:
-        """Convert response rows into a clean dataframe when possible."""
-        if not response_data:
-            return None
+        graph_pattern: dict[str, str],
+        column_profile: Optional[ColumnProfile] = None,
+    ) -> dict[str, Any]:
+        """Return a Vega-Lite style spec of the selected graph for the browser to draw.
+
+        The rows go through the same reduction as a rendered graph, but nothing
+        is drawn, encoded or uploaded.
+        """
+        dataframe = self._build_dataframe(response_data, column_profile)
+        if dataframe is None:
+            raise ValueError("Graph rendering requires non-empty tabular data.")
 
-        dataframe = pd.DataFrame(response_data)
-        if dataframe.empty:
-            return None
+        return self._get_spec_builder().build(
+            self._build_render_payload(dataframe, graph_pattern),
+            label=graph_pattern.get("label", ""),
+        )
 
-        dataframe = dataframe.copy()
-        dataframe = dataframe.dropna(axis=1, how="all")
-        if dataframe.empty:
-            return None
+    def get_plotted_fields(self, graph_pattern: dict[str, str]) -> list[str]:
+        """Return the columns a graph pattern reads, so callers can load only those."""
+        return list(
+            dict.fromkeys(
+                graph_pattern[key]
+                for key in ("x_field", "y_field", "hue_field")
+                if graph_pattern.get(key)
+            )
+        )
 
-        for column in list(dataframe.columns):
-            series = dataframe[column]
-            if self._looks_datetime(series):
-                dataframe[column] = pd.to_datetime(series, errors="coerce")
-                continue
+    def find_rendered_graph(
+        self,
+        *,
+        graph_pattern: dict[str, str],
+        data_version: str,
+        user_email: str,
+        chat_id: str,
+        question_id: str,
+    ) -> Optional[str]:
+        """Return the path of a saved render of this data and pattern, or None.
 
-            if self._looks_numeric(series):
-                dataframe[column] = pd.to_numeric(series, errors="coerce")
+        The storage manager answers from its local blob cache before asking the
+        bucket; neither downloads the rows nor draws anything.
+        """
+        if self._storage_manager is None or not data_version:
+            return None
 
-        return dataframe
+        render_key = build_render_key(data_version, graph_pattern)
+        if not self._storage_manager.graph_render_exists(
+            user_email=user_email,
+            chat_id=chat_id,
+            message_id=question_id,
+            render_key=render_key,
+        ):
+            return None
 
-    def _numeric_columns(self, dataframe: pd.DataFrame) -> list[str]:
-        """Return numeric columns excluding booleans."""
-        numeric_columns: list[str] = []
-        for column in dataframe.columns:
-            series = dataframe[column]
-            if pd.api.types.is_bool_dtype(series):
-                continue
-            if pd.api.types.is_numeric_dtype(series):
-                numeric_columns.append(str(column))
-        return numeric_columns
-
-    def _datetime_columns(self, dataframe: pd.DataFrame) -> list[str]:
-        """Return columns that were normalized as datetimes."""
-        columns: list[str] = []
-        for column in dataframe.columns:
-            if pd.api.types.is_datetime64_any_dtype(dataframe[column]):
-                columns.append(str(column))
-        return columns
-
-    def _categorical_columns(
+        self.log_info(
+            f"Graph render cache hit for '{graph_pattern['id']}'.",
+            user_email=user_email,
+            chat_id=chat_id,
+            question_id=question_id,
+        )
+        return self._storage_manager.build_graph_access_path(
+            chat_id=chat_id,
+            message_id=question_id,
+            render_key=render_key,
+        )
+
+    def load_rendered_graph(
         self,
-        dataframe: pd.DataFrame,
         *,
-        numeric_columns: list[str],
-        datetime_columns: list[str],
-    ) -> list[str]:
-        """Return non-numeric, non-datetime columns that still carry data."""
-        excluded_columns = set(numeric_columns) | set(datetime_columns)
-        columns: list[str] = []
-        for column in dataframe.columns:
-            column_name = str(column)
-            if column_name in excluded_columns:
-                continue
-            if dataframe[column].dropna().empty:
-                continue
-            columns.append(column_name)
-        return columns
-
-    def _looks_numeric(self, series: pd.Series) -> bool:
-        """Return True when the series can reasonably be treated as numeric."""
-        non_null_values = series.dropna()
-        if non_null_values.empty:
-            return False
-
-        if pd.api.types.is_numeric_dtype(non_null_values):
-            return True
+        render_key: str,
+        user_email: str,
+        chat_id: str,
+        question_id: str,
+    ) -> Optional[bytes]:
+        """Return the image saved under a render key, read through the storage blob cache."""
+        if self._storage_manager is None or not RENDER_KEY_PATTERN.fullmatch(render_key):
+            return None
 
-        converted_values = pd.to_numeric(non_null_values, errors="coerce")
-        successful_values = converted_values.notna().sum()
-        return successful_values == len(non_null_values)
+        return self._storage_manager.load_graph_render(
+            user_email=user_email,
+            chat_id=chat_id,
+            message_id=question_id,
+            render_key=render_key,
+        )
 
-    def _looks_datetime(self, series: pd.Series) -> bool:
-        """Return True when the series can reasonably be treated as datetime."""
-        non_null_values = series.dropna()
-        if non_null_values.empty:
-            return False
+    def _build_render_payload(
+        self,
+        dataframe: pd.DataFrame,
+        graph_pattern: dict[str, str],
+    ) -> GraphRenderPayload:
+        """Reduce the plotted columns to a bounded payload for the render worker."""
+        fields = self.get_plotted_fields(graph_pattern)
+        missing_fields = [field for field in fields if field not in dataframe.columns]
+        if missing_fields:
+            raise ValueError(f"Graph fields not found in data: {', '.join(missing_fields)}")
 
-        if pd.api.types.is_datetime64_any_dtype(non_null_values):
-            return True
+        return self._get_data_reducer().reduce(dataframe, graph_pattern)
 
-        if pd.api.types.is_numeric_dtype(non_null_values):
-            return False
+    def _build_dataframe(
+        self,
+        response_data: list[dict[str, Any]],
+        column_profile: Optional[ColumnProfile] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Convert response rows into a typed dataframe when possible."""
+        if not response_data:
+            return None
 
-        sample_values = list(non_null_values.head(10))
-        if not sample_values:
-            return False
+        profiler = self._get_column_profiler()
+        dataframe = profiler.build_frame(response_data)
+        if column_profile is None:
+            column_profile = profiler.profile_frame(dataframe)
 
-        if all(isinstance(value, (date, datetime, pd.Timestamp)) for value in sample_values):
-            return True
+        dataframe = dataframe[
+            [column for column in column_profile.columns if column in dataframe.columns]
+        ]
+        if dataframe.empty:
+            return None
 
-        converted_values = pd.to_datetime(sample_values, errors="coerce")
-        successful_values = pd.Series(converted_values).notna().sum()
-        return successful_values == len(sample_values)
+        return profiler.apply_types(dataframe.copy(), column_profile)
+
+    def _get_column_profiler(self) -> ColumnProfiler:
+        profiler = getattr(self, "_column_profiler", None)
+        if profiler is None:
+            profiler = ColumnProfiler()
+            self._column_profiler = profiler
+        return profiler
+
+    def _get_render_pool(self) -> GraphRenderPool:
+        return getattr(self, "_render_pool", None) or graph_render_pool
+
+    def _get_data_reducer(self) -> GraphDataReducer:
+        reducer = getattr(self, "_data_reducer", None)
+        if reducer is None:
+            reducer = GraphDataReducer()
+            self._data_reducer = reducer
+        return reducer
+
+    def _get_spec_builder(self) -> GraphSpecBuilder:
+        builder = getattr(self, "_spec_builder", None)
+        if builder is None:
+            builder = GraphSpecBuilder()
+            self._spec_builder = builder
+        return builder
 
     def _build_suggestion(
         self,
@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+
+from src.agents.graph_agent.renderer import GraphRenderPayload
+
+
+MAX_CATEGORIES = 20
+MAX_TIME_BUCKETS = 60
+MAX_LINE_POINTS = 1000
+MAX_SCATTER_POINTS = 5000
+MAX_HISTOGRAM_BINS = 100
+OTHER_CATEGORY_LABEL = "Outros"
+HISTOGRAM_WEIGHT_FIELD = "__count__"
+TIME_BUCKET_FREQUENCIES = ("D", "W", "M", "Q", "Y")
+SCATTER_SAMPLE_SEED = 0
+# Part of the render key: changing a limit changes the pixels.
+REDUCTION_SETTINGS = {
+    "max_categories": MAX_CATEGORIES,
+    "max_time_buckets": MAX_TIME_BUCKETS,
+    "max_line_points": MAX_LINE_POINTS,
+    "max_scatter_points": MAX_SCATTER_POINTS,
+    "max_histogram_bins": MAX_HISTOGRAM_BINS,
+    "other_category_label": OTHER_CATEGORY_LABEL,
+}
+
+
+class GraphDataReducer:
+    """Shrink typed query rows to what a graph can show before it is drawn.
+
+    Bars are pre-aggregated to one mean per category or time bucket, with
+    categories beyond the top ``MAX_CATEGORIES`` folded into an "Outros" bar.
+    Lines are averaged per x value and downsampled with LTTB, scatters are
+    sampled, and histograms are binned with NumPy. The payload handed to the
+    renderer is therefore bounded no matter how many rows the query returned.
+    """
+
+    def reduce(
+        self,
+        dataframe: pd.DataFrame,
+        graph_pattern: dict[str, str],
+    ) -> GraphRenderPayload:
+        graph_id = graph_pattern["id"]
+        x_field = graph_pattern["x_field"]
+        y_field = graph_pattern.get("y_field") or ""
+        hue_field = graph_pattern.get("hue_field") or ""
+        fields = list(dict.fromkeys(field for field in (x_field, y_field, hue_field) if field))
+        plot_frame = dataframe[fields].dropna(subset=[x_field, y_field] if y_field else [x_field])
+
+        if graph_id == "histogram":
+            return self._reduce_histogram(plot_frame, x_field)
+
+        if graph_id in {"bar_vertical", "bar_horizontal"}:
+            plot_frame = self._aggregate_bars(plot_frame, x_field, y_field, hue_field)
+        elif graph_id == "line":
+            plot_frame = self._reduce_line(plot_frame, x_field, y_field, hue_field)
+        elif graph_id == "scatter":
+            plot_frame = self._sample_points(plot_frame, MAX_SCATTER_POINTS)
+
+        return GraphRenderPayload(
+            graph_id=graph_id,
+            x_field=x_field,
+            y_field=y_field,
+            hue_field=hue_field,
+            columns={field: plot_frame[field].to_numpy() for field in fields},
+        )
+
+    def _aggregate_bars(
+        self,
+        plot_frame: pd.DataFrame,
+        x_field: str,
+        y_field: str,
+        hue_field: str,
+    ) -> pd.DataFrame:
+        """Return one mean per bar, the value seaborn's default estimator draws."""
+        x_values = plot_frame[x_field]
+        if pd.api.types.is_datetime64_any_dtype(x_values.dtype):
+            x_values = self._bucket_dates(x_values)
+        else:
+            x_values = self._cap_categories(x_values, plot_frame[y_field])
+
+        group_keys = [x_values.rename(x_field)]
+        if hue_field:
+            group_keys.append(plot_frame[hue_field])
+
+        grouped = plot_frame[y_field].groupby(group_keys, sort=False, observed=True)
+        return grouped.mean().reset_index()
+
+    def _cap_categories(self, x_values: pd.Series, y_values: pd.Series) -> pd.Series:
+        """Keep the categories with the largest means and fold the rest into one."""
+        category_means = y_values.groupby(x_values, sort=False, observed=True).mean()
+        if len(category_means) <= MAX_CATEGORIES:
+            return x_values
+
+        kept_categories = category_means.nlargest(MAX_CATEGORIES - 1).index
+        return x_values.astype(object).where(
+            x_values.isin(kept_categories),
+            OTHER_CATEGORY_LABEL,
+        )
+
+    def _bucket_dates(self, x_values: pd.Series) -> pd.Series:
+        """Group dates into the finest calendar period with few enough buckets."""
+        if x_values.nunique() <= MAX_TIME_BUCKETS:
+            return x_values
+
+        if x_values.dt.tz is not None:
+            x_values = x_values.dt.tz_convert(None)
+
+        for frequency in TIME_BUCKET_FREQUENCIES:
+            bucketed_values = x_values.dt.to_period(frequency).dt.start_time
+            if bucketed_values.nunique() <= MAX_TIME_BUCKETS:
+                return bucketed_values
+        return bucketed_values
+
+    def _reduce_line(
+        self,
+        plot_frame: pd.DataFrame,
+        x_field: str,
+        y_field: str,
+        hue_field: str,
+    ) -> pd.DataFrame:
+        """Average repeated x values, sort by x and downsample each series."""
+        group_keys = [x_field, hue_field] if hue_field else [x_field]
+        aggregated_frame = (
+            plot_frame.groupby(group_keys, sort=True, observed=True)[y_field]
+            .mean()
+            .reset_index()
+        )
+        if not hue_field:
+            return self._downsample_series(aggregated_frame, x_field, y_field, MAX_LINE_POINTS)
+
+        series_count = max(aggregated_frame[hue_field].nunique(), 1)
+        points_per_series = max(MAX_LINE_POINTS // series_count, 3)
+        return pd.concat(
+            [
+                self._downsample_series(series_frame, x_field, y_field, points_per_series)
+                for _, series_frame in aggregated_frame.groupby(
+                    hue_field,
+                    sort=False,
+                    observed=True,
+                )
+            ],
+            ignore_index=True,
+        )
+
+    def _downsample_series(
+        self,
+        series_frame: pd.DataFrame,
+        x_field: str,
+        y_field: str,
+        max_points: int,
+    ) -> pd.DataFrame:
+        if len(series_frame.index) <= max_points:
+            return series_frame
+
+        x_values = series_frame[x_field]
+        if pd.api.types.is_datetime64_any_dtype(x_values.dtype):
+            x_positions = x_values.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        elif pd.api.types.is_numeric_dtype(x_values.dtype):
+            x_positions = x_values.to_numpy(dtype=float)
+        else:
+            x_positions = np.arange(len(x_values.index))
+
+        selected = largest_triangle_three_buckets(
+            np.asarray(x_positions, dtype=float),
+            series_frame[y_field].to_numpy(dtype=float),
+            max_points,
+        )
+        return series_frame.iloc[selected]
+
+    def _sample_points(self, plot_frame: pd.DataFrame, max_points: int) -> pd.DataFrame:
+        """Keep a fixed-seed sample of points so repeat renders are identical."""
+        if len(plot_frame.index) <= max_points:
+            return plot_frame
+
+        generator = np.random.default_rng(SCATTER_SAMPLE_SEED)
+        selected = np.sort(
+            generator.choice(len(plot_frame.index), size=max_points, replace=False)
+        )
+        return plot_frame.iloc[selected]
+
+    def _reduce_histogram(self, plot_frame: pd.DataFrame, x_field: str) -> GraphRenderPayload:
+        """Bin the values once and send bin centers weighted by their counts."""
+        values = plot_frame[x_field]
+        if not pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(
+            values.dtype
+        ):
+            return GraphRenderPayload(
+                graph_id="histogram",
+                x_field=x_field,
+                columns={x_field: values.to_numpy()},
+            )
+
+        finite_values = values.to_numpy(dtype=float)
+        finite_values = finite_values[np.isfinite(finite_values)]
+        bin_edges = np.histogram_bin_edges(finite_values, bins="auto")
+        if len(bin_edges) - 1 > MAX_HISTOGRAM_BINS:
+            bin_edges = np.histogram_bin_edges(finite_values, bins=MAX_HISTOGRAM_BINS)
+        counts, bin_edges = np.histogram(finite_values, bins=bin_edges)
+
+        return GraphRenderPayload(
+            graph_id="histogram",
+            x_field=x_field,
+            weight_field=HISTOGRAM_WEIGHT_FIELD,
+            bins=tuple(float(edge) for edge in bin_edges),
+            columns={
+                x_field: (bin_edges[:-1] + bin_edges[1:]) / 2,
+                HISTOGRAM_WEIGHT_FIELD: counts,
+            },
+        )
+
+
+def largest_triangle_three_buckets(
+    x_values: np.ndarray,
+    y_values: np.ndarray,
+    threshold: int,
+) -> np.ndarray:
+    """Return the indices kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the previous pick and the
+    mean of the next bucket, which preserves peaks and troughs.
+    """
+    point_count = len(x_values)
+    if threshold >= point_count or threshold < 3:
+        return np.arange(point_count)
+
+    bucket_edges = np.linspace(1, point_count - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = point_count - 1
+    previous = 0
+
+    for bucket_index in range(threshold - 2):
+        start = bucket_edges[bucket_index]
+        end = bucket_edges[bucket_index + 1]
+        next_end = (
+            bucket_edges[bucket_index + 2]
+            if bucket_index + 2 < len(bucket_edges)
+            else point_count
+        )
+        next_x = x_values[end:next_end].mean()
+        next_y = y_values[end:next_end].mean()
+
+        areas = np.abs(
+            (x_values[previous] - next_x) * (y_values[start:end] - y_values[previous])
+            - (x_values[previous] - x_values[start:end]) * (next_y - y_values[previous])
+        )
+        previous = start + int(areas.argmax())
+        selected[bucket_index + 1] = previous
+
+    return selected
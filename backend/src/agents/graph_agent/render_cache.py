@@ -0,0 +1,31 @@
+import hashlib
+import json
+import re
+
+from src.agents.graph_agent.reduction import REDUCTION_SETTINGS
+from src.agents.graph_agent.renderer import RENDER_FORMAT
+from src.agents.graph_agent.renderer import RENDER_STYLE
+
+
+RENDER_KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+GRAPH_PATTERN_FIELDS = ("id", "x_field", "y_field", "hue_field")
+
+
+def build_render_key(
+    data_version: str,
+    graph_pattern: dict[str, str],
+    image_format: str = RENDER_FORMAT,
+) -> str:
+    """Return the content address of one render: data, pattern, style, reduction and format."""
+    payload = {
+        "data_version": str(data_version),
+        "graph_pattern": {
+            field: str(graph_pattern.get(field) or "") for field in GRAPH_PATTERN_FIELDS
+        },
+        "style": RENDER_STYLE,
+        "reduction": REDUCTION_SETTINGS,
+        "format": image_format,
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode("utf-8")
+    ).hexdigest()
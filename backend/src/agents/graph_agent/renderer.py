@@ -0,0 +1,291 @@
+import multiprocessing
+import time
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from dataclasses import field
+from io import BytesIO
+from threading import Lock
+from typing import Optional
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib import font_manager
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+
+from src.infra.config import settings
+from src.infra.logging_utils import LoggedComponent
+
+
+PRIMARY_COLOR = "#009EFB"
+SECONDARY_COLOR = "#006B99"
+BACKGROUND_COLOR = "#FFFFFF"
+FIGURE_SIZE = (8, 4.8)
+SEABORN_THEME = "whitegrid"
+RENDER_FORMAT = "png"
+# Everything besides the data and the pattern that changes the rendered pixels.
+RENDER_STYLE = {
+    "primary_color": PRIMARY_COLOR,
+    "secondary_color": SECONDARY_COLOR,
+    "background_color": BACKGROUND_COLOR,
+    "figure_size": list(FIGURE_SIZE),
+    "theme": SEABORN_THEME,
+    "matplotlib": matplotlib.__version__,
+    "seaborn": sns.__version__,
+}
+SUPPORTED_GRAPH_IDS = frozenset(
+    {"bar_vertical", "bar_horizontal", "line", "scatter", "histogram"}
+)
+
+
+@dataclass(frozen=True)
+class GraphRenderPayload:
+    """Columnar input for one render: the plotted fields as NumPy arrays.
+
+    Histograms may arrive pre-binned, with ``bins`` holding the bin edges and
+    ``weight_field`` naming the column of counts per bin center.
+    """
+
+    graph_id: str
+    x_field: str
+    y_field: str = ""
+    hue_field: str = ""
+    weight_field: str = ""
+    bins: tuple[float, ...] = ()
+    columns: dict[str, np.ndarray] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class GraphRenderResult:
+    """Rendered PNG bytes and the time spent in each render stage, in milliseconds."""
+
+    image_bytes: bytes
+    timings: dict[str, float]
+
+
+def initialize_render_worker() -> None:
+    """Load the seaborn theme and the font cache once per worker process."""
+    sns.set_theme(style=SEABORN_THEME)
+    font_manager.findfont(
+        font_manager.FontProperties(family=matplotlib.rcParams["font.family"])
+    )
+
+
+def render_graph_png(
+    payload: GraphRenderPayload,
+    submitted_at: Optional[float] = None,
+) -> GraphRenderResult:
+    """Render the payload with the object-oriented Figure API and return PNG bytes.
+
+    No pyplot state is touched, so renders are safe to run concurrently in
+    threads as well as in worker processes.
+    """
+    started_at = time.time()
+    if payload.graph_id not in SUPPORTED_GRAPH_IDS:
+        raise ValueError(f"Unsupported graph pattern: {payload.graph_id}")
+
+    dataframe = pd.DataFrame(payload.columns)
+    figure = Figure(figsize=FIGURE_SIZE, facecolor=BACKGROUND_COLOR)
+    axis = figure.subplots()
+    axis.set_facecolor(BACKGROUND_COLOR)
+    _draw_graph(axis, dataframe, payload)
+    _style_axis(axis)
+    figure.tight_layout()
+    plotted_at = time.time()
+
+    image_buffer = BytesIO()
+    figure.savefig(
+        image_buffer,
+        format=RENDER_FORMAT,
+        facecolor=figure.get_facecolor(),
+        bbox_inches="tight",
+    )
+    finished_at = time.time()
+
+    return GraphRenderResult(
+        image_bytes=image_buffer.getvalue(),
+        timings={
+            "queue_ms": _elapsed_ms(submitted_at or started_at, started_at),
+            "plot_ms": _elapsed_ms(started_at, plotted_at),
+            "encode_ms": _elapsed_ms(plotted_at, finished_at),
+            "total_ms": _elapsed_ms(submitted_at or started_at, finished_at),
+        },
+    )
+
+
+def _draw_graph(
+    axis: Axes,
+    dataframe: pd.DataFrame,
+    payload: GraphRenderPayload,
+) -> None:
+    graph_id = payload.graph_id
+    x_field = payload.x_field
+    y_field = payload.y_field
+    hue_field = payload.hue_field or None
+    palette = [PRIMARY_COLOR, SECONDARY_COLOR] if hue_field else None
+    color = PRIMARY_COLOR if not hue_field else None
+
+    if graph_id == "bar_vertical":
+        sns.barplot(
+            data=dataframe,
+            x=x_field,
+            y=y_field,
+            hue=hue_field,
+            ax=axis,
+            palette=palette,
+            color=color,
+            errorbar=None,
+        )
+    elif graph_id == "bar_horizontal":
+        sns.barplot(
+            data=dataframe,
+            x=y_field,
+            y=x_field,
+            hue=hue_field,
+            ax=axis,
+            palette=palette,
+            color=color,
+            orient="h",
+            errorbar=None,
+        )
+    elif graph_id == "line":
+        sns.lineplot(
+            data=dataframe.sort_values(by=x_field),
+            x=x_field,
+            y=y_field,
+            hue=hue_field,
+            ax=axis,
+            palette=palette,
+            color=color,
+            errorbar=None,
+        )
+    elif graph_id == "scatter":
+        sns.scatterplot(
+            data=dataframe,
+            x=x_field,
+            y=y_field,
+            hue=hue_field,
+            ax=axis,
+            palette=palette,
+            color=color,
+        )
+    else:
+        sns.histplot(
+            data=dataframe,
+            x=x_field,
+            weights=payload.weight_field or None,
+            bins=list(payload.bins) if payload.bins else "auto",
+            ax=axis,
+            color=PRIMARY_COLOR,
+        )
+
+
+def _style_axis(axis: Axes) -> None:
+    axis.tick_params(colors=SECONDARY_COLOR)
+    axis.xaxis.label.set_color(SECONDARY_COLOR)
+    axis.yaxis.label.set_color(SECONDARY_COLOR)
+    axis.title.set_color(SECONDARY_COLOR)
+    legend = axis.get_legend()
+    if legend is not None:
+        legend.get_frame().set_facecolor(BACKGROUND_COLOR)
+
+
+def _elapsed_ms(started_at: float, finished_at: float) -> float:
+    return round(max(finished_at - started_at, 0.0) * 1000, 2)
+
+
+def _warm_up_worker() -> int:
+    return multiprocessing.current_process().pid or 0
+
+
+class GraphRenderPool(LoggedComponent):
+    """Run graph renders on a pool of warm worker processes.
+
+    Workers are spawned once, load the plotting theme and fonts in their
+    initializer, and then serve renders for the life of the API process.
+    With ``max_workers=0`` renders run in the calling thread instead, after the
+    same initializer has run once in this process.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        super().__init__()
+        self.max_workers = max(max_workers, 0)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inline_initialized = False
+        self._lock = Lock()
+
+    def render(self, payload: GraphRenderPayload) -> GraphRenderResult:
+        """Render the payload and wait for the PNG bytes."""
+        try:
+            return self.submit(payload).result()
+        except BrokenProcessPool:
+            self.log_warning("Graph render worker died. Restarting the render pool.")
+            self.shutdown()
+            return self.submit(payload).result()
+
+    def submit(self, payload: GraphRenderPayload) -> Future:
+        """Queue a render and return a future resolving to a GraphRenderResult."""
+        submitted_at = time.time()
+        if self.max_workers == 0:
+            self._initialize_inline()
+            future: Future = Future()
+            try:
+                future.set_result(render_graph_png(payload, submitted_at))
+            except Exception as exp:
+                future.set_exception(exp)
+            return future
+
+        return self._get_executor().submit(render_graph_png, payload, submitted_at)
+
+    def warm_up(self) -> None:
+        """Start every worker now so the first graph request does not pay for it."""
+        if self.max_workers == 0:
+            self._initialize_inline()
+            return
+
+        executor = self._get_executor()
+        warm_up_tasks = [
+            executor.submit(_warm_up_worker) for _ in range(self.max_workers)
+        ]
+        for task in warm_up_tasks:
+            task.result()
+        self.log_info(f"Graph render pool ready with {self.max_workers} workers.")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _initialize_inline(self) -> None:
+        with self._lock:
+            if not self._inline_initialized:
+                initialize_render_worker()
+                self._inline_initialized = True
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=initialize_render_worker,
+                )
+            return self._executor
+
+
+def build_graph_render_pool() -> GraphRenderPool:
+    """Return the process-wide render pool; workers start on first use or warm-up."""
+    return GraphRenderPool(max_workers=settings.graph_render_workers)
+
+
+graph_render_pool = build_graph_render_pool()
@@ -0,0 +1,163 @@
+import math
+from datetime import date
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.agents.graph_agent.renderer import BACKGROUND_COLOR
+from src.agents.graph_agent.renderer import PRIMARY_COLOR
+from src.agents.graph_agent.renderer import SECONDARY_COLOR
+from src.agents.graph_agent.renderer import GraphRenderPayload
+
+
+VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+HISTOGRAM_BIN_START_FIELD = "bin_start"
+HISTOGRAM_BIN_END_FIELD = "bin_end"
+HISTOGRAM_COUNT_FIELD = "count"
+MARK_TYPES = {
+    "bar_vertical": "bar",
+    "bar_horizontal": "bar",
+    "line": "line",
+    "scatter": "point",
+    "histogram": "bar",
+}
+
+
+class GraphSpecBuilder:
+    """Describe a reduced graph payload as a Vega-Lite style spec.
+
+    The spec carries the already aggregated and downsampled series inline, so
+    the browser draws the chart without any further request.
+    """
+
+    def build(self, payload: GraphRenderPayload, label: str = "") -> dict[str, Any]:
+        graph_id = payload.graph_id
+        if graph_id not in MARK_TYPES:
+            raise ValueError(f"Unsupported graph pattern: {graph_id}")
+
+        if graph_id == "histogram":
+            values, encoding = self._build_histogram(payload)
+        else:
+            values = self._build_values(payload.columns)
+            encoding = self._build_encoding(payload)
+
+        return {
+            "$schema": VEGA_LITE_SCHEMA,
+            "description": label or graph_id,
+            "graph_id": graph_id,
+            "width": "container",
+            "data": {"values": values},
+            "mark": {"type": MARK_TYPES[graph_id], "color": PRIMARY_COLOR, "tooltip": True},
+            "encoding": encoding,
+            "config": {
+                "background": BACKGROUND_COLOR,
+                "axis": {
+                    "labelColor": SECONDARY_COLOR,
+                    "titleColor": SECONDARY_COLOR,
+                },
+                "range": {"category": [PRIMARY_COLOR, SECONDARY_COLOR]},
+            },
+        }
+
+    def _build_encoding(self, payload: GraphRenderPayload) -> dict[str, Any]:
+        x_channel = self._build_channel(payload.x_field, payload.columns[payload.x_field])
+        y_channel = self._build_channel(payload.y_field, payload.columns[payload.y_field])
+        if x_channel["type"] == "nominal":
+            # Keep the reducer's order, which puts the folded bucket last.
+            x_channel["sort"] = None
+
+        encoding = (
+            {"x": y_channel, "y": x_channel}
+            if payload.graph_id == "bar_horizontal"
+            else {"x": x_channel, "y": y_channel}
+        )
+        if payload.hue_field:
+            encoding["color"] = {
+                "field": payload.hue_field,
+                "type": "nominal",
+                "title": payload.hue_field,
+            }
+        return encoding
+
+    def _build_histogram(
+        self,
+        payload: GraphRenderPayload,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        x_field = payload.x_field
+        count_channel = {
+            "field": HISTOGRAM_COUNT_FIELD,
+            "type": "quantitative",
+            "title": HISTOGRAM_COUNT_FIELD,
+        }
+
+        if not payload.bins:
+            counts = pd.Series(payload.columns[x_field]).value_counts(sort=False)
+            values = self._build_values(
+                {
+                    x_field: counts.index.to_numpy(),
+                    HISTOGRAM_COUNT_FIELD: counts.to_numpy(),
+                }
+            )
+            return values, {
+                "x": {"field": x_field, "type": "nominal", "title": x_field, "sort": None},
+                "y": count_channel,
+            }
+
+        bin_edges = np.asarray(payload.bins, dtype=float)
+        values = self._build_values(
+            {
+                HISTOGRAM_BIN_START_FIELD: bin_edges[:-1],
+                HISTOGRAM_BIN_END_FIELD: bin_edges[1:],
+                HISTOGRAM_COUNT_FIELD: payload.columns[payload.weight_field],
+            }
+        )
+        return values, {
+            "x": {
+                "field": HISTOGRAM_BIN_START_FIELD,
+                "type": "quantitative",
+                "bin": {"binned": True},
+                "title": x_field,
+            },
+            "x2": {"field": HISTOGRAM_BIN_END_FIELD},
+            "y": count_channel,
+        }
+
+    def _build_channel(self, field: str, values: np.ndarray) -> dict[str, Any]:
+        return {"field": field, "type": self._field_type(values), "title": field}
+
+    def _field_type(self, values: np.ndarray) -> str:
+        dtype = np.asarray(values).dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return "temporal"
+        if pd.api.types.is_bool_dtype(dtype):
+            return "nominal"
+        if pd.api.types.is_numeric_dtype(dtype):
+            return "quantitative"
+        if len(values) and all(isinstance(value, date) for value in values):
+            return "temporal"
+        return "nominal"
+
+    def _build_values(self, columns: dict[str, np.ndarray]) -> list[dict[str, Any]]:
+        """Return one JSON-ready record per plotted point."""
+        json_columns = {
+            field: [self._to_json_value(value) for value in pd.Series(values).tolist()]
+            for field, values in columns.items()
+        }
+        return [
+            dict(zip(json_columns, row_values))
+            for row_values in zip(*json_columns.values())
+        ]
+
+    def _to_json_value(self, value: Any) -> Any:
+        if value is None or value is pd.NaT:
+            return None
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float):
+            return value if math.isfinite(value) else None
+        if isinstance(value, (bool, int, str)):
+            return value
+        return str(value)
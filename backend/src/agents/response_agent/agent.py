@@ -1,11 +1,17 @@
 from dataclasses import dataclass
-import json
 from typing import Any
 
 from src.agents.base import BaseAgent, get_session_history
+from src.infra.column_profile import ColumnProfile
+from src.infra.config import settings
+from src.infra.result_spill import SpilledResultSet
+from src.infra.result_spill import preview_rows
 
 from .analysis import AnalyticalSummaryBuilder
 from .formatter import ResponseReportFormatter
+from .history import HistoryWindowPolicy
+from .history import history_window_policy
+from .prompt_data import PromptDataReducer
 from .tool_kit import build_response_toolkit
 
 
@@ -22,6 +28,7 @@ class ResponseDraft:
     response_data: list[ResponseRow]
     serialized_rows: str
     analysis_summary: str
+    row_count: int
 
     def to_prompt_payload(self, history_messages: list[object]) -> dict[str, object]:
         return {
@@ -39,7 +46,12 @@ class ResponseAgent(BaseAgent):
         super().__init__()
         self._chain = build_response_toolkit(self.llm)
         self._summary_builder = AnalyticalSummaryBuilder()
-        self._report_formatter = ResponseReportFormatter()
+        self._report_formatter = ResponseReportFormatter(self._summary_builder)
+        self._prompt_data_reducer = PromptDataReducer(
+            token_budget=settings.response_prompt_token_budget,
+            summary_builder=self._summary_builder,
+        )
+        self._history_policy = history_window_policy
 
     def generate_natural_language(
         self,
@@ -48,8 +60,13 @@ class ResponseAgent(BaseAgent):
         user_email: str,
         chat_id: str,
         question_id: str,
+        column_profile: ColumnProfile | None = None,
     ) -> str:
-        """Generate a grounded natural-language answer for the returned rows."""
+        """Generate a grounded natural-language answer for the returned rows.
+
+        ``column_profile`` is the profile computed with the query result; it
+        spares the summary and the prompt digest from inferring column types.
+        """
         if not response_data:
             self.log_warning(
                 "No response data returned from the query.",
@@ -59,14 +76,34 @@ class ResponseAgent(BaseAgent):
             )
             return NO_DATA_MESSAGE
 
+        deterministic_response = self._build_deterministic_response(response_data)
+        if deterministic_response:
+            self._record_history(
+                history=get_session_history(chat_id),
+                question_text=question_text,
+                final_response=deterministic_response,
+            )
+            self.log_info(
+                f"Deterministic response generated without the LLM: {deterministic_response}",
+                user_email=user_email,
+                chat_id=chat_id,
+                question_id=question_id,
+            )
+            return deterministic_response
+
         draft = self._build_response_draft(
             question_text=question_text,
             response_data=response_data,
+            column_profile=column_profile,
         )
         history = get_session_history(chat_id)
-        response_text = self._chain.invoke(
-            draft.to_prompt_payload(history.messages)
+        first_sequence, history_messages = history.message_window()
+        prompt_history = self._get_history_policy().build_prompt_history(
+            chat_id,
+            history_messages,
+            first_sequence=first_sequence,
         )
+        response_text = self._chain.invoke(draft.to_prompt_payload(prompt_history))
         final_response = self._finalize_response(
             response_text=response_text,
             draft=draft,
@@ -85,22 +122,56 @@ class ResponseAgent(BaseAgent):
         )
         return final_response
 
+    def _build_deterministic_response(self, response_data: list[ResponseRow]) -> str:
+        """Return templated prose for tiny results, or an empty string to use the LLM."""
+        if not settings.response_deterministic_enabled:
+            return ""
+
+        return self._get_report_formatter().build_deterministic_response(
+            response_data=response_data,
+            max_rows=settings.response_deterministic_max_rows,
+        ) or ""
+
     def _build_response_draft(
         self,
         *,
         question_text: str,
         response_data: list[ResponseRow],
+        column_profile: ColumnProfile | None = None,
     ) -> ResponseDraft:
+        row_count = len(response_data)
+        if isinstance(response_data, SpilledResultSet):
+            # Spilled results are too large for the prompt; ground it on a preview.
+            response_data = preview_rows(response_data, settings.result_preview_rows)
+
         return ResponseDraft(
             question_text=question_text,
             response_data=response_data,
-            serialized_rows=self._serialize_response_data(response_data),
-            analysis_summary=self._get_summary_builder().build_summary(response_data),
+            serialized_rows=self._serialize_response_data(
+                response_data,
+                row_count=row_count,
+                column_profile=column_profile,
+            ),
+            analysis_summary=self._get_summary_builder().build_summary(
+                response_data,
+                row_count=row_count,
+                column_profile=column_profile,
+            ),
+            row_count=row_count,
         )
 
-    def _serialize_response_data(self, response_data: list[ResponseRow]) -> str:
-        """Return a stable JSON representation of the rows for prompt grounding."""
-        return json.dumps(response_data, ensure_ascii=False, default=str)
+    def _serialize_response_data(
+        self,
+        response_data: list[ResponseRow],
+        row_count: int | None = None,
+        column_profile: ColumnProfile | None = None,
+    ) -> str:
+        """Return the rows, or a budgeted digest of them, as JSON for prompt grounding."""
+        return self._get_prompt_data_reducer().reduce(
+            response_data,
+            row_count=row_count,
+            column_profile=column_profile,
+        )
 
     def _finalize_response(
         self,
@@ -114,6 +185,7 @@ class ResponseAgent(BaseAgent):
             response_data=draft.response_data,
             serialized_rows=draft.serialized_rows,
             analysis_summary=draft.analysis_summary,
+            row_count=draft.row_count,
         )
 
     def _record_history(
@@ -133,9 +205,26 @@ class ResponseAgent(BaseAgent):
             self._summary_builder = builder
         return builder
 
+    def _get_prompt_data_reducer(self) -> PromptDataReducer:
+        reducer = getattr(self, "_prompt_data_reducer", None)
+        if reducer is None:
+            reducer = PromptDataReducer(
+                token_budget=settings.response_prompt_token_budget,
+                summary_builder=self._get_summary_builder(),
+            )
+            self._prompt_data_reducer = reducer
+        return reducer
+
+    def _get_history_policy(self) -> HistoryWindowPolicy:
+        policy = getattr(self, "_history_policy", None)
+        if policy is None:
+            policy = history_window_policy
+            self._history_policy = policy
+        return policy
+
     def _get_report_formatter(self) -> ResponseReportFormatter:
         formatter = getattr(self, "_report_formatter", None)
         if formatter is None:
-            formatter = ResponseReportFormatter()
+            formatter = ResponseReportFormatter(self._get_summary_builder())
             self._report_formatter = formatter
         return formatter
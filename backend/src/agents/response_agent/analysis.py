@@ -1,37 +1,87 @@
-from collections import Counter
-from datetime import datetime
 from typing import Any
 
+import numpy as np
+import pandas as pd
+
+from src.infra.column_profile import ColumnProfile
+from src.infra.column_profile import ColumnProfiler
+from src.infra.column_profile import PLAIN_NUMBER_TYPES
+from src.infra.column_profile import is_numeric_value
+from src.infra.column_profile import parse_datetime_series
+from src.infra.column_profile import parse_datetime_value
+
 
 ResponseRow = dict[str, Any]
 NumericColumns = dict[str, list[float]]
 CategoricalColumns = dict[str, list[str]]
+NumericArrays = dict[str, np.ndarray]
+CategoricalArrays = dict[str, np.ndarray]
+DatedMetricSeries = tuple[tuple[str, float], tuple[str, float]]
 
-DATE_PARSE_FORMATS = (
-    "%Y-%m-%d",
-    "%Y-%m-%d %H:%M:%S",
-    "%Y-%m-%dT%H:%M:%S",
-    "%d/%m/%Y",
-)
+# Below this many rows a DataFrame costs more to build than the whole summary,
+# so columns are read straight from the row dicts instead.
+FRAME_SUMMARY_MIN_ROWS = 5_000
 
 
 class AnalyticalSummaryBuilder:
-    """Build a deterministic analytical brief from query rows."""
+    """Build a deterministic analytical brief from query rows.
+
+    Large results are loaded into a DataFrame once and every column is
+    summarized with array operations; results under ``frame_min_rows`` rows
+    are read straight from the row dicts, which is faster at that size. Column
+    types come from a shared ``ColumnProfile``, so a profile computed upstream
+    is reused instead of inferred again.
+    """
+
+    def __init__(
+        self,
+        column_profiler: ColumnProfiler | None = None,
+        frame_min_rows: int = FRAME_SUMMARY_MIN_ROWS,
+    ) -> None:
+        self._column_profiler = column_profiler or ColumnProfiler()
+        self.frame_min_rows = frame_min_rows
+
+    def build_summary(
+        self,
+        response_data: list[ResponseRow],
+        row_count: int | None = None,
+        column_profile: ColumnProfile | None = None,
+    ) -> str:
+        """Return a concise analytical summary grounded in the returned rows.
 
-    def build_summary(self, response_data: list[ResponseRow]) -> str:
-        """Return a concise analytical summary grounded in the returned rows."""
+        ``row_count`` overrides the reported total when ``response_data`` is
+        only a preview of a larger result.
+        """
         valid_rows = [row for row in response_data if isinstance(row, dict)]
         if not valid_rows:
             return ""
 
-        numeric_columns = self._extract_numeric_columns(valid_rows)
-        categorical_columns = self._extract_categorical_columns(
+        column_profile, numeric_columns, categorical_columns, frame = self._load_columns(
             valid_rows,
-            numeric_columns,
+            column_profile,
         )
+        primary_metric = next(iter(numeric_columns), "")
+        if not primary_metric:
+            dated_series = None
+        elif frame is None:
+            dated_series = self._extract_row_dated_metric_series(
+                valid_rows,
+                column_profile,
+                primary_metric,
+            )
+        else:
+            dated_series = self._extract_dated_metric_series(
+                frame,
+                column_profile,
+                primary_metric,
+            )
 
-        paragraphs = [self._build_row_count_summary(valid_rows)]
-        paragraphs.extend(self._build_numeric_summary(valid_rows, numeric_columns))
+        paragraphs = [
+            self._build_row_count_summary(
+                len(valid_rows) if row_count is None else row_count
+            )
+        ]
+        paragraphs.extend(self._build_numeric_summary(numeric_columns, dated_series))
 
         categorical_summary = self._build_categorical_summary(categorical_columns)
         if categorical_summary:
@@ -39,8 +89,155 @@ class AnalyticalSummaryBuilder:
 
         return " ".join(paragraph for paragraph in paragraphs if paragraph)
 
-    def _build_row_count_summary(self, rows: list[ResponseRow]) -> str:
-        row_count = len(rows)
+    def profile_columns(
+        self,
+        rows: list[ResponseRow],
+        column_profile: ColumnProfile | None = None,
+    ) -> tuple[NumericColumns, CategoricalColumns]:
+        """Split row values into numeric and categorical columns, in column order.
+
+        Date columns are reported as categorical so they can label groups.
+        """
+        valid_rows = [row for row in rows if isinstance(row, dict)]
+        if not valid_rows:
+            return {}, {}
+
+        _, numeric_columns, categorical_columns, _ = self._load_columns(
+            valid_rows,
+            column_profile,
+        )
+        return (
+            {column: values.tolist() for column, values in numeric_columns.items()},
+            {column: values.tolist() for column, values in categorical_columns.items()},
+        )
+
+    def format_localized_number(self, value: float | int) -> str:
+        """Format a number with pt-BR separators, e.g. 12.345,67."""
+        numeric_value = float(value)
+        if numeric_value.is_integer():
+            grouped = f"{int(numeric_value):,}"
+        else:
+            grouped = f"{numeric_value:,.2f}"
+
+        return grouped.replace(",", "_").replace(".", ",").replace("_", ".")
+
+    def _get_column_profiler(self) -> ColumnProfiler:
+        profiler = getattr(self, "_column_profiler", None)
+        if profiler is None:
+            profiler = ColumnProfiler()
+            self._column_profiler = profiler
+        return profiler
+
+    def _load_columns(
+        self,
+        rows: list[ResponseRow],
+        column_profile: ColumnProfile | None,
+    ) -> tuple[ColumnProfile, NumericArrays, CategoricalArrays, pd.DataFrame | None]:
+        """Return the profile and split columns, plus the frame when one was built."""
+        if len(rows) >= self.frame_min_rows:
+            frame, column_profile = self._build_profiled_frame(rows, column_profile)
+            numeric_columns, categorical_columns = self._split_columns(
+                frame,
+                column_profile,
+            )
+            return column_profile, numeric_columns, categorical_columns, frame
+
+        profiler = self._get_column_profiler()
+        values_by_column = profiler.collect_values(rows)
+        if column_profile is None:
+            column_profile = profiler.profile_values(values_by_column, len(rows))
+        numeric_columns, categorical_columns = self._split_values(
+            values_by_column,
+            column_profile,
+        )
+        return column_profile, numeric_columns, categorical_columns, None
+
+    def _build_profiled_frame(
+        self,
+        rows: list[ResponseRow],
+        column_profile: ColumnProfile | None,
+    ) -> tuple[pd.DataFrame, ColumnProfile]:
+        profiler = self._get_column_profiler()
+        frame = profiler.build_frame(rows)
+        if column_profile is None:
+            column_profile = profiler.profile_frame(frame)
+        return frame, column_profile
+
+    def _split_columns(
+        self,
+        frame: pd.DataFrame,
+        column_profile: ColumnProfile,
+    ) -> tuple[NumericArrays, CategoricalArrays]:
+        """Return the non-null values of each profiled column present in the frame."""
+        numeric_columns: NumericArrays = {}
+        categorical_columns: CategoricalArrays = {}
+        numeric_names = set(column_profile.numeric_columns)
+
+        for column in column_profile.columns:
+            if column not in frame.columns:
+                continue
+
+            values = frame[column].dropna()
+            if values.empty:
+                continue
+
+            if column in numeric_names:
+                numeric_values = pd.to_numeric(values, errors="coerce").dropna()
+                if not numeric_values.empty:
+                    numeric_columns[column] = numeric_values.to_numpy(dtype=float)
+            else:
+                categorical_columns[column] = values.astype(str).to_numpy(dtype=object)
+
+        return numeric_columns, categorical_columns
+
+    def _split_values(
+        self,
+        values_by_column: dict[str, list[Any]],
+        column_profile: ColumnProfile,
+    ) -> tuple[NumericArrays, CategoricalArrays]:
+        """Row-dict counterpart of ``_split_columns`` for small results."""
+        numeric_columns: NumericArrays = {}
+        categorical_columns: CategoricalArrays = {}
+        numeric_names = set(column_profile.numeric_columns)
+
+        for column in column_profile.columns:
+            values = values_by_column.get(column)
+            if not values:
+                continue
+
+            if column in numeric_names:
+                if all(type(value) in PLAIN_NUMBER_TYPES for value in values):
+                    numeric_values = values
+                else:
+                    numeric_values = [
+                        number
+                        for number in map(self._to_number, values)
+                        if number is not None
+                    ]
+                if numeric_values:
+                    numeric_columns[column] = np.array(numeric_values, dtype=float)
+            else:
+                categorical_columns[column] = np.array(
+                    [str(value) for value in values],
+                    dtype=object,
+                )
+
+        return numeric_columns, categorical_columns
+
+    def _to_number(self, value: object) -> float | None:
+        """Coerce a cell like ``pd.to_numeric(errors="coerce")``, or return None."""
+        if type(value) in PLAIN_NUMBER_TYPES or is_numeric_value(value):
+            number = float(value)
+        elif isinstance(value, str):
+            try:
+                number = float(value)
+            except ValueError:
+                return None
+        else:
+            return None
+        return None if number != number else number
+
+    def _build_row_count_summary(self, row_count: int) -> str:
         return (
             f"Destaques analiticos: a consulta retornou {row_count} registro"
             f"{'' if row_count == 1 else 's'}."
@@ -48,8 +245,8 @@ class AnalyticalSummaryBuilder:
 
     def _build_numeric_summary(
         self,
-        rows: list[ResponseRow],
-        numeric_columns: NumericColumns,
+        numeric_columns: NumericArrays,
+        dated_series: DatedMetricSeries | None,
     ) -> list[str]:
         if not numeric_columns:
             return [
@@ -58,15 +255,13 @@ class AnalyticalSummaryBuilder:
 
         primary_metric = next(iter(numeric_columns))
         metric_values = numeric_columns[primary_metric]
-        average_value = sum(metric_values) / len(metric_values)
-        min_value = min(metric_values)
-        max_value = max(metric_values)
 
         summary = [
             "Na metrica "
-            f"{primary_metric}, a media e {self._format_number(average_value)}, "
-            f"com minimo de {self._format_number(min_value)} e maximo de "
-            f"{self._format_number(max_value)}.",
+            f"{primary_metric}, a media e {self._format_number(metric_values.mean())}, "
+            f"a mediana e {self._format_number(np.median(metric_values))}, "
+            f"com minimo de {self._format_number(metric_values.min())} e maximo de "
+            f"{self._format_number(metric_values.max())}.",
         ]
 
         metric_mode = self._describe_mode(metric_values)
@@ -77,12 +272,12 @@ class AnalyticalSummaryBuilder:
             )
         else:
             summary.append(
-                f"A moda numerica dessa metrica e {self._format_number(metric_mode)}."
+                f"A moda numerica dessa metrica e {self._format_number(metric_mode[0])}."
             )
 
         summary.append(self._describe_outliers(primary_metric, metric_values))
 
-        trend_text = self._describe_trend(rows, primary_metric)
+        trend_text = self._describe_trend(primary_metric, metric_values, dated_series)
         if trend_text:
             summary.append(trend_text)
         else:
@@ -91,11 +286,27 @@ class AnalyticalSummaryBuilder:
                 "disponivel nos dados."
             )
 
+        secondary_summary = self._describe_secondary_metrics(numeric_columns)
+        if secondary_summary:
+            summary.append(secondary_summary)
+
         return summary
 
+    def _describe_secondary_metrics(self, numeric_columns: NumericArrays) -> str:
+        fragments = [
+            f"{column} com media {self._format_number(values.mean())}, minimo "
+            f"{self._format_number(values.min())} e maximo "
+            f"{self._format_number(values.max())}"
+            for column, values in list(numeric_columns.items())[1:]
+        ]
+        if not fragments:
+            return ""
+
+        return f"Outras metricas numericas: {'; '.join(fragments)}."
+
     def _build_categorical_summary(
         self,
-        categorical_columns: CategoricalColumns,
+        categorical_columns: CategoricalArrays,
     ) -> str:
         if not categorical_columns:
             return (
@@ -103,88 +314,53 @@ class AnalyticalSummaryBuilder:
             )
 
         category_column = next(iter(categorical_columns))
-        category_values = categorical_columns[category_column]
-        category_mode = self._describe_mode(category_values)
+        category_mode = self._describe_mode(categorical_columns[category_column])
         if category_mode is None:
             return ""
 
-        frequency = category_values.count(category_mode)
+        category_value, frequency = category_mode
         return (
             "Na dimensao "
-            f"{category_column}, a moda e '{category_mode}', aparecendo em "
+            f"{category_column}, a moda e '{category_value}', aparecendo em "
             f"{frequency} registro"
             f"{'' if frequency == 1 else 's'}."
         )
 
-    def _extract_numeric_columns(self, rows: list[ResponseRow]) -> NumericColumns:
-        values_by_column: NumericColumns = {}
-
-        for row in rows:
-            for key, value in row.items():
-                if self._is_numeric(value):
-                    values_by_column.setdefault(str(key), []).append(float(value))
-
-        return {
-            column: values
-            for column, values in values_by_column.items()
-            if values
-        }
-
-    def _extract_categorical_columns(
-        self,
-        rows: list[ResponseRow],
-        numeric_columns: NumericColumns,
-    ) -> CategoricalColumns:
-        values_by_column: CategoricalColumns = {}
-
-        for row in rows:
-            for key, value in row.items():
-                column = str(key)
-                if column in numeric_columns or value is None:
-                    continue
-
-                values_by_column.setdefault(column, []).append(str(value))
-
-        return {
-            column: values
-            for column, values in values_by_column.items()
-            if values
-        }
-
-    def _is_numeric(self, value: object) -> bool:
-        return isinstance(value, (int, float)) and not isinstance(value, bool)
-
-    def _describe_mode(self, values: list[object]) -> object:
-        if not values:
+    def _describe_mode(self, values: np.ndarray) -> tuple[Any, int] | None:
+        """Return the most frequent value and its count; ties keep the first seen."""
+        if not len(values):
             return None
 
-        best_value, frequency = Counter(values).most_common(1)[0]
+        codes, uniques = pd.factorize(values)
+        counts = np.bincount(codes)
+        best_index = int(counts.argmax())
+        frequency = int(counts[best_index])
         if frequency <= 1:
             return None
 
-        return best_value
+        best_value = uniques[best_index]
+        if isinstance(best_value, np.generic):
+            best_value = best_value.item()
+        return best_value, frequency
 
-    def _describe_outliers(self, column: str, values: list[float]) -> str:
+    def _describe_outliers(self, column: str, values: np.ndarray) -> str:
         if len(values) < 4:
             return (
                 f"Nao ha dados suficientes em {column} para uma analise confiavel de outliers."
             )
 
-        sorted_values = sorted(values)
+        sorted_values = np.sort(values)
         midpoint = len(sorted_values) // 2
-        lower_half = sorted_values[:midpoint]
-        upper_half = sorted_values[-midpoint:]
-        q1 = self._median(lower_half)
-        q3 = self._median(upper_half)
+        q1 = float(np.median(sorted_values[:midpoint]))
+        q3 = float(np.median(sorted_values[-midpoint:]))
         iqr = q3 - q1
         lower_bound = q1 - (1.5 * iqr)
         upper_bound = q3 + (1.5 * iqr)
-        outliers = [
-            value for value in sorted_values
-            if value < lower_bound or value > upper_bound
+        outliers = sorted_values[
+            (sorted_values < lower_bound) | (sorted_values > upper_bound)
         ]
 
-        if not outliers:
+        if not len(outliers):
             return (
                 f"Nao surgiram outliers claros em {column} com base no intervalo interquartil."
             )
@@ -195,11 +371,14 @@ class AnalyticalSummaryBuilder:
             f"{'' if len(outliers) == 1 else 's'} em {column}; exemplos: {preview}."
         )
 
-    def _describe_trend(self, rows: list[ResponseRow], metric_column: str) -> str:
-        dated_rows = self._extract_dated_metric_series(rows, metric_column)
-        if dated_rows:
-            first_label, first_value = dated_rows[0]
-            last_label, last_value = dated_rows[-1]
+    def _describe_trend(
+        self,
+        metric_column: str,
+        metric_values: np.ndarray,
+        dated_series: DatedMetricSeries | None,
+    ) -> str:
+        if dated_series:
+            (first_label, first_value), (last_label, last_value) = dated_series
             trend_direction = self._trend_direction(first_value, last_value)
             return (
                 f"A tendencia de {metric_column} e {trend_direction}, saindo de "
@@ -207,16 +386,11 @@ class AnalyticalSummaryBuilder:
                 f"{self._format_number(last_value)} em {last_label}."
             )
 
-        ordered_values = [
-            float(row[metric_column])
-            for row in rows
-            if metric_column in row and self._is_numeric(row[metric_column])
-        ]
-        if len(ordered_values) < 2:
+        if len(metric_values) < 2:
             return ""
 
-        first_value = ordered_values[0]
-        last_value = ordered_values[-1]
+        first_value = float(metric_values[0])
+        last_value = float(metric_values[-1])
         trend_direction = self._trend_direction(first_value, last_value)
         return (
             f"Considerando a ordem retornada pela consulta, a tendencia de {metric_column} "
@@ -226,65 +400,87 @@ class AnalyticalSummaryBuilder:
 
     def _extract_dated_metric_series(
         self,
-        rows: list[ResponseRow],
+        frame: pd.DataFrame,
+        column_profile: ColumnProfile,
         metric_column: str,
-    ) -> list[tuple[str, float]]:
-        date_column = self._find_date_column(rows, metric_column)
+    ) -> DatedMetricSeries | None:
+        """Return the (label, value) pairs at the earliest and latest dates."""
+        date_column = next(
+            (
+                column
+                for column in column_profile.datetime_columns
+                if column in frame.columns
+            ),
+            "",
+        )
         if not date_column:
-            return []
+            return None
 
-        series: list[tuple[datetime, str, float]] = []
-        for row in rows:
-            raw_date = row.get(date_column)
-            raw_metric = row.get(metric_column)
-            if raw_date is None or not self._is_numeric(raw_metric):
-                continue
+        raw_dates = frame[date_column]
+        parsed_dates = parse_datetime_series(raw_dates)
+        metric_series = pd.to_numeric(frame[metric_column], errors="coerce")
+        valid_mask = parsed_dates.notna().to_numpy() & metric_series.notna().to_numpy()
+        if not valid_mask.any():
+            return None
 
-            parsed_date = self._parse_datetime(raw_date)
-            if parsed_date is None:
-                continue
+        valid_dates = parsed_dates[valid_mask]
+        # Keep native datetime64 values when pandas could unify them; mixed
+        # time zones stay as Python datetimes.
+        valid_dates = (
+            valid_dates.to_numpy()
+            if pd.api.types.is_datetime64_any_dtype(valid_dates.dtype)
+            else valid_dates.to_numpy(dtype=object)
+        )
+        valid_labels = raw_dates[valid_mask].to_numpy(dtype=object)
+        valid_values = metric_series[valid_mask].to_numpy(dtype=float)
 
-            series.append((parsed_date, str(raw_date), float(raw_metric)))
+        # The first minimum and the last maximum match a stable sort by date.
+        first_index = int(np.argmin(valid_dates))
+        last_index = len(valid_dates) - 1 - int(np.argmax(valid_dates[::-1]))
+        return (
+            (str(valid_labels[first_index]), float(valid_values[first_index])),
+            (str(valid_labels[last_index]), float(valid_values[last_index])),
+        )
 
-        series.sort(key=lambda item: item[0])
-        return [(label, value) for _, label, value in series]
+    def _extract_row_dated_metric_series(
+        self,
+        rows: list[ResponseRow],
+        column_profile: ColumnProfile,
+        metric_column: str,
+    ) -> DatedMetricSeries | None:
+        """Row-dict counterpart of ``_extract_dated_metric_series`` for small results."""
+        date_column = next(
+            (
+                column
+                for column in column_profile.datetime_columns
+                if any(column in row for row in rows)
+            ),
+            "",
+        )
+        if not date_column:
+            return None
 
-    def _find_date_column(self, rows: list[ResponseRow], metric_column: str) -> str:
+        earliest: tuple[Any, Any, float] | None = None
+        latest: tuple[Any, Any, float] | None = None
         for row in rows:
-            for key, value in row.items():
-                column = str(key)
-                if column == metric_column or value is None:
-                    continue
-
-                if self._parse_datetime(value) is not None:
-                    return column
-
-        return ""
+            raw_date = row.get(date_column)
+            parsed_date = parse_datetime_value(raw_date)
+            metric_value = self._to_number(row.get(metric_column))
+            if parsed_date is None or metric_value is None:
+                continue
 
-    def _parse_datetime(self, value: object) -> datetime | None:
-        if isinstance(value, datetime):
-            return value
+            # The first minimum and the last maximum match a stable sort by date.
+            if earliest is None or parsed_date < earliest[0]:
+                earliest = (parsed_date, raw_date, metric_value)
+            if latest is None or parsed_date >= latest[0]:
+                latest = (parsed_date, raw_date, metric_value)
 
-        if not isinstance(value, str):
+        if earliest is None or latest is None:
             return None
-
-        candidate = value.strip()
-        if not candidate:
-            return None
-
-        normalized = candidate.replace("Z", "+00:00")
-        try:
-            return datetime.fromisoformat(normalized)
-        except ValueError:
-            pass
-
-        for date_format in DATE_PARSE_FORMATS:
-            try:
-                return datetime.strptime(normalized, date_format)
-            except ValueError:
-                continue
-
-        return None
+        return (
+            (str(earliest[1]), earliest[2]),
+            (str(latest[1]), latest[2]),
+        )
 
     def _trend_direction(self, first_value: float, last_value: float) -> str:
         if last_value > first_value:
@@ -293,17 +489,6 @@ class AnalyticalSummaryBuilder:
             return "de queda"
         return "estavel"
 
-    def _median(self, values: list[float]) -> float:
-        if not values:
-            return 0.0
-
-        sorted_values = sorted(values)
-        midpoint = len(sorted_values) // 2
-        if len(sorted_values) % 2:
-            return sorted_values[midpoint]
-
-        return (sorted_values[midpoint - 1] + sorted_values[midpoint]) / 2
-
     def _format_number(self, value: float | int) -> str:
         numeric_value = float(value)
         if numeric_value.is_integer():
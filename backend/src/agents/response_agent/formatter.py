@@ -1,5 +1,9 @@
 from typing import Any
 
+from src.infra.column_profile import is_numeric_value
+
+from .analysis import AnalyticalSummaryBuilder
+
 
 ResponseRow = dict[str, Any]
 
@@ -22,9 +26,59 @@ ANALYTICAL_SIGNAL_WORDS = (
 )
 
 
+ACCESS_SCOPE_COLUMN = "company_id"
+MAX_SINGLE_ROW_FIELDS = 4
+
+
 class ResponseReportFormatter:
     """Normalize model output into grounded readable prose."""
 
+    def __init__(self, summary_builder: AnalyticalSummaryBuilder | None = None) -> None:
+        self._summary_builder = summary_builder or AnalyticalSummaryBuilder()
+
+    def build_deterministic_response(
+        self,
+        *,
+        response_data: list[ResponseRow],
+        max_rows: int,
+    ) -> str | None:
+        """Return templated prose for scalar, single-row, and small-category results.
+
+        Returns None when the result shape needs the LLM to be explained.
+        """
+        if not response_data or len(response_data) > max_rows:
+            return None
+
+        if not all(isinstance(row, dict) for row in response_data):
+            return None
+
+        columns = self._display_columns(response_data)
+        if not columns:
+            return None
+
+        rows = [{column: row.get(column) for column in columns} for row in response_data]
+        numeric_columns, categorical_columns = self._get_summary_builder().profile_columns(
+            rows
+        )
+        if set(columns) != set(numeric_columns) | set(categorical_columns):
+            return None
+
+        if len(rows) == 1:
+            if len(columns) <= 2 and not categorical_columns:
+                return self._build_scalar_response(rows[0], columns)
+            if len(columns) <= MAX_SINGLE_ROW_FIELDS:
+                return self._build_single_row_response(rows[0], columns)
+            return None
+
+        if len(numeric_columns) == 1 and len(categorical_columns) == 1:
+            return self._build_category_response(
+                rows,
+                category_column=next(iter(categorical_columns)),
+                metric_column=next(iter(numeric_columns)),
+            )
+
+        return None
+
     def finalize_response(
         self,
         *,
@@ -33,6 +87,7 @@ class ResponseReportFormatter:
         response_data: list[ResponseRow],
         serialized_rows: str,
         analysis_summary: str,
+        row_count: int | None = None,
     ) -> str:
         """Return the best readable response for the given model output."""
         cleaned_response = str(response_text or "").strip()
@@ -45,6 +100,7 @@ class ResponseReportFormatter:
                 question_text=question_text,
                 response_data=response_data,
                 analysis_summary=analysis_summary,
+                row_count=row_count,
             )
 
         if analysis_summary and not self._contains_analytical_signals(cleaned_response):
@@ -52,6 +108,80 @@ class ResponseReportFormatter:
 
         return cleaned_response
 
+    def _display_columns(self, rows: list[ResponseRow]) -> list[str]:
+        columns: list[str] = []
+        for row in rows:
+            for key in row.keys():
+                column = str(key)
+                if column != ACCESS_SCOPE_COLUMN and column not in columns:
+                    columns.append(column)
+        return columns
+
+    def _build_scalar_response(self, row: ResponseRow, columns: list[str]) -> str:
+        fragments = [
+            f"{self._label(column)} e {self._format_value(row[column])}"
+            for column in columns
+        ]
+        if len(fragments) == 1:
+            return f"O resultado da consulta para {fragments[0]}."
+
+        return f"O resultado da consulta para {fragments[0]}, e para {fragments[1]}."
+
+    def _build_single_row_response(self, row: ResponseRow, columns: list[str]) -> str:
+        values_text = "; ".join(
+            f"{self._label(column)}: {self._format_value(row[column])}"
+            for column in columns
+        )
+        return f"A consulta retornou um unico registro. {values_text}."
+
+    def _build_category_response(
+        self,
+        rows: list[ResponseRow],
+        *,
+        category_column: str,
+        metric_column: str,
+    ) -> str:
+        ranked_rows = sorted(
+            (row for row in rows if row.get(metric_column) is not None),
+            key=lambda row: float(row[metric_column]),
+            reverse=True,
+        )
+        if not ranked_rows:
+            return ""
+
+        values_text = "; ".join(
+            f"{row.get(category_column)}: {self._format_value(row[metric_column])}"
+            for row in ranked_rows
+        )
+        highest = ranked_rows[0]
+        lowest = ranked_rows[-1]
+        total = sum(float(row[metric_column]) for row in ranked_rows)
+        return (
+            f"{self._label(metric_column).capitalize()} por "
+            f"{self._label(category_column)}: {values_text}. "
+            f"O maior valor e de {highest.get(category_column)} "
+            f"({self._format_value(highest[metric_column])}) e o menor de "
+            f"{lowest.get(category_column)} "
+            f"({self._format_value(lowest[metric_column])}), somando "
+            f"{self._format_value(total)} no total."
+        )
+
+    def _label(self, column: str) -> str:
+        return column.replace("_", " ").strip()
+
+    def _format_value(self, value: object) -> str:
+        if is_numeric_value(value):
+            return self._get_summary_builder().format_localized_number(value)
+
+        return str(value)
+
+    def _get_summary_builder(self) -> AnalyticalSummaryBuilder:
+        builder = getattr(self, "_summary_builder", None)
+        if builder is None:
+            builder = AnalyticalSummaryBuilder()
+            self._summary_builder = builder
+        return builder
+
     def _contains_analytical_signals(self, response_text: str) -> bool:
         lowered = response_text.lower()
         return any(word in lowered for word in ANALYTICAL_SIGNAL_WORDS)
@@ -80,8 +210,9 @@ class ResponseReportFormatter:
         question_text: str,
         response_data: list[ResponseRow],
         analysis_summary: str,
+        row_count: int | None = None,
     ) -> str:
-        total_rows = len(response_data)
+        total_rows = len(response_data) if row_count is None else row_count
         first_row = (
             response_data[0]
             if response_data and isinstance(response_data[0], dict)
@@ -0,0 +1,210 @@
+import hashlib
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from dataclasses import field
+from threading import Lock
+
+from langchain_core.messages import AIMessage
+from langchain_core.messages import BaseMessage
+from langchain_core.messages import HumanMessage
+from langchain_core.messages import SystemMessage
+
+from src.infra.config import settings
+
+
+CHARS_PER_TOKEN = 4
+SUMMARY_LINE_CHARS = 160
+SUMMARY_HEADER = "Resumo das interacoes anteriores desta conversa:"
+DEFAULT_MAX_CACHED_CHATS = 1000
+
+
+@dataclass
+class RollingSummary:
+    """Summary lines folded so far and the sequence number they fold up to.
+
+    ``folded_until`` is the absolute sequence number, exclusive, handed out by
+    the history backend, so it stays valid after the backend's message cap
+    drops the oldest messages. ``last_message_key`` identifies the last folded
+    message while it is still stored, which detects a restarted chat.
+    """
+
+    lines: list[str] = field(default_factory=list)
+    folded_until: int = 0
+    last_message_key: str = ""
+
+
+class HistoryWindowPolicy:
+    """Keep the latest turns verbatim and fold older ones into a rolling summary.
+
+    Summaries are cached per chat id and only new messages are folded on each
+    turn, so building the prompt history costs the same for long chats as for
+    short ones. Turns stay in the summary after the history backend evicts
+    them. The summary plus the verbatim window stays under the token budget;
+    the oldest summary lines are dropped first.
+    """
+
+    def __init__(
+        self,
+        max_recent_turns: int,
+        token_budget: int,
+        max_cached_chats: int = DEFAULT_MAX_CACHED_CHATS,
+        chars_per_token: int = CHARS_PER_TOKEN,
+    ) -> None:
+        self.max_recent_turns = max(max_recent_turns, 0)
+        self.token_budget = token_budget
+        self.max_cached_chats = max(max_cached_chats, 1)
+        self.chars_per_token = max(chars_per_token, 1)
+        self._lock = Lock()
+        self._summaries: OrderedDict[str, RollingSummary] = OrderedDict()
+
+    def build_prompt_history(
+        self,
+        chat_id: str,
+        messages: list[BaseMessage],
+        first_sequence: int = 0,
+    ) -> list[BaseMessage]:
+        """Return the history messages to place in the response prompt.
+
+        ``first_sequence`` is the backend sequence number of ``messages[0]``.
+        """
+        if self.token_budget <= 0:
+            return list(messages)
+
+        recent_messages = (
+            list(messages[-self.max_recent_turns * 2:]) if self.max_recent_turns else []
+        )
+        while recent_messages and self._estimate_messages(recent_messages) > self.token_budget:
+            recent_messages = recent_messages[2:]
+
+        summary_lines = self._fold(
+            chat_id,
+            messages,
+            first_sequence=first_sequence,
+            older_count=len(messages) - len(recent_messages),
+        )
+        remaining_budget = self.token_budget - self._estimate_messages(recent_messages)
+        summary_message = self._build_summary_message(summary_lines, remaining_budget)
+
+        if summary_message is None:
+            return recent_messages
+        return [summary_message, *recent_messages]
+
+    def forget(self, chat_id: str) -> None:
+        with self._lock:
+            self._summaries.pop(chat_id, None)
+
+    def _fold(
+        self,
+        chat_id: str,
+        messages: list[BaseMessage],
+        *,
+        first_sequence: int,
+        older_count: int,
+    ) -> list[str]:
+        """Fold the first ``older_count`` messages into the cached summary of the chat.
+
+        Only messages numbered at or after the cached ``folded_until`` are summarized.
+        """
+        with self._lock:
+            summary = self._summaries.pop(chat_id, None) or RollingSummary()
+            if not self._summary_lines_up(summary, messages, first_sequence, older_count):
+                # The chat restarted underneath the cached summary; rebuild it.
+                summary = RollingSummary(folded_until=first_sequence)
+
+            fold_start = max(summary.folded_until - first_sequence, 0)
+            summary.lines = self._tail_within_budget(
+                summary.lines
+                + [
+                    self._summarize_message(message)
+                    for message in messages[fold_start:older_count]
+                ],
+                self.token_budget,
+            )
+            if older_count > fold_start:
+                summary.folded_until = first_sequence + older_count
+                summary.last_message_key = self._message_key(messages[older_count - 1])
+
+            self._summaries[chat_id] = summary
+            while len(self._summaries) > self.max_cached_chats:
+                self._summaries.popitem(last=False)
+
+            return list(summary.lines)
+
+    def _summary_lines_up(
+        self,
+        summary: RollingSummary,
+        messages: list[BaseMessage],
+        first_sequence: int,
+        older_count: int,
+    ) -> bool:
+        if summary.folded_until > first_sequence + older_count:
+            return False
+
+        last_folded_index = summary.folded_until - 1 - first_sequence
+        if last_folded_index < 0:
+            # Nothing folded yet, or the last folded message was already evicted.
+            return True
+        return self._message_key(messages[last_folded_index]) == summary.last_message_key
+
+    def _build_summary_message(
+        self,
+        summary_lines: list[str],
+        token_budget: int,
+    ) -> SystemMessage | None:
+        kept_lines = self._tail_within_budget(
+            summary_lines,
+            token_budget - self._estimate_text(SUMMARY_HEADER),
+        )
+        if not kept_lines:
+            return None
+        return SystemMessage("\n".join([SUMMARY_HEADER, *kept_lines]))
+
+    def _tail_within_budget(self, lines: list[str], token_budget: int) -> list[str]:
+        """Return the most recent lines whose estimated tokens fit the budget."""
+        kept_lines: list[str] = []
+        used_tokens = 0
+        for line in reversed(lines):
+            used_tokens += self._estimate_text(line) + 1
+            if used_tokens > token_budget:
+                break
+            kept_lines.append(line)
+
+        kept_lines.reverse()
+        return kept_lines
+
+    def _summarize_message(self, message: BaseMessage) -> str:
+        if isinstance(message, HumanMessage):
+            speaker = "Usuario"
+        elif isinstance(message, AIMessage):
+            speaker = "Assistente"
+        else:
+            speaker = message.type.capitalize()
+
+        text = " ".join(str(message.content).split())
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = f"{text[: SUMMARY_LINE_CHARS - 3].rstrip()}..."
+        return f"- {speaker}: {text}"
+
+    def _message_key(self, message: BaseMessage) -> str:
+        return hashlib.sha1(
+            f"{message.type}:{message.content}".encode("utf-8")
+        ).hexdigest()
+
+    def _estimate_messages(self, messages: list[BaseMessage]) -> int:
+        return sum(self._estimate_text(str(message.content)) for message in messages)
+
+    def _estimate_text(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+
+def build_history_window_policy() -> HistoryWindowPolicy:
+    """Return the process-wide policy so rolling summaries survive across requests."""
+    return HistoryWindowPolicy(
+        max_recent_turns=settings.response_history_turns,
+        token_budget=settings.response_history_token_budget,
+        max_cached_chats=settings.chat_history_max_sessions,
+    )
+
+
+history_window_policy = build_history_window_policy()
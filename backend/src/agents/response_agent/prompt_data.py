@@ -0,0 +1,253 @@
+import json
+import math
+from collections import Counter
+from typing import Any
+
+from src.infra.column_profile import ColumnProfile
+from src.infra.column_profile import is_numeric_value
+
+from .analysis import AnalyticalSummaryBuilder
+from .analysis import CategoricalColumns
+from .analysis import NumericColumns
+from .formatter import ACCESS_SCOPE_COLUMN
+
+
+ResponseRow = dict[str, Any]
+
+CHARS_PER_TOKEN = 4
+DEFAULT_EXTREME_ROWS = 5
+DEFAULT_SAMPLE_ROWS = 20
+DEFAULT_GROUP_LIMIT = 10
+
+
+class PromptDataReducer:
+    """Fit query rows into the response prompt under a token budget.
+
+    Results that fit the budget are serialized unchanged. Larger results are
+    replaced by a digest with column statistics, the top and bottom rows of
+    the primary metric, a stratified sample, and group aggregates, shrinking
+    the row sections until the digest fits.
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        summary_builder: AnalyticalSummaryBuilder | None = None,
+        chars_per_token: int = CHARS_PER_TOKEN,
+    ) -> None:
+        self.token_budget = token_budget
+        self.chars_per_token = max(chars_per_token, 1)
+        self._summary_builder = summary_builder or AnalyticalSummaryBuilder()
+
+    def reduce(
+        self,
+        response_data: list[ResponseRow],
+        row_count: int | None = None,
+        column_profile: ColumnProfile | None = None,
+    ) -> str:
+        """Return the JSON text placed in the prompt for the given rows."""
+        serialized_rows = self._dumps(response_data)
+        if self.token_budget <= 0 or self._fits(serialized_rows):
+            return serialized_rows
+
+        valid_rows = [row for row in response_data if isinstance(row, dict)]
+        numeric_columns, categorical_columns = self._summary_builder.profile_columns(
+            valid_rows,
+            column_profile=column_profile,
+        )
+        # The access-scope id is numeric but is never a metric worth ranking or summing.
+        numeric_columns.pop(ACCESS_SCOPE_COLUMN, None)
+        total_rows = len(valid_rows) if row_count is None else row_count
+
+        extreme_rows = DEFAULT_EXTREME_ROWS
+        sample_rows = DEFAULT_SAMPLE_ROWS
+        group_limit = DEFAULT_GROUP_LIMIT
+        while True:
+            digest = self._dumps(
+                self._build_digest(
+                    rows=valid_rows,
+                    total_rows=total_rows,
+                    numeric_columns=numeric_columns,
+                    categorical_columns=categorical_columns,
+                    extreme_rows=extreme_rows,
+                    sample_rows=sample_rows,
+                    group_limit=group_limit,
+                )
+            )
+            if self._fits(digest) or (
+                extreme_rows == 0 and sample_rows == 0 and group_limit == 1
+            ):
+                return digest
+
+            extreme_rows //= 2
+            sample_rows //= 2
+            group_limit = max(group_limit // 2, 1)
+
+    def estimate_tokens(self, text: str) -> int:
+        """Return a character-based token estimate for prompt text."""
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def _fits(self, text: str) -> bool:
+        return self.estimate_tokens(text) <= self.token_budget
+
+    def _build_digest(
+        self,
+        *,
+        rows: list[ResponseRow],
+        total_rows: int,
+        numeric_columns: NumericColumns,
+        categorical_columns: CategoricalColumns,
+        extreme_rows: int,
+        sample_rows: int,
+        group_limit: int,
+    ) -> dict[str, Any]:
+        primary_metric = next(iter(numeric_columns), "")
+        primary_category = next(iter(categorical_columns), "")
+
+        digest: dict[str, Any] = {
+            "note": self._build_note(total_rows, len(rows)),
+            "row_count": total_rows,
+            "column_stats": self._build_column_stats(
+                numeric_columns,
+                categorical_columns,
+                group_limit,
+            ),
+        }
+
+        if primary_metric and extreme_rows:
+            ranked_rows = sorted(
+                (row for row in rows if self._is_numeric(row.get(primary_metric))),
+                key=lambda row: float(row[primary_metric]),
+            )
+            digest["top_rows"] = ranked_rows[::-1][:extreme_rows]
+            digest["bottom_rows"] = ranked_rows[:extreme_rows]
+
+        if sample_rows:
+            digest["sample_rows"] = self._stratified_sample(
+                rows,
+                primary_category,
+                sample_rows,
+            )
+
+        if primary_metric and primary_category:
+            digest["group_aggregates"] = self._build_group_aggregates(
+                rows,
+                primary_category,
+                primary_metric,
+                group_limit,
+            )
+
+        return digest
+
+    def _build_note(self, total_rows: int, available_rows: int) -> str:
+        if available_rows >= total_rows:
+            return (
+                f"Reduced view of {total_rows} rows; statistics and aggregates "
+                "cover every row of the result."
+            )
+        return (
+            f"Reduced view of a preview: statistics and aggregates cover only the first "
+            f"{available_rows} of {total_rows} rows and are not totals of the full result."
+        )
+
+    def _build_column_stats(
+        self,
+        numeric_columns: NumericColumns,
+        categorical_columns: CategoricalColumns,
+        group_limit: int,
+    ) -> dict[str, dict[str, Any]]:
+        stats: dict[str, dict[str, Any]] = {}
+        for column, values in numeric_columns.items():
+            stats[column] = {
+                "count": len(values),
+                "sum": round(sum(values), 4),
+                "mean": round(sum(values) / len(values), 4),
+                "min": min(values),
+                "max": max(values),
+            }
+
+        for column, values in categorical_columns.items():
+            frequencies = Counter(values)
+            stats[column] = {
+                "count": len(values),
+                "distinct": len(frequencies),
+                "top_values": frequencies.most_common(group_limit),
+            }
+
+        return stats
+
+    def _stratified_sample(
+        self,
+        rows: list[ResponseRow],
+        stratum_column: str,
+        sample_size: int,
+    ) -> list[ResponseRow]:
+        """Pick evenly spaced rows, split across strata in proportion to their size."""
+        if len(rows) <= sample_size:
+            return list(rows)
+
+        indexes_by_stratum: dict[str, list[int]] = {}
+        for index, row in enumerate(rows):
+            stratum = str(row.get(stratum_column)) if stratum_column else ""
+            indexes_by_stratum.setdefault(stratum, []).append(index)
+
+        selected_indexes: list[int] = []
+        for indexes in indexes_by_stratum.values():
+            quota = max(1, round(sample_size * len(indexes) / len(rows)))
+            selected_indexes.extend(self._evenly_spaced_indexes(indexes, quota))
+
+        selected_indexes.sort()
+        if len(selected_indexes) > sample_size:
+            selected_indexes = self._evenly_spaced_indexes(selected_indexes, sample_size)
+
+        return [rows[index] for index in selected_indexes]
+
+    def _evenly_spaced_indexes(self, indexes: list[int], size: int) -> list[int]:
+        if len(indexes) <= size:
+            return list(indexes)
+
+        step = len(indexes) / size
+        return [indexes[int(position * step)] for position in range(size)]
+
+    def _build_group_aggregates(
+        self,
+        rows: list[ResponseRow],
+        group_column: str,
+        metric_column: str,
+        group_limit: int,
+    ) -> dict[str, Any]:
+        totals: dict[str, list[float]] = {}
+        for row in rows:
+            value = row.get(metric_column)
+            if not self._is_numeric(value):
+                continue
+
+            group = totals.setdefault(str(row.get(group_column)), [0, 0.0])
+            group[0] += 1
+            group[1] += float(value)
+
+        ranked_groups = sorted(
+            totals.items(),
+            key=lambda item: item[1][1],
+            reverse=True,
+        )
+        return {
+            "group_by": group_column,
+            "metric": metric_column,
+            "groups": [
+                {
+                    group_column: group,
+                    "count": count,
+                    f"sum_{metric_column}": round(total, 4),
+                    f"avg_{metric_column}": round(total / count, 4),
+                }
+                for group, (count, total) in ranked_groups[:group_limit]
+            ],
+            "other_groups": max(len(ranked_groups) - group_limit, 0),
+        }
+
+    def _is_numeric(self, value: object) -> bool:
+        return is_numeric_value(value)
+
+    def _dumps(self, payload: object) -> str:
+        return json.dumps(payload, ensure_ascii=False, default=str)
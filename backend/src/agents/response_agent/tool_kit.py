@@ -12,6 +12,10 @@ def build_response_toolkit(llm):
                 "Precomputed analytical brief: {analysis_summary}. "
                 "Answer the user's question directly, explain what the returned data means, "
                 "and keep the explanation grounded in the returned rows. "
+                "When the database response is a reduced view with a note, row_count "
+                "and column_stats, its rows are examples only, and its statistics and "
+                "aggregates cover exactly the rows its note states. When the note says "
+                "they cover only a preview, do not present them as totals of the result. "
                 "Write 2 to 4 short paragraphs in prose. "
                 "Explicitly cover highlights, insights, averages, mode/frequency, outliers, "
                 "and trends whenever the data supports them. "
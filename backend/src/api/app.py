@@ -1,10 +1,16 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 
-from src.api.config import assets_dir
+from src.agents.graph_agent.renderer import graph_render_pool
+from src.api.config import graph_prerenderer
+from src.api.config import static_asset_bundle
 from src.api.routes.agent import router as agent_router
 from src.api.routes.auth import router as auth_router
 from src.api.routes.pages import router as pages_router
+from src.api.static_assets import FingerprintedStaticFiles
 
 
 API_DESCRIPTION = """
@@ -32,15 +38,27 @@ API_TAGS_METADATA = [
 ]
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Start the graph render workers with the API and stop them on shutdown."""
+    await run_in_threadpool(graph_render_pool.warm_up)
+    try:
+        yield
+    finally:
+        graph_prerenderer.shutdown()
+        graph_render_pool.shutdown()
+
+
 app = FastAPI(
     title="Analytical Agent Backend API",
     summary="FastAPI backend for the Analytical Agent project.",
     description=API_DESCRIPTION,
     version="1.0.0",
     openapi_tags=API_TAGS_METADATA,
+    lifespan=lifespan,
 )
 
-app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+app.mount("/assets", FingerprintedStaticFiles(static_asset_bundle), name="assets")
 app.include_router(pages_router)
 app.include_router(auth_router)
 app.include_router(agent_router)
@@ -1,32 +1,61 @@
 import json
+import sqlite3
+from contextlib import closing
 from datetime import datetime, timezone
 from pathlib import Path
+from threading import RLock
 from typing import Any
 
+from src.api.chat_store_schema import ChatMessage
 from src.api.chat_store_schema import ChatStore
 from src.api.chat_store_schema import ChatStoreSerializer
+from src.api.chat_store_schema import GraphCacheEntry
 from src.api.chat_store_schema import clean_text
 from src.api.chat_store_schema import generate_hash_id
+from src.api.chat_store_schema import MESSAGE_ID_KEY
 from src.api.chat_store_schema import STORE_CHAT_ID_KEY
 from src.api.chat_store_schema import STORE_MESSAGES_KEY
+from src.infra.column_profile import ColumnProfile
 from src.infra.config.config_google.storage_manager import StorageManager
 from src.infra.logging_utils import LoggedComponent
+from src.infra.result_spill import SpilledResultSet
+
+
+DEFAULT_CHAT_STORE_DB_NAME = "chat_store.sqlite3"
+LEGACY_CHAT_STORE_NAME = "chat_messages.json"
+MIGRATED_LEGACY_SUFFIX = ".migrated"
 
 
 class ChatStoreManager(LoggedComponent):
-    """Manage local chat metadata and delegate structured payload storage."""
+    """Manage local chat metadata and delegate structured payload storage.
 
-    def __init__(self, base_dir: Path, storage_manager: StorageManager) -> None:
+    Messages are rows of a WAL-mode SQLite file, keyed by message id and
+    indexed by chat id, so every write upserts a single row. A legacy
+    ``chat_messages.json`` is imported once and renamed.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        storage_manager: StorageManager,
+        database_path: Path | str | None = None,
+    ) -> None:
         super().__init__()
         self.base_dir = base_dir.resolve()
         self.project_root = self.base_dir.parent
-        self.chat_messages_path = self.base_dir / "chat_messages.json"
+        self.chat_messages_path = self.base_dir / LEGACY_CHAT_STORE_NAME
+        self.database_path = (
+            Path(database_path) if database_path else self.base_dir / DEFAULT_CHAT_STORE_DB_NAME
+        )
         self.storage_manager = storage_manager
         self.serializer = ChatStoreSerializer()
+        # Background graph pre-renders write to the store from worker threads.
+        self._store_lock = RLock()
+        self._store_ready = False
         self.log_debug("Chat store manager initialized.")
 
     def _reconcile_legacy_root_chat_store(self) -> None:
-        legacy_chat_path = self.project_root / "chat_messages.json"
+        legacy_chat_path = self.project_root / LEGACY_CHAT_STORE_NAME
         if legacy_chat_path == self.chat_messages_path or not legacy_chat_path.exists():
             return
 
@@ -39,20 +68,68 @@ class ChatStoreManager(LoggedComponent):
         self.log_warning("Removed legacy root-level chat_messages.json file.")
 
     def ensure_chat_store(self) -> None:
-        """Ensure the canonical chat store file exists."""
-        self._reconcile_legacy_root_chat_store()
-        if self.chat_messages_path.exists():
-            return
+        """Create the chat store tables and import the legacy JSON store once."""
+        with self._store_lock:
+            if self._store_ready:
+                return
 
-        self._write_store(self.serializer.build_default_store())
-        self.log_info("Created chat_messages.json store.")
+            self._reconcile_legacy_root_chat_store()
+            self.database_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as connection, connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS chat_store_meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL
+                    )
+                    """
+                )
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS chat_messages (
+                        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                        message_id TEXT NOT NULL UNIQUE,
+                        chat_id TEXT NOT NULL,
+                        data_version TEXT NOT NULL DEFAULT '',
+                        message TEXT NOT NULL,
+                        user_email TEXT NOT NULL DEFAULT ''
+                    )
+                    """
+                )
+                self._add_message_owner_column(connection)
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_chat_messages_chat "
+                    "ON chat_messages (chat_id, seq)"
+                )
+
+            self._migrate_legacy_chat_store()
+            with self._connect() as connection, connection:
+                connection.execute(
+                    "INSERT OR IGNORE INTO chat_store_meta (key, value) VALUES (?, ?)",
+                    (STORE_CHAT_ID_KEY, generate_hash_id()),
+                )
+            self._store_ready = True
 
     def load_chat_store(self) -> ChatStore:
-        """Load, normalize, and persist the canonical chat store structure."""
+        """Load every stored message in the canonical chat store structure."""
         self.ensure_chat_store()
-        payload = self._read_store_payload()
-        store = self.serializer.normalize_store(payload)
-        self._write_store(store)
+        with self._connect() as connection, connection:
+            stored_chat_id = self._read_chat_id(connection)
+            rows = connection.execute(
+                "SELECT message FROM chat_messages ORDER BY seq"
+            ).fetchall()
+
+        store = self.serializer.normalize_store(
+            {
+                STORE_CHAT_ID_KEY: stored_chat_id,
+                STORE_MESSAGES_KEY: [json.loads(row[0]) for row in rows],
+            }
+        )
+        if store[STORE_CHAT_ID_KEY] != stored_chat_id:
+            # Persist the replacement of an unsafe id so it stays stable.
+            with self._connect() as connection, connection:
+                self._write_chat_id(connection, store[STORE_CHAT_ID_KEY])
 
         self.log_debug(
             f"Chat store loaded. Messages: {len(store[STORE_MESSAGES_KEY])}.",
@@ -73,6 +150,8 @@ class ChatStoreManager(LoggedComponent):
         response_types: list[str] | None = None,
         graph_suggestions: list[dict[str, str]] | None = None,
         user_email: str | None = None,
+        column_profile: ColumnProfile | None = None,
+        data_version: str = "",
     ) -> None:
         """Create or update a message while preserving existing non-empty metadata."""
         clean_question = clean_text(question)
@@ -85,37 +164,46 @@ class ChatStoreManager(LoggedComponent):
             )
             return
 
-        store = self.load_chat_store()
-        normalized_chat_id = clean_text(chat_id) or str(store[STORE_CHAT_ID_KEY])
-        normalized_message_id = clean_text(message_id) or generate_hash_id()
-        timestamp = self._current_timestamp()
-
-        incoming_message = self.serializer.build_message_record(
-            message_id=normalized_message_id,
-            question=clean_question,
-            response=clean_text(response),
-            query=clean_text(query),
-            data_path=clean_text(data_path),
-            graph_path=clean_text(graph_path),
-            selected_graph_pattern=clean_text(selected_graph_pattern),
-            response_types=self.serializer.normalize_response_types(response_types),
-            graph_suggestions=self.serializer.normalize_graph_suggestions(
-                graph_suggestions
-            ),
-            created_at=timestamp,
-        )
+        self.ensure_chat_store()
+        with self._store_lock, self._connect() as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            normalized_chat_id = clean_text(chat_id) or self._read_chat_id(connection)
+            normalized_message_id = clean_text(message_id) or generate_hash_id()
+            timestamp = self._current_timestamp()
 
-        store[STORE_CHAT_ID_KEY] = normalized_chat_id
-        existing_message = self.serializer.find_message(store, normalized_message_id)
+            incoming_message = self.serializer.build_message_record(
+                message_id=normalized_message_id,
+                question=clean_question,
+                response=clean_text(response),
+                query=clean_text(query),
+                data_path=clean_text(data_path),
+                graph_path=clean_text(graph_path),
+                selected_graph_pattern=clean_text(selected_graph_pattern),
+                response_types=self.serializer.normalize_response_types(response_types),
+                graph_suggestions=self.serializer.normalize_graph_suggestions(
+                    graph_suggestions
+                ),
+                created_at=timestamp,
+                column_profile=self.serializer.normalize_column_profile(column_profile),
+                data_version=clean_text(data_version),
+            )
 
-        if existing_message is None:
-            store[STORE_MESSAGES_KEY].append(incoming_message)
-            action_message = "Chat message created in store."
-        else:
-            self.serializer.merge_upsert(existing_message, incoming_message, timestamp)
-            action_message = "Chat message updated in store."
+            existing_message = self._read_message(connection, normalized_message_id)
+            if existing_message is None:
+                stored_message = incoming_message
+                action_message = "Chat message created in store."
+            else:
+                self.serializer.merge_upsert(existing_message, incoming_message, timestamp)
+                stored_message = existing_message
+                action_message = "Chat message updated in store."
 
-        self._write_store(store)
+            self._upsert_message_row(
+                connection,
+                normalized_chat_id,
+                stored_message,
+                self._normalize_owner_email(user_email),
+            )
+            self._write_chat_id(connection, normalized_chat_id)
         self.log_info(
             action_message,
             user_email=user_email,
@@ -136,6 +224,8 @@ class ChatStoreManager(LoggedComponent):
         response_types: list[str] | None = None,
         graph_suggestions: list[dict[str, str]] | None = None,
         user_email: str | None = None,
+        column_profile: ColumnProfile | None = None,
+        data_version: str = "",
     ) -> None:
         """Backward-compatible alias for the message upsert operation."""
         self.upsert_message(
@@ -150,6 +240,8 @@ class ChatStoreManager(LoggedComponent):
             response_types=response_types,
             graph_suggestions=graph_suggestions,
             user_email=user_email,
+            column_profile=column_profile,
+            data_version=data_version,
         )
 
     def save_message_data(
@@ -160,7 +252,7 @@ class ChatStoreManager(LoggedComponent):
         user_email: str | None = None,
     ) -> str:
         """Persist structured query rows in cloud storage and return the access path."""
-        if not isinstance(response_data, list):
+        if not isinstance(response_data, (list, SpilledResultSet)):
             self.log_debug(
                 "No structured response data to persist.",
                 user_email=user_email,
@@ -177,13 +269,21 @@ class ChatStoreManager(LoggedComponent):
             )
             return ""
 
-        payload = [item for item in response_data if isinstance(item, dict)]
-        relative_path = self.storage_manager.save_json_data(
-            user_email=user_email,
-            chat_id=chat_id,
-            message_id=message_id,
-            payload=payload,
-        )
+        if isinstance(response_data, SpilledResultSet):
+            relative_path = self.storage_manager.save_json_rows(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                rows=response_data,
+            )
+        else:
+            payload = [item for item in response_data if isinstance(item, dict)]
+            relative_path = self.storage_manager.save_json_data(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                payload=payload,
+            )
         self.log_info(
             f"Response data stored at {relative_path}.",
             user_email=user_email,
@@ -197,8 +297,9 @@ class ChatStoreManager(LoggedComponent):
         chat_id: str,
         message_id: str,
         user_email: str | None = None,
+        columns: list[str] | None = None,
     ) -> list[dict[str, Any]] | None:
-        """Load the persisted structured response rows for a given message."""
+        """Load the persisted structured response rows, or only some columns, for a message."""
         if not user_email:
             self.log_warning(
                 "Structured response data could not be loaded because the user email is missing.",
@@ -211,6 +312,7 @@ class ChatStoreManager(LoggedComponent):
             user_email=user_email,
             chat_id=chat_id,
             message_id=message_id,
+            columns=columns,
         )
         if payload is None:
             self.log_warning(
@@ -223,6 +325,47 @@ class ChatStoreManager(LoggedComponent):
 
         return payload
 
+    def load_graph_cache(
+        self,
+        chat_id: str,
+        message_id: str,
+        user_email: str | None = None,
+    ) -> GraphCacheEntry | None:
+        """Return the graph suggestions and column profile stored for the message data."""
+        self.ensure_chat_store()
+        with self._connect() as connection, connection:
+            message = self._read_message(connection, clean_text(message_id))
+        graph_cache = (
+            self.serializer.build_graph_cache_entry(message)
+            if message is not None
+            else None
+        )
+        if graph_cache is None:
+            self.log_debug(
+                "No versioned graph metadata found for the message.",
+                user_email=user_email,
+                chat_id=chat_id,
+                question_id=message_id,
+            )
+        return graph_cache
+
+    def load_data_version(self, chat_id: str, message_id: str, user_email: str) -> str:
+        """Return the data version of a message the user owns in the chat, or an empty string."""
+        owner_email = self._normalize_owner_email(user_email)
+        if not owner_email:
+            return ""
+
+        self.ensure_chat_store()
+        with self._connect() as connection, connection:
+            row = connection.execute(
+                """
+                SELECT data_version FROM chat_messages
+                WHERE message_id = ? AND chat_id = ? AND user_email = ?
+                """,
+                (clean_text(message_id), clean_text(chat_id), owner_email),
+            ).fetchone()
+        return clean_text(row[0]) if row is not None else ""
+
     def update_message_metadata(
         self,
         chat_id: str,
@@ -230,43 +373,56 @@ class ChatStoreManager(LoggedComponent):
         *,
         data_path: str | None = None,
         graph_path: str | None = None,
+        graph_spec: dict[str, Any] | None = None,
         selected_graph_pattern: str | None = None,
         response_types: list[str] | None = None,
         graph_suggestions: list[dict[str, str]] | None = None,
+        column_profile: ColumnProfile | None = None,
+        data_version: str | None = None,
         user_email: str | None = None,
     ) -> bool:
-        """Update stored metadata fields for an existing message."""
-        store = self.load_chat_store()
-        normalized_message_id = clean_text(message_id)
-        existing_message = self.serializer.find_message(store, normalized_message_id)
+        """Update stored metadata fields for an existing message; None leaves a field as is."""
+        self.ensure_chat_store()
+        with self._store_lock, self._connect() as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            normalized_message_id = clean_text(message_id)
+            existing_message = self._read_message(connection, normalized_message_id)
 
-        if existing_message is None:
-            self.log_warning(
-                "Chat message metadata update skipped because the message was not found.",
-                user_email=user_email,
-                chat_id=chat_id,
-                question_id=normalized_message_id,
-            )
-            return False
+            if existing_message is None:
+                self.log_warning(
+                    "Chat message metadata update skipped because the message was not found.",
+                    user_email=user_email,
+                    chat_id=chat_id,
+                    question_id=normalized_message_id,
+                )
+                return False
 
-        if data_path is not None:
-            existing_message["data_path"] = clean_text(data_path)
-        if graph_path is not None:
-            existing_message["graph_path"] = clean_text(graph_path)
-        if selected_graph_pattern is not None:
-            existing_message["selected_graph_pattern"] = clean_text(
-                selected_graph_pattern
-            )
-        if response_types is not None:
-            existing_message["response_types"] = self.serializer.normalize_response_types(
-                response_types
-            )
-        if graph_suggestions is not None:
-            existing_message[
-                "graph_suggestions"
-            ] = self.serializer.normalize_graph_suggestions(graph_suggestions)
+            if data_path is not None:
+                existing_message["data_path"] = clean_text(data_path)
+            if graph_path is not None:
+                existing_message["graph_path"] = clean_text(graph_path)
+            if graph_spec is not None:
+                existing_message["graph_spec"] = self.serializer.normalize_graph_spec(graph_spec)
+            if selected_graph_pattern is not None:
+                existing_message["selected_graph_pattern"] = clean_text(
+                    selected_graph_pattern
+                )
+            if response_types is not None:
+                existing_message["response_types"] = self.serializer.normalize_response_types(
+                    response_types
+                )
+            if graph_suggestions is not None:
+                existing_message[
+                    "graph_suggestions"
+                ] = self.serializer.normalize_graph_suggestions(graph_suggestions)
+            if column_profile is not None:
+                existing_message[
+                    "column_profile"
+                ] = self.serializer.normalize_column_profile(column_profile)
+            if data_version is not None:
+                existing_message["data_version"] = clean_text(data_version)
 
-        self._write_store(store)
+            self._update_message_row(connection, existing_message)
         self.log_info(
             "Chat message metadata updated in store.",
             user_email=user_email,
@@ -275,18 +431,175 @@ class ChatStoreManager(LoggedComponent):
         )
         return True
 
-    def _read_store_payload(self) -> ChatStore:
+    def record_prerendered_graph(
+        self,
+        chat_id: str,
+        message_id: str,
+        *,
+        graph_path: str,
+        selected_graph_pattern: str,
+        data_version: str,
+        user_email: str | None = None,
+    ) -> bool:
+        """Store a background render unless the message moved on meanwhile.
+
+        The graph is only recorded while the message still holds the rendered
+        ``data_version`` and no graph was selected by the user in between.
+        """
+        self.ensure_chat_store()
+        with self._store_lock, self._connect() as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            normalized_message_id = clean_text(message_id)
+            existing_message = self._read_message(connection, normalized_message_id)
+            if (
+                existing_message is None
+                or existing_message.get("data_version") != clean_text(data_version)
+                or existing_message.get("selected_graph_pattern")
+            ):
+                self.log_debug(
+                    "Pre-rendered graph not recorded because the message changed.",
+                    user_email=user_email,
+                    chat_id=chat_id,
+                    question_id=normalized_message_id,
+                )
+                return False
+
+            existing_message["graph_path"] = clean_text(graph_path)
+            existing_message["selected_graph_pattern"] = clean_text(selected_graph_pattern)
+            self._update_message_row(connection, existing_message)
+
+        self.log_info(
+            "Pre-rendered graph recorded in store.",
+            user_email=user_email,
+            chat_id=chat_id,
+            question_id=normalized_message_id,
+        )
+        return True
+
+    def _migrate_legacy_chat_store(self) -> None:
+        """Import the messages of chat_messages.json and set the file aside."""
         try:
-            return json.loads(self.chat_messages_path.read_text(encoding="utf-8"))
+            payload = json.loads(self.chat_messages_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
         except json.JSONDecodeError:
-            self.log_warning("Invalid chat store JSON detected. Resetting store.")
-            return {}
+            self.log_warning("Invalid chat store JSON detected. Skipping its migration.")
+            payload = {}
 
-    def _write_store(self, store: ChatStore) -> None:
-        self.chat_messages_path.write_text(
-            json.dumps(store, indent=2),
-            encoding="utf-8",
+        store = self.serializer.normalize_store(payload)
+        chat_id = store[STORE_CHAT_ID_KEY]
+        with self._connect() as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "INSERT OR IGNORE INTO chat_store_meta (key, value) VALUES (?, ?)",
+                (STORE_CHAT_ID_KEY, chat_id),
+            )
+            connection.executemany(
+                """
+                INSERT OR IGNORE INTO chat_messages (message_id, chat_id, data_version, message)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    self._build_message_row(chat_id, message)
+                    for message in store[STORE_MESSAGES_KEY]
+                ],
+            )
+
+        migrated_path = self.chat_messages_path.with_name(
+            f"{LEGACY_CHAT_STORE_NAME}{MIGRATED_LEGACY_SUFFIX}"
+        )
+        try:
+            self.chat_messages_path.replace(migrated_path)
+        except OSError:
+            pass
+        self.log_info(
+            f"Migrated {len(store[STORE_MESSAGES_KEY])} messages from "
+            f"{LEGACY_CHAT_STORE_NAME} to {self.database_path}."
+        )
+
+    def _read_chat_id(self, connection: sqlite3.Connection) -> str:
+        row = connection.execute(
+            "SELECT value FROM chat_store_meta WHERE key = ?",
+            (STORE_CHAT_ID_KEY,),
+        ).fetchone()
+        return row[0] if row is not None else ""
+
+    def _write_chat_id(self, connection: sqlite3.Connection, chat_id: str) -> None:
+        connection.execute(
+            "INSERT OR REPLACE INTO chat_store_meta (key, value) VALUES (?, ?)",
+            (STORE_CHAT_ID_KEY, chat_id),
+        )
+
+    def _read_message(
+        self,
+        connection: sqlite3.Connection,
+        message_id: str,
+    ) -> ChatMessage | None:
+        row = connection.execute(
+            "SELECT message FROM chat_messages WHERE message_id = ?",
+            (message_id,),
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def _upsert_message_row(
+        self,
+        connection: sqlite3.Connection,
+        chat_id: str,
+        message: ChatMessage,
+        owner_email: str,
+    ) -> None:
+        # The first known owner is kept; a later upsert cannot claim the message.
+        connection.execute(
+            """
+            INSERT INTO chat_messages (message_id, chat_id, data_version, message, user_email)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (message_id) DO UPDATE SET
+                chat_id = excluded.chat_id,
+                data_version = excluded.data_version,
+                message = excluded.message,
+                user_email = CASE
+                    WHEN chat_messages.user_email = '' THEN excluded.user_email
+                    ELSE chat_messages.user_email
+                END
+            """,
+            (*self._build_message_row(chat_id, message), owner_email),
+        )
+
+    def _update_message_row(self, connection: sqlite3.Connection, message: ChatMessage) -> None:
+        connection.execute(
+            "UPDATE chat_messages SET data_version = ?, message = ? WHERE message_id = ?",
+            (
+                clean_text(message.get("data_version")),
+                json.dumps(message),
+                str(message[MESSAGE_ID_KEY]),
+            ),
         )
 
+    def _build_message_row(self, chat_id: str, message: ChatMessage) -> tuple[str, ...]:
+        return (
+            str(message[MESSAGE_ID_KEY]),
+            chat_id,
+            clean_text(message.get("data_version")),
+            json.dumps(message),
+        )
+
+    def _add_message_owner_column(self, connection: sqlite3.Connection) -> None:
+        # Stores created before messages recorded their owner gain an empty column.
+        columns = {
+            row[1] for row in connection.execute("PRAGMA table_info(chat_messages)")
+        }
+        if "user_email" not in columns:
+            connection.execute(
+                "ALTER TABLE chat_messages ADD COLUMN user_email TEXT NOT NULL DEFAULT ''"
+            )
+
+    def _normalize_owner_email(self, user_email: str | None) -> str:
+        return clean_text(user_email).lower()
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        # Short-lived connections keep the store safe across threads and
+        # worker processes; the inner with-block commits each write.
+        return closing(sqlite3.connect(self.database_path, timeout=10))
+
     def _current_timestamp(self) -> str:
         return datetime.now(timezone.utc).isoformat()
@@ -1,7 +1,13 @@
+import hashlib
+import json
 import re
 import secrets
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import Any
 
+from src.infra.column_profile import ColumnProfile
+
 
 SAFE_STORAGE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
 
@@ -35,15 +41,36 @@ def clean_text(value: object) -> str:
     return as_text(value).strip()
 
 
+def build_data_version(rows: Iterable[dict[str, Any]]) -> str:
+    """Return a content hash of stored rows that versions metadata derived from them."""
+    digest = hashlib.sha256()
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        digest.update(json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class GraphCacheEntry:
+    """Graph metadata stored with a message for one version of its data."""
+
+    data_version: str
+    column_profile: ColumnProfile | None
+    graph_suggestions: list[GraphSuggestion]
+
+    def find_suggestion(self, graph_pattern_id: str) -> GraphSuggestion | None:
+        normalized_pattern_id = clean_text(graph_pattern_id)
+        for suggestion in self.graph_suggestions:
+            if suggestion["id"] == normalized_pattern_id:
+                return suggestion
+        return None
+
+
 class ChatStoreSerializer:
     """Own the persisted chat-store schema and normalization rules."""
 
-    def build_default_store(self) -> ChatStore:
-        return {
-            STORE_CHAT_ID_KEY: generate_hash_id(),
-            STORE_MESSAGES_KEY: [],
-        }
-
     def normalize_store(self, payload: object) -> ChatStore:
         raw_payload = payload if isinstance(payload, dict) else {}
         return {
@@ -68,6 +95,9 @@ class ChatStoreSerializer:
         response_types: list[str],
         graph_suggestions: list[GraphSuggestion],
         created_at: str,
+        column_profile: dict[str, Any] | None = None,
+        data_version: str = "",
+        graph_spec: dict[str, Any] | None = None,
     ) -> ChatMessage:
         return {
             MESSAGE_ID_KEY: message_id,
@@ -76,23 +106,15 @@ class ChatStoreSerializer:
             "query": query,
             "data_path": data_path,
             "graph_path": graph_path,
+            "graph_spec": graph_spec or {},
             "selected_graph_pattern": selected_graph_pattern,
             "response_types": response_types,
             "graph_suggestions": graph_suggestions,
+            "column_profile": column_profile or {},
+            "data_version": data_version,
             "created_at": created_at,
         }
 
-    def find_message(
-        self,
-        store: ChatStore,
-        message_id: str,
-    ) -> ChatMessage | None:
-        for item in store[STORE_MESSAGES_KEY]:
-            if str(item.get(MESSAGE_ID_KEY)) == message_id:
-                return item
-
-        return None
-
     def merge_upsert(
         self,
         existing_message: ChatMessage,
@@ -100,13 +122,7 @@ class ChatStoreSerializer:
         timestamp: str,
     ) -> None:
         existing_message["question"] = incoming_message["question"]
-        for field in (
-            "response",
-            "query",
-            "data_path",
-            "graph_path",
-            "selected_graph_pattern",
-        ):
+        for field in ("response", "query", "data_path"):
             existing_message[field] = self._prefer_non_empty(
                 incoming_message[field],
                 existing_message.get(field),
@@ -115,12 +131,51 @@ class ChatStoreSerializer:
         existing_message["response_types"] = (
             incoming_message["response_types"] or existing_message["response_types"]
         )
+        existing_message["created_at"] = (
+            as_text(existing_message.get("created_at")) or timestamp
+        )
+
+        incoming_version = incoming_message["data_version"]
+        if incoming_version and incoming_version != existing_message.get("data_version"):
+            # New rows invalidate every graph artifact derived from the old ones.
+            for field in (
+                "graph_path",
+                "graph_spec",
+                "selected_graph_pattern",
+                "graph_suggestions",
+                "column_profile",
+                "data_version",
+            ):
+                existing_message[field] = incoming_message[field]
+            return
+
+        for field in ("graph_path", "selected_graph_pattern"):
+            existing_message[field] = self._prefer_non_empty(
+                incoming_message[field],
+                existing_message.get(field),
+            )
         existing_message["graph_suggestions"] = (
             incoming_message["graph_suggestions"]
             or existing_message["graph_suggestions"]
         )
-        existing_message["created_at"] = (
-            as_text(existing_message.get("created_at")) or timestamp
+        existing_message["column_profile"] = (
+            incoming_message["column_profile"]
+            or existing_message.get("column_profile")
+            or {}
+        )
+
+    def build_graph_cache_entry(self, message: ChatMessage) -> GraphCacheEntry | None:
+        """Return the cached graph metadata of a message whose data is versioned."""
+        data_version = clean_text(message.get("data_version"))
+        if not data_version:
+            return None
+
+        return GraphCacheEntry(
+            data_version=data_version,
+            column_profile=ColumnProfile.from_dict(message.get("column_profile")),
+            graph_suggestions=self.normalize_graph_suggestions(
+                message.get("graph_suggestions")
+            ),
         )
 
     def normalize_response_types(self, response_types: object) -> list[str]:
@@ -164,6 +219,24 @@ class ChatStoreSerializer:
 
         return normalized_suggestions
 
+    def normalize_graph_spec(self, graph_spec: object) -> dict[str, Any]:
+        """Keep a stored graph spec only when it carries its inline data values."""
+        if not isinstance(graph_spec, dict):
+            return {}
+
+        data = graph_spec.get("data")
+        if not isinstance(data, dict) or not isinstance(data.get("values"), list):
+            return {}
+        return graph_spec
+
+    def normalize_column_profile(self, column_profile: object) -> dict[str, Any]:
+        """Normalize a stored column profile, dropping payloads that are not one."""
+        if isinstance(column_profile, ColumnProfile):
+            return column_profile.to_dict()
+
+        profile = ColumnProfile.from_dict(column_profile)
+        return profile.to_dict() if profile is not None else {}
+
     def _normalize_chat_id(self, raw_chat_id: object) -> str:
         chat_id = clean_text(raw_chat_id)
         if not chat_id:
@@ -207,6 +280,11 @@ class ChatStoreSerializer:
                 raw_message.get("graph_suggestions")
             ),
             created_at=as_text(raw_message.get("created_at")),
+            column_profile=self.normalize_column_profile(
+                raw_message.get("column_profile")
+            ),
+            data_version=clean_text(raw_message.get("data_version")),
+            graph_spec=self.normalize_graph_spec(raw_message.get("graph_spec")),
         )
 
     def _prefer_non_empty(self, new_value: object, current_value: object) -> str:
@@ -1,6 +1,10 @@
 from pathlib import Path
 
+from src.agents.graph_agent import GraphAgent
 from src.api.chat_store import ChatStoreManager
+from src.api.graph_prerender import build_graph_prerenderer
+from src.api.static_assets import StaticAssetBundle
+from src.infra.config import settings
 from src.infra.config.config_google.storage_manager import StorageManager
 from src.infra.logging_utils import LoggedComponent, configure_file_logging
 
@@ -20,5 +24,12 @@ class ApiAuditService(LoggedComponent):
 
 
 storage_manager = StorageManager()
-chat_store_manager = ChatStoreManager(backend_root, storage_manager=storage_manager)
+chat_store_manager = ChatStoreManager(
+    backend_root,
+    storage_manager=storage_manager,
+    database_path=settings.chat_store_path or None,
+)
+graph_agent = GraphAgent(storage_manager)
+graph_prerenderer = build_graph_prerenderer(graph_agent, chat_store_manager)
+static_asset_bundle = StaticAssetBundle(assets_dir)
 api_audit = ApiAuditService()
@@ -0,0 +1,306 @@
+from concurrent.futures import CancelledError
+from concurrent.futures import Future
+from concurrent.futures import InvalidStateError
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import BoundedSemaphore
+from threading import Lock
+from typing import Any
+from typing import Optional
+
+from src.agents.graph_agent import GraphAgent
+from src.api.chat_store import ChatStoreManager
+from src.infra.column_profile import ColumnProfile
+from src.infra.config import settings
+from src.infra.logging_utils import LoggedComponent
+
+
+PRERENDER_MODE_OFF = "off"
+PRERENDER_MODE_TOP = "top"
+PRERENDER_MODE_ALL = "all"
+
+
+@dataclass(frozen=True)
+class GraphPrerenderJob:
+    """Everything a background render needs once the ask response is sent.
+
+    ``response_data`` is None when the rows were spilled to disk; the job then
+    reads them back from the saved message data.
+    """
+
+    user_email: str
+    chat_id: str
+    question_id: str
+    data_version: str
+    graph_suggestions: tuple[dict[str, str], ...]
+    column_profile: Optional[ColumnProfile] = None
+    response_data: Optional[list[dict[str, Any]]] = None
+
+
+class GraphPrerenderer(LoggedComponent):
+    """Render graph suggestions in the background right after ``/v1/ask``.
+
+    Jobs run on a small thread pool and wait on the graph render pool, so
+    renders land in the content-addressed cache before the user asks for
+    them. At most ``max_pending`` jobs are queued; extra jobs are dropped.
+    The top suggestion's path is recorded in the chat store.
+    """
+
+    def __init__(
+        self,
+        graph_agent: GraphAgent,
+        chat_store_manager: ChatStoreManager,
+        *,
+        mode: str = PRERENDER_MODE_OFF,
+        max_workers: int = 2,
+        max_pending: int = 16,
+    ) -> None:
+        super().__init__()
+        self.graph_agent = graph_agent
+        self.chat_store_manager = chat_store_manager
+        self.mode = mode
+        self.max_workers = max(max_workers, 1)
+        self._pending_slots = BoundedSemaphore(max(max_pending, 1))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+        self._in_flight: dict[tuple[str, str, str, str], Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in {PRERENDER_MODE_TOP, PRERENDER_MODE_ALL}
+
+    def submit(self, job: GraphPrerenderJob) -> Optional[Future]:
+        """Queue the job and return its future, or None when it is skipped."""
+        if not self.enabled or not job.data_version or not job.graph_suggestions:
+            return None
+
+        if not self._pending_slots.acquire(blocking=False):
+            self.log_warning(
+                "Graph pre-render skipped because the queue is full.",
+                user_email=job.user_email,
+                chat_id=job.chat_id,
+                question_id=job.question_id,
+            )
+            return None
+
+        graph_patterns = (
+            job.graph_suggestions
+            if self.mode == PRERENDER_MODE_ALL
+            else job.graph_suggestions[:1]
+        )
+        pattern_futures: list[Future] = []
+        with self._lock:
+            for graph_pattern in graph_patterns:
+                pattern_future: Future = Future()
+                self._in_flight[self._build_job_key(job, graph_pattern)] = pattern_future
+                pattern_futures.append(pattern_future)
+
+        try:
+            job_future = self._get_executor().submit(
+                self._run_job,
+                job,
+                graph_patterns,
+                pattern_futures,
+            )
+        except RuntimeError:
+            self._finish_job(job, graph_patterns, pattern_futures)
+            raise
+
+        def release_if_cancelled(cancelled_future: Future) -> None:
+            # A job cancelled before it started never reaches _run_job's cleanup.
+            if cancelled_future.cancelled():
+                self._finish_job(job, graph_patterns, pattern_futures)
+
+        job_future.add_done_callback(release_if_cancelled)
+        return job_future
+
+    def wait_for_graph(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        question_id: str,
+        graph_pattern_id: str,
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """Return the path of an in-flight pre-render once it lands, or None.
+
+        None means no pre-render is running for the pattern, it failed, or it
+        did not finish within ``timeout`` seconds.
+        """
+        with self._lock:
+            pattern_future = self._in_flight.get(
+                self._build_key(user_email, chat_id, question_id, graph_pattern_id)
+            )
+        if pattern_future is None:
+            return None
+
+        try:
+            return pattern_future.result(timeout=timeout)
+        except (CancelledError, Exception):
+            # A failed pre-render falls back to rendering in the request.
+            return None
+
+    def shutdown(self) -> None:
+        """Drop queued jobs and release their slots; waiters stop waiting at once.
+
+        Jobs already running finish in the background and still fill the
+        render cache, but nobody waits on them anymore.
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        with self._lock:
+            pattern_futures = list(self._in_flight.values())
+            self._in_flight.clear()
+        for pattern_future in pattern_futures:
+            pattern_future.cancel()
+
+    def _run_job(
+        self,
+        job: GraphPrerenderJob,
+        graph_patterns: tuple[dict[str, str], ...],
+        pattern_futures: list[Future],
+    ) -> list[str]:
+        graph_paths: list[str] = []
+        try:
+            response_data = job.response_data
+            if response_data is None:
+                response_data = self.chat_store_manager.load_message_data(
+                    job.chat_id,
+                    job.question_id,
+                    user_email=job.user_email,
+                    columns=list(
+                        dict.fromkeys(
+                            field
+                            for graph_pattern in graph_patterns
+                            for field in self.graph_agent.get_plotted_fields(graph_pattern)
+                        )
+                    ),
+                )
+            if not response_data:
+                raise ValueError("Saved response data was not found for this message.")
+
+            for index, (graph_pattern, pattern_future) in enumerate(
+                zip(graph_patterns, pattern_futures)
+            ):
+                graph_path = self._render_pattern(job, response_data, graph_pattern)
+                try:
+                    pattern_future.set_result(graph_path)
+                except InvalidStateError:
+                    # Cancelled by shutdown; the render is still cached.
+                    pass
+                graph_paths.append(graph_path)
+                if index == 0:
+                    self.chat_store_manager.record_prerendered_graph(
+                        job.chat_id,
+                        job.question_id,
+                        graph_path=graph_path,
+                        selected_graph_pattern=graph_pattern["id"],
+                        data_version=job.data_version,
+                        user_email=job.user_email,
+                    )
+        except Exception as exp:
+            self.log_warning(
+                f"Graph pre-render failed: {exp}",
+                user_email=job.user_email,
+                chat_id=job.chat_id,
+                question_id=job.question_id,
+            )
+            for pattern_future in pattern_futures:
+                if not pattern_future.done():
+                    pattern_future.set_exception(exp)
+        finally:
+            self._finish_job(job, graph_patterns, pattern_futures)
+
+        self.log_info(
+            f"Pre-rendered {len(graph_paths)} of {len(graph_patterns)} graph suggestions.",
+            user_email=job.user_email,
+            chat_id=job.chat_id,
+            question_id=job.question_id,
+        )
+        return graph_paths
+
+    def _render_pattern(
+        self,
+        job: GraphPrerenderJob,
+        response_data: list[dict[str, Any]],
+        graph_pattern: dict[str, str],
+    ) -> str:
+        graph_path = self.graph_agent.find_rendered_graph(
+            graph_pattern=graph_pattern,
+            data_version=job.data_version,
+            user_email=job.user_email,
+            chat_id=job.chat_id,
+            question_id=job.question_id,
+        )
+        if graph_path is not None:
+            return graph_path
+
+        return self.graph_agent.render_graph(
+            response_data=response_data,
+            graph_pattern=graph_pattern,
+            user_email=job.user_email,
+            chat_id=job.chat_id,
+            question_id=job.question_id,
+            column_profile=job.column_profile,
+            data_version=job.data_version,
+        )
+
+    def _finish_job(
+        self,
+        job: GraphPrerenderJob,
+        graph_patterns: tuple[dict[str, str], ...],
+        pattern_futures: list[Future],
+    ) -> None:
+        with self._lock:
+            for graph_pattern, pattern_future in zip(graph_patterns, pattern_futures):
+                key = self._build_job_key(job, graph_pattern)
+                if self._in_flight.get(key) is pattern_future:
+                    del self._in_flight[key]
+                if not pattern_future.done():
+                    pattern_future.cancel()
+        self._pending_slots.release()
+
+    def _build_job_key(
+        self,
+        job: GraphPrerenderJob,
+        graph_pattern: dict[str, str],
+    ) -> tuple[str, str, str, str]:
+        return self._build_key(job.user_email, job.chat_id, job.question_id, graph_pattern["id"])
+
+    def _build_key(
+        self,
+        user_email: str,
+        chat_id: str,
+        question_id: str,
+        graph_pattern_id: str,
+    ) -> tuple[str, str, str, str]:
+        return (str(user_email).strip().lower(), chat_id, question_id, graph_pattern_id)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="graph-prerender",
+                )
+            return self._executor
+
+
+def build_graph_prerenderer(
+    graph_agent: GraphAgent,
+    chat_store_manager: ChatStoreManager,
+) -> GraphPrerenderer:
+    """Return the process-wide pre-renderer; it stays idle unless GRAPH_PRERENDER is set."""
+    return GraphPrerenderer(
+        graph_agent,
+        chat_store_manager,
+        mode=settings.graph_prerender_mode,
+        max_workers=settings.graph_prerender_workers,
+        max_pending=settings.graph_prerender_max_pending,
+    )
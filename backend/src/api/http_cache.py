@@ -0,0 +1,74 @@
+import hashlib
+from typing import Optional
+
+from fastapi.responses import Response
+
+
+IMMUTABLE_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
+PUBLIC_IMMUTABLE_CACHE_CONTROL = f"public, max-age={IMMUTABLE_MAX_AGE_SECONDS}, immutable"
+PRIVATE_IMMUTABLE_CACHE_CONTROL = f"private, max-age={IMMUTABLE_MAX_AGE_SECONDS}, immutable"
+PRIVATE_REVALIDATE_CACHE_CONTROL = "private, no-cache"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+ETAG_DIGEST_LENGTH = 32
+
+
+def build_etag(*parts: object) -> str:
+    """Return a strong ETag hashed from the parts that identify a representation."""
+    digest = hashlib.sha256(
+        "\x1f".join(str(part) for part in parts).encode("utf-8")
+    ).hexdigest()
+    return f'"{digest[:ETAG_DIGEST_LENGTH]}"'
+
+
+def build_content_etag(body: bytes) -> str:
+    """Return a strong ETag hashed from the bytes of a response body."""
+    return f'"{hashlib.sha256(body).hexdigest()[:ETAG_DIGEST_LENGTH]}"'
+
+
+def accepts_encoding(accept_encoding: Optional[str], encoding: str) -> bool:
+    """Return True when the Accept-Encoding header allows the given coding."""
+    for item in str(accept_encoding or "").split(","):
+        name, _, parameters = item.partition(";")
+        if name.strip().lower() not in (encoding, "*"):
+            continue
+
+        quality = parameters.strip().lower()
+        if not quality.startswith("q="):
+            return True
+        try:
+            return float(quality[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def with_content_encoding(etag: str, content_encoding: Optional[str]) -> str:
+    """Give an encoded representation its own strong ETag, as its bytes differ."""
+    if not content_encoding:
+        return etag
+    return f'{etag[:-1]}-{content_encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True when If-None-Match names the ETag or one of its encoded variants."""
+    if not isinstance(if_none_match, str) or not etag:
+        return False
+
+    opaque_tag = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+
+        candidate = candidate.removeprefix("W/").strip('"')
+        if candidate == opaque_tag or candidate.startswith(f"{opaque_tag}-"):
+            return True
+    return False
+
+
+def not_modified_response(etag: str, cache_control: str, *, vary: str = "") -> Response:
+    """Return the 304 answer to a conditional request whose ETag still matches."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=304, headers=headers)
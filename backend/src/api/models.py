@@ -1,3 +1,4 @@
+from typing import Literal
 from typing import Optional
 from pydantic import AliasChoices
 from pydantic import BaseModel
@@ -7,6 +8,8 @@ from pydantic import model_validator
 
 
 SUPPORTED_RESPONSE_TYPES = ("TEXT", "SQL", "GRAPH")
+GRAPH_FORMAT_PNG = "png"
+GRAPH_FORMAT_SPEC = "spec"
 RESPONSE_TYPE_ALIASES = {
     "GRAPHIC": "GRAPH",
 }
@@ -87,6 +90,11 @@ class ModelRequest(BaseModel):
         description="Optional context hint. Supported values are TRAVEL, EXPENSE, COMMERCIAL, and SERVICE.",
         examples=["TRAVEL"],
     )
+    include_debug: bool = Field(
+        default=False,
+        description="When true, the response includes a debug field with query job statistics.",
+        examples=[False],
+    )
 
     @model_validator(mode="after")
     def _normalize_response_types(self) -> "ModelRequest":
@@ -124,6 +132,15 @@ class GraphRequest(BaseModel):
         max_length=64,
         pattern=r"^[A-Za-z0-9_-]+$",
     )
+    format: Literal["png", "spec"] = Field(
+        default=GRAPH_FORMAT_PNG,
+        description=(
+            "`png` renders and stores an image and returns its `graph_path`; "
+            "`spec` returns a Vega-Lite style `graph_spec` with the reduced series "
+            "for the browser to draw."
+        ),
+        examples=[GRAPH_FORMAT_SPEC],
+    )
 
 
 class LoginRequest(BaseModel):
@@ -4,19 +4,26 @@ from typing import Optional
 from fastapi import APIRouter
 from fastapi import Header
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.encoders import jsonable_encoder
-from src.agents.graph_agent import GraphAgent
 from src.api.auth import validate_token
+from src.api.chat_store_schema import GraphCacheEntry
+from src.api.chat_store_schema import build_data_version
 from src.api.config import api_audit
 from src.api.config import chat_store_manager
-from src.api.config import storage_manager
+from src.api.config import graph_agent
+from src.api.config import graph_prerenderer
+from src.api.graph_prerender import GraphPrerenderJob
+from src.api.models import GRAPH_FORMAT_SPEC
 from src.api.models import GraphRequest
 from src.api.models import ModelRequest
+from src.infra.column_profile import ColumnProfile
+from src.infra.config import settings
+from src.infra.result_spill import SpilledResultSet
 from src.main.main import OrchestrateAgent
 
 
 router = APIRouter(tags=["Agent"])
-graph_agent = GraphAgent(storage_manager)
 
 
 class AgentRouteHandler:
@@ -61,68 +68,20 @@ class AgentRouteHandler:
                 input_response_types=request.response_types,
             )
 
-            result_payload = jsonable_encoder(result if isinstance(result, dict) else {})
-
-            if result_payload.get("status") == "error":
-                error_message = str(
-                    result_payload.get("message") or "Invalid request."
-                )
-                chat_store_manager.upsert_mock_message(
-                    request.chat_id,
-                    request.question_id,
-                    request.question,
-                    response=error_message,
+            result = dict(result) if isinstance(result, dict) else {}
+            spilled_rows = result.pop("response_data_spill", None)
+            column_profile = result.pop("column_profile", None)
+            try:
+                return self._build_ask_response(
+                    request=request,
+                    result=result,
+                    spilled_rows=spilled_rows,
+                    column_profile=column_profile,
                     user_email=user_email,
                 )
-                raise HTTPException(
-                    status_code=400,
-                    detail=error_message,
-                )
-
-            data_path = chat_store_manager.save_message_data(
-                request.chat_id,
-                request.question_id,
-                result_payload.get("response_data"),
-                user_email=user_email,
-            )
-
-            response_payload = dict(result_payload)
-            response_payload["data_path"] = data_path
-
-            chat_store_manager.upsert_mock_message(
-                request.chat_id,
-                request.question_id,
-                request.question,
-                response=str(response_payload.get("response_natural_language") or ""),
-                query=str(response_payload.get("response_sql") or ""),
-                data_path=data_path,
-                graph_path=str(response_payload.get("graph_path") or ""),
-                selected_graph_pattern=str(
-                    response_payload.get("selected_graph_pattern") or ""
-                ),
-                response_types=list(response_payload.get("response_types") or []),
-                graph_suggestions=list(
-                    response_payload.get("graph_suggestions") or []
-                ),
-                user_email=user_email,
-            )
-
-            api_audit.log_info(
-                "Ask endpoint completed successfully.",
-                user_email=user_email,
-                chat_id=chat_id,
-                question_id=question_id,
-            )
-            return {
-                "status": "success",
-                "status_code": 200,
-                "user": user_email,
-                "email": user_email,
-                "chat_id": request.chat_id,
-                "question_id": request.question_id,
-                "question": request.question,
-                "response": response_payload,
-            }
+            finally:
+                if spilled_rows is not None:
+                    spilled_rows.close()
 
         except HTTPException as exp:
             api_audit.log_warning(
@@ -144,12 +103,123 @@ class AgentRouteHandler:
                 detail="Internal server error in the agent pipeline.",
             )
 
+    def _build_ask_response(
+        self,
+        *,
+        request: ModelRequest,
+        result: Dict[str, Any],
+        spilled_rows: Optional[SpilledResultSet],
+        user_email: str,
+        column_profile: Optional[ColumnProfile] = None,
+    ) -> Dict[str, Any]:
+        """Persist the orchestrator result and build the API response payload."""
+        result_payload = jsonable_encoder(result)
+        debug_payload = result_payload.pop("debug", None)
+
+        if result_payload.get("status") == "error":
+            error_message = str(
+                result_payload.get("message") or "Invalid request."
+            )
+            chat_store_manager.upsert_mock_message(
+                request.chat_id,
+                request.question_id,
+                request.question,
+                response=error_message,
+                user_email=user_email,
+            )
+            raise HTTPException(
+                status_code=400,
+                detail=error_message,
+            )
+
+        response_rows = (
+            spilled_rows
+            if spilled_rows is not None
+            else result_payload.get("response_data")
+        )
+        data_path = chat_store_manager.save_message_data(
+            request.chat_id,
+            request.question_id,
+            response_rows,
+            user_email=user_email,
+        )
+        # Graph suggestions and the column profile are cached for this exact data.
+        data_version = build_data_version(response_rows) if data_path else ""
+
+        response_payload = dict(result_payload)
+        response_payload["data_path"] = data_path
+        inline_rows = response_payload.get("response_data")
+        if (
+            data_path
+            and isinstance(inline_rows, list)
+            and len(inline_rows) > settings.result_preview_rows
+        ):
+            # Saved rows are paged from the data endpoint; only the first page is inline.
+            response_payload["response_data"] = inline_rows[: settings.result_preview_rows]
+            response_payload["response_data_truncated"] = True
+        if request.include_debug:
+            response_payload["debug"] = debug_payload or {}
+
+        chat_store_manager.upsert_mock_message(
+            request.chat_id,
+            request.question_id,
+            request.question,
+            response=str(response_payload.get("response_natural_language") or ""),
+            query=str(response_payload.get("response_sql") or ""),
+            data_path=data_path,
+            graph_path=str(response_payload.get("graph_path") or ""),
+            selected_graph_pattern=str(
+                response_payload.get("selected_graph_pattern") or ""
+            ),
+            response_types=list(response_payload.get("response_types") or []),
+            graph_suggestions=list(
+                response_payload.get("graph_suggestions") or []
+            ),
+            user_email=user_email,
+            column_profile=column_profile,
+            data_version=data_version,
+        )
+        if data_path:
+            # Spilled rows are closed after the response; the job reads the saved copy.
+            graph_prerenderer.submit(
+                GraphPrerenderJob(
+                    user_email=user_email,
+                    chat_id=request.chat_id,
+                    question_id=request.question_id,
+                    data_version=data_version,
+                    graph_suggestions=tuple(
+                        response_payload.get("graph_suggestions") or ()
+                    ),
+                    column_profile=column_profile,
+                    response_data=(
+                        None if spilled_rows is not None else list(response_rows or [])
+                    ),
+                )
+            )
+
+        api_audit.log_info(
+            "Ask endpoint completed successfully.",
+            user_email=user_email,
+            chat_id=request.chat_id,
+            question_id=request.question_id,
+        )
+        return {
+            "status": "success",
+            "status_code": 200,
+            "user": user_email,
+            "email": user_email,
+            "chat_id": request.chat_id,
+            "question_id": request.question_id,
+            "question": request.question,
+            "response": response_payload,
+        }
+
     async def generate_graph(
         self,
         request: GraphRequest,
         authorization: Optional[str] = Header(default=None),
     ) -> Dict[str, Any]:
-        """Render a graph for previously persisted query data."""
+        """Render a graph, or describe it as a spec, for previously persisted query data."""
         chat_id = request.chat_id
         question_id = request.question_id
         user_email = "SYSTEM"
@@ -164,46 +234,74 @@ class AgentRouteHandler:
             authenticated_user = validate_token(authorization)
             user_email = str(authenticated_user["email"])
 
-            response_data = chat_store_manager.load_message_data(
+            graph_cache = chat_store_manager.load_graph_cache(
                 request.chat_id,
                 request.question_id,
                 user_email=user_email,
             )
-            if response_data is None:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Saved response data was not found for this message.",
-                )
+            selected_graph = None
+            if graph_cache is not None and graph_cache.graph_suggestions:
+                # Suggestions saved with this data version validate the pattern
+                # without downloading the rows.
+                selected_graph = graph_cache.find_suggestion(request.graph_pattern_id)
+                if selected_graph is None:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Invalid graph pattern for the saved data.",
+                    )
 
-            graph_suggestions = graph_agent.suggest_graphs(response_data)
-            selected_graph = next(
-                (
-                    suggestion
-                    for suggestion in graph_suggestions
-                    if suggestion["id"] == request.graph_pattern_id
-                ),
-                None,
-            )
-            if selected_graph is None:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid graph pattern for the saved data.",
+            graph_path = None
+            graph_spec = None
+            if request.format == GRAPH_FORMAT_SPEC:
+                response_data, graph_cache, selected_graph = self._load_graph_data(
+                    request=request,
+                    user_email=user_email,
+                    graph_cache=graph_cache,
+                    selected_graph=selected_graph,
+                )
+                graph_spec = await run_in_threadpool(
+                    graph_agent.build_graph_spec,
+                    response_data,
+                    selected_graph,
+                    column_profile=graph_cache.column_profile,
                 )
+            elif selected_graph is not None:
+                # A render of the same data and pattern is reused without
+                # downloading the rows or drawing anything.
+                graph_path = graph_agent.find_rendered_graph(
+                    graph_pattern=selected_graph,
+                    data_version=graph_cache.data_version,
+                    user_email=user_email,
+                    chat_id=request.chat_id,
+                    question_id=request.question_id,
+                )
+                if graph_path is None:
+                    # A background pre-render of this pattern may be drawing it now.
+                    graph_path = await run_in_threadpool(
+                        graph_prerenderer.wait_for_graph,
+                        user_email=user_email,
+                        chat_id=request.chat_id,
+                        question_id=request.question_id,
+                        graph_pattern_id=request.graph_pattern_id,
+                        timeout=settings.graph_prerender_wait_seconds,
+                    )
 
-            graph_path = graph_agent.render_graph(
-                response_data=response_data,
-                graph_pattern=selected_graph,
-                user_email=user_email,
-                chat_id=request.chat_id,
-                question_id=request.question_id,
-            )
+            if graph_path is None and graph_spec is None:
+                graph_path, graph_cache = await self._render_graph(
+                    request=request,
+                    user_email=user_email,
+                    graph_cache=graph_cache,
+                    selected_graph=selected_graph,
+                )
 
+            # A spec is stored beside the message's PNG path, which stays intact;
+            # a new PNG drops the spec of the previously selected pattern.
             chat_store_manager.update_message_metadata(
                 request.chat_id,
                 request.question_id,
-                graph_path=graph_path,
+                graph_path=graph_path if graph_spec is None else None,
+                graph_spec=graph_spec if graph_spec is not None else {},
                 selected_graph_pattern=request.graph_pattern_id,
-                graph_suggestions=graph_suggestions,
                 user_email=user_email,
             )
 
@@ -218,9 +316,10 @@ class AgentRouteHandler:
                 "status_code": 200,
                 "chat_id": request.chat_id,
                 "question_id": request.question_id,
-                "graph_path": graph_path,
+                "graph_path": graph_path or "",
+                "graph_spec": graph_spec,
                 "selected_graph_pattern": request.graph_pattern_id,
-                "graph_suggestions": graph_suggestions,
+                "graph_suggestions": graph_cache.graph_suggestions,
             }
         except HTTPException as exp:
             api_audit.log_warning(
@@ -242,6 +341,107 @@ class AgentRouteHandler:
                 detail="Internal server error while generating the graph.",
             )
 
+    async def _render_graph(
+        self,
+        *,
+        request: GraphRequest,
+        user_email: str,
+        graph_cache: Optional[GraphCacheEntry],
+        selected_graph: Optional[Dict[str, str]],
+    ) -> tuple[str, GraphCacheEntry]:
+        """Load the saved rows and render the requested pattern from them."""
+        response_data, graph_cache, selected_graph = self._load_graph_data(
+            request=request,
+            user_email=user_email,
+            graph_cache=graph_cache,
+            selected_graph=selected_graph,
+        )
+
+        # Rendering waits on the render pool; keep the event loop free meanwhile.
+        graph_path = await run_in_threadpool(
+            graph_agent.render_graph,
+            response_data=response_data,
+            graph_pattern=selected_graph,
+            user_email=user_email,
+            chat_id=request.chat_id,
+            question_id=request.question_id,
+            column_profile=graph_cache.column_profile,
+            data_version=graph_cache.data_version,
+        )
+        return graph_path, graph_cache
+
+    def _load_graph_data(
+        self,
+        *,
+        request: GraphRequest,
+        user_email: str,
+        graph_cache: Optional[GraphCacheEntry],
+        selected_graph: Optional[Dict[str, str]],
+    ) -> tuple[list[Dict[str, Any]], GraphCacheEntry, Dict[str, str]]:
+        """Load the saved rows, profiling them when no cached suggestions exist.
+
+        With cached suggestions only the plotted columns are read; profiling
+        needs every column.
+        """
+        columns = (
+            graph_agent.get_plotted_fields(selected_graph)
+            if selected_graph is not None and graph_cache is not None
+            else None
+        )
+        response_data = chat_store_manager.load_message_data(
+            request.chat_id,
+            request.question_id,
+            user_email=user_email,
+            columns=columns,
+        )
+        if response_data is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Saved response data was not found for this message.",
+            )
+
+        if selected_graph is None or graph_cache is None:
+            graph_cache = self._build_graph_cache(
+                request=request,
+                response_data=response_data,
+                user_email=user_email,
+            )
+            selected_graph = graph_cache.find_suggestion(request.graph_pattern_id)
+            if selected_graph is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid graph pattern for the saved data.",
+                )
+
+        return response_data, graph_cache, selected_graph
+
+    def _build_graph_cache(
+        self,
+        *,
+        request: GraphRequest,
+        response_data: list[Dict[str, Any]],
+        user_email: str,
+    ) -> GraphCacheEntry:
+        """Profile saved rows that have no cached suggestions and store the result."""
+        column_profile = graph_agent.build_column_profile(response_data)
+        graph_cache = GraphCacheEntry(
+            data_version=build_data_version(response_data),
+            column_profile=column_profile,
+            graph_suggestions=graph_agent.suggest_graphs(
+                response_data,
+                column_profile=column_profile,
+            ),
+        )
+        chat_store_manager.update_message_metadata(
+            request.chat_id,
+            request.question_id,
+            graph_suggestions=graph_cache.graph_suggestions,
+            column_profile=column_profile,
+            data_version=graph_cache.data_version,
+            user_email=user_email,
+        )
+        return graph_cache
+
 
 agent_route_handler = AgentRouteHandler()
 ask_agent = agent_route_handler.ask_agent
@@ -280,7 +480,9 @@ router.add_api_route(
     summary="Generate Graph",
     description=(
         "Loads previously saved structured data for a message, validates the selected "
-        "graph pattern, renders a PNG graph, and stores it in backend storage."
+        "graph pattern, renders a PNG graph, and stores it in backend storage. With "
+        "`format=spec` it returns a Vega-Lite style `graph_spec` with the aggregated "
+        "series instead, and nothing is rendered or stored."
     ),
     response_description="Graph rendering result for a previously processed message.",
     responses={
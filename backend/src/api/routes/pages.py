@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Any
 from typing import Dict
 from typing import Optional
@@ -5,20 +6,41 @@ from fastapi import APIRouter
 from fastapi import Cookie
 from fastapi import Header
 from fastapi import HTTPException
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse
 from fastapi.responses import JSONResponse
 from fastapi.responses import RedirectResponse
 from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from src.api.auth import validate_token
 from src.api.config import api_audit
 from src.api.config import chat_store_manager
 from src.api.config import frontend_dir
+from src.api.config import graph_agent
 from src.api.config import login_page
 from src.api.config import pipeline_log_path
+from src.api.config import static_asset_bundle
 from src.api.config import storage_manager
+from src.api.http_cache import PRIVATE_IMMUTABLE_CACHE_CONTROL
+from src.api.http_cache import PRIVATE_REVALIDATE_CACHE_CONTROL
+from src.api.http_cache import REVALIDATE_CACHE_CONTROL
+from src.api.http_cache import accepts_encoding
+from src.api.http_cache import build_content_etag
+from src.api.http_cache import build_etag
+from src.api.http_cache import etag_matches
+from src.api.http_cache import not_modified_response
+from src.api.http_cache import with_content_encoding
+from src.infra.config.config_google.storage_manager import StoredDataStream
+from src.infra.storage_codec import COMPRESSION_GZIP
+from src.infra.storage_codec import COMPRESSION_NONE
+from src.infra.storage_codec import JSON_CONTENT_TYPE
+from src.infra.storage_codec import NDJSON_CONTENT_TYPE
+from src.infra.storage_codec import iter_decompressed
+from src.infra.storage_codec import iter_ndjson
 
 
 router = APIRouter()
+DATA_RESPONSE_FORMATS = ("json", "ndjson")
 
 
 class PagesRouteHandler:
@@ -47,7 +69,7 @@ class PagesRouteHandler:
             return RedirectResponse(url="/login", status_code=303)
 
         api_audit.log_debug("Serving frontend shell.")
-        return FileResponse(frontend_dir / "index.html")
+        return await self._serve_html_shell(frontend_dir / "index.html")
 
     async def serve_login(
         self,
@@ -67,19 +89,16 @@ class PagesRouteHandler:
                 )
 
         api_audit.log_debug("Serving login shell.")
-        return FileResponse(login_page)
+        return await self._serve_html_shell(login_page)
 
-    async def serve_chat_messages(self) -> FileResponse:
-        """Serve the persisted local chat history JSON file."""
-        store = chat_store_manager.load_chat_store()
+    async def serve_chat_messages(self) -> JSONResponse:
+        """Serve the persisted local chat history as JSON."""
+        store = await run_in_threadpool(chat_store_manager.load_chat_store)
         api_audit.log_debug(
             f"Serving chat history. Messages: {len(store['mensages'])}.",
             chat_id=str(store["chat_id"]),
         )
-        return FileResponse(
-            chat_store_manager.chat_messages_path,
-            media_type="application/json",
-        )
+        return JSONResponse(content=store)
 
     async def serve_runtime_logs(
         self,
@@ -127,13 +146,93 @@ class PagesRouteHandler:
         chat_id: str,
         message_id: str,
         session_token: Optional[str] = Cookie(default=None, alias="ia_agent_auth_token"),
+        columns: str = "",
+        offset: int = 0,
+        limit: Optional[int] = None,
+        format: str = "json",
+        accept_encoding: Optional[str] = Header(default=None),
+        if_none_match: Optional[str] = Header(default=None),
     ) -> Response:
-        """Proxy stored JSON data from cloud storage for the authenticated user."""
+        """Proxy stored JSON data from cloud storage for the authenticated user.
+
+        ``columns`` (comma-separated), ``offset`` and ``limit`` page through the
+        rows, and ``format=ndjson`` streams one row per line. Parquet-stored
+        data only downloads the requested part. Unprojected
+        reads of JSON row lists stream the stored bytes without parsing them,
+        or redirect to a signed bucket URL when STORAGE_SIGNED_URLS is on.
+        Responses carry an ETag derived from the message's data version, so a
+        browser revalidating a page it already holds gets a 304 without a
+        storage read.
+        """
         authenticated_user = self._validate_session_cookie(session_token)
+        if offset < 0 or (limit is not None and limit < 0):
+            raise HTTPException(
+                status_code=400,
+                detail="offset and limit must not be negative.",
+            )
+        response_format = format.strip().lower()
+        if response_format not in DATA_RESPONSE_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail="format must be json or ndjson.",
+            )
+
+        selected_columns = [
+            column.strip() for column in columns.split(",") if column.strip()
+        ]
+        etag = self._build_data_etag(
+            str(authenticated_user["email"]),
+            chat_id,
+            message_id,
+            response_format,
+            selected_columns,
+            offset,
+            limit,
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified_response(
+                etag,
+                PRIVATE_REVALIDATE_CACHE_CONTROL,
+                vary="Accept-Encoding",
+            )
+
+        is_unprojected = not selected_columns and offset == 0 and limit is None
+        if response_format == "json" and is_unprojected:
+            if storage_manager.signed_urls_enabled:
+                signed_download = storage_manager.sign_data_download(
+                    user_email=str(authenticated_user["email"]),
+                    chat_id=chat_id,
+                    message_id=message_id,
+                )
+                # GCS decompresses gzip for clients that lack it, but not zstd.
+                if signed_download is not None and (
+                    signed_download.content_encoding in (None, COMPRESSION_GZIP)
+                    or accepts_encoding(
+                        accept_encoding,
+                        signed_download.content_encoding,
+                    )
+                ):
+                    return RedirectResponse(url=signed_download.url, status_code=307)
+
+            stored_stream = storage_manager.open_json_stream(
+                user_email=str(authenticated_user["email"]),
+                chat_id=chat_id,
+                message_id=message_id,
+            )
+            if stored_stream is not None:
+                return self._build_passthrough_response(
+                    stored_stream,
+                    accept_encoding,
+                    etag,
+                )
+
         response_data = storage_manager.load_json_data(
             user_email=str(authenticated_user["email"]),
             chat_id=chat_id,
             message_id=message_id,
+            columns=selected_columns or None,
+            offset=offset,
+            limit=limit,
         )
         if response_data is None:
             raise HTTPException(
@@ -141,28 +240,153 @@ class PagesRouteHandler:
                 detail="Saved response data was not found for this message.",
             )
 
-        return JSONResponse(content=response_data)
+        headers = self._build_cache_headers(etag, PRIVATE_REVALIDATE_CACHE_CONTROL)
+        if response_format == "ndjson":
+            return StreamingResponse(
+                iter_ndjson(response_data),
+                media_type=NDJSON_CONTENT_TYPE,
+                headers=headers,
+            )
+        return JSONResponse(content=response_data, headers=headers)
 
     async def serve_stored_graph(
         self,
         chat_id: str,
         message_id: str,
         session_token: Optional[str] = Cookie(default=None, alias="ia_agent_auth_token"),
+        render: str = "",
+        if_none_match: Optional[str] = Header(default=None),
     ) -> Response:
-        """Proxy a stored graph image from cloud storage for the authenticated user."""
+        """Proxy a stored graph image from cloud storage for the authenticated user.
+
+        ``render`` selects a content-addressed render saved by ``/v1/graph``;
+        without it the message's legacy graph image is returned. With
+        STORAGE_SIGNED_URLS on, the browser is redirected to a signed bucket URL.
+        Renders never change, so they are cached for good and revalidated by
+        key alone; legacy images are revalidated against a hash of their bytes.
+        """
         authenticated_user = self._validate_session_cookie(session_token)
-        graph_bytes = storage_manager.load_graph_image(
-            user_email=str(authenticated_user["email"]),
-            chat_id=chat_id,
-            message_id=message_id,
+        user_email = str(authenticated_user["email"])
+        render_etag = (
+            build_etag("render", user_email.strip().lower(), render) if render else ""
         )
+        if etag_matches(if_none_match, render_etag):
+            return not_modified_response(render_etag, PRIVATE_IMMUTABLE_CACHE_CONTROL)
+
+        if storage_manager.signed_urls_enabled:
+            signed_download = storage_manager.sign_graph_download(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                render_key=render,
+            )
+            if signed_download is not None:
+                return RedirectResponse(url=signed_download.url, status_code=307)
+
+        if render:
+            graph_bytes = graph_agent.load_rendered_graph(
+                render_key=render,
+                user_email=user_email,
+                chat_id=chat_id,
+                question_id=message_id,
+            )
+        else:
+            graph_bytes = storage_manager.load_graph_image(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+            )
         if graph_bytes is None:
             raise HTTPException(
                 status_code=404,
                 detail="Saved graph was not found for this message.",
             )
 
-        return Response(content=graph_bytes, media_type="image/png")
+        if render_etag:
+            etag, cache_control = render_etag, PRIVATE_IMMUTABLE_CACHE_CONTROL
+        else:
+            etag = build_content_etag(graph_bytes)
+            cache_control = PRIVATE_REVALIDATE_CACHE_CONTROL
+            if etag_matches(if_none_match, etag):
+                return not_modified_response(etag, cache_control)
+
+        return Response(
+            content=graph_bytes,
+            media_type="image/png",
+            headers=self._build_cache_headers(etag, cache_control),
+        )
+
+    async def _serve_html_shell(self, html_path: Path) -> HTMLResponse:
+        """Serve a page whose asset URLs carry fingerprints, revalidating the page itself."""
+        html = await run_in_threadpool(static_asset_bundle.render_html, html_path)
+        return HTMLResponse(
+            content=html,
+            headers={"Cache-Control": REVALIDATE_CACHE_CONTROL},
+        )
+
+    def _build_data_etag(
+        self,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        response_format: str,
+        selected_columns: list[str],
+        offset: int,
+        limit: Optional[int],
+    ) -> str:
+        """Return the ETag of a data page the user owns, or an empty string otherwise.
+
+        The version is only read for a message owned by the user in that chat,
+        so a 304 is never answered for someone else's data.
+        """
+        data_version = chat_store_manager.load_data_version(
+            chat_id,
+            message_id,
+            user_email,
+        )
+        if not data_version:
+            return ""
+
+        return build_etag(
+            user_email.strip().lower(),
+            data_version,
+            storage_manager.data_format,
+            response_format,
+            ",".join(selected_columns),
+            offset,
+            "" if limit is None else limit,
+        )
+
+    def _build_cache_headers(self, etag: str, cache_control: str) -> Dict[str, str]:
+        """Return the validator headers of a response; unversioned ones are not cached."""
+        if not etag:
+            return {"Cache-Control": PRIVATE_REVALIDATE_CACHE_CONTROL}
+        return {"ETag": etag, "Cache-Control": cache_control}
+
+    def _build_passthrough_response(
+        self,
+        stored_stream: StoredDataStream,
+        accept_encoding: Optional[str],
+        etag: str = "",
+    ) -> StreamingResponse:
+        """Send stored bytes as they are, decompressing only for clients that cannot."""
+        headers = {"Vary": "Accept-Encoding"}
+        chunks = stored_stream.chunks
+        content_encoding = None
+        if stored_stream.compression != COMPRESSION_NONE:
+            if accepts_encoding(accept_encoding, stored_stream.compression):
+                content_encoding = stored_stream.compression
+                headers["Content-Encoding"] = content_encoding
+            else:
+                chunks = iter_decompressed(chunks, stored_stream.compression)
+
+        headers.update(
+            self._build_cache_headers(
+                with_content_encoding(etag, content_encoding) if etag else "",
+                PRIVATE_REVALIDATE_CACHE_CONTROL,
+            )
+        )
+        return StreamingResponse(chunks, media_type=JSON_CONTENT_TYPE, headers=headers)
 
     def _filter_runtime_panel_lines(self, lines: list[str]) -> list[str]:
         """Remove runtime-panel self-referential lines from the visible log stream."""
@@ -210,7 +434,7 @@ router.add_api_route(
     "/",
     endpoint=serve_frontend,
     methods=["GET"],
-    response_class=FileResponse,
+    response_class=HTMLResponse,
     include_in_schema=False,
 )
 
@@ -218,7 +442,7 @@ router.add_api_route(
     "/login",
     endpoint=serve_login,
     methods=["GET"],
-    response_class=FileResponse,
+    response_class=HTMLResponse,
     include_in_schema=False,
 )
 
@@ -226,7 +450,7 @@ router.add_api_route(
     "/chat_messages.json",
     endpoint=serve_chat_messages,
     methods=["GET"],
-    response_class=FileResponse,
+    response_class=JSONResponse,
     include_in_schema=False,
 )
 
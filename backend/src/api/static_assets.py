@@ -0,0 +1,245 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from threading import RLock
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.datastructures import QueryParams
+from starlette.exceptions import HTTPException
+from starlette.types import Scope
+
+from src.api.http_cache import PUBLIC_IMMUTABLE_CACHE_CONTROL
+from src.api.http_cache import REVALIDATE_CACHE_CONTROL
+from src.api.http_cache import accepts_encoding
+from src.api.http_cache import etag_matches
+from src.api.http_cache import not_modified_response
+from src.api.http_cache import with_content_encoding
+from src.infra.logging_utils import LoggedComponent
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on installed extras
+    brotli = None
+
+
+FINGERPRINT_LENGTH = 16
+MIN_COMPRESSED_BYTES = 1024
+COMPRESSIBLE_SUFFIXES = frozenset({".css", ".html", ".js", ".json", ".mjs", ".svg", ".txt"})
+MODULE_SUFFIXES = frozenset({".js", ".mjs"})
+MEDIA_TYPES = {
+    ".js": "text/javascript; charset=utf-8",
+    ".mjs": "text/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+}
+# Relative specifiers of static and dynamic imports, also in minified bundles.
+MODULE_IMPORT_PATTERN = re.compile(
+    r"""(\b(?:from|import)\s*\(?\s*)(["'])(\.{1,2}/[^"'?#\s]+)\2"""
+)
+HTML_ASSET_PATTERN = re.compile(r"""(["'])/assets/([^"'?#\s]+)(?:\?[^"'#\s]*)?\1""")
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    """One frontend file as served, with its fingerprint and precompressed variants."""
+
+    body: bytes
+    media_type: str
+    fingerprint: str
+    encoded_bodies: dict[str, bytes]
+    dependencies: tuple[tuple[Path, int, int], ...]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.fingerprint}"'
+
+
+class StaticAssetBundle(LoggedComponent):
+    """Fingerprint, rewrite and precompress the frontend assets on first use.
+
+    The frontend has no build step, so the fingerprint of a module covers its
+    own bytes and, through its rewritten relative imports, the fingerprints of
+    everything it imports. Entries are rebuilt when any file they depend on
+    changes on disk.
+    """
+
+    def __init__(self, assets_dir: Path, url_prefix: str = "/assets") -> None:
+        super().__init__()
+        self.assets_dir = Path(assets_dir).resolve()
+        self.url_prefix = url_prefix.rstrip("/")
+        self._lock = RLock()
+        self._assets: dict[Path, StaticAsset] = {}
+
+    def get_asset(self, relative_path: str) -> Optional[StaticAsset]:
+        """Return the served form of an asset, or None when it does not exist."""
+        path = self._resolve(self.assets_dir / relative_path)
+        if path is None:
+            return None
+        return self._load(path, ())
+
+    def asset_url(self, relative_path: str) -> str:
+        """Return the fingerprinted URL of an asset, or its plain URL when it is missing."""
+        url = f"{self.url_prefix}/{relative_path}"
+        asset = self.get_asset(relative_path)
+        return f"{url}?v={asset.fingerprint}" if asset is not None else url
+
+    def render_html(self, html_path: Path) -> str:
+        """Return an HTML page whose asset references carry current fingerprints."""
+        html = Path(html_path).read_text(encoding="utf-8")
+        return HTML_ASSET_PATTERN.sub(
+            lambda match: f"{match.group(1)}{self.asset_url(match.group(2))}{match.group(1)}",
+            html,
+        )
+
+    def _resolve(self, path: Path) -> Optional[Path]:
+        resolved_path = path.resolve()
+        if not resolved_path.is_relative_to(self.assets_dir) or not resolved_path.is_file():
+            return None
+        return resolved_path
+
+    def _load(self, path: Path, loading: tuple[Path, ...]) -> StaticAsset:
+        with self._lock:
+            asset = self._assets.get(path)
+            if asset is None or not self._is_current(asset):
+                asset = self._build(path, (*loading, path))
+                self._assets[path] = asset
+            return asset
+
+    def _is_current(self, asset: StaticAsset) -> bool:
+        for path, mtime_ns, size in asset.dependencies:
+            try:
+                stat = path.stat()
+            except OSError:
+                return False
+            if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                return False
+        return True
+
+    def _build(self, path: Path, loading: tuple[Path, ...]) -> StaticAsset:
+        stat = path.stat()
+        body = path.read_bytes()
+        dependencies = [(path, stat.st_mtime_ns, stat.st_size)]
+        if path.suffix in MODULE_SUFFIXES:
+            body = self._rewrite_imports(path, body, loading, dependencies)
+
+        self.log_debug(f"Fingerprinted static asset {path.relative_to(self.assets_dir)}.")
+        return StaticAsset(
+            body=body,
+            media_type=self._media_type(path),
+            fingerprint=hashlib.sha256(body).hexdigest()[:FINGERPRINT_LENGTH],
+            encoded_bodies=self._compress(path, body),
+            dependencies=tuple(dict.fromkeys(dependencies)),
+        )
+
+    def _rewrite_imports(
+        self,
+        path: Path,
+        body: bytes,
+        loading: tuple[Path, ...],
+        dependencies: list[tuple[Path, int, int]],
+    ) -> bytes:
+        """Append the imported module's fingerprint to each relative import."""
+
+        def fingerprint_import(match: re.Match) -> str:
+            target = self._resolve(path.parent / match.group(3))
+            # An import cycle keeps its plain specifier instead of recursing forever.
+            if target is None or target in loading:
+                return match.group(0)
+
+            imported_asset = self._load(target, loading)
+            dependencies.extend(imported_asset.dependencies)
+            prefix, quote, specifier = match.groups()
+            return f"{prefix}{quote}{specifier}?v={imported_asset.fingerprint}{quote}"
+
+        source = body.decode("utf-8")
+        return MODULE_IMPORT_PATTERN.sub(fingerprint_import, source).encode("utf-8")
+
+    def _compress(self, path: Path, body: bytes) -> dict[str, bytes]:
+        if path.suffix not in COMPRESSIBLE_SUFFIXES or len(body) < MIN_COMPRESSED_BYTES:
+            return {}
+
+        encoded_bodies = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encoded_bodies["br"] = brotli.compress(body, quality=11)
+        return {
+            encoding: encoded_body
+            for encoding, encoded_body in encoded_bodies.items()
+            if len(encoded_body) < len(body)
+        }
+
+    def _media_type(self, path: Path) -> str:
+        media_type = MEDIA_TYPES.get(path.suffix)
+        if media_type is None:
+            media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        return media_type
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """Serve bundle assets with ETags, long caching for fingerprinted URLs and precompression."""
+
+    def __init__(self, bundle: StaticAssetBundle) -> None:
+        super().__init__(directory=bundle.assets_dir)
+        self.bundle = bundle
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+
+        asset = await run_in_threadpool(self.bundle.get_asset, path)
+        if asset is None:
+            raise HTTPException(status_code=404)
+
+        headers = Headers(scope=scope)
+        version = QueryParams(scope["query_string"]).get("v", "")
+        return build_asset_response(
+            asset,
+            is_fingerprinted=version == asset.fingerprint,
+            if_none_match=headers.get("if-none-match"),
+            accept_encoding=headers.get("accept-encoding"),
+        )
+
+
+def build_asset_response(
+    asset: StaticAsset,
+    *,
+    is_fingerprinted: bool,
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+) -> Response:
+    """Answer an asset request, caching fingerprinted URLs for a year."""
+    cache_control = (
+        PUBLIC_IMMUTABLE_CACHE_CONTROL if is_fingerprinted else REVALIDATE_CACHE_CONTROL
+    )
+    vary = "Accept-Encoding" if asset.encoded_bodies else ""
+    if etag_matches(if_none_match, asset.etag):
+        return not_modified_response(asset.etag, cache_control, vary=vary)
+
+    content_encoding = next(
+        (
+            encoding
+            for encoding in ("br", "gzip")
+            if encoding in asset.encoded_bodies and accepts_encoding(accept_encoding, encoding)
+        ),
+        None,
+    )
+    headers = {
+        "ETag": with_content_encoding(asset.etag, content_encoding),
+        "Cache-Control": cache_control,
+    }
+    if vary:
+        headers["Vary"] = vary
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+
+    return Response(
+        content=asset.encoded_bodies[content_encoding] if content_encoding else asset.body,
+        media_type=asset.media_type,
+        headers=headers,
+    )
+
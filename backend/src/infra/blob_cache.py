@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from src.infra.bytes_cache import BytesCache
+from src.infra.config import settings
+
+
+BLOB_FILE_SUFFIX = ".blob"
+MAX_TRACKED_BLOBS = 10_000
+
+
+class BlobCache:
+    """Process-local read-through cache of storage blobs, bounded in bytes, with a disk tier.
+
+    Entries are keyed by blob name and GCS generation, so a body looked up by
+    its current generation is never stale: an overwritten blob has a new
+    generation. The latest generation seen by this process is also tracked,
+    but another worker may have replaced the blob since, so lookups without a
+    generation are only safe for immutable, content-addressed blob names.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 16 * 1024 * 1024,
+        disk_dir: Path | None = None,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        self._bodies = BytesCache(
+            max_bytes=max_bytes,
+            max_entry_bytes=max_entry_bytes,
+            disk_dir=disk_dir,
+            disk_max_bytes=disk_max_bytes,
+            file_suffix=BLOB_FILE_SUFFIX,
+        )
+        self._lock = Lock()
+        self._generations: OrderedDict[str, str] = OrderedDict()
+
+    @property
+    def max_entry_bytes(self) -> int:
+        return self._bodies.max_entry_bytes
+
+    @property
+    def disk_dir(self) -> Path | None:
+        return self._bodies.disk_dir
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bodies.total_bytes
+
+    def latest_generation(self, blob_name: str) -> Optional[str]:
+        with self._lock:
+            return self._generations.get(blob_name)
+
+    def get(self, blob_name: str, generation: object = None) -> bytes | None:
+        """Return the body of a generation, or of the latest one seen here, from memory then disk."""
+        generation = str(generation) if generation else self.latest_generation(blob_name)
+        if not generation:
+            return None
+
+        body = self._bodies.get(self._build_key(blob_name, generation))
+        if body is not None:
+            self._remember_generation(blob_name, generation)
+        return body
+
+    def set(self, blob_name: str, generation: object, body: bytes) -> None:
+        """Cache the body of a blob generation; blobs without a generation are skipped."""
+        if not generation or len(body) > self.max_entry_bytes:
+            return
+
+        generation = str(generation)
+        previous_generation = self._remember_generation(blob_name, generation)
+        if previous_generation and previous_generation != generation:
+            self._bodies.discard(self._build_key(blob_name, previous_generation))
+        self._bodies.set(self._build_key(blob_name, generation), body)
+
+    def forget(self, blob_name: str) -> None:
+        """Drop a deleted blob so reads go back to the bucket."""
+        with self._lock:
+            generation = self._generations.pop(blob_name, None)
+        if generation:
+            self._bodies.discard(self._build_key(blob_name, generation))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generations.clear()
+        self._bodies.clear()
+
+    def _build_key(self, blob_name: str, generation: str) -> str:
+        return f"{blob_name}#{generation}"
+
+    def _remember_generation(self, blob_name: str, generation: str) -> Optional[str]:
+        with self._lock:
+            previous_generation = self._generations.pop(blob_name, None)
+            self._generations[blob_name] = generation
+            while len(self._generations) > MAX_TRACKED_BLOBS:
+                self._generations.popitem(last=False)
+        return previous_generation
+
+
+def build_blob_cache() -> Optional[BlobCache]:
+    """Return the storage read cache, or None when STORAGE_CACHE_MAX_BYTES disables it."""
+    if settings.storage_cache_max_bytes <= 0:
+        return None
+
+    cache_dir = settings.storage_cache_dir
+    return BlobCache(
+        max_bytes=settings.storage_cache_max_bytes,
+        disk_dir=Path(cache_dir) if cache_dir else None,
+    )
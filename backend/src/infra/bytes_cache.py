@@ -0,0 +1,142 @@
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+
+
+class BytesCache:
+    """Process-local LRU of byte bodies, bounded in bytes, with an optional disk tier.
+
+    Disk entries are files named by a hash of their key, written atomically
+    and pruned oldest first once the directory passes ``disk_max_bytes``, so
+    other processes sharing the directory read them back after a restart.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        max_entry_bytes: int | None = None,
+        disk_dir: Path | None = None,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+        file_suffix: str = ".bin",
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(
+            max_bytes if max_entry_bytes is None else max_entry_bytes,
+            max_bytes,
+        )
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self.file_suffix = file_suffix
+        self._lock = Lock()
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._total_bytes = 0
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: str) -> bytes | None:
+        """Return the body for the key from memory, then from disk."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                return body
+
+        body = self._read_disk_entry(key)
+        if body is not None:
+            self._store_memory_entry(key, body)
+        return body
+
+    def set(self, key: str, body: bytes) -> None:
+        """Cache the body in both tiers; bodies over ``max_entry_bytes`` are skipped."""
+        if len(body) > self.max_entry_bytes:
+            return
+
+        self._store_memory_entry(key, body)
+        self._write_disk_entry(key, body)
+
+    def discard(self, key: str) -> None:
+        """Drop the key from both tiers."""
+        with self._lock:
+            body = self._entries.pop(key, None)
+            if body is not None:
+                self._total_bytes -= len(body)
+
+        if self.disk_dir is not None:
+            self._disk_path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob(f"*{self.file_suffix}"):
+                path.unlink(missing_ok=True)
+
+    def _store_memory_entry(self, key: str, body: bytes) -> None:
+        with self._lock:
+            previous_body = self._entries.pop(key, None)
+            if previous_body is not None:
+                self._total_bytes -= len(previous_body)
+
+            self._entries[key] = body
+            self._total_bytes += len(body)
+
+            while self._entries and self._total_bytes > self.max_bytes:
+                _, evicted_body = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted_body)
+
+    def _disk_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{digest}{self.file_suffix}"
+
+    def _read_disk_entry(self, key: str) -> bytes | None:
+        if self.disk_dir is None:
+            return None
+
+        try:
+            return self._disk_path(key).read_bytes()
+        except OSError:
+            return None
+
+    def _write_disk_entry(self, key: str, body: bytes) -> None:
+        if self.disk_dir is None:
+            return
+
+        path = self._disk_path(key)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            temp_path.write_bytes(body)
+            temp_path.replace(path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            return
+
+        prune_disk_files(self.disk_dir, f"*{self.file_suffix}", self.disk_max_bytes)
+
+
+def prune_disk_files(directory: Path, pattern: str, max_bytes: int) -> None:
+    """Delete the least recently written files matching the pattern until they fit max_bytes."""
+    files = []
+    for path in Path(directory).glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total_size <= max_bytes:
+            break
+
+        path.unlink(missing_ok=True)
+        total_size -= size
@@ -0,0 +1,294 @@
+import json
+import sqlite3
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+from threading import Lock
+from typing import Callable
+from typing import Sequence
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage
+from langchain_core.messages import messages_from_dict
+from langchain_core.messages import messages_to_dict
+
+from src.infra.config import settings
+
+
+SQLITE_HISTORY_BACKEND = "sqlite"
+DEFAULT_HISTORY_DB_NAME = "chat_history.sqlite3"
+
+
+class ChatHistoryBackend(ABC):
+    """Store conversation messages per chat id for the LLM agents.
+
+    Every message appended to a chat gets the next absolute sequence number,
+    starting at 0, so readers can tell how many older messages the message
+    cap or the TTL already dropped. Clearing or expiring a chat restarts it.
+    """
+
+    def get_messages(self, session_id: str) -> list[BaseMessage]:
+        """Return the stored messages of the chat, oldest first."""
+        return self.get_message_window(session_id)[1]
+
+    @abstractmethod
+    def get_message_window(self, session_id: str) -> tuple[int, list[BaseMessage]]:
+        """Return the sequence number of the first stored message and the messages."""
+
+    @abstractmethod
+    def add_messages(self, session_id: str, messages: Sequence[BaseMessage]) -> None:
+        """Append messages to the chat."""
+
+    @abstractmethod
+    def clear(self, session_id: str) -> None:
+        """Delete every message of the chat."""
+
+
+class InMemoryChatHistoryBackend(ChatHistoryBackend):
+    """Keep recent chats in an LRU map bounded by chat count, TTL and message cap."""
+
+    def __init__(
+        self,
+        max_sessions: int,
+        ttl_seconds: int,
+        max_messages_per_chat: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_sessions = max(max_sessions, 1)
+        self.ttl_seconds = ttl_seconds
+        self.max_messages_per_chat = max(max_messages_per_chat, 1)
+        self._clock = clock
+        self._lock = Lock()
+        # session id -> (touched at, sequence of the first message, messages)
+        self._sessions: OrderedDict[
+            str, tuple[float, int, list[BaseMessage]]
+        ] = OrderedDict()
+
+    def get_message_window(self, session_id: str) -> tuple[int, list[BaseMessage]]:
+        now = self._clock()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return 0, []
+
+            touched_at, first_sequence, messages = entry
+            if self._is_expired(touched_at, now):
+                del self._sessions[session_id]
+                return 0, []
+
+            self._sessions.move_to_end(session_id)
+            return first_sequence, list(messages)
+
+    def add_messages(self, session_id: str, messages: Sequence[BaseMessage]) -> None:
+        now = self._clock()
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            first_sequence, stored_messages = (
+                (entry[1], entry[2])
+                if entry and not self._is_expired(entry[0], now)
+                else (0, [])
+            )
+            stored_messages = stored_messages + list(messages)
+            dropped_count = max(len(stored_messages) - self.max_messages_per_chat, 0)
+            self._sessions[session_id] = (
+                now,
+                first_sequence + dropped_count,
+                stored_messages[dropped_count:],
+            )
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    @property
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    def _is_expired(self, touched_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - touched_at > self.ttl_seconds
+
+
+class SQLiteChatHistoryBackend(ChatHistoryBackend):
+    """Share chat history between worker processes through a WAL-mode SQLite file."""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: int,
+        max_messages_per_chat: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_messages_per_chat = max(max_messages_per_chat, 1)
+        self._clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chat_history_session "
+                "ON chat_history (session_id, id)"
+            )
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_history_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    appended_count INTEGER NOT NULL
+                )
+                """
+            )
+
+    def get_message_window(self, session_id: str) -> tuple[int, list[BaseMessage]]:
+        with self._connect() as connection, connection:
+            rows = connection.execute(
+                """
+                SELECT message
+                FROM chat_history
+                WHERE session_id = ? AND created_at >= ?
+                ORDER BY id
+                """,
+                (session_id, self._expiry_cutoff()),
+            ).fetchall()
+            appended_count = self._read_appended_count(connection, session_id)
+
+        # Surviving rows are always the newest ones, so they end the sequence.
+        first_sequence = max(appended_count - len(rows), 0) if rows else 0
+        return first_sequence, messages_from_dict([json.loads(row[0]) for row in rows])
+
+    def add_messages(self, session_id: str, messages: Sequence[BaseMessage]) -> None:
+        now = self._clock()
+        with self._connect() as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            has_live_messages = connection.execute(
+                "SELECT 1 FROM chat_history WHERE session_id = ? AND created_at >= ? LIMIT 1",
+                (session_id, self._expiry_cutoff()),
+            ).fetchone()
+            appended_count = (
+                self._read_appended_count(connection, session_id)
+                if has_live_messages
+                else 0
+            )
+            connection.execute(
+                """
+                INSERT INTO chat_history_sessions (session_id, appended_count)
+                VALUES (?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET appended_count = excluded.appended_count
+                """,
+                (session_id, appended_count + len(messages)),
+            )
+            connection.executemany(
+                "INSERT INTO chat_history (session_id, message, created_at) VALUES (?, ?, ?)",
+                [
+                    (session_id, json.dumps(message), now)
+                    for message in messages_to_dict(list(messages))
+                ],
+            )
+            connection.execute(
+                """
+                DELETE FROM chat_history
+                WHERE session_id = ? AND id NOT IN (
+                    SELECT id FROM chat_history
+                    WHERE session_id = ?
+                    ORDER BY id DESC
+                    LIMIT ?
+                )
+                """,
+                (session_id, session_id, self.max_messages_per_chat),
+            )
+            connection.execute(
+                "DELETE FROM chat_history WHERE created_at < ?",
+                (self._expiry_cutoff(),),
+            )
+            connection.execute(
+                """
+                DELETE FROM chat_history_sessions
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM chat_history
+                    WHERE chat_history.session_id = chat_history_sessions.session_id
+                )
+                """
+            )
+
+    def clear(self, session_id: str) -> None:
+        with self._connect() as connection, connection:
+            connection.execute(
+                "DELETE FROM chat_history WHERE session_id = ?",
+                (session_id,),
+            )
+            connection.execute(
+                "DELETE FROM chat_history_sessions WHERE session_id = ?",
+                (session_id,),
+            )
+
+    def _read_appended_count(self, connection: sqlite3.Connection, session_id: str) -> int:
+        row = connection.execute(
+            "SELECT appended_count FROM chat_history_sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def _expiry_cutoff(self) -> float:
+        if self.ttl_seconds <= 0:
+            return float("-inf")
+        return self._clock() - self.ttl_seconds
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        # Short-lived connections keep the backend safe across threads and
+        # worker processes; the inner with-block commits each write.
+        return closing(sqlite3.connect(self.path, timeout=10))
+
+
+class BoundedChatMessageHistory(BaseChatMessageHistory):
+    """LangChain message history view over one chat id in a history backend."""
+
+    def __init__(self, session_id: str, backend: ChatHistoryBackend) -> None:
+        self.session_id = session_id
+        self.backend = backend
+
+    @property
+    def messages(self) -> list[BaseMessage]:
+        return self.backend.get_messages(self.session_id)
+
+    def message_window(self) -> tuple[int, list[BaseMessage]]:
+        """Return the sequence number of the first stored message and the messages."""
+        return self.backend.get_message_window(self.session_id)
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        self.backend.add_messages(self.session_id, messages)
+
+    def clear(self) -> None:
+        self.backend.clear(self.session_id)
+
+
+def build_chat_history_backend() -> ChatHistoryBackend:
+    """Return the history backend selected by CHAT_HISTORY_BACKEND."""
+    if settings.chat_history_backend == SQLITE_HISTORY_BACKEND:
+        return SQLiteChatHistoryBackend(
+            path=Path(
+                settings.chat_history_path
+                or settings.backend_root / DEFAULT_HISTORY_DB_NAME
+            ),
+            ttl_seconds=settings.chat_history_ttl_seconds,
+            max_messages_per_chat=settings.chat_history_max_messages,
+        )
+
+    return InMemoryChatHistoryBackend(
+        max_sessions=settings.chat_history_max_sessions,
+        ttl_seconds=settings.chat_history_ttl_seconds,
+        max_messages_per_chat=settings.chat_history_max_messages,
+    )
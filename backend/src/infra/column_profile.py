@@ -0,0 +1,318 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.infra.result_spill import SpilledResultSet
+
+
+ResultRow = dict[str, Any]
+
+PROFILE_SAMPLE_SIZE = 20
+DATE_PARSE_CACHE_SIZE = 4096
+DATE_PARSE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%d/%m/%Y",
+    "%Y-%m",
+)
+NUMERIC_INFERRED_TYPES = {"integer", "floating", "mixed-integer-float", "decimal"}
+# Exact types, so bool (a subclass of int) is not matched.
+PLAIN_NUMBER_TYPES = frozenset({int, float})
+
+NUMERIC_KIND = "numeric"
+DATETIME_KIND = "datetime"
+CATEGORICAL_KIND = "categorical"
+
+
+@dataclass(frozen=True)
+class ColumnProfile:
+    """Column types of one result set, inferred once and shared by its consumers.
+
+    ``columns`` lists every column holding at least one non-null value, in
+    result order, and each of them is exactly one of numeric, datetime or
+    categorical. ``populated_columns`` leaves out columns that only hold
+    blank strings.
+    """
+
+    row_count: int
+    columns: tuple[str, ...] = ()
+    numeric_columns: tuple[str, ...] = ()
+    datetime_columns: tuple[str, ...] = ()
+    categorical_columns: tuple[str, ...] = ()
+    populated_columns: tuple[str, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "row_count": self.row_count,
+            "columns": list(self.columns),
+            "numeric_columns": list(self.numeric_columns),
+            "datetime_columns": list(self.datetime_columns),
+            "categorical_columns": list(self.categorical_columns),
+            "populated_columns": list(self.populated_columns),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: object) -> "ColumnProfile | None":
+        """Rebuild a stored profile, or return None when the payload is not one."""
+        if not isinstance(payload, dict):
+            return None
+
+        try:
+            row_count = int(payload.get("row_count"))
+        except (TypeError, ValueError):
+            return None
+
+        def read_columns(key: str) -> tuple[str, ...]:
+            value = payload.get(key)
+            if not isinstance(value, list):
+                return ()
+            return tuple(str(column) for column in value)
+
+        return cls(
+            row_count=row_count,
+            columns=read_columns("columns"),
+            numeric_columns=read_columns("numeric_columns"),
+            datetime_columns=read_columns("datetime_columns"),
+            categorical_columns=read_columns("categorical_columns"),
+            populated_columns=read_columns("populated_columns"),
+        )
+
+
+class ColumnProfiler:
+    """Infer numeric, datetime and categorical columns in one pass over a result.
+
+    Object columns are classified from the first non-null values; a full scan
+    only runs to confirm a column whose sample is entirely numeric. Date
+    strings are parsed once per distinct value through a shared cache.
+    """
+
+    def __init__(self, sample_size: int = PROFILE_SAMPLE_SIZE) -> None:
+        self.sample_size = max(sample_size, 1)
+
+    def profile(self, rows: Iterable[ResultRow]) -> ColumnProfile:
+        """Return the profile of query rows or of a spilled result set."""
+        return self.profile_frame(self.build_frame(rows))
+
+    def build_frame(self, rows: Iterable[ResultRow]) -> pd.DataFrame:
+        """Return the rows as a DataFrame with string column names."""
+        if isinstance(rows, SpilledResultSet):
+            frame = rows.to_dataframe()
+        else:
+            frame = pd.DataFrame.from_records(
+                [row for row in rows if isinstance(row, dict)]
+            )
+        frame.columns = [str(column) for column in frame.columns]
+        return frame
+
+    def collect_values(self, rows: Iterable[ResultRow]) -> dict[str, list[Any]]:
+        """Return the non-null values of each column in result order, without pandas."""
+        valid_rows = [row for row in rows if isinstance(row, dict)]
+        columns = dict.fromkeys(column for row in valid_rows for column in row)
+        return {
+            str(column): [
+                value
+                for value in [row[column] for row in valid_rows if column in row]
+                if not is_null_value(value)
+            ]
+            for column in columns
+        }
+
+    def profile_values(
+        self,
+        values_by_column: dict[str, list[Any]],
+        row_count: int,
+    ) -> ColumnProfile:
+        """Profile values grouped by ``collect_values`` with the same rules as a frame.
+
+        Small results are cheaper to classify this way than through a DataFrame.
+        """
+        columns_by_kind: dict[str, list[str]] = {
+            NUMERIC_KIND: [],
+            DATETIME_KIND: [],
+            CATEGORICAL_KIND: [],
+        }
+        columns: list[str] = []
+        populated_columns: list[str] = []
+
+        for column, values in values_by_column.items():
+            if not values:
+                continue
+
+            kind = self._classify_values(values)
+            columns.append(column)
+            columns_by_kind[kind].append(column)
+            if kind != CATEGORICAL_KIND or self._has_non_blank_value(values):
+                populated_columns.append(column)
+
+        return ColumnProfile(
+            row_count=row_count,
+            columns=tuple(columns),
+            numeric_columns=tuple(columns_by_kind[NUMERIC_KIND]),
+            datetime_columns=tuple(columns_by_kind[DATETIME_KIND]),
+            categorical_columns=tuple(columns_by_kind[CATEGORICAL_KIND]),
+            populated_columns=tuple(populated_columns),
+        )
+
+    def profile_frame(self, frame: pd.DataFrame) -> ColumnProfile:
+        columns_by_kind: dict[str, list[str]] = {
+            NUMERIC_KIND: [],
+            DATETIME_KIND: [],
+            CATEGORICAL_KIND: [],
+        }
+        columns: list[str] = []
+        populated_columns: list[str] = []
+
+        for column in frame.columns:
+            non_null_values = frame[column].dropna()
+            if non_null_values.empty:
+                continue
+
+            kind = self._classify(non_null_values)
+            columns.append(column)
+            columns_by_kind[kind].append(column)
+            if kind != CATEGORICAL_KIND or self._has_non_blank_value(non_null_values):
+                populated_columns.append(column)
+
+        return ColumnProfile(
+            row_count=len(frame.index),
+            columns=tuple(columns),
+            numeric_columns=tuple(columns_by_kind[NUMERIC_KIND]),
+            datetime_columns=tuple(columns_by_kind[DATETIME_KIND]),
+            categorical_columns=tuple(columns_by_kind[CATEGORICAL_KIND]),
+            populated_columns=tuple(populated_columns),
+        )
+
+    def apply_types(self, frame: pd.DataFrame, profile: ColumnProfile) -> pd.DataFrame:
+        """Convert numeric and datetime columns of the frame in place and return it."""
+        for column in profile.numeric_columns:
+            if column in frame.columns and not pd.api.types.is_numeric_dtype(
+                frame[column].dtype
+            ):
+                frame[column] = pd.to_numeric(frame[column], errors="coerce")
+
+        for column in profile.datetime_columns:
+            if column in frame.columns:
+                frame[column] = parse_datetime_series(frame[column])
+
+        return frame
+
+    def _classify(self, non_null_values: pd.Series) -> str:
+        dtype = non_null_values.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            return CATEGORICAL_KIND
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return DATETIME_KIND
+        if pd.api.types.is_numeric_dtype(dtype):
+            return NUMERIC_KIND
+        if dtype != object:
+            return CATEGORICAL_KIND
+
+        sample = non_null_values.head(self.sample_size).tolist()
+        if all(is_numeric_value(value) for value in sample):
+            return NUMERIC_KIND if self._all_numeric(non_null_values) else CATEGORICAL_KIND
+        if all(parse_datetime_value(value) is not None for value in sample):
+            return DATETIME_KIND
+        return CATEGORICAL_KIND
+
+    def _classify_values(self, non_null_values: list[Any]) -> str:
+        sample = non_null_values[: self.sample_size]
+        if all(is_numeric_value(value) for value in sample):
+            if all(
+                type(value) in PLAIN_NUMBER_TYPES or is_numeric_value(value)
+                for value in non_null_values
+            ):
+                return NUMERIC_KIND
+            return CATEGORICAL_KIND
+        if all(parse_datetime_value(value) is not None for value in sample):
+            return DATETIME_KIND
+        return CATEGORICAL_KIND
+
+    def _all_numeric(self, non_null_values: pd.Series) -> bool:
+        if pd.api.types.infer_dtype(non_null_values, skipna=True) in NUMERIC_INFERRED_TYPES:
+            return True
+        return all(is_numeric_value(value) for value in non_null_values)
+
+    def _has_non_blank_value(self, non_null_values: Iterable[Any]) -> bool:
+        return any(
+            not isinstance(value, str) or bool(value.strip())
+            for value in non_null_values
+        )
+
+
+def is_numeric_value(value: object) -> bool:
+    """Return True for plain numbers; booleans are not metrics."""
+    return isinstance(value, (int, float, Decimal, np.number)) and not isinstance(
+        value,
+        (bool, np.bool_),
+    )
+
+
+def is_null_value(value: object) -> bool:
+    """Return True for None and float NaN, the values a DataFrame drops as missing."""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def parse_datetime_value(value: object) -> datetime | None:
+    """Return the value as a datetime when it is a date or a supported date string."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if not isinstance(value, str):
+        return None
+    return _parse_datetime_text(value)
+
+
+def parse_datetime_series(series: pd.Series) -> pd.Series:
+    """Parse each distinct value once and map the results back onto the rows."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series
+
+    try:
+        distinct_values = series.dropna().unique()
+    except TypeError:
+        # Unhashable cells such as REPEATED fields: parse row by row.
+        parsed_series = series.map(parse_datetime_value)
+    else:
+        parsed_by_value = {
+            value: parse_datetime_value(value) for value in distinct_values
+        }
+        parsed_series = series.map(parsed_by_value)
+
+    if pd.api.types.is_datetime64_any_dtype(parsed_series.dtype):
+        return parsed_series
+
+    try:
+        return pd.to_datetime(parsed_series)
+    except (TypeError, ValueError):
+        # Mixed time zones cannot share a datetime64 dtype; keep the objects.
+        return parsed_series
+
+
+@lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def _parse_datetime_text(text: str) -> datetime | None:
+    candidate = text.strip()
+    if not candidate:
+        return None
+
+    normalized = candidate.replace("Z", "+00:00")
+    try:
+        return datetime.fromisoformat(normalized)
+    except ValueError:
+        pass
+
+    for date_format in DATE_PARSE_FORMATS:
+        try:
+            return datetime.strptime(normalized, date_format)
+        except ValueError:
+            continue
+
+    return None
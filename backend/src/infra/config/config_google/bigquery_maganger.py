@@ -1,27 +1,72 @@
-import os
+import hashlib
+import re
+from pathlib import Path
 from typing import Dict
 
-from google.cloud import bigquery
-from google.cloud.bigquery import SchemaField, Table
 from src.infra.config import settings
+from src.infra.config.config_google.client_factory import client_factory
+from src.infra.config.config_google.query_backend import BigQueryBackend
+from src.infra.config.config_local import get_shared_sqlite_backend
 from src.infra.logging_utils import LoggedComponent
+from src.infra.query_backend import QueryBackend
+from src.infra.query_backend import QueryJobStatistics
+from src.infra.query_result_cache import QueryResultCache
+from src.infra.query_result_cache import fingerprint_sql
+
+
+LOCAL_QUERY_BACKEND = "sqlite"
+LOCAL_PROJECT_ID = "local-project"
+JOB_LABEL_APP = "analytical_agent"
+JOB_LABEL_INVALID_CHARACTERS = re.compile(r"[^a-z0-9_-]")
+
+
+def build_query_result_cache() -> QueryResultCache | None:
+    """Return the process-wide result cache, or None when caching is disabled."""
+    if settings.query_cache_ttl_seconds <= 0:
+        return None
+
+    cache_dir = settings.query_cache_dir
+    return QueryResultCache(
+        ttl_seconds=settings.query_cache_ttl_seconds,
+        max_entries=settings.query_cache_max_entries,
+        max_bytes=settings.query_cache_max_bytes,
+        disk_dir=Path(cache_dir) if cache_dir else None,
+    )
+
+
+query_result_cache = build_query_result_cache()
 
 
 class BigQueryManager(LoggedComponent):
     """Handles BigQuery interactions, including schema retrieval and query execution."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        backend: QueryBackend | None = None,
+        result_cache: QueryResultCache | None = query_result_cache,
+    ) -> None:
         super().__init__()
         self.project_id = settings.project_id
         self.project_sa = settings.project_sa_path
+        self.bq_client = None
+        self.result_cache = result_cache
+        self.last_query_statistics: QueryJobStatistics | None = None
+
+        if backend is None and settings.query_backend == LOCAL_QUERY_BACKEND:
+            self.project_id = self.project_id or LOCAL_PROJECT_ID
+            backend = get_shared_sqlite_backend(self.project_id)
+            self.log_debug("Local SQLite query backend attached.")
 
-        if not self.project_id or not self.project_sa:
-            self.log_error("Missing GCP environment variables.")
-            raise EnvironmentError("PROJECT_ID/PROJECT or PROJECT_SA not set.")
+        if backend is None:
+            if not self.project_id or not self.project_sa:
+                self.log_error("Missing GCP environment variables.")
+                raise EnvironmentError("PROJECT_ID/PROJECT or PROJECT_SA not set.")
 
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = self.project_sa
-        self.bq_client = bigquery.Client(project=self.project_id)
-        self.log_debug("BigQuery client initialized.")
+            self.bq_client = client_factory.bigquery_client()
+            backend = BigQueryBackend(self.bq_client)
+            self.log_debug("BigQuery client attached.")
+
+        self.backend = backend
 
     def get_schema(
         self,
@@ -39,12 +84,7 @@ class BigQueryManager(LoggedComponent):
             chat_id=chat_id,
             question_id=question_id,
         )
-        table: Table = self.bq_client.get_table(table_id)
-
-        schema_map: Dict[str, str] = {}
-        for schema_field in table.schema:
-            schema_field_typed: SchemaField = schema_field
-            schema_map[schema_field_typed.name] = schema_field_typed.field_type
+        schema_map = self.backend.get_table_schema(table_id)
 
         self.log_info(
             f"Schema loaded for table {table_id}. Columns: {len(schema_map)}.",
@@ -60,10 +100,20 @@ class BigQueryManager(LoggedComponent):
         user_email: str,
         chat_id: str,
         question_id: str,
+        context: str | None = None,
+        attempt: int | None = None,
     ) -> list[dict]:
         """
         Wrap the AI-generated SQL in a company-scoped access filter.
+
+        Job statistics for the run are kept in ``last_query_statistics``.
         """
+        self.last_query_statistics = None
+        labels = self._build_job_labels(
+            chat_id=chat_id,
+            context=context,
+            attempt=attempt,
+        )
         secure_sql = f"""
         WITH scoped_user AS (
             SELECT company_id
@@ -94,23 +144,46 @@ class BigQueryManager(LoggedComponent):
             question_id=question_id,
         )
 
-        job_config = bigquery.QueryJobConfig(
-            use_query_cache=True,
-            priority=bigquery.QueryPriority.INTERACTIVE,
-            query_parameters=[
-                bigquery.ScalarQueryParameter("user_email", "STRING", user_email)
-            ],
-        )
+        cache_key = self._build_cache_key(response_sql, user_email)
+        if cache_key:
+            cached_results = self.result_cache.get(cache_key)
+            if cached_results is not None:
+                self.last_query_statistics = QueryJobStatistics(
+                    source="local_cache",
+                    cache_hit=True,
+                    row_count=len(cached_results),
+                    labels=labels,
+                )
+                self.log_info(
+                    "Query served from the local result cache. "
+                    f"Rows returned: {len(cached_results)}.",
+                    user_email=user_email,
+                    chat_id=chat_id,
+                    question_id=question_id,
+                )
+                return cached_results
 
         try:
-            query_job = self.bq_client.query(secure_sql, job_config=job_config)
-            results = [dict(row) for row in query_job.result()]
+            results, statistics = self.backend.run_query_with_statistics(
+                secure_sql,
+                user_email=user_email,
+                labels=labels,
+            )
+            self.last_query_statistics = statistics
             self.log_info(
                 f"Query successful. Rows returned: {len(results)}.",
                 user_email=user_email,
                 chat_id=chat_id,
                 question_id=question_id,
             )
+            self._log_query_statistics(
+                statistics,
+                user_email=user_email,
+                chat_id=chat_id,
+                question_id=question_id,
+            )
+            if cache_key:
+                self.result_cache.set(cache_key, results)
             return results
 
         except Exception as exp:
@@ -121,3 +194,58 @@ class BigQueryManager(LoggedComponent):
                 question_id=question_id,
             )
             raise
+
+    def _build_job_labels(
+        self,
+        chat_id: str,
+        context: str | None,
+        attempt: int | None,
+    ) -> dict[str, str]:
+        """Return BigQuery job labels that identify the question without exposing ids."""
+        labels = {
+            "app": JOB_LABEL_APP,
+            "chat_id_hash": hashlib.sha256(
+                str(chat_id or "").encode("utf-8")
+            ).hexdigest()[:16],
+        }
+        if context:
+            labels["context"] = JOB_LABEL_INVALID_CHARACTERS.sub(
+                "_",
+                str(context).strip().lower(),
+            )[:63]
+        if attempt is not None:
+            labels["attempt"] = str(attempt)
+        return labels
+
+    def _log_query_statistics(
+        self,
+        statistics: QueryJobStatistics,
+        user_email: str,
+        chat_id: str,
+        question_id: str,
+    ) -> None:
+        self.log_info(
+            f"Query statistics: {statistics.to_log_text()}.",
+            user_email=user_email,
+            chat_id=chat_id,
+            question_id=question_id,
+        )
+        for stage in statistics.stages:
+            self.log_debug(
+                f"Query plan stage: {stage}",
+                user_email=user_email,
+                chat_id=chat_id,
+                question_id=question_id,
+            )
+
+    def _build_cache_key(self, response_sql: str, user_email: str) -> str:
+        """Return the result-cache key for the SQL and the caller's access scope.
+
+        The secure wrapper resolves companies from the user's email inside the
+        query itself, so the email is the scope and no extra lookup job runs.
+        """
+        if self.result_cache is None:
+            return ""
+
+        scope = f"{self.project_id}:{str(user_email or '').strip().lower()}"
+        return fingerprint_sql(response_sql, scope)
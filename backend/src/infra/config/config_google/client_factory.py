@@ -0,0 +1,200 @@
+from threading import Lock
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth.credentials import AnonymousCredentials
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import bigquery
+from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
+from src.infra.config import settings
+from src.infra.logging_utils import LoggedComponent
+
+try:
+    from google.cloud import storage
+except ImportError:  # pragma: no cover - depends on installed extras
+    storage = None
+
+
+GOOGLE_CLOUD_SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
+EMULATOR_SIGNER_KEY_SIZE = 2048
+
+
+class GoogleClientFactory(LoggedComponent):
+    """Load service-account credentials once and share pooled Google Cloud clients."""
+
+    def __init__(
+        self,
+        project_id: str | None = None,
+        project_sa: str | None = None,
+        pool_size: int | None = None,
+    ) -> None:
+        super().__init__()
+        self._project_id = project_id
+        self._project_sa = project_sa
+        self._pool_size = pool_size
+        self._lock = Lock()
+        self._credentials = None
+        self._emulator_signing_credentials = None
+        self._bigquery_client = None
+        self._storage_client = None
+
+    @property
+    def project_id(self) -> str:
+        return self._project_id if self._project_id is not None else settings.project_id
+
+    @property
+    def project_sa(self) -> str:
+        return (
+            self._project_sa
+            if self._project_sa is not None
+            else settings.project_sa_path
+        )
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size or settings.gcp_http_pool_size
+
+    @property
+    def storage_emulator_host(self) -> str:
+        return settings.storage_emulator_host
+
+    def bigquery_client(self) -> Any:
+        """Return the process-wide BigQuery client."""
+        if self._bigquery_client is not None:
+            return self._bigquery_client
+
+        with self._lock:
+            if self._bigquery_client is None:
+                credentials = self._load_credentials()
+                self._bigquery_client = bigquery.Client(
+                    project=self.project_id,
+                    credentials=credentials,
+                    _http=self._build_http_session(credentials),
+                )
+                self.log_debug(
+                    f"Shared BigQuery client initialized (pool size: {self.pool_size})."
+                )
+
+        return self._bigquery_client
+
+    def storage_client(self) -> Any:
+        """Return the process-wide Cloud Storage client."""
+        if self._storage_client is not None:
+            return self._storage_client
+
+        with self._lock:
+            if self._storage_client is None:
+                if storage is None:
+                    raise RuntimeError(
+                        "google-cloud-storage is not installed in the active environment."
+                    )
+
+                if self.storage_emulator_host:
+                    self._storage_client = self._build_emulator_storage_client()
+                else:
+                    credentials = self._load_credentials()
+                    self._storage_client = storage.Client(
+                        project=self.project_id or None,
+                        credentials=credentials,
+                        _http=self._build_http_session(credentials),
+                    )
+                    self.log_debug(
+                        f"Shared storage client initialized (pool size: {self.pool_size})."
+                    )
+
+        return self._storage_client
+
+    def signing_credentials(self) -> Any:
+        """Return the service-account credentials used to sign storage URLs.
+
+        The storage emulator does not verify signatures, so without PROJECT_SA
+        emulator URLs are signed with a throwaway key generated in-process.
+        """
+        with self._lock:
+            if self.storage_emulator_host and not self.project_sa:
+                return self._load_emulator_signing_credentials()
+            return self._load_credentials()
+
+    def reset(self) -> None:
+        """Drop cached credentials and clients so the next call rebuilds them."""
+        with self._lock:
+            for client in (self._bigquery_client, self._storage_client):
+                close = getattr(client, "close", None)
+                if callable(close):
+                    close()
+
+            self._credentials = None
+            self._emulator_signing_credentials = None
+            self._bigquery_client = None
+            self._storage_client = None
+
+    def _load_credentials(self) -> Any:
+        """Read the service-account file once; callers must hold the lock."""
+        if self._credentials is not None:
+            return self._credentials
+
+        if not self.project_sa:
+            raise EnvironmentError("PROJECT_SA not set.")
+
+        self._credentials = service_account.Credentials.from_service_account_file(
+            self.project_sa,
+            scopes=GOOGLE_CLOUD_SCOPES,
+        )
+        self.log_debug("Google Cloud service-account credentials loaded.")
+        return self._credentials
+
+    def _load_emulator_signing_credentials(self) -> Any:
+        """Generate the emulator signing key once; callers must hold the lock."""
+        if self._emulator_signing_credentials is not None:
+            return self._emulator_signing_credentials
+
+        private_key = rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=EMULATOR_SIGNER_KEY_SIZE,
+        )
+        project_id = self.project_id or "local-emulator"
+        self._emulator_signing_credentials = (
+            service_account.Credentials.from_service_account_info(
+                {
+                    "type": "service_account",
+                    "client_email": f"emulator-signer@{project_id}.iam.gserviceaccount.com",
+                    "private_key": private_key.private_bytes(
+                        serialization.Encoding.PEM,
+                        serialization.PrivateFormat.PKCS8,
+                        serialization.NoEncryption(),
+                    ).decode("utf-8"),
+                    "private_key_id": "emulator",
+                    "token_uri": "https://oauth2.googleapis.com/token",
+                },
+                scopes=GOOGLE_CLOUD_SCOPES,
+            )
+        )
+        self.log_debug("Generated a throwaway key to sign storage emulator URLs.")
+        return self._emulator_signing_credentials
+
+    def _build_emulator_storage_client(self) -> Any:
+        """Return an unauthenticated client for a local storage emulator."""
+        client = storage.Client(
+            project=self.project_id or "local-emulator",
+            credentials=AnonymousCredentials(),
+            client_options={"api_endpoint": self.storage_emulator_host},
+        )
+        self.log_debug(
+            f"Storage client initialized against the emulator at {self.storage_emulator_host}."
+        )
+        return client
+
+    def _build_http_session(self, credentials: Any) -> Any:
+        """Return an authorized keep-alive session sized for the worker concurrency."""
+        session = AuthorizedSession(credentials)
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+        )
+        session.mount("https://", adapter)
+        return session
+
+
+client_factory = GoogleClientFactory()
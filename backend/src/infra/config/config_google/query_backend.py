@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import Any
+from typing import Dict
+
+from google.cloud import bigquery
+from google.cloud.bigquery import SchemaField, Table
+from src.infra.query_backend import QueryBackend
+from src.infra.query_backend import QueryJobStatistics
+from src.infra.query_backend import QueryRows
+from src.infra.result_spill import collect_rows
+
+
+QUERY_PLAN_STAGE_FIELDS = (
+    "name",
+    "status",
+    "slot_ms",
+    "records_read",
+    "records_written",
+    "wait_ms_avg",
+    "read_ms_avg",
+    "compute_ms_avg",
+    "write_ms_avg",
+    "shuffle_output_bytes",
+    "shuffle_output_bytes_spilled",
+)
+
+
+class BigQueryBackend(QueryBackend):
+    """Run queries against a live BigQuery project."""
+
+    source = "bigquery"
+
+    def __init__(self, bq_client: Any) -> None:
+        self.bq_client = bq_client
+
+    def get_table_schema(self, table_id: str) -> Dict[str, str]:
+        table: Table = self.bq_client.get_table(table_id)
+
+        schema_map: Dict[str, str] = {}
+        for schema_field in table.schema:
+            schema_field_typed: SchemaField = schema_field
+            schema_map[schema_field_typed.name] = schema_field_typed.field_type
+
+        return schema_map
+
+    def run_query(self, sql: str, user_email: str) -> QueryRows:
+        rows, _ = self.run_query_with_statistics(sql, user_email=user_email)
+        return rows
+
+    def run_query_with_statistics(
+        self,
+        sql: str,
+        user_email: str,
+        labels: dict[str, str] | None = None,
+    ) -> tuple[QueryRows, QueryJobStatistics]:
+        job_config = bigquery.QueryJobConfig(
+            use_query_cache=True,
+            priority=bigquery.QueryPriority.INTERACTIVE,
+            query_parameters=[
+                bigquery.ScalarQueryParameter("user_email", "STRING", user_email)
+            ],
+            labels=dict(labels or {}),
+        )
+        query_job = self.bq_client.query(sql, job_config=job_config)
+        rows = collect_rows(dict(row) for row in query_job.result())
+        return rows, self._build_statistics(query_job, rows, labels)
+
+    def _build_statistics(
+        self,
+        query_job: Any,
+        rows: QueryRows,
+        labels: dict[str, str] | None,
+    ) -> QueryJobStatistics:
+        """Read the job statistics exposed by the finished QueryJob."""
+        query_plan = getattr(query_job, "query_plan", None)
+        job_id = getattr(query_job, "job_id", "")
+        return QueryJobStatistics(
+            source=self.source,
+            job_id=job_id if isinstance(job_id, str) else "",
+            elapsed_ms=self._elapsed_ms(
+                getattr(query_job, "started", None),
+                getattr(query_job, "ended", None),
+            ),
+            bytes_processed=self._optional_int(
+                getattr(query_job, "total_bytes_processed", None)
+            ),
+            bytes_billed=self._optional_int(
+                getattr(query_job, "total_bytes_billed", None)
+            ),
+            slot_millis=self._optional_int(getattr(query_job, "slot_millis", None)),
+            cache_hit=self._optional_bool(getattr(query_job, "cache_hit", None)),
+            row_count=len(rows),
+            labels=dict(labels or {}),
+            stages=[
+                self._describe_stage(stage)
+                for stage in (query_plan if isinstance(query_plan, list) else [])
+            ],
+        )
+
+    def _describe_stage(self, stage: Any) -> dict[str, Any]:
+        return {
+            field_name: getattr(stage, field_name, None)
+            for field_name in QUERY_PLAN_STAGE_FIELDS
+        }
+
+    def _elapsed_ms(self, started: object, ended: object) -> int | None:
+        if not isinstance(started, datetime) or not isinstance(ended, datetime):
+            return None
+
+        return int((ended - started).total_seconds() * 1000)
+
+    def _optional_int(self, value: object) -> int | None:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+
+        return int(value)
+
+    def _optional_bool(self, value: object) -> bool | None:
+        return value if isinstance(value, bool) else None
@@ -1,9 +1,31 @@
-import json
+import io
 import os
+import re
+import tempfile
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any
 
+from src.infra.blob_cache import BlobCache
+from src.infra.blob_cache import build_blob_cache
 from src.infra.config import settings
+from src.infra.config.config_google.client_factory import client_factory
 from src.infra.logging_utils import LoggedComponent
+from src.infra.storage_codec import JSON_CONTENT_TYPE
+from src.infra.storage_codec import LAYOUT_COLUMNS
+from src.infra.storage_codec import PARQUET_AVAILABLE
+from src.infra.storage_codec import PARQUET_CONTENT_TYPE
+from src.infra.storage_codec import StorageCodec
+from src.infra.storage_codec import build_storage_codec
+from src.infra.storage_codec import decode_rows
+from src.infra.storage_codec import detect_compression
+from src.infra.storage_codec import project_rows
+from src.infra.storage_codec import read_parquet_rows
+from src.infra.storage_codec import starts_record_list
+from src.infra.storage_codec import write_parquet_rows
 
 try:
     from google.cloud import storage
@@ -14,13 +36,48 @@ except ImportError:  # pragma: no cover - depends on installed extras
 DEFAULT_STORAGE_BUCKET = "agent_analytical"
 DATA_ENDPOINT_TEMPLATE = "/v1/storage/data/{chat_id}/{message_id}"
 GRAPH_ENDPOINT_TEMPLATE = "/v1/storage/graph/{chat_id}/{message_id}"
+DATA_FORMAT_JSON = "json"
+DATA_FORMAT_PARQUET = "parquet"
+# Ranged reads fetch Parquet footers and column chunks without the whole blob.
+PARQUET_READ_CHUNK_BYTES = 1024 * 1024
+PASSTHROUGH_CHUNK_BYTES = 256 * 1024
+SIGNED_URL_VERSION = "v4"
+# Renders live under graph/{message}/{render key}.png; the key addresses the
+# content, so these blobs are never overwritten and need no GCS revalidation.
+IMMUTABLE_BLOB_NAME_PATTERN = re.compile(r"/graph/[^/]+/[^/]+\.png\Z")
+
+
+@dataclass(frozen=True)
+class StoredDataStream:
+    """Stored JSON rows to send as they are, chunk by chunk, with their compression."""
+
+    compression: str
+    chunks: Iterator[bytes]
+
+
+@dataclass(frozen=True)
+class SignedDownload:
+    """Short-lived URL the browser can fetch a stored blob from directly."""
+
+    url: str
+    content_encoding: str | None = None
 
 
 class StorageManager(LoggedComponent):
     """Handle persisted response data and graphs in Google Cloud Storage."""
 
-    def __init__(self, bucket_name: str = DEFAULT_STORAGE_BUCKET) -> None:
+    def __init__(
+        self,
+        bucket_name: str = DEFAULT_STORAGE_BUCKET,
+        codec: StorageCodec | None = None,
+    ) -> None:
         super().__init__()
+        self.codec = codec or build_storage_codec()
+        self.blob_cache: BlobCache | None = build_blob_cache()
+        self.signed_urls_enabled = settings.storage_signed_urls
+        self.data_format = (
+            settings.storage_data_format if PARQUET_AVAILABLE else DATA_FORMAT_JSON
+        )
         self.bucket_name = settings.storage_bucket(bucket_name)
         self.project_id = settings.project_id
         self.project_sa = settings.project_sa_path
@@ -36,7 +93,7 @@ class StorageManager(LoggedComponent):
             )
             return
 
-        if not self.project_sa:
+        if not self.project_sa and not settings.storage_emulator_host:
             self._configuration_error = (
                 "PROJECT_SA is not configured for Google Cloud authentication."
             )
@@ -45,9 +102,8 @@ class StorageManager(LoggedComponent):
             )
             return
 
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = self.project_sa
         try:
-            client = storage.Client(project=self.project_id or None)
+            client = client_factory.storage_client()
             self._bucket = client.bucket(self.bucket_name)
         except Exception as exp:
             self._configuration_error = f"Unable to initialize the storage client: {exp}"
@@ -68,7 +124,15 @@ class StorageManager(LoggedComponent):
         message_id: str,
         payload: list[dict[str, Any]],
     ) -> str:
-        """Persist structured rows as JSON and return the API access path."""
+        """Persist structured rows in the configured data format and return the API access path."""
+        if self.data_format == DATA_FORMAT_PARQUET and self._save_parquet_rows(
+            user_email=user_email,
+            chat_id=chat_id,
+            message_id=message_id,
+            rows=payload,
+        ):
+            return self.build_data_access_path(chat_id=chat_id, message_id=message_id)
+
         blob = self._build_blob(
             self._build_data_blob_name(
                 user_email=user_email,
@@ -76,20 +140,34 @@ class StorageManager(LoggedComponent):
                 message_id=message_id,
             )
         )
-        blob.upload_from_string(
-            json.dumps(payload, indent=2),
-            content_type="application/json",
-        )
+        body = self.codec.encode_bytes(payload)
+        blob.content_encoding = self.codec.content_encoding
+        blob.metadata = {"layout": self.codec.layout}
+        blob.upload_from_string(body, content_type=JSON_CONTENT_TYPE)
+        self._cache_blob(blob, body)
         return self.build_data_access_path(chat_id=chat_id, message_id=message_id)
 
-    def load_json_data(
+    def save_json_rows(
         self,
         *,
         user_email: str,
         chat_id: str,
         message_id: str,
-    ) -> list[dict[str, Any]] | None:
-        """Load structured rows from cloud storage."""
+        rows: Iterable[dict[str, Any]],
+    ) -> str:
+        """Stream rows into a temporary encoded file and upload it without buffering the payload."""
+        if self.data_format == DATA_FORMAT_PARQUET:
+            if not isinstance(rows, Sequence):
+                # A failed Parquet write falls back to JSON, which reads the rows again.
+                rows = list(rows)
+            if self._save_parquet_rows(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                rows=rows,
+            ):
+                return self.build_data_access_path(chat_id=chat_id, message_id=message_id)
+
         blob = self._build_blob(
             self._build_data_blob_name(
                 user_email=user_email,
@@ -97,16 +175,197 @@ class StorageManager(LoggedComponent):
                 message_id=message_id,
             )
         )
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".json")
+        try:
+            with os.fdopen(file_descriptor, "wb") as handle:
+                self.codec.encode(rows, handle, columns=getattr(rows, "columns", None))
+
+            blob.content_encoding = self.codec.content_encoding
+            blob.metadata = {"layout": self.codec.layout}
+            blob.upload_from_filename(temp_path, content_type=JSON_CONTENT_TYPE)
+            self._cache_blob_file(blob, temp_path)
+        finally:
+            os.unlink(temp_path)
+
+        return self.build_data_access_path(chat_id=chat_id, message_id=message_id)
 
+    def load_json_data(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        columns: Sequence[str] | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]] | None:
+        """Load structured rows from cloud storage, optionally projected to columns and a row range.
+
+        Blobs already in the local cache are read without calling GCS. Parquet
+        blobs too large to cache are read with ranged requests, so only the
+        footer and the row groups and column chunks in the projection are
+        downloaded. JSON blobs in any codec, including legacy JSON, are
+        downloaded whole and projected afterwards.
+        """
+        for data_format in self._get_read_formats():
+            try:
+                if data_format == DATA_FORMAT_PARQUET:
+                    return self._load_parquet_rows(
+                        user_email=user_email,
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        columns=columns,
+                        offset=offset,
+                        limit=limit,
+                    )
+                return self._load_json_rows(
+                    user_email=user_email,
+                    chat_id=chat_id,
+                    message_id=message_id,
+                    columns=columns,
+                    offset=offset,
+                    limit=limit,
+                )
+            except Exception:
+                continue
+        return None
+
+    def open_json_stream(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+    ) -> StoredDataStream | None:
+        """Open the stored JSON rows for passthrough without parsing them.
+
+        Returns None when the rows must be decoded instead: Parquet data,
+        column-layout payloads, or a missing blob. Cached bodies are served
+        from memory; otherwise the blob is read from GCS in chunks.
+        """
+        try:
+            if self.data_format == DATA_FORMAT_PARQUET and self._blob_exists(
+                self._build_blob(
+                    self._build_data_blob_name(
+                        user_email=user_email,
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        data_format=DATA_FORMAT_PARQUET,
+                    )
+                )
+            ):
+                return None
+
+            blob = self._build_blob(
+                self._build_data_blob_name(
+                    user_email=user_email,
+                    chat_id=chat_id,
+                    message_id=message_id,
+                )
+            )
+            body = self._read_cached_blob(blob)
+            if body is not None:
+                first_chunk, reader = body, None
+            else:
+                reader = blob.open(
+                    "rb",
+                    chunk_size=PASSTHROUGH_CHUNK_BYTES,
+                    raw_download=True,
+                )
+                first_chunk = reader.read(PASSTHROUGH_CHUNK_BYTES)
+        except Exception:
+            return None
+
+        if not starts_record_list(first_chunk):
+            if reader is not None:
+                reader.close()
+            return None
+
+        return StoredDataStream(
+            compression=detect_compression(first_chunk),
+            chunks=(
+                iter((first_chunk,))
+                if reader is None
+                else self._iter_blob_chunks(blob, reader, first_chunk)
+            ),
+        )
+
+    def sign_data_download(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+    ) -> SignedDownload | None:
+        """Return a signed URL for the stored JSON rows, or None when they must be proxied.
+
+        Parquet data and column-layout payloads are proxied, since the browser
+        expects a JSON list of rows, and so is a missing blob.
+        """
         try:
-            payload = json.loads(blob.download_as_text(encoding="utf-8"))
+            if self.data_format == DATA_FORMAT_PARQUET and self._blob_exists(
+                self._build_blob(
+                    self._build_data_blob_name(
+                        user_email=user_email,
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        data_format=DATA_FORMAT_PARQUET,
+                    )
+                )
+            ):
+                return None
+
+            blob = self._build_blob(
+                self._build_data_blob_name(
+                    user_email=user_email,
+                    chat_id=chat_id,
+                    message_id=message_id,
+                )
+            )
+            blob.reload()
         except Exception:
             return None
 
-        if not isinstance(payload, list):
+        if (blob.metadata or {}).get("layout") == LAYOUT_COLUMNS:
             return None
 
-        return [item for item in payload if isinstance(item, dict)]
+        signed_url = self._sign_blob_url(blob)
+        if not signed_url:
+            return None
+        return SignedDownload(url=signed_url, content_encoding=blob.content_encoding)
+
+    def sign_graph_download(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        render_key: str = "",
+    ) -> SignedDownload | None:
+        """Return a signed URL for a stored graph, or None when it does not exist."""
+        if render_key:
+            blob_name = self._build_graph_render_blob_name(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                render_key=render_key,
+            )
+        else:
+            blob_name = self._build_graph_blob_name(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+            )
+
+        try:
+            blob = self._build_blob(blob_name)
+            if not self._blob_exists(blob):
+                return None
+        except Exception:
+            return None
+
+        signed_url = self._sign_blob_url(blob)
+        return SignedDownload(url=signed_url) if signed_url else None
 
     def save_graph_image(
         self,
@@ -125,6 +384,7 @@ class StorageManager(LoggedComponent):
             )
         )
         blob.upload_from_string(image_bytes, content_type="image/png")
+        self._cache_blob(blob, image_bytes)
         return self.build_graph_access_path(chat_id=chat_id, message_id=message_id)
 
     def load_graph_image(
@@ -144,10 +404,82 @@ class StorageManager(LoggedComponent):
         )
 
         try:
-            return blob.download_as_bytes()
+            return self._download_blob(blob)
+        except Exception:
+            return None
+
+    def save_graph_render(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        render_key: str,
+        image_bytes: bytes,
+    ) -> str:
+        """Persist a content-addressed graph render and return its API access path."""
+        blob = self._build_blob(
+            self._build_graph_render_blob_name(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                render_key=render_key,
+            )
+        )
+        blob.upload_from_string(image_bytes, content_type="image/png")
+        self._cache_blob(blob, image_bytes)
+        return self.build_graph_access_path(
+            chat_id=chat_id,
+            message_id=message_id,
+            render_key=render_key,
+        )
+
+    def load_graph_render(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        render_key: str,
+    ) -> bytes | None:
+        """Load a content-addressed graph render from cloud storage."""
+        blob = self._build_blob(
+            self._build_graph_render_blob_name(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                render_key=render_key,
+            )
+        )
+
+        try:
+            return self._download_blob(blob)
         except Exception:
             return None
 
+    def graph_render_exists(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        render_key: str,
+    ) -> bool:
+        """Return True when the render was already saved, without downloading it."""
+        blob = self._build_blob(
+            self._build_graph_render_blob_name(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                render_key=render_key,
+            )
+        )
+
+        try:
+            return self._blob_exists(blob)
+        except Exception:
+            return False
+
     def build_data_access_path(self, *, chat_id: str, message_id: str) -> str:
         """Return the backend route that proxies stored JSON data."""
         return DATA_ENDPOINT_TEMPLATE.format(
@@ -155,12 +487,227 @@ class StorageManager(LoggedComponent):
             message_id=self._normalize_segment(message_id),
         )
 
-    def build_graph_access_path(self, *, chat_id: str, message_id: str) -> str:
+    def build_graph_access_path(
+        self,
+        *,
+        chat_id: str,
+        message_id: str,
+        render_key: str = "",
+    ) -> str:
         """Return the backend route that proxies stored graph content."""
-        return GRAPH_ENDPOINT_TEMPLATE.format(
+        access_path = GRAPH_ENDPOINT_TEMPLATE.format(
             chat_id=self._normalize_segment(chat_id),
             message_id=self._normalize_segment(message_id),
         )
+        if render_key:
+            access_path = f"{access_path}?render={self._normalize_segment(render_key)}"
+        return access_path
+
+    def _save_parquet_rows(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        rows: Iterable[dict[str, Any]],
+    ) -> bool:
+        """Upload the rows as Parquet, or return False when they need the JSON codec."""
+        blob = self._build_blob(
+            self._build_data_blob_name(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                data_format=DATA_FORMAT_PARQUET,
+            )
+        )
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".parquet")
+        os.close(file_descriptor)
+        try:
+            try:
+                write_parquet_rows(rows, temp_path)
+            except ValueError as exp:
+                self.log_warning(f"{exp} Storing the rows as JSON instead.")
+                # A Parquet blob from earlier data would be read before the JSON one.
+                self._delete_blob(blob)
+                return False
+
+            blob.upload_from_filename(temp_path, content_type=PARQUET_CONTENT_TYPE)
+            self._cache_blob_file(blob, temp_path)
+        finally:
+            os.unlink(temp_path)
+        return True
+
+    def _load_parquet_rows(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        columns: Sequence[str] | None,
+        offset: int,
+        limit: int | None,
+    ) -> list[dict[str, Any]]:
+        blob = self._build_blob(
+            self._build_data_blob_name(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+                data_format=DATA_FORMAT_PARQUET,
+            )
+        )
+        body = self._read_cached_blob(blob)
+        if body is None and self.blob_cache is not None:
+            if blob.size is None:
+                blob.reload()
+            if blob.size <= self.blob_cache.max_entry_bytes:
+                body = blob.download_as_bytes()
+                self._cache_blob(blob, body)
+
+        if body is not None:
+            return read_parquet_rows(
+                io.BytesIO(body),
+                columns=columns,
+                offset=offset,
+                limit=limit,
+            )
+
+        with blob.open("rb", chunk_size=PARQUET_READ_CHUNK_BYTES) as reader:
+            return read_parquet_rows(reader, columns=columns, offset=offset, limit=limit)
+
+    def _load_json_rows(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        columns: Sequence[str] | None,
+        offset: int,
+        limit: int | None,
+    ) -> list[dict[str, Any]] | None:
+        blob = self._build_blob(
+            self._build_data_blob_name(
+                user_email=user_email,
+                chat_id=chat_id,
+                message_id=message_id,
+            )
+        )
+        # Raw bytes skip GCS gzip transcoding; the codec detects compression itself.
+        rows = decode_rows(self._download_blob(blob, raw_download=True))
+        if rows is None:
+            return None
+        return project_rows(rows, columns=columns, offset=offset, limit=limit)
+
+    def _iter_blob_chunks(self, blob, reader, first_chunk: bytes) -> Iterator[bytes]:
+        """Yield the blob in chunks and cache the body once it was read to the end."""
+        cached_chunks: list[bytes] | None = [] if self.blob_cache is not None else None
+        cached_size = 0
+        try:
+            chunk = first_chunk
+            while chunk:
+                yield chunk
+                if cached_chunks is not None:
+                    cached_size += len(chunk)
+                    if cached_size > self.blob_cache.max_entry_bytes:
+                        cached_chunks = None
+                    else:
+                        cached_chunks.append(chunk)
+                chunk = reader.read(PASSTHROUGH_CHUNK_BYTES)
+        finally:
+            reader.close()
+
+        if cached_chunks is not None:
+            self._cache_blob(blob, b"".join(cached_chunks))
+
+    def _sign_blob_url(self, blob) -> str:
+        """Return a V4 signed GET URL, or an empty string when signing is unavailable.
+
+        The URL uses the storage client's endpoint, so it points at the local
+        emulator when STORAGE_EMULATOR_HOST is set.
+        """
+        try:
+            return blob.generate_signed_url(
+                version=SIGNED_URL_VERSION,
+                expiration=timedelta(seconds=settings.storage_signed_url_ttl_seconds),
+                method="GET",
+                credentials=client_factory.signing_credentials(),
+            )
+        except Exception as exp:
+            self.log_warning(f"Unable to sign a storage URL, proxying instead: {exp}")
+            return ""
+
+    def _blob_exists(self, blob) -> bool:
+        if (
+            self.blob_cache is not None
+            and self._is_immutable_blob(blob.name)
+            and self.blob_cache.latest_generation(blob.name)
+        ):
+            return True
+        return bool(blob.exists())
+
+    def _get_read_formats(self) -> list[str]:
+        """Return the data formats to try, the configured one first."""
+        read_formats = [self.data_format, DATA_FORMAT_JSON, DATA_FORMAT_PARQUET]
+        return [
+            data_format
+            for data_format in dict.fromkeys(read_formats)
+            if data_format == DATA_FORMAT_JSON or PARQUET_AVAILABLE
+        ]
+
+    def _download_blob(self, blob, *, raw_download: bool = False) -> bytes:
+        """Return the blob body from the local cache, or download and cache it."""
+        body = self._read_cached_blob(blob)
+        if body is None:
+            body = blob.download_as_bytes(raw_download=raw_download)
+            self._cache_blob(blob, body)
+        return body
+
+    def _read_cached_blob(self, blob) -> bytes | None:
+        """Return a cached body of the blob's current generation, or None.
+
+        Immutable renders are served without calling GCS. Data and legacy graph
+        blobs can be overwritten or deleted by another worker, so a cached body
+        is only used after a metadata request confirms its generation.
+        """
+        if self.blob_cache is None:
+            return None
+
+        if self._is_immutable_blob(blob.name):
+            body = self.blob_cache.get(blob.name)
+            if body is not None:
+                return body
+
+        if self.blob_cache.disk_dir is None and not self.blob_cache.latest_generation(
+            blob.name
+        ):
+            return None
+
+        blob.reload()
+        return self.blob_cache.get(blob.name, blob.generation)
+
+    def _is_immutable_blob(self, blob_name: str) -> bool:
+        return IMMUTABLE_BLOB_NAME_PATTERN.search(blob_name) is not None
+
+    def _cache_blob(self, blob, body: bytes) -> None:
+        if self.blob_cache is not None:
+            self.blob_cache.set(blob.name, blob.generation, body)
+
+    def _cache_blob_file(self, blob, path: str) -> None:
+        if self.blob_cache is None:
+            return
+        if os.path.getsize(path) > self.blob_cache.max_entry_bytes:
+            return
+
+        with open(path, "rb") as handle:
+            self._cache_blob(blob, handle.read())
+
+    def _delete_blob(self, blob) -> None:
+        if self.blob_cache is not None:
+            self.blob_cache.forget(blob.name)
+
+        try:
+            blob.delete()
+        except Exception:
+            pass
 
     def _build_data_blob_name(
         self,
@@ -168,11 +715,12 @@ class StorageManager(LoggedComponent):
         user_email: str,
         chat_id: str,
         message_id: str,
+        data_format: str = DATA_FORMAT_JSON,
     ) -> str:
         return (
             f"{self._normalize_email(user_email)}/"
             f"{self._normalize_segment(chat_id)}/"
-            f"data/{self._normalize_segment(message_id)}.json"
+            f"data/{self._normalize_segment(message_id)}.{data_format}"
         )
 
     def _build_graph_blob_name(
@@ -188,6 +736,21 @@ class StorageManager(LoggedComponent):
             f"graph/{self._normalize_segment(message_id)}.png"
         )
 
+    def _build_graph_render_blob_name(
+        self,
+        *,
+        user_email: str,
+        chat_id: str,
+        message_id: str,
+        render_key: str,
+    ) -> str:
+        return (
+            f"{self._normalize_email(user_email)}/"
+            f"{self._normalize_segment(chat_id)}/"
+            f"graph/{self._normalize_segment(message_id)}/"
+            f"{self._normalize_segment(render_key)}.png"
+        )
+
     def _build_blob(self, blob_name: str):
         bucket = self._require_bucket()
         return bucket.blob(blob_name)
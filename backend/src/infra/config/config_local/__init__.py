@@ -0,0 +1,4 @@
+from .sqlite_backend import SQLiteQueryBackend
+from .sqlite_backend import get_shared_sqlite_backend
+
+__all__ = ["SQLiteQueryBackend", "get_shared_sqlite_backend"]
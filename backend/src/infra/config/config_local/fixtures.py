@@ -0,0 +1,217 @@
+from datetime import date
+from datetime import timedelta
+from hashlib import sha256
+from typing import Any
+
+
+FixtureRow = dict[str, Any]
+
+FIXTURE_DATASET = "test_ia"
+
+# Column order and BigQuery types mirror the setup script in the project readme.
+FIXTURE_SCHEMAS: dict[str, dict[str, str]] = {
+    "users": {
+        "id": "INTEGER",
+        "name": "STRING",
+        "email": "STRING",
+        "company_id": "INTEGER",
+    },
+    "air_tickets": {
+        "id": "INTEGER",
+        "ticket": "STRING",
+        "company_id": "INTEGER",
+        "departure_date": "DATE",
+        "arrival_date": "DATE",
+        "departure_amount": "NUMERIC",
+        "arrival_amount": "NUMERIC",
+    },
+    "companies": {
+        "company_id": "INTEGER",
+        "company_name": "STRING",
+        "company_hash": "STRING",
+    },
+    "expenses": {
+        "id": "INTEGER",
+        "user_id": "INTEGER",
+        "company_id": "INTEGER",
+        "expense_date": "DATE",
+        "category": "STRING",
+        "description": "STRING",
+        "amount": "NUMERIC",
+        "status": "STRING",
+        "ticket": "STRING",
+    },
+}
+
+FIRST_NAMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduardo", "Fernanda", "Gabriel", "Helena",
+    "Igor", "Juliana", "Kleber", "Larissa", "Marcos", "Natalia", "Otavio",
+    "Patricia", "Rafael", "Sabrina", "Tiago", "Vanessa", "William", "Yasmin",
+    "Beatriz", "Caio", "Debora", "Fabio", "Giovana", "Hugo", "Isabela", "Joao",
+    "Karen", "Leandro", "Mariana", "Nicolas", "Paula", "Renato", "Sara", "Vitor",
+    "Wesley", "Aline", "Cintia", "Diego", "Elaine", "Felipe", "Gustavo", "Livia",
+    "Mateus", "Priscila", "Rodrigo", "Tatiane",
+)
+LAST_NAMES = (
+    "Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Carvalho",
+    "Ribeiro", "Almeida", "Gomes", "Martins", "Ferreira", "Rodrigues", "Barbosa",
+    "Teixeira", "Moura", "Araujo", "Monteiro",
+)
+EXPENSE_CATEGORIES = (
+    "Food",
+    "Gasoline",
+    "Hotel",
+    "Transport",
+    "Air Ticket",
+    "Uber",
+    "Reimbursement",
+)
+EXPENSE_STATUSES = ("APPROVED", "PENDING", "REJECTED")
+COMPANY_OWNERS = (
+    (1, "Manuel Company", "owner_manual"),
+    (1001, "Company 1001", "owner_a"),
+    (1002, "Company 1002", "owner_a"),
+    (1003, "Company 1003", "owner_b"),
+    (1004, "Company 1004", "owner_c"),
+    (1005, "Company 1005", "owner_c"),
+    (1006, "Company 1006", "owner_c"),
+    (1007, "Company 1007", "owner_d"),
+    (1008, "Company 1008", "owner_d"),
+)
+BASE_DATE = date(2026, 1, 1)
+
+
+def build_fixture_rows() -> dict[str, list[FixtureRow]]:
+    """Return the deterministic mocked travel-management dataset."""
+    air_tickets = _build_air_tickets()
+    return {
+        "users": _build_users(),
+        "air_tickets": air_tickets,
+        "companies": _build_companies(),
+        "expenses": _build_expenses(air_tickets),
+    }
+
+
+def _build_users() -> list[FixtureRow]:
+    rows = [
+        {
+            "id": user_id,
+            "name": (
+                f"{FIRST_NAMES[(user_id - 1) % len(FIRST_NAMES)]} "
+                f"{LAST_NAMES[(user_id * 3) % len(LAST_NAMES)]}"
+            ),
+            "email": f"user{user_id:03d}@company.com",
+            "company_id": 1001 + (user_id - 1) % 8,
+        }
+        for user_id in range(1, 51)
+    ]
+    rows.append(
+        {
+            "id": 6666,
+            "name": "Manuel Ventura",
+            "email": "user@example.com",
+            "company_id": 1,
+        }
+    )
+    return rows
+
+
+def _build_air_tickets() -> list[FixtureRow]:
+    rows: list[FixtureRow] = []
+    for ticket_id in range(1, 201):
+        departure_date = BASE_DATE + timedelta(days=ticket_id)
+        rows.append(
+            {
+                "id": ticket_id,
+                "ticket": f"CODE-{departure_date:%Y%m}-{ticket_id:06d}",
+                "company_id": 1001 + (ticket_id - 1) % 8,
+                "departure_date": departure_date.isoformat(),
+                "arrival_date": (
+                    departure_date + timedelta(days=2 + ticket_id % 14)
+                ).isoformat(),
+                "departure_amount": _amount(
+                    150 + (ticket_id * 97) % 2200,
+                    (ticket_id * 13) % 100,
+                ),
+                "arrival_amount": _amount(
+                    150 + (ticket_id * 131) % 2400,
+                    (ticket_id * 29) % 100,
+                ),
+            }
+        )
+
+    rows.append(
+        {
+            "id": 666,
+            "ticket": "CODE-202602-000666",
+            "company_id": 1,
+            "departure_date": "2025-12-31",
+            "arrival_date": "2026-12-31",
+            "departure_amount": 666.66,
+            "arrival_amount": 1001.0,
+        }
+    )
+    return rows
+
+
+def _build_companies() -> list[FixtureRow]:
+    return [
+        {
+            "company_id": company_id,
+            "company_name": company_name,
+            "company_hash": sha256(owner.encode("utf-8")).hexdigest(),
+        }
+        for company_id, company_name, owner in COMPANY_OWNERS
+    ]
+
+
+def _build_expenses(air_tickets: list[FixtureRow]) -> list[FixtureRow]:
+    tickets_by_id = {row["id"]: row for row in air_tickets}
+    rows: list[FixtureRow] = []
+    for expense_id in range(1, 501):
+        is_owner_expense = expense_id % 40 == 0
+        company_id = 1 if is_owner_expense else 1001 + (expense_id - 1) % 8
+        category = EXPENSE_CATEGORIES[(expense_id - 1) % len(EXPENSE_CATEGORIES)]
+        linked_ticket = tickets_by_id[1 + (expense_id - 1) % 200]
+        rows.append(
+            {
+                "id": expense_id,
+                "user_id": 6666 if is_owner_expense else 1 + (expense_id - 1) % 50,
+                "company_id": company_id,
+                "expense_date": (
+                    BASE_DATE + timedelta(days=(expense_id * 7) % 180)
+                ).isoformat(),
+                "category": category,
+                "description": f"Expense {category} #{expense_id}",
+                "amount": _amount(
+                    20 + (expense_id * 37) % 1500,
+                    (expense_id * 19) % 100,
+                ),
+                "status": EXPENSE_STATUSES[(expense_id - 1) % len(EXPENSE_STATUSES)],
+                "ticket": (
+                    linked_ticket["ticket"]
+                    if category == "Air Ticket"
+                    and linked_ticket["company_id"] == company_id
+                    else None
+                ),
+            }
+        )
+
+    rows.append(
+        {
+            "id": 999999,
+            "user_id": 6666,
+            "company_id": 1,
+            "expense_date": "2026-01-15",
+            "category": "Food",
+            "description": "Dinner with client",
+            "amount": 189.9,
+            "status": "APPROVED",
+            "ticket": None,
+        }
+    )
+    return rows
+
+
+def _amount(units: int, cents: int) -> float:
+    return round(units + cents / 100, 2)
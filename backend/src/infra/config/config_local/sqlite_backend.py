@@ -0,0 +1,146 @@
+import re
+import sqlite3
+from datetime import date
+from threading import Lock
+from typing import Any
+from typing import Dict
+
+from src.infra.query_backend import QueryBackend
+from src.infra.query_backend import QueryRows
+from src.infra.result_spill import collect_rows
+
+from .fixtures import FIXTURE_DATASET
+from .fixtures import FIXTURE_SCHEMAS
+from .fixtures import FixtureRow
+from .fixtures import build_fixture_rows
+
+
+SQLITE_COLUMN_TYPES = {
+    "INTEGER": "INTEGER",
+    "INT64": "INTEGER",
+    "NUMERIC": "REAL",
+    "FLOAT": "REAL",
+    "FLOAT64": "REAL",
+    "BOOLEAN": "INTEGER",
+}
+
+BACKTICK_IDENTIFIER_PATTERN = re.compile(r"`([^`]+)`")
+
+_shared_backend_lock = Lock()
+_shared_backends: dict[str, "SQLiteQueryBackend"] = {}
+
+
+def get_shared_sqlite_backend(project_id: str) -> "SQLiteQueryBackend":
+    """Return one fixture-loaded backend per project for the whole process."""
+    with _shared_backend_lock:
+        backend = _shared_backends.get(project_id)
+        if backend is None:
+            backend = SQLiteQueryBackend(project_id=project_id)
+            _shared_backends[project_id] = backend
+
+        return backend
+
+
+class SQLiteQueryBackend(QueryBackend):
+    """Serve the mocked test_ia tables from an in-memory SQLite database.
+
+    Backtick `project.dataset.table` names are rewritten to the attached
+    dataset schema and @user_email is bound natively by sqlite3. Only the
+    BigQuery SQL subset that SQLite shares is supported, which is enough for
+    deterministic offline benchmarks of the orchestrator.
+    """
+
+    source = "sqlite"
+
+    def __init__(
+        self,
+        project_id: str = "",
+        fixtures: dict[str, list[FixtureRow]] | None = None,
+    ) -> None:
+        self.project_id = project_id
+        self._lock = Lock()
+        self._connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.create_function("FORMAT_DATE", 2, _format_date)
+        self._connection.create_function("SAFE_DIVIDE", 2, _safe_divide)
+        self._connection.execute(
+            f"ATTACH DATABASE ':memory:' AS {FIXTURE_DATASET}"
+        )
+        self._load_fixtures(fixtures or build_fixture_rows())
+
+    def get_table_schema(self, table_id: str) -> Dict[str, str]:
+        table_name = self._split_table_id(table_id)
+        if table_name not in FIXTURE_SCHEMAS:
+            raise ValueError(f"Table {table_id} is not available in the local backend.")
+
+        return dict(FIXTURE_SCHEMAS[table_name])
+
+    def run_query(self, sql: str, user_email: str) -> QueryRows:
+        sqlite_sql = self.to_sqlite_sql(sql)
+        with self._lock:
+            cursor = self._connection.execute(sqlite_sql, {"user_email": user_email})
+            return collect_rows(dict(row) for row in cursor)
+
+    def to_sqlite_sql(self, sql: str) -> str:
+        """Translate BigQuery identifier quoting into SQLite-compatible SQL."""
+        translated_sql = BACKTICK_IDENTIFIER_PATTERN.sub(
+            lambda match: self._translate_identifier(match.group(1)),
+            sql,
+        )
+        if self.project_id:
+            translated_sql = re.sub(
+                rf"(?<![\w.-]){re.escape(self.project_id)}\.(?={FIXTURE_DATASET}\.)",
+                "",
+                translated_sql,
+            )
+        return translated_sql
+
+    def _translate_identifier(self, identifier: str) -> str:
+        parts = [part.strip('"') for part in identifier.split(".") if part]
+        if len(parts) >= 2 and parts[-2] == FIXTURE_DATASET:
+            return f"{FIXTURE_DATASET}.{parts[-1]}"
+
+        return ".".join(f'"{part}"' for part in parts)
+
+    def _split_table_id(self, table_id: str) -> str:
+        parts = str(table_id).strip("`").split(".")
+        if len(parts) < 2 or parts[-2] != FIXTURE_DATASET:
+            return ""
+
+        return parts[-1]
+
+    def _load_fixtures(self, fixtures: dict[str, list[FixtureRow]]) -> None:
+        with self._lock:
+            for table_name, schema in FIXTURE_SCHEMAS.items():
+                column_sql = ", ".join(
+                    f'"{column}" {SQLITE_COLUMN_TYPES.get(field_type, "TEXT")}'
+                    for column, field_type in schema.items()
+                )
+                self._connection.execute(
+                    f"CREATE TABLE {FIXTURE_DATASET}.{table_name} ({column_sql})"
+                )
+
+                columns = list(schema)
+                placeholders = ", ".join("?" for _ in columns)
+                self._connection.executemany(
+                    f"INSERT INTO {FIXTURE_DATASET}.{table_name} VALUES ({placeholders})",
+                    [
+                        tuple(row.get(column) for column in columns)
+                        for row in fixtures.get(table_name, [])
+                    ],
+                )
+            self._connection.commit()
+
+
+def _format_date(date_format: str, value: str | None) -> str | None:
+    if value is None:
+        return None
+
+    return date.fromisoformat(str(value)[:10]).strftime(date_format)
+
+
+def _safe_divide(numerator: float | None, denominator: float | None) -> float | None:
+    if numerator is None or not denominator:
+        return None
+
+    return numerator / denominator
@@ -30,6 +30,38 @@ class BackendSettings:
 
         return default
 
+    def _read_int(self, key: str, default: int) -> int:
+        """Return an integer environment value or raise a readable error."""
+        raw_value = self._read_first(key, default=str(default))
+        try:
+            return int(raw_value)
+        except ValueError as exp:
+            raise ValueError(f"{key} must be a valid integer.") from exp
+
+    def _read_bool(self, key: str, default: bool) -> bool:
+        """Return a boolean environment value, accepting common true/false spellings."""
+        raw_value = self._read_first(key).lower()
+        if not raw_value:
+            return default
+
+        if raw_value in {"1", "true", "yes", "on"}:
+            return True
+        if raw_value in {"0", "false", "no", "off"}:
+            return False
+
+        raise ValueError(f"{key} must be a valid boolean.")
+
+    def _resolve_backend_path(self, raw_value: str) -> str:
+        """Resolve a configured path relative to the backend folder."""
+        if not raw_value:
+            return ""
+
+        candidate_path = Path(raw_value)
+        if candidate_path.is_absolute():
+            return str(candidate_path)
+
+        return str((self.backend_root / candidate_path).resolve())
+
     @property
     def app_host(self) -> str:
         return self._read_first("APP_HOST", default="127.0.0.1")
@@ -54,6 +86,58 @@ class BackendSettings:
             "GEN_IA_KEY",
         )
 
+    @property
+    def chat_history_backend(self) -> str:
+        return self._read_first("CHAT_HISTORY_BACKEND", default="memory").lower()
+
+    @property
+    def chat_history_max_messages(self) -> int:
+        return max(self._read_int("CHAT_HISTORY_MAX_MESSAGES", 40), 2)
+
+    @property
+    def chat_history_max_sessions(self) -> int:
+        return max(self._read_int("CHAT_HISTORY_MAX_SESSIONS", 1000), 1)
+
+    @property
+    def chat_history_path(self) -> str:
+        raw_value = self._read_first("CHAT_HISTORY_PATH")
+        return self._resolve_backend_path(raw_value)
+
+    @property
+    def chat_history_ttl_seconds(self) -> int:
+        return self._read_int("CHAT_HISTORY_TTL_SECONDS", 7 * 24 * 60 * 60)
+
+    @property
+    def chat_store_path(self) -> str:
+        raw_value = self._read_first("CHAT_STORE_PATH")
+        return self._resolve_backend_path(raw_value)
+
+    @property
+    def gcp_http_pool_size(self) -> int:
+        return max(self._read_int("GCP_HTTP_POOL_SIZE", 40), 1)
+
+    @property
+    def graph_prerender_mode(self) -> str:
+        mode = self._read_first("GRAPH_PRERENDER", default="off").lower()
+        return mode if mode in {"off", "top", "all"} else "off"
+
+    @property
+    def graph_prerender_max_pending(self) -> int:
+        return max(self._read_int("GRAPH_PRERENDER_MAX_PENDING", 16), 1)
+
+    @property
+    def graph_prerender_workers(self) -> int:
+        return max(self._read_int("GRAPH_PRERENDER_WORKERS", 2), 1)
+
+    @property
+    def graph_prerender_wait_seconds(self) -> int:
+        return max(self._read_int("GRAPH_PRERENDER_WAIT_SECONDS", 10), 0)
+
+    @property
+    def graph_render_workers(self) -> int:
+        default_workers = min(os.cpu_count() or 1, 4)
+        return max(self._read_int("GRAPH_RENDER_WORKERS", default_workers), 0)
+
     @property
     def privileged_log_viewer_emails(self) -> set[str]:
         raw_value = self._read_first(
@@ -78,14 +162,97 @@ class BackendSettings:
     @property
     def project_sa_path(self) -> str:
         raw_value = self._read_first("PROJECT_SA")
-        if not raw_value:
-            return ""
+        return self._resolve_backend_path(raw_value)
 
-        candidate_path = Path(raw_value)
-        if candidate_path.is_absolute():
-            return str(candidate_path)
+    @property
+    def query_backend(self) -> str:
+        return self._read_first("QUERY_BACKEND", default="bigquery").lower()
 
-        return str((self.backend_root / candidate_path).resolve())
+    @property
+    def query_cache_ttl_seconds(self) -> int:
+        return self._read_int("QUERY_CACHE_TTL_SECONDS", 300)
+
+    @property
+    def query_cache_max_entries(self) -> int:
+        return self._read_int("QUERY_CACHE_MAX_ENTRIES", 256)
+
+    @property
+    def query_cache_max_bytes(self) -> int:
+        return self._read_int("QUERY_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+    @property
+    def query_cache_dir(self) -> str:
+        raw_value = self._read_first("QUERY_CACHE_DIR")
+        return self._resolve_backend_path(raw_value)
+
+    @property
+    def response_deterministic_enabled(self) -> bool:
+        return self._read_bool("RESPONSE_DETERMINISTIC_ENABLED", True)
+
+    @property
+    def response_deterministic_max_rows(self) -> int:
+        return max(self._read_int("RESPONSE_DETERMINISTIC_MAX_ROWS", 5), 0)
+
+    @property
+    def response_history_token_budget(self) -> int:
+        return self._read_int("RESPONSE_HISTORY_TOKEN_BUDGET", 1500)
+
+    @property
+    def response_history_turns(self) -> int:
+        return max(self._read_int("RESPONSE_HISTORY_TURNS", 3), 0)
+
+    @property
+    def response_prompt_token_budget(self) -> int:
+        return self._read_int("RESPONSE_PROMPT_TOKEN_BUDGET", 6000)
+
+    @property
+    def result_preview_rows(self) -> int:
+        return max(self._read_int("RESULT_PREVIEW_ROWS", 200), 1)
+
+    @property
+    def result_spill_threshold_bytes(self) -> int:
+        return self._read_int("RESULT_SPILL_THRESHOLD_BYTES", 32 * 1024 * 1024)
+
+    @property
+    def result_spill_dir(self) -> str:
+        raw_value = self._read_first("RESULT_SPILL_DIR")
+        return self._resolve_backend_path(raw_value)
+
+    @property
+    def storage_cache_dir(self) -> str:
+        raw_value = self._read_first("STORAGE_CACHE_DIR")
+        return self._resolve_backend_path(raw_value)
+
+    @property
+    def storage_cache_max_bytes(self) -> int:
+        return self._read_int("STORAGE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+    @property
+    def storage_data_format(self) -> str:
+        data_format = self._read_first("STORAGE_DATA_FORMAT", default="json").lower()
+        return data_format if data_format in {"json", "parquet"} else "json"
+
+    @property
+    def storage_emulator_host(self) -> str:
+        return self._read_first("STORAGE_EMULATOR_HOST").rstrip("/")
+
+    @property
+    def storage_json_compression(self) -> str:
+        compression = self._read_first("STORAGE_JSON_COMPRESSION", default="zstd").lower()
+        return compression if compression in {"none", "gzip", "zstd"} else "zstd"
+
+    @property
+    def storage_json_layout(self) -> str:
+        layout = self._read_first("STORAGE_JSON_LAYOUT", default="records").lower()
+        return layout if layout in {"records", "columns"} else "records"
+
+    @property
+    def storage_signed_url_ttl_seconds(self) -> int:
+        return max(self._read_int("STORAGE_SIGNED_URL_TTL_SECONDS", 300), 1)
+
+    @property
+    def storage_signed_urls(self) -> bool:
+        return self._read_bool("STORAGE_SIGNED_URLS", False)
 
     def storage_bucket(self, default_bucket: str) -> str:
         return self._read_first("STORAGE_BUCKET", default=default_bucket)
@@ -0,0 +1,71 @@
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import Sequence
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Dict
+
+
+# A list, or a file-backed SpilledResultSet for very large results.
+QueryRows = Sequence[dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class QueryJobStatistics:
+    """Hold the cost and timing figures recorded for one executed query."""
+
+    source: str
+    job_id: str = ""
+    elapsed_ms: int | None = None
+    bytes_processed: int | None = None
+    bytes_billed: int | None = None
+    slot_millis: int | None = None
+    cache_hit: bool | None = None
+    row_count: int = 0
+    labels: dict[str, str] = field(default_factory=dict)
+    stages: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def to_log_text(self) -> str:
+        return (
+            f"source={self.source} job_id={self.job_id or 'N/A'} "
+            f"elapsed_ms={self.elapsed_ms} bytes_processed={self.bytes_processed} "
+            f"bytes_billed={self.bytes_billed} slot_millis={self.slot_millis} "
+            f"cache_hit={self.cache_hit} rows={self.row_count} "
+            f"stages={len(self.stages)}"
+        )
+
+
+class QueryBackend(ABC):
+    """Execute scoped SQL and describe tables for the BigQuery manager."""
+
+    source = "backend"
+
+    @abstractmethod
+    def get_table_schema(self, table_id: str) -> Dict[str, str]:
+        """Return a map of column name -> BigQuery type."""
+
+    @abstractmethod
+    def run_query(self, sql: str, user_email: str) -> QueryRows:
+        """Run SQL with the @user_email named parameter bound."""
+
+    def run_query_with_statistics(
+        self,
+        sql: str,
+        user_email: str,
+        labels: dict[str, str] | None = None,
+    ) -> tuple[QueryRows, QueryJobStatistics]:
+        """Run SQL and return the rows with the statistics the backend can observe."""
+        started_at = time.perf_counter()
+        rows = self.run_query(sql, user_email=user_email)
+        return rows, QueryJobStatistics(
+            source=self.source,
+            elapsed_ms=int((time.perf_counter() - started_at) * 1000),
+            row_count=len(rows),
+            labels=dict(labels or {}),
+        )
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from typing import Callable
+
+from src.infra.bytes_cache import prune_disk_files
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - depends on installed extras
+    pa = None
+
+
+ResultRows = list[dict[str, Any]]
+
+DISK_ENTRY_SUFFIX = ".arrow"
+DISK_EXPIRES_AT_KEY = b"expires_at"
+
+SQL_LITERAL_PATTERN = re.compile(
+    r"('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)"
+)
+SQL_PUNCTUATION_SPACING_PATTERN = re.compile(r"\s*([(),=<>+*/-])\s*")
+
+
+def normalize_sql(sql: str) -> str:
+    """Lowercase and collapse whitespace outside quoted literals and identifiers."""
+    segments = SQL_LITERAL_PATTERN.split(str(sql or "").strip().rstrip(";"))
+    normalized_segments: list[str] = []
+    for index, segment in enumerate(segments):
+        if index % 2:
+            normalized_segments.append(segment)
+            continue
+
+        collapsed = re.sub(r"\s+", " ", segment.lower())
+        normalized_segments.append(
+            SQL_PUNCTUATION_SPACING_PATTERN.sub(r"\1", collapsed)
+        )
+
+    return "".join(normalized_segments).strip()
+
+
+def fingerprint_sql(sql: str, scope: str) -> str:
+    """Return a stable cache key for the normalized SQL within a tenant scope."""
+    digest = hashlib.sha256()
+    digest.update(normalize_sql(sql).encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(scope.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class QueryResultCache:
+    """Process-local LRU of query rows with TTL, byte bounds, and an optional disk tier.
+
+    Disk entries are Arrow IPC files, which keep Decimal and date values typed
+    without unpickling anything; the disk tier is off when pyarrow is missing.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Path | None = None,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir and pa is not None else None
+        self.disk_max_bytes = disk_max_bytes
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, int, ResultRows]] = OrderedDict()
+        self._total_bytes = 0
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: str) -> ResultRows | None:
+        """Return cached rows for the key, or None when missing or expired."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, size, rows = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return self._copy_rows(rows)
+
+                self._entries.pop(key)
+                self._total_bytes -= size
+
+        disk_entry = self._read_disk_entry(key)
+        if disk_entry is None:
+            return None
+
+        rows, remaining_seconds = disk_entry
+        self._store_memory_entry(
+            key,
+            rows,
+            self._estimate_size(rows, self.max_bytes),
+            ttl_seconds=remaining_seconds,
+        )
+        return self._copy_rows(rows)
+
+    def set(self, key: str, rows: ResultRows) -> None:
+        """Store rows for the key when they fit in the configured byte budget."""
+        if not isinstance(rows, list):
+            # Spilled result sets are file-backed and too large to cache.
+            return
+
+        size = self._estimate_size(rows, self.max_bytes)
+        if size > self.max_bytes:
+            return
+
+        stored_rows = self._copy_rows(rows)
+        self._store_memory_entry(key, stored_rows, size)
+        self._write_disk_entry(key, stored_rows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob(f"*{DISK_ENTRY_SUFFIX}"):
+                path.unlink(missing_ok=True)
+
+    def _store_memory_entry(
+        self,
+        key: str,
+        rows: ResultRows,
+        size: int,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        expires_at = self._clock() + (
+            self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        )
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self._total_bytes -= previous_entry[1]
+
+            self._entries[key] = (expires_at, size, rows)
+            self._total_bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or self._total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def _read_disk_entry(self, key: str) -> tuple[ResultRows, float] | None:
+        """Return the rows on disk and the seconds left before they expire."""
+        if self.disk_dir is None:
+            return None
+
+        path = self.disk_dir / f"{key}{DISK_ENTRY_SUFFIX}"
+        try:
+            with pa.memory_map(str(path), "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+                rows = table.to_pylist()
+            expires_at = float(table.schema.metadata[DISK_EXPIRES_AT_KEY])
+        except (OSError, KeyError, TypeError, ValueError, pa.ArrowException):
+            return None
+
+        remaining_seconds = expires_at - time.time()
+        if remaining_seconds <= 0:
+            path.unlink(missing_ok=True)
+            return None
+
+        return rows, remaining_seconds
+
+    def _write_disk_entry(self, key: str, rows: ResultRows) -> None:
+        if self.disk_dir is None:
+            return
+
+        path = self.disk_dir / f"{key}{DISK_ENTRY_SUFFIX}"
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            table = pa.Table.from_pylist(rows).replace_schema_metadata(
+                {DISK_EXPIRES_AT_KEY: str(time.time() + self.ttl_seconds)}
+            )
+            with pa.OSFile(str(temp_path), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            temp_path.replace(path)
+        except (OSError, TypeError, ValueError, pa.ArrowException):
+            # Rows Arrow cannot type consistently stay in the memory tier only.
+            temp_path.unlink(missing_ok=True)
+            return
+
+        prune_disk_files(self.disk_dir, f"*{DISK_ENTRY_SUFFIX}", self.disk_max_bytes)
+
+    def _estimate_size(self, rows: ResultRows, limit: int) -> int:
+        """Return the JSON size of the rows, stopping as soon as it passes ``limit``."""
+        size = 2
+        for row in rows:
+            size += len(json.dumps(row, default=str).encode("utf-8")) + 2
+            if size > limit:
+                break
+        return size
+
+    def _copy_rows(self, rows: ResultRows) -> ResultRows:
+        return [dict(row) for row in rows]
@@ -0,0 +1,225 @@
+import tempfile
+import weakref
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from decimal import Decimal
+from pathlib import Path
+from secrets import token_hex
+from typing import Any
+
+from src.infra.config import settings
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - depends on installed extras
+    pa = None
+
+
+ResultRow = dict[str, Any]
+
+DEFAULT_SPILL_BATCH_ROWS = 5000
+SPILL_FILE_SUFFIX = ".arrow"
+
+
+class SpilledResultSet(Sequence):
+    """Read-only row sequence backed by a memory-mapped Arrow IPC file.
+
+    Rows are materialized as dicts only for the slice or batch being read,
+    so callers can iterate, index, and preview results of any size while
+    the worker only keeps file-backed pages resident.
+    """
+
+    def __init__(self, path: Path, row_count: int, columns: list[str]) -> None:
+        self.path = Path(path)
+        self.row_count = row_count
+        self.columns = list(columns)
+        self._table = None
+        self._finalizer = weakref.finalize(self, _remove_file, self.path)
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def __iter__(self) -> Iterator[ResultRow]:
+        for batch in self.iter_batches():
+            yield from batch
+
+    def __getitem__(self, index: int | slice) -> ResultRow | list[ResultRow]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.row_count)
+            if step != 1:
+                return [self[position] for position in range(start, stop, step)]
+            return self._read_slice(start, stop)
+
+        position = index + self.row_count if index < 0 else index
+        if position < 0 or position >= self.row_count:
+            raise IndexError("SpilledResultSet index out of range.")
+        return self._read_slice(position, position + 1)[0]
+
+    def preview(self, limit: int) -> list[ResultRow]:
+        """Return the first rows as plain dicts."""
+        return self._read_slice(0, min(max(limit, 0), self.row_count))
+
+    def iter_batches(
+        self,
+        batch_rows: int = DEFAULT_SPILL_BATCH_ROWS,
+    ) -> Iterator[list[ResultRow]]:
+        """Yield consecutive row batches read from the mapped file."""
+        for start in range(0, self.row_count, batch_rows):
+            yield self._read_slice(start, min(start + batch_rows, self.row_count))
+
+    def to_arrow_table(self) -> Any:
+        """Return the mapped Arrow table without copying it into memory."""
+        return self._open_table()
+
+    def to_dataframe(self, columns: list[str] | None = None) -> Any:
+        """Return a pandas DataFrame built from the mapped Arrow columns."""
+        table = self._open_table()
+        if columns:
+            table = table.select([column for column in columns if column in self.columns])
+        return table.to_pandas()
+
+    def close(self) -> None:
+        """Release the mapping and delete the spill file."""
+        self._table = None
+        self._finalizer()
+
+    def _read_slice(self, start: int, stop: int) -> list[ResultRow]:
+        if stop <= start:
+            return []
+        return self._open_table().slice(start, stop - start).to_pylist()
+
+    def _open_table(self) -> Any:
+        if self._table is None:
+            source = pa.memory_map(str(self.path), "r")
+            self._table = pa.ipc.open_file(source).read_all()
+        return self._table
+
+
+class ResultSetCollector:
+    """Accumulate query rows in memory and spill them to disk past a byte threshold."""
+
+    def __init__(
+        self,
+        threshold_bytes: int,
+        spill_dir: Path,
+        batch_rows: int = DEFAULT_SPILL_BATCH_ROWS,
+    ) -> None:
+        self.threshold_bytes = threshold_bytes
+        self.spill_dir = Path(spill_dir)
+        self.batch_rows = batch_rows
+        self._rows: list[ResultRow] = []
+        self._estimated_bytes = 0
+        self._row_count = 0
+        self._path: Path | None = None
+        self._sink = None
+        self._writer = None
+        self._schema = None
+        self._stringified_columns: set[str] = set()
+
+    @property
+    def is_spilled(self) -> bool:
+        return self._writer is not None
+
+    def add(self, row: ResultRow) -> None:
+        self._rows.append(row)
+        self._row_count += 1
+
+        if self.is_spilled:
+            if len(self._rows) >= self.batch_rows:
+                self._write_buffer()
+            return
+
+        self._estimated_bytes += len(repr(row))
+        if (
+            pa is not None
+            and self.threshold_bytes > 0
+            and self._estimated_bytes > self.threshold_bytes
+        ):
+            self._open_writer()
+            self._write_buffer()
+
+    def finish(self) -> list[ResultRow] | SpilledResultSet:
+        """Return the in-memory rows or the spilled sequence once all rows were added."""
+        if not self.is_spilled:
+            return self._rows
+
+        if self._rows:
+            self._write_buffer()
+        self._writer.close()
+        self._sink.close()
+        return SpilledResultSet(
+            path=self._path,
+            row_count=self._row_count,
+            columns=list(self._schema.names),
+        )
+
+    def abort(self) -> None:
+        """Close and remove a partially written spill file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+        if self._path is not None:
+            _remove_file(self._path)
+
+    def _open_writer(self) -> None:
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._path = self.spill_dir / f"result-{token_hex(12)}{SPILL_FILE_SUFFIX}"
+        first_batch = pa.Table.from_pylist(
+            [self._normalize_row(row) for row in self._rows]
+        )
+        fields = []
+        for schema_field in first_batch.schema:
+            if pa.types.is_null(schema_field.type):
+                # All-null in the first batch: keep later values as text.
+                self._stringified_columns.add(schema_field.name)
+                schema_field = schema_field.with_type(pa.string())
+            fields.append(schema_field)
+        self._schema = pa.schema(fields)
+        self._sink = pa.OSFile(str(self._path), "wb")
+        self._writer = pa.ipc.new_file(self._sink, self._schema)
+
+    def _write_buffer(self) -> None:
+        batch = pa.Table.from_pylist(
+            [self._normalize_row(row) for row in self._rows],
+            schema=self._schema,
+        )
+        self._writer.write_table(batch)
+        self._rows = []
+
+    def _normalize_row(self, row: ResultRow) -> ResultRow:
+        normalized_row: ResultRow = {}
+        for key, value in row.items():
+            if isinstance(value, Decimal):
+                value = float(value)
+            elif key in self._stringified_columns and value is not None:
+                value = str(value)
+            normalized_row[str(key)] = value
+        return normalized_row
+
+
+def collect_rows(rows: Iterable[ResultRow]) -> list[ResultRow] | SpilledResultSet:
+    """Materialize query rows, spilling to disk when they exceed the memory threshold."""
+    collector = ResultSetCollector(
+        threshold_bytes=settings.result_spill_threshold_bytes,
+        spill_dir=Path(settings.result_spill_dir or tempfile.gettempdir()),
+    )
+    try:
+        for row in rows:
+            collector.add(row)
+    except BaseException:
+        collector.abort()
+        raise
+
+    return collector.finish()
+
+
+def preview_rows(rows: Sequence[ResultRow], limit: int) -> list[ResultRow]:
+    """Return the first rows of an in-memory list or a spilled result set."""
+    if isinstance(rows, SpilledResultSet):
+        return rows.preview(limit)
+    return list(rows[:limit])
+
+
+def _remove_file(path: Path) -> None:
+    Path(path).unlink(missing_ok=True)
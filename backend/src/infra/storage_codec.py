@@ -0,0 +1,442 @@
+import gzip
+import io
+import json
+import math
+import shutil
+import tempfile
+import zlib
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from datetime import time
+from typing import Any
+from typing import BinaryIO
+
+from src.infra.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on installed extras
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on installed extras
+    pa = None
+    pq = None
+
+PARQUET_AVAILABLE = pq is not None
+
+
+StoredRow = dict[str, Any]
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+LAYOUT_RECORDS = "records"
+LAYOUT_COLUMNS = "columns"
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+JSON_CONTENT_TYPE = "application/json"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+NDJSON_BATCH_ROWS = 500
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+PARQUET_ROW_GROUP_ROWS = 10_000
+PARQUET_COMPRESSION = "zstd"
+
+
+def dumps_json(value: Any) -> bytes:
+    """Return compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        value,
+        default=str,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def loads_json(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def iter_ndjson(
+    rows: Iterable[StoredRow],
+    batch_rows: int = NDJSON_BATCH_ROWS,
+) -> Iterator[bytes]:
+    """Yield rows as newline-delimited JSON, one batch of lines per chunk."""
+    batch: list[bytes] = []
+    for row in rows:
+        batch.append(dumps_json(row))
+        if len(batch) >= batch_rows:
+            yield b"\n".join(batch) + b"\n"
+            batch = []
+
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
+
+def detect_compression(body: bytes) -> str:
+    """Return the compression of a stored body from its frame magic bytes."""
+    if body.startswith(GZIP_MAGIC):
+        return COMPRESSION_GZIP
+    if body.startswith(ZSTD_MAGIC):
+        return COMPRESSION_ZSTD
+    return COMPRESSION_NONE
+
+
+def iter_decompressed(chunks: Iterable[bytes], compression: str) -> Iterator[bytes]:
+    """Decompress a stream of stored chunks one chunk at a time."""
+    if compression == COMPRESSION_NONE:
+        yield from chunks
+        return
+
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed data.")
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    for chunk in chunks:
+        body = decompressor.decompress(chunk)
+        if body:
+            yield body
+
+    body = decompressor.flush()
+    if body:
+        yield body
+
+
+def starts_record_list(first_chunk: bytes) -> bool:
+    """Return True when a stored body is a JSON list of rows, judged from its first chunk.
+
+    Record-layout payloads and legacy JSON lists already have the shape the
+    data endpoint returns, while column-layout payloads must be decoded.
+    """
+    compression = detect_compression(first_chunk)
+    if compression == COMPRESSION_ZSTD and zstandard is None:
+        return False
+
+    for body in iter_decompressed((first_chunk,), compression):
+        stripped_body = body.lstrip()
+        if stripped_body:
+            return stripped_body.startswith(b"[")
+    return False
+
+
+def decompress_body(body: bytes) -> bytes:
+    """Undo gzip or zstd compression detected from the frame magic bytes."""
+    if body.startswith(GZIP_MAGIC):
+        return gzip.decompress(body)
+    if body.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed data.")
+        # Streamed frames carry no content size, so decompress incrementally.
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return body
+
+
+def decode_rows(body: bytes) -> list[StoredRow] | None:
+    """Return the rows of a stored payload in any codec, or None when it holds no rows.
+
+    Plain pretty-printed JSON lists written before the codec existed are read
+    the same way as compressed record or column payloads.
+    """
+    payload = loads_json(decompress_body(body))
+    if isinstance(payload, dict) and payload.get("layout") == LAYOUT_COLUMNS:
+        return _rows_from_columns(payload)
+    if not isinstance(payload, list):
+        return None
+    return [item for item in payload if isinstance(item, dict)]
+
+
+@dataclass(frozen=True)
+class StorageCodec:
+    """Encode result rows as compact, compressed JSON for the storage bucket.
+
+    ``records`` writes a JSON list of row objects. ``columns`` writes every
+    column name once followed by its values, which compresses better for
+    wide or long results. Either layout can be gzip or zstd compressed.
+    """
+
+    compression: str = COMPRESSION_ZSTD
+    layout: str = LAYOUT_RECORDS
+
+    @property
+    def content_encoding(self) -> str | None:
+        return None if self.compression == COMPRESSION_NONE else self.compression
+
+    def encode_bytes(
+        self,
+        rows: Iterable[StoredRow],
+        columns: Sequence[str] | None = None,
+    ) -> bytes:
+        buffer = io.BytesIO()
+        self.encode(rows, buffer, columns=columns)
+        return buffer.getvalue()
+
+    def encode(
+        self,
+        rows: Iterable[StoredRow],
+        handle: BinaryIO,
+        columns: Sequence[str] | None = None,
+    ) -> None:
+        """Stream the rows into a binary handle without building the whole document."""
+        with self._open_writer(handle) as writer:
+            if self.layout == LAYOUT_COLUMNS:
+                self._write_columns(writer, rows, columns)
+            else:
+                self._write_records(writer, rows)
+
+    @contextmanager
+    def _open_writer(self, handle: BinaryIO) -> Iterator[BinaryIO]:
+        if self.compression == COMPRESSION_ZSTD:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            with compressor.stream_writer(handle, closefd=False) as writer:
+                yield writer
+        elif self.compression == COMPRESSION_GZIP:
+            with gzip.GzipFile(
+                fileobj=handle,
+                mode="wb",
+                compresslevel=GZIP_LEVEL,
+                mtime=0,
+            ) as writer:
+                yield writer
+        else:
+            yield handle
+
+    def _write_records(self, writer: BinaryIO, rows: Iterable[StoredRow]) -> None:
+        writer.write(b"[")
+        for index, row in enumerate(rows):
+            if index:
+                writer.write(b",")
+            writer.write(dumps_json(row))
+        writer.write(b"]")
+
+    def _write_columns(
+        self,
+        writer: BinaryIO,
+        rows: Iterable[StoredRow],
+        columns: Sequence[str] | None,
+    ) -> None:
+        if isinstance(rows, list):
+            column_names = list(dict.fromkeys(columns or ()))
+            for row in rows:
+                column_names.extend(name for name in row if name not in column_names)
+            writer.write(
+                dumps_json(
+                    {
+                        "layout": LAYOUT_COLUMNS,
+                        "columns": column_names,
+                        "values": [
+                            [row.get(name) for row in rows] for name in column_names
+                        ],
+                        "row_count": len(rows),
+                    }
+                )
+            )
+            return
+
+        # Streamed rows are split into one temporary file per column, so only
+        # one row is held in memory while the column order is assembled.
+        column_files: dict[str, BinaryIO] = {}
+        row_count = 0
+        try:
+            for name in dict.fromkeys(columns or ()):
+                column_files[name] = tempfile.TemporaryFile()
+
+            for row in rows:
+                for name in row:
+                    if name not in column_files:
+                        column_file = tempfile.TemporaryFile()
+                        column_file.write(b",".join([b"null"] * row_count))
+                        column_files[name] = column_file
+
+                for name, column_file in column_files.items():
+                    if row_count:
+                        column_file.write(b",")
+                    column_file.write(dumps_json(row.get(name)))
+                row_count += 1
+
+            writer.write(b'{"layout":"columns","columns":')
+            writer.write(dumps_json(list(column_files)))
+            writer.write(b',"values":[')
+            for index, column_file in enumerate(column_files.values()):
+                if index:
+                    writer.write(b",")
+                writer.write(b"[")
+                column_file.seek(0)
+                shutil.copyfileobj(column_file, writer)
+                writer.write(b"]")
+            writer.write(b'],"row_count":')
+            writer.write(str(row_count).encode("ascii"))
+            writer.write(b"}")
+        finally:
+            for column_file in column_files.values():
+                column_file.close()
+
+
+def _rows_from_columns(payload: dict[str, Any]) -> list[StoredRow] | None:
+    column_names = payload.get("columns")
+    column_values = payload.get("values")
+    if not isinstance(column_names, list) or not isinstance(column_values, list):
+        return None
+
+    if not column_names:
+        return [{} for _ in range(int(payload.get("row_count") or 0))]
+
+    return [
+        dict(zip(column_names, row_values))
+        for row_values in zip(*column_values)
+    ]
+
+
+def project_rows(
+    rows: list[StoredRow],
+    *,
+    columns: Sequence[str] | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> list[StoredRow]:
+    """Return the requested row range with only the requested columns."""
+    stop = None if limit is None else max(offset, 0) + max(limit, 0)
+    rows = rows[max(offset, 0):stop]
+    if columns is None:
+        return rows
+    return [{name: row[name] for name in columns if name in row} for row in rows]
+
+
+def write_parquet_rows(rows: Iterable[StoredRow], destination: Any) -> int:
+    """Write the rows as a Parquet file with bounded row groups and return the row count.
+
+    Raises ``ValueError`` when a column mixes types Arrow cannot store together.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required to write Parquet data.")
+
+    table = _build_arrow_table(rows)
+    pq.write_table(
+        table,
+        destination,
+        row_group_size=PARQUET_ROW_GROUP_ROWS,
+        compression=PARQUET_COMPRESSION,
+    )
+    return table.num_rows
+
+
+def read_parquet_rows(
+    source: Any,
+    *,
+    columns: Sequence[str] | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> list[StoredRow]:
+    """Read a row range of selected columns, touching only the row groups that hold it.
+
+    With a seekable remote ``source`` only the footer and the selected column
+    chunks are fetched.
+    """
+    if pq is None:
+        raise RuntimeError("pyarrow is required to read Parquet data.")
+
+    parquet_file = pq.ParquetFile(source)
+    metadata = parquet_file.metadata
+    start = min(max(offset, 0), metadata.num_rows)
+    stop = metadata.num_rows if limit is None else min(start + max(limit, 0), metadata.num_rows)
+    selected_columns = (
+        None
+        if columns is None
+        else [name for name in dict.fromkeys(columns) if name in parquet_file.schema_arrow.names]
+    )
+
+    row_groups = []
+    first_group_start = 0
+    group_start = 0
+    for index in range(metadata.num_row_groups):
+        group_rows = metadata.row_group(index).num_rows
+        if group_start < stop and group_start + group_rows > start:
+            if not row_groups:
+                first_group_start = group_start
+            row_groups.append(index)
+        group_start += group_rows
+    if not row_groups:
+        return []
+
+    table = parquet_file.read_row_groups(row_groups, columns=selected_columns)
+    return _table_to_rows(table.slice(start - first_group_start, stop - start))
+
+
+def _build_arrow_table(rows: Iterable[StoredRow]) -> Any:
+    to_arrow_table = getattr(rows, "to_arrow_table", None)
+    if to_arrow_table is not None:
+        return to_arrow_table()
+
+    rows = list(rows)
+    column_names: dict[str, None] = {}
+    for row in rows:
+        column_names.update(dict.fromkeys(row))
+    try:
+        return pa.table({name: [row.get(name) for row in rows] for name in column_names})
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as exp:
+        raise ValueError(f"Rows cannot be stored as Parquet: {exp}") from exp
+
+
+def _table_to_rows(table: Any) -> list[StoredRow]:
+    """Return JSON-ready rows, formatted the way the JSON codec writes them."""
+    if not table.column_names:
+        return [{} for _ in range(table.num_rows)]
+
+    column_values = []
+    for field, column in zip(table.schema, table.columns):
+        values = column.to_pylist()
+        if pa.types.is_floating(field.type):
+            values = [
+                None if value is not None and not math.isfinite(value) else value
+                for value in values
+            ]
+        elif not (
+            pa.types.is_integer(field.type)
+            or pa.types.is_boolean(field.type)
+            or pa.types.is_string(field.type)
+            or pa.types.is_large_string(field.type)
+            or pa.types.is_null(field.type)
+        ):
+            values = [_to_json_value(value) for value in values]
+        column_values.append(values)
+
+    return [dict(zip(table.column_names, row_values)) for row_values in zip(*column_values)]
+
+
+def _to_json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [_to_json_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_json_value(item) for key, item in value.items()}
+    return str(value)
+
+
+def build_storage_codec() -> StorageCodec:
+    """Return the codec configured for new uploads; zstd falls back to gzip if missing."""
+    compression = settings.storage_json_compression
+    if compression == COMPRESSION_ZSTD and zstandard is None:
+        compression = COMPRESSION_GZIP
+    return StorageCodec(compression=compression, layout=settings.storage_json_layout)
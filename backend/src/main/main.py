@@ -10,8 +10,14 @@ from src.agents import SecurityAgent
 from src.agents.graph_agent import GraphAgent
 from src.agents.security_agent.tool_kit import SecurityCategory
 from src.api.models import normalize_response_types
+from src.infra.column_profile import ColumnProfile
+from src.infra.column_profile import ColumnProfiler
+from src.infra.config import settings
 from src.infra.config.config_google.bigquery_maganger import BigQueryManager
+from src.infra.query_backend import QueryJobStatistics
 from src.infra.logging_utils import LoggedComponent
+from src.infra.result_spill import SpilledResultSet
+from src.infra.result_spill import preview_rows
 
 
 class QuestionContext(str, Enum):
@@ -84,27 +90,38 @@ class QueryResultValidator:
         "registros",
     )
 
+    def __init__(self, column_profiler: Optional[ColumnProfiler] = None) -> None:
+        self._column_profiler = column_profiler or ColumnProfiler()
+
     def validate(
         self,
         question_text: str,
         response_data: list[dict],
+        column_profile: Optional[ColumnProfile] = None,
     ) -> Optional[str]:
-        """Return a retry reason when the result shape is not useful enough."""
+        """Return a retry reason when the result shape is not useful enough.
+
+        ``column_profile`` is computed from the rows when it is not given.
+        """
         if not response_data:
             return None
 
-        if not all(isinstance(row, dict) for row in response_data):
+        # Spilled rows are dicts by construction; avoid materializing them.
+        if not isinstance(response_data, SpilledResultSet) and not all(
+            isinstance(row, dict) for row in response_data
+        ):
             return "Query returned rows in an unexpected format."
 
-        typed_rows = [row for row in response_data if isinstance(row, dict)]
+        if column_profile is None:
+            column_profile = self._column_profiler.profile(response_data)
 
-        if self._contains_only_scope_column(typed_rows):
+        if self._contains_only_scope_column(column_profile):
             return (
                 "Query returned only company_id without any analytical metric "
                 "or dimension."
             )
 
-        if self._is_too_granular(question_text, typed_rows):
+        if self._is_too_granular(question_text, column_profile.row_count):
             return (
                 "Query returned data at an inappropriate granularity for the "
                 "question."
@@ -112,25 +129,20 @@ class QueryResultValidator:
 
         return None
 
-    def _contains_only_scope_column(self, rows: list[dict[str, Any]]) -> bool:
-        """Return True when every row only contains the access-scope column."""
-        for row in rows:
-            if any(
-                key != self._ACCESS_SCOPE_COLUMN and self._has_meaningful_value(value)
-                for key, value in row.items()
-            ):
-                return False
-
-        return True
+    def _contains_only_scope_column(self, column_profile: ColumnProfile) -> bool:
+        """Return True when only the access-scope column carries values."""
+        return all(
+            column == self._ACCESS_SCOPE_COLUMN
+            for column in column_profile.populated_columns
+        )
 
     def _is_too_granular(
         self,
         question_text: str,
-        rows: list[dict[str, Any]],
+        row_count: int,
     ) -> bool:
         """Use question hints to reject result sets that are too detailed."""
         normalized_question = f" {question_text.strip().lower()} "
-        row_count = len(rows)
 
         if self._contains_hint(normalized_question, self._DETAIL_HINTS):
             return False
@@ -152,16 +164,6 @@ class QueryResultValidator:
         """Return True when one of the hint fragments exists in the question."""
         return any(hint in normalized_question for hint in hints)
 
-    def _has_meaningful_value(self, value: Any) -> bool:
-        """Return True for values that carry information beyond empty placeholders."""
-        if value is None:
-            return False
-
-        if isinstance(value, str):
-            return bool(value.strip())
-
-        return True
-
 
 class OrchestrateAgent(LoggedComponent):
     """Manages the multi-agent workflow from safety checks to response generation."""
@@ -179,7 +181,8 @@ class OrchestrateAgent(LoggedComponent):
         self.responder = ResponseAgent()
         self.graph_agent = GraphAgent()
         self.db = BigQueryManager()
-        self.result_validator = QueryResultValidator()
+        self.column_profiler = ColumnProfiler()
+        self.result_validator = QueryResultValidator(self.column_profiler)
         self.project_id = self.db.project_id
 
     def _available_contexts(self) -> Set[str]:
@@ -360,12 +363,15 @@ class OrchestrateAgent(LoggedComponent):
                 "context": context_key,
             }
 
-        response_sql, response_data = self._generate_and_execute_query(
+        query_statistics: list[dict[str, Any]] = []
+        response_sql, response_data, column_profile = self._generate_and_execute_query(
             tables_and_schemas=tables_and_schemas,
             question_text=question_text,
             user_email=user_email,
             chat_id=chat_id,
             question_id=question_id,
+            context_key=context_key,
+            query_statistics=query_statistics,
         )
 
         enabled_types = self._enabled_response_types(response_types)
@@ -377,11 +383,15 @@ class OrchestrateAgent(LoggedComponent):
                 user_email=user_email,
                 chat_id=chat_id,
                 question_id=question_id,
+                column_profile=column_profile,
             )
 
         graph_suggestions: list[dict[str, str]] = []
         if ResponseType.GRAPH in enabled_types:
-            graph_suggestions = self.graph_agent.suggest_graphs(response_data)
+            graph_suggestions = self.graph_agent.suggest_graphs(
+                response_data,
+                column_profile=column_profile,
+            )
 
         self.log_info(
             "Pipeline execution finished successfully.",
@@ -389,19 +399,33 @@ class OrchestrateAgent(LoggedComponent):
             chat_id=chat_id,
             question_id=question_id,
         )
-        return {
+        is_spilled = isinstance(response_data, SpilledResultSet)
+        response_preview = (
+            preview_rows(response_data, settings.result_preview_rows)
+            if is_spilled
+            else response_data
+        )
+        result: Dict[str, Any] = {
             "status": "success",
             "context": context_key,
             "response_types": response_types,
             "response_sql": (
                 response_sql if ResponseType.SQL in enabled_types else ""
             ),
-            "response_data": response_data,
+            "response_data": response_preview,
+            "response_row_count": len(response_data),
+            "response_data_truncated": is_spilled,
             "response_natural_language": response_natural_language,
             "graph_suggestions": graph_suggestions,
             "graph_path": "",
             "selected_graph_pattern": "",
+            "column_profile": column_profile,
+            "debug": {"query_statistics": query_statistics},
         }
+        if is_spilled:
+            # The route streams the full spilled rows to storage and closes them.
+            result["response_data_spill"] = response_data
+        return result
 
     def _generate_and_execute_query(
         self,
@@ -410,10 +434,17 @@ class OrchestrateAgent(LoggedComponent):
         user_email: str,
         chat_id: str,
         question_id: str,
-    ) -> tuple[str, list[dict]]:
-        """Generate SQL, retry execution, and regenerate SQL with DB errors when needed."""
+        context_key: Optional[str] = None,
+        query_statistics: Optional[list[dict[str, Any]]] = None,
+    ) -> tuple[str, list[dict], ColumnProfile]:
+        """Generate SQL, retry execution, and regenerate SQL with DB errors when needed.
+
+        The column profile of the accepted rows is returned with them so later
+        stages reuse it instead of inferring column types again.
+        """
         retry_reason: Optional[str] = None
         previous_sql: Optional[str] = None
+        execution_count = 0
 
         for generation_attempt in range(1, self._MAX_QUERY_REGENERATION_ATTEMPTS + 1):
             response_sql = self.query_specialist.generate_sql(
@@ -427,14 +458,18 @@ class OrchestrateAgent(LoggedComponent):
             )
 
             for execution_attempt in range(1, self._MAX_QUERY_EXECUTION_RETRIES + 1):
+                execution_count += 1
                 try:
                     response_data = self.db.execute_query(
                         response_sql=response_sql,
                         user_email=user_email,
                         chat_id=chat_id,
                         question_id=question_id,
+                        context=context_key,
+                        attempt=execution_count,
                     )
                 except Exception as exp:
+                    self._record_query_statistics(query_statistics)
                     retry_reason = f"Database execution error: {exp}"
                     previous_sql = response_sql
                     self.log_warning(
@@ -448,13 +483,16 @@ class OrchestrateAgent(LoggedComponent):
                     )
                     continue
 
+                self._record_query_statistics(query_statistics)
+                column_profile = self.column_profiler.profile(response_data)
                 validation_issue = self.result_validator.validate(
                     question_text=question_text,
                     response_data=response_data,
+                    column_profile=column_profile,
                 )
 
                 if validation_issue is None:
-                    return response_sql, response_data
+                    return response_sql, response_data, column_profile
 
                 retry_reason = validation_issue
                 previous_sql = response_sql
@@ -480,6 +518,18 @@ class OrchestrateAgent(LoggedComponent):
             f"attempts. Last issue: {retry_reason or 'Unknown query processing error.'}"
         )
 
+    def _record_query_statistics(
+        self,
+        query_statistics: Optional[list[dict[str, Any]]],
+    ) -> None:
+        """Append the statistics of the last executed query when they are available."""
+        if query_statistics is None:
+            return
+
+        statistics = getattr(self.db, "last_query_statistics", None)
+        if isinstance(statistics, QueryJobStatistics):
+            query_statistics.append(statistics.to_dict())
+
     def run_agent(
         self,
         input_question: str,
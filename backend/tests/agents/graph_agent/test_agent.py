@@ -1,7 +1,11 @@
 import unittest
 from unittest.mock import Mock
+from unittest.mock import patch
 
 from src.agents.graph_agent.agent import GraphAgent
+from src.agents.graph_agent.render_cache import build_render_key
+from src.agents.graph_agent.renderer import GraphRenderPool
+from src.infra.column_profile import ColumnProfile
 
 
 class GraphAgentTests(unittest.TestCase):
@@ -23,6 +27,26 @@ class GraphAgentTests(unittest.TestCase):
         self.assertEqual(suggestions[0]["x_field"], "month")
         self.assertEqual(suggestions[0]["y_field"], "total")
 
+    def test_suggests_graphs_from_a_stored_profile_without_rows(self) -> None:
+        """It derives suggestions from the column profile alone."""
+        agent = GraphAgent()
+        column_profile = ColumnProfile(
+            row_count=12,
+            columns=("category", "total"),
+            numeric_columns=("total",),
+            categorical_columns=("category",),
+            populated_columns=("category", "total"),
+        )
+
+        with patch.object(agent._column_profiler, "build_frame") as build_frame:
+            suggestions = agent.suggest_graphs([], column_profile=column_profile)
+
+        build_frame.assert_not_called()
+        self.assertEqual(
+            [suggestion["id"] for suggestion in suggestions],
+            ["bar_vertical", "bar_horizontal", "histogram"],
+        )
+
     def test_rejects_unknown_pattern_id(self) -> None:
         """It returns None when the requested pattern is not available for the data."""
         agent = GraphAgent()
@@ -38,7 +62,7 @@ class GraphAgentTests(unittest.TestCase):
         """It renders the selected graph and returns the public storage path."""
         storage_manager = Mock()
         storage_manager.save_graph_image.return_value = "/v1/storage/graph/chat-1/question-1"
-        agent = GraphAgent(storage_manager)
+        agent = GraphAgent(storage_manager, render_pool=GraphRenderPool(max_workers=0))
         graph_pattern = {
             "id": "bar_vertical",
             "label": "Bar",
@@ -64,3 +88,113 @@ class GraphAgentTests(unittest.TestCase):
             "/v1/storage/graph/chat-1/question-1",
         )
         storage_manager.save_graph_image.assert_called_once()
+        image_bytes = storage_manager.save_graph_image.call_args.kwargs["image_bytes"]
+        self.assertTrue(image_bytes.startswith(b"\x89PNG"))
+
+    def test_sends_only_the_plotted_columns_to_the_render_pool(self) -> None:
+        """It builds a columnar payload with the graph fields and nothing else."""
+        render_pool = Mock()
+        render_pool.render.return_value.image_bytes = b"png"
+        render_pool.render.return_value.timings = {
+            "queue_ms": 0.0,
+            "plot_ms": 1.0,
+            "encode_ms": 1.0,
+            "total_ms": 2.0,
+        }
+        agent = GraphAgent(Mock(), render_pool=render_pool)
+
+        agent.render_graph(
+            response_data=[
+                {"category": "Hotel", "total": 10, "note": "a"},
+                {"category": "Food", "total": 20, "note": "b"},
+            ],
+            graph_pattern={
+                "id": "bar_vertical",
+                "x_field": "category",
+                "y_field": "total",
+                "hue_field": "",
+            },
+            user_email="user@example.com",
+            chat_id="chat-1",
+            question_id="question-1",
+        )
+
+        payload = render_pool.render.call_args.args[0]
+        self.assertEqual(payload.graph_id, "bar_vertical")
+        self.assertEqual(list(payload.columns), ["category", "total"])
+        self.assertEqual(payload.columns["total"].tolist(), [10, 20])
+
+    def test_saves_versioned_renders_under_their_render_key(self) -> None:
+        """It stores the image in the bucket by content address."""
+        storage_manager = Mock()
+        agent = GraphAgent(
+            storage_manager,
+            render_pool=GraphRenderPool(max_workers=0),
+        )
+        graph_pattern = {
+            "id": "histogram",
+            "x_field": "total",
+            "y_field": "",
+            "hue_field": "",
+        }
+
+        agent.render_graph(
+            response_data=[{"total": 10}, {"total": 20}],
+            graph_pattern=graph_pattern,
+            user_email="user@example.com",
+            chat_id="chat-1",
+            question_id="question-1",
+            data_version="version-1",
+        )
+
+        save_kwargs = storage_manager.save_graph_render.call_args.kwargs
+        self.assertEqual(
+            save_kwargs["render_key"],
+            build_render_key("version-1", graph_pattern),
+        )
+        self.assertTrue(save_kwargs["image_bytes"].startswith(b"\x89PNG"))
+        storage_manager.save_graph_image.assert_not_called()
+
+    def test_finds_saved_renders_without_rendering(self) -> None:
+        """It returns the saved path when storage already holds the render."""
+        storage_manager = Mock()
+        storage_manager.build_graph_access_path.return_value = "/cached"
+        storage_manager.graph_render_exists.return_value = False
+        render_pool = Mock()
+        agent = GraphAgent(storage_manager, render_pool=render_pool)
+        graph_pattern = {"id": "line", "x_field": "month", "y_field": "total"}
+        lookup = {
+            "graph_pattern": graph_pattern,
+            "data_version": "version-1",
+            "user_email": "user@example.com",
+            "chat_id": "chat-1",
+            "question_id": "question-1",
+        }
+
+        self.assertIsNone(agent.find_rendered_graph(**lookup))
+
+        storage_manager.graph_render_exists.return_value = True
+        self.assertEqual(agent.find_rendered_graph(**lookup), "/cached")
+        self.assertEqual(
+            storage_manager.graph_render_exists.call_args.kwargs["render_key"],
+            build_render_key("version-1", graph_pattern),
+        )
+        render_pool.render.assert_not_called()
+
+    def test_loads_rendered_graphs_by_render_key(self) -> None:
+        """It reads renders from storage and rejects keys that are not render keys."""
+        storage_manager = Mock()
+        storage_manager.load_graph_render.return_value = b"png"
+        agent = GraphAgent(storage_manager)
+        lookup = {
+            "render_key": build_render_key("version-1", {"id": "line"}),
+            "user_email": "user@example.com",
+            "chat_id": "chat-1",
+            "question_id": "question-1",
+        }
+
+        self.assertEqual(agent.load_rendered_graph(**lookup), b"png")
+        storage_manager.load_graph_render.assert_called_once()
+        self.assertIsNone(
+            agent.load_rendered_graph(**{**lookup, "render_key": "../other"})
+        )
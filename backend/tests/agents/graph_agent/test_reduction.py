@@ -0,0 +1,125 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.agents.graph_agent import reduction
+from src.agents.graph_agent.reduction import GraphDataReducer
+from src.agents.graph_agent.reduction import largest_triangle_three_buckets
+from src.agents.graph_agent.renderer import render_graph_png
+
+
+class GraphDataReducerTests(unittest.TestCase):
+    """Tests for the reduction stage that runs before plotting."""
+
+    def setUp(self) -> None:
+        self.reducer = GraphDataReducer()
+
+    def test_pre_aggregates_bars_and_folds_small_categories(self) -> None:
+        """It draws one mean per category and groups the rest into an other bar."""
+        categories = [f"C{index:02d}" for index in range(reduction.MAX_CATEGORIES + 5)]
+        dataframe = pd.DataFrame(
+            {
+                "category": [category for category in categories for _ in range(2)],
+                "total": [
+                    float(index * 10 + offset)
+                    for index in range(len(categories))
+                    for offset in (0, 2)
+                ],
+            }
+        )
+
+        payload = self.reducer.reduce(
+            dataframe,
+            {"id": "bar_vertical", "x_field": "category", "y_field": "total"},
+        )
+
+        labels = payload.columns["category"].tolist()
+        values = dict(zip(labels, payload.columns["total"].tolist()))
+        self.assertEqual(len(labels), reduction.MAX_CATEGORIES)
+        self.assertEqual(values["C24"], 241.0)
+        self.assertEqual(values[reduction.OTHER_CATEGORY_LABEL], 26.0)
+
+    def test_downsamples_long_lines_and_keeps_the_peak(self) -> None:
+        """It averages repeated dates and keeps extremes when downsampling."""
+        point_count = reduction.MAX_LINE_POINTS * 5
+        totals = np.zeros(point_count)
+        totals[1234] = 100.0
+        dates = pd.date_range("2020-01-01", periods=point_count, freq="D")
+        dataframe = pd.DataFrame(
+            {
+                "day": np.concatenate([dates, dates]),
+                "total": np.concatenate([totals, totals]),
+            }
+        )
+
+        payload = self.reducer.reduce(
+            dataframe,
+            {"id": "line", "x_field": "day", "y_field": "total"},
+        )
+
+        self.assertEqual(len(payload.columns["day"]), reduction.MAX_LINE_POINTS)
+        self.assertIn(100.0, payload.columns["total"].tolist())
+        self.assertEqual(payload.columns["day"][0], dates[0].to_datetime64())
+        self.assertEqual(payload.columns["day"][-1], dates[-1].to_datetime64())
+
+    def test_pre_bins_histograms_with_numpy(self) -> None:
+        """It sends bin centers weighted by counts instead of raw values."""
+        values = np.random.default_rng(3).normal(size=50_000)
+
+        payload = self.reducer.reduce(
+            pd.DataFrame({"amount": values}),
+            {"id": "histogram", "x_field": "amount", "y_field": ""},
+        )
+
+        counts = payload.columns[payload.weight_field]
+        self.assertLessEqual(len(counts), reduction.MAX_HISTOGRAM_BINS)
+        self.assertEqual(int(counts.sum()), len(values))
+        self.assertEqual(len(payload.bins), len(counts) + 1)
+        self.assertTrue(render_graph_png(payload).image_bytes.startswith(b"\x89PNG"))
+
+    def test_samples_large_scatters_deterministically(self) -> None:
+        """It caps scatter points with a fixed seed so renders are repeatable."""
+        generator = np.random.default_rng(5)
+        dataframe = pd.DataFrame(
+            {
+                "amount": generator.normal(size=reduction.MAX_SCATTER_POINTS * 2),
+                "quantity": generator.normal(size=reduction.MAX_SCATTER_POINTS * 2),
+            }
+        )
+        graph_pattern = {"id": "scatter", "x_field": "amount", "y_field": "quantity"}
+
+        first_payload = self.reducer.reduce(dataframe, graph_pattern)
+        second_payload = self.reducer.reduce(dataframe, graph_pattern)
+
+        self.assertEqual(len(first_payload.columns["amount"]), reduction.MAX_SCATTER_POINTS)
+        np.testing.assert_array_equal(
+            first_payload.columns["amount"],
+            second_payload.columns["amount"],
+        )
+
+
+class LargestTriangleThreeBucketsTests(unittest.TestCase):
+    """Tests for LTTB downsampling."""
+
+    def test_keeps_endpoints_and_returns_sorted_indices(self) -> None:
+        """It returns exactly the threshold, starting and ending at the series ends."""
+        x_values = np.arange(100, dtype=float)
+        y_values = np.sin(x_values / 5)
+
+        selected = largest_triangle_three_buckets(x_values, y_values, 10)
+
+        self.assertEqual(len(selected), 10)
+        self.assertEqual(selected[0], 0)
+        self.assertEqual(selected[-1], 99)
+        self.assertTrue(np.all(np.diff(selected) > 0))
+
+    def test_returns_every_index_for_short_series(self) -> None:
+        """It leaves series at or under the threshold untouched."""
+        selected = largest_triangle_three_buckets(np.arange(5.0), np.arange(5.0), 10)
+
+        self.assertEqual(selected.tolist(), [0, 1, 2, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from src.agents.graph_agent.render_cache import build_render_key
+
+
+class BuildRenderKeyTests(unittest.TestCase):
+    """Tests for render content addresses."""
+
+    def test_changes_with_data_pattern_and_format(self) -> None:
+        """It gives one key per data version, plotted fields and output format."""
+        graph_pattern = {"id": "line", "x_field": "month", "y_field": "total"}
+        render_key = build_render_key("version-1", graph_pattern)
+
+        self.assertEqual(
+            render_key,
+            build_render_key("version-1", {**graph_pattern, "label": "Line"}),
+        )
+        self.assertNotEqual(render_key, build_render_key("version-2", graph_pattern))
+        self.assertNotEqual(
+            render_key,
+            build_render_key("version-1", {**graph_pattern, "id": "bar_vertical"}),
+        )
+        self.assertNotEqual(
+            render_key,
+            build_render_key("version-1", graph_pattern, image_format="svg"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch
+
+import matplotlib
+import numpy as np
+
+from src.agents.graph_agent.renderer import GraphRenderPayload
+from src.agents.graph_agent.renderer import GraphRenderPool
+from src.agents.graph_agent.renderer import initialize_render_worker
+from src.agents.graph_agent.renderer import render_graph_png
+
+
+class GraphRendererTests(unittest.TestCase):
+    """Tests for the Figure-based renderer and its worker pool."""
+
+    def test_renders_png_bytes_with_stage_timings(self) -> None:
+        """It returns the encoded image and the time spent in each stage."""
+        result = render_graph_png(
+            GraphRenderPayload(
+                graph_id="line",
+                x_field="month",
+                y_field="total",
+                columns={
+                    "month": np.array(["2026-02", "2026-01"], dtype=object),
+                    "total": np.array([20, 10]),
+                },
+            )
+        )
+
+        self.assertTrue(result.image_bytes.startswith(b"\x89PNG"))
+        self.assertEqual(
+            set(result.timings),
+            {"queue_ms", "plot_ms", "encode_ms", "total_ms"},
+        )
+
+    def test_rejects_unsupported_graph_ids(self) -> None:
+        """It raises before drawing anything for an unknown graph id."""
+        with self.assertRaises(ValueError):
+            render_graph_png(GraphRenderPayload(graph_id="pie", x_field="category"))
+
+    def test_renders_on_a_worker_process(self) -> None:
+        """It renders through a spawned worker and restarts cleanly after shutdown."""
+        render_pool = GraphRenderPool(max_workers=1)
+        payload = GraphRenderPayload(
+            graph_id="histogram",
+            x_field="total",
+            columns={"total": np.array([1.0, 2.0, 2.0, 3.0])},
+        )
+
+        try:
+            render_pool.warm_up()
+            first_result = render_pool.render(payload)
+            render_pool.shutdown()
+            second_result = render_pool.render(payload)
+        finally:
+            render_pool.shutdown()
+
+        self.assertTrue(first_result.image_bytes.startswith(b"\x89PNG"))
+        self.assertTrue(second_result.image_bytes.startswith(b"\x89PNG"))
+
+    def test_inline_renders_apply_the_theme_once(self) -> None:
+        """It loads the worker theme in-process before the first inline render."""
+        render_pool = GraphRenderPool(max_workers=0)
+        payload = GraphRenderPayload(
+            graph_id="bar_vertical",
+            x_field="category",
+            y_field="total",
+            columns={
+                "category": np.array(["Food", "Hotel"], dtype=object),
+                "total": np.array([10, 20]),
+            },
+        )
+
+        with patch(
+            "src.agents.graph_agent.renderer.initialize_render_worker",
+            wraps=initialize_render_worker,
+        ) as initializer:
+            first_result = render_pool.render(payload)
+            second_result = render_pool.render(payload)
+
+        initializer.assert_called_once_with()
+        self.assertTrue(matplotlib.rcParams["axes.grid"])
+        self.assertTrue(first_result.image_bytes.startswith(b"\x89PNG"))
+        self.assertTrue(second_result.image_bytes.startswith(b"\x89PNG"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.agents.graph_agent.reduction import GraphDataReducer
+from src.agents.graph_agent.renderer import GraphRenderPayload
+from src.agents.graph_agent.spec import GraphSpecBuilder
+
+
+class GraphSpecBuilderTests(unittest.TestCase):
+    """Tests for browser-drawn graph specs."""
+
+    def setUp(self) -> None:
+        self.builder = GraphSpecBuilder()
+
+    def test_describes_a_time_series_with_inline_values(self) -> None:
+        """It marks dates as temporal and serializes them as ISO strings."""
+        spec = self.builder.build(
+            GraphRenderPayload(
+                graph_id="line",
+                x_field="month",
+                y_field="total",
+                columns={
+                    "month": pd.to_datetime(["2026-01-01", "2026-02-01"]).to_numpy(),
+                    "total": np.array([10.0, np.nan]),
+                },
+            ),
+            label="Line",
+        )
+
+        self.assertEqual(spec["mark"]["type"], "line")
+        self.assertEqual(spec["description"], "Line")
+        self.assertEqual(spec["encoding"]["x"]["type"], "temporal")
+        self.assertEqual(spec["encoding"]["y"]["type"], "quantitative")
+        self.assertEqual(
+            spec["data"]["values"],
+            [
+                {"month": "2026-01-01T00:00:00", "total": 10.0},
+                {"month": "2026-02-01T00:00:00", "total": None},
+            ],
+        )
+
+    def test_swaps_axes_for_horizontal_bars_and_keeps_data_order(self) -> None:
+        """It puts categories on the y axis without re-sorting them."""
+        spec = self.builder.build(
+            GraphRenderPayload(
+                graph_id="bar_horizontal",
+                x_field="category",
+                y_field="total",
+                columns={
+                    "category": np.array(["Hotel", "Outros"], dtype=object),
+                    "total": np.array([3, 1]),
+                },
+            )
+        )
+
+        self.assertEqual(spec["encoding"]["y"]["field"], "category")
+        self.assertIsNone(spec["encoding"]["y"]["sort"])
+        self.assertEqual(spec["encoding"]["x"]["field"], "total")
+
+    def test_uses_pre_binned_histograms(self) -> None:
+        """It sends bin edges and counts instead of the raw values."""
+        payload = GraphDataReducer().reduce(
+            pd.DataFrame({"amount": np.arange(1000, dtype=float)}),
+            {"id": "histogram", "x_field": "amount", "y_field": ""},
+        )
+
+        spec = self.builder.build(payload)
+
+        values = spec["data"]["values"]
+        self.assertEqual(spec["encoding"]["x"]["bin"], {"binned": True})
+        self.assertEqual(spec["encoding"]["x2"]["field"], "bin_end")
+        self.assertEqual(sum(value["count"] for value in values), 1000)
+        self.assertEqual(values[0]["bin_start"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
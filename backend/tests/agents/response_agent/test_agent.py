@@ -1,4 +1,5 @@
 import unittest
+from decimal import Decimal
 from unittest.mock import Mock
 from unittest.mock import patch
 
@@ -39,7 +40,7 @@ class ResponseAgentGenerateNaturalLanguageTests(unittest.TestCase):
         """It uses chat history and returns the LLM response when data exists."""
         agent = self._build_agent()
         history = Mock()
-        history.messages = []
+        history.message_window.return_value = (0, [])
         agent._chain.invoke.return_value = (
             "The report highlights the average, mode, outlier, and trend clearly."
         )
@@ -63,7 +64,7 @@ class ResponseAgentGenerateNaturalLanguageTests(unittest.TestCase):
         agent._chain.invoke.assert_called_once()
         payload = agent._chain.invoke.call_args.args[0]
         self.assertEqual(payload["response_data"], '[{"company_id": 1}]')
-        self.assertEqual(payload["history"], history.messages)
+        self.assertEqual(payload["history"], [])
         self.assertEqual(payload["question_text"], "Show my flights")
         self.assertIn("Destaques analiticos", payload["analysis_summary"])
         history.add_user_message.assert_called_once_with("Show my flights")
@@ -76,13 +77,17 @@ class ResponseAgentGenerateNaturalLanguageTests(unittest.TestCase):
         """It converts a dump-like LLM output into a readable paragraph report."""
         agent = self._build_agent()
         history = Mock()
-        history.messages = []
+        history.message_window.return_value = (0, [])
         agent._chain.invoke.return_value = '[{"ticket": "AZ123", "price": 540}]'
+        llm_only_settings = Mock(
+            response_deterministic_enabled=False,
+            response_prompt_token_budget=6000,
+        )
 
         with patch(
             "src.agents.response_agent.agent.get_session_history",
             return_value=history,
-        ):
+        ), patch("src.agents.response_agent.agent.settings", llm_only_settings):
             response = agent.generate_natural_language(
                 question_text="Show my flights",
                 response_data=[{"ticket": "AZ123", "price": 540}],
@@ -104,7 +109,7 @@ class ResponseAgentGenerateNaturalLanguageTests(unittest.TestCase):
         """It appends computed insights when the model omits analytical details."""
         agent = self._build_agent()
         history = Mock()
-        history.messages = []
+        history.message_window.return_value = (0, [])
         agent._chain.invoke.return_value = "Resumo objetivo da consulta."
 
         with patch(
@@ -130,3 +135,76 @@ class ResponseAgentGenerateNaturalLanguageTests(unittest.TestCase):
         self.assertIn("moda", response)
         self.assertIn("outlier", response)
         self.assertIn("tendencia", response)
+
+    def test_answers_scalar_results_without_the_llm(self) -> None:
+        """It returns localized templated prose for a single-metric row."""
+        agent = self._build_agent()
+        history = Mock()
+
+        with patch(
+            "src.agents.response_agent.agent.get_session_history",
+            return_value=history,
+        ):
+            response = agent.generate_natural_language(
+                question_text="How much did I spend?",
+                response_data=[{"company_id": 1, "total_spent": 12345.678}],
+                user_email="user@example.com",
+                chat_id="chat-1",
+                question_id="question-1",
+            )
+
+        self.assertEqual(
+            response,
+            "O resultado da consulta para total spent e 12.345,68.",
+        )
+        agent._chain.invoke.assert_not_called()
+        history.add_ai_message.assert_called_once_with(response)
+
+    def test_localizes_decimal_metrics_in_templated_answers(self) -> None:
+        """It formats NUMERIC values from the database like any other number."""
+        agent = self._build_agent()
+
+        with patch(
+            "src.agents.response_agent.agent.get_session_history",
+            return_value=Mock(),
+        ):
+            response = agent.generate_natural_language(
+                question_text="How much did I spend?",
+                response_data=[{"company_id": 1, "total_spent": Decimal("12345.678")}],
+                user_email="user@example.com",
+                chat_id="chat-1",
+                question_id="question-1",
+            )
+
+        self.assertEqual(
+            response,
+            "O resultado da consulta para total spent e 12.345,68.",
+        )
+
+    def test_answers_small_category_results_without_the_llm(self) -> None:
+        """It ranks small category breakdowns and reports the total."""
+        agent = self._build_agent()
+
+        with patch(
+            "src.agents.response_agent.agent.get_session_history",
+            return_value=Mock(),
+        ):
+            response = agent.generate_natural_language(
+                question_text="How much per category?",
+                response_data=[
+                    {"company_id": 1, "category": "Hotel", "amount": 1500},
+                    {"company_id": 1, "category": "Food", "amount": 250.5},
+                    {"company_id": 1, "category": "Taxi", "amount": 80},
+                ],
+                user_email="user@example.com",
+                chat_id="chat-1",
+                question_id="question-1",
+            )
+
+        self.assertEqual(
+            response,
+            "Amount por category: Hotel: 1.500; Food: 250,50; Taxi: 80. "
+            "O maior valor e de Hotel (1.500) e o menor de Taxi (80), "
+            "somando 1.830,50 no total.",
+        )
+        agent._chain.invoke.assert_not_called()
@@ -0,0 +1,125 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from src.agents.response_agent.analysis import AnalyticalSummaryBuilder
+from src.infra.column_profile import ColumnProfile
+
+
+class AnalyticalSummaryBuilderTests(unittest.TestCase):
+    """Tests for the vectorized analytical summary."""
+
+    def setUp(self) -> None:
+        self.builder = AnalyticalSummaryBuilder()
+
+    def test_summarizes_every_numeric_column(self) -> None:
+        """It reports the primary metric in detail and the others briefly."""
+        rows = [
+            {"category": "Hotel", "amount": 10, "quantity": 1},
+            {"category": "Hotel", "amount": 20, "quantity": 3},
+            {"category": "Food", "amount": 30, "quantity": 5},
+        ]
+
+        summary = self.builder.build_summary(rows)
+
+        self.assertIn("Na metrica amount, a media e 20, a mediana e 20", summary)
+        self.assertIn("quantity com media 3, minimo 1 e maximo 5", summary)
+        self.assertIn("Na dimensao category, a moda e 'Hotel'", summary)
+
+    def test_detects_outliers_and_mode(self) -> None:
+        """It flags values outside the interquartile range."""
+        rows = [{"amount": value} for value in (10, 10, 11, 12, 13, 500)]
+
+        summary = self.builder.build_summary(rows)
+
+        self.assertIn("A moda numerica dessa metrica e 10.", summary)
+        self.assertIn("Foram identificados 1 outlier em amount; exemplos: 500.", summary)
+
+    def test_uses_the_date_column_for_the_trend(self) -> None:
+        """It compares the earliest and latest dates, not the row order."""
+        rows = [
+            {"expense_date": "2025-03-01", "amount": 40},
+            {"expense_date": "2025-01-01", "amount": 10},
+            {"expense_date": None, "amount": 99},
+            {"expense_date": "2025-02-01", "amount": 25},
+        ]
+
+        summary = self.builder.build_summary(rows)
+
+        self.assertIn(
+            "A tendencia de amount e de alta, saindo de 10 em 2025-01-01 para 40 em 2025-03-01.",
+            summary,
+        )
+
+    def test_keeps_booleans_and_missing_keys_out_of_metrics(self) -> None:
+        """It only treats plain numbers as numeric values."""
+        rows = [
+            {"flag": True, "region": "north"},
+            {"flag": False, "region": "south", "amount": 5},
+            {"flag": True, "region": "north", "amount": 7.5},
+        ]
+
+        numeric_columns, categorical_columns = self.builder.profile_columns(rows)
+
+        self.assertEqual(numeric_columns, {"amount": [5.0, 7.5]})
+        self.assertEqual(list(categorical_columns), ["flag", "region"])
+
+    def test_uses_the_given_column_profile(self) -> None:
+        """It takes column types from the supplied profile instead of the rows."""
+        rows = [
+            {"period": "P1", "amount": 30},
+            {"period": "P2", "amount": 10},
+        ]
+        column_profile = ColumnProfile(
+            row_count=2,
+            columns=("period", "amount"),
+            numeric_columns=("amount",),
+            categorical_columns=("period",),
+            populated_columns=("period", "amount"),
+        )
+
+        with patch.object(
+            self.builder._column_profiler,
+            "profile_frame",
+        ) as profile_frame, patch.object(
+            self.builder._column_profiler,
+            "profile_values",
+        ) as profile_values:
+            summary = self.builder.build_summary(rows, column_profile=column_profile)
+
+        profile_frame.assert_not_called()
+        profile_values.assert_not_called()
+        self.assertIn("Na metrica amount, a media e 20", summary)
+
+    def test_reports_the_full_row_count_for_previews(self) -> None:
+        """It uses the explicit row count when the rows are a preview."""
+        summary = self.builder.build_summary([{"amount": 1}], row_count=5000)
+
+        self.assertTrue(
+            summary.startswith("Destaques analiticos: a consulta retornou 5000 registros.")
+        )
+
+    def test_row_and_frame_paths_build_the_same_summary(self) -> None:
+        """It reads small results from the row dicts without changing the summary."""
+        rows = [
+            {
+                "expense_date": f"2025-01-{day:02d}" if day % 7 else None,
+                "category": ("Hotel", "Food", "Taxi")[day % 3],
+                "amount": Decimal(day * 3) if day % 2 else float(day),
+                "quantity": day % 4,
+                "is_refund": day % 5 == 0,
+            }
+            for day in range(1, 29)
+        ]
+        row_builder = AnalyticalSummaryBuilder(frame_min_rows=len(rows) + 1)
+        frame_builder = AnalyticalSummaryBuilder(frame_min_rows=0)
+
+        summary = row_builder.build_summary(rows)
+
+        self.assertEqual(summary, frame_builder.build_summary(rows))
+        self.assertEqual(row_builder.profile_columns(rows), frame_builder.profile_columns(rows))
+        self.assertIn("A tendencia de amount", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage
+from langchain_core.messages import HumanMessage
+from langchain_core.messages import SystemMessage
+
+from src.agents.response_agent.history import HistoryWindowPolicy
+from src.infra.chat_history import InMemoryChatHistoryBackend
+
+
+class HistoryWindowPolicyTests(unittest.TestCase):
+    """Tests for the windowed response history with a rolling summary."""
+
+    def _build_messages(self, turns: int) -> list:
+        messages = []
+        for index in range(turns):
+            messages.append(HumanMessage(f"question {index}"))
+            messages.append(AIMessage(f"answer {index}"))
+        return messages
+
+    def test_returns_short_chats_verbatim(self) -> None:
+        """It keeps every message when the chat fits the recent window."""
+        policy = HistoryWindowPolicy(max_recent_turns=3, token_budget=1000)
+        messages = self._build_messages(2)
+
+        self.assertEqual(policy.build_prompt_history("chat-1", messages), messages)
+
+    def test_folds_older_turns_into_a_rolling_summary(self) -> None:
+        """It keeps the last turns verbatim and summarizes the older ones."""
+        policy = HistoryWindowPolicy(max_recent_turns=2, token_budget=1000)
+
+        prompt_history = policy.build_prompt_history("chat-1", self._build_messages(5))
+
+        self.assertIsInstance(prompt_history[0], SystemMessage)
+        self.assertIn("- Usuario: question 0", prompt_history[0].content)
+        self.assertIn("- Assistente: answer 2", prompt_history[0].content)
+        self.assertEqual(
+            [message.content for message in prompt_history[1:]],
+            ["question 3", "answer 3", "question 4", "answer 4"],
+        )
+
+    def test_only_folds_new_messages_on_later_turns(self) -> None:
+        """It reuses the cached summary and summarizes just the newly aged turn."""
+        policy = HistoryWindowPolicy(max_recent_turns=1, token_budget=1000)
+        policy.build_prompt_history("chat-1", self._build_messages(3))
+
+        with patch.object(
+            policy,
+            "_summarize_message",
+            wraps=policy._summarize_message,
+        ) as summarize_message:
+            prompt_history = policy.build_prompt_history(
+                "chat-1",
+                self._build_messages(4),
+            )
+
+        self.assertEqual(summarize_message.call_count, 2)
+        self.assertEqual(prompt_history[0].content.count("- Usuario:"), 3)
+
+    def test_folds_repeated_messages_by_position(self) -> None:
+        """It folds the newly aged turn even when its text repeats earlier turns."""
+        policy = HistoryWindowPolicy(max_recent_turns=1, token_budget=1000)
+        repeated_turn = [HumanMessage("ok"), AIMessage("ok")]
+        policy.build_prompt_history("chat-1", repeated_turn * 3)
+
+        prompt_history = policy.build_prompt_history("chat-1", repeated_turn * 4)
+
+        self.assertEqual(prompt_history[0].content.count("- Usuario: ok"), 3)
+
+    def test_rebuilds_the_summary_when_the_history_was_rewritten(self) -> None:
+        """It refolds from scratch when the cached offset no longer matches."""
+        policy = HistoryWindowPolicy(max_recent_turns=1, token_budget=1000)
+        policy.build_prompt_history("chat-1", self._build_messages(4))
+        rewritten = [HumanMessage("other"), AIMessage("reply"), *self._build_messages(1)]
+
+        prompt_history = policy.build_prompt_history("chat-1", rewritten)
+
+        self.assertIn("- Usuario: other", prompt_history[0].content)
+        self.assertNotIn("question 0", prompt_history[0].content)
+
+    def test_keeps_folding_incrementally_past_the_backend_message_cap(self) -> None:
+        """It keeps evicted turns in the summary and folds only the newly aged turn."""
+        policy = HistoryWindowPolicy(max_recent_turns=1, token_budget=1000)
+        backend = InMemoryChatHistoryBackend(
+            max_sessions=10,
+            ttl_seconds=0,
+            max_messages_per_chat=6,
+        )
+
+        with patch.object(
+            policy,
+            "_summarize_message",
+            wraps=policy._summarize_message,
+        ) as summarize_message:
+            for index in range(10):
+                backend.add_messages(
+                    "chat-1",
+                    [HumanMessage(f"question {index}"), AIMessage(f"answer {index}")],
+                )
+                first_sequence, messages = backend.get_message_window("chat-1")
+                prompt_history = policy.build_prompt_history(
+                    "chat-1",
+                    messages,
+                    first_sequence=first_sequence,
+                )
+
+        self.assertEqual(first_sequence, 14)
+        self.assertEqual(summarize_message.call_count, 18)
+        summary = prompt_history[0].content
+        self.assertIn("- Usuario: question 0", summary)
+        self.assertIn("- Assistente: answer 8", summary)
+        self.assertEqual(summary.count("- Usuario:"), 9)
+
+    def test_drops_oldest_summary_lines_to_respect_the_budget(self) -> None:
+        """It keeps the prompt history under the token budget."""
+        policy = HistoryWindowPolicy(max_recent_turns=1, token_budget=40)
+        messages = self._build_messages(30)
+
+        prompt_history = policy.build_prompt_history("chat-1", messages)
+
+        total_tokens = sum(len(message.content) / 4 for message in prompt_history)
+        self.assertLessEqual(total_tokens, 40)
+        self.assertIn("answer 28", prompt_history[0].content)
+        self.assertNotIn("question 0", prompt_history[0].content)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import unittest
+from decimal import Decimal
+
+from src.agents.response_agent.prompt_data import PromptDataReducer
+
+
+class PromptDataReducerTests(unittest.TestCase):
+    """Tests for the token-budgeted prompt data reducer."""
+
+    def _build_rows(self, count: int) -> list[dict]:
+        return [
+            {
+                "category": f"category-{index % 4}",
+                "amount": float(index),
+                "expense_date": f"2026-01-{(index % 28) + 1:02d}",
+            }
+            for index in range(count)
+        ]
+
+    def test_keeps_every_row_when_the_result_fits_the_budget(self) -> None:
+        """It serializes small results unchanged."""
+        reducer = PromptDataReducer(token_budget=1000)
+        rows = self._build_rows(3)
+
+        serialized = reducer.reduce(rows)
+
+        self.assertEqual(json.loads(serialized), rows)
+
+    def test_replaces_large_results_with_a_budgeted_digest(self) -> None:
+        """It sends stats, extremes, a stratified sample and group aggregates."""
+        reducer = PromptDataReducer(token_budget=1500)
+        rows = self._build_rows(5000)
+
+        serialized = reducer.reduce(rows)
+        digest = json.loads(serialized)
+
+        self.assertLessEqual(reducer.estimate_tokens(serialized), 1500)
+        self.assertEqual(digest["row_count"], 5000)
+        self.assertEqual(digest["column_stats"]["amount"]["max"], 4999.0)
+        self.assertEqual(digest["column_stats"]["category"]["distinct"], 4)
+        self.assertEqual(digest["top_rows"][0]["amount"], 4999.0)
+        self.assertEqual(digest["bottom_rows"][0]["amount"], 0.0)
+        self.assertEqual(
+            {row["category"] for row in digest["sample_rows"]},
+            {"category-0", "category-1", "category-2", "category-3"},
+        )
+        self.assertEqual(len(digest["group_aggregates"]["groups"]), 4)
+        self.assertEqual(digest["group_aggregates"]["groups"][0]["category"], "category-3")
+
+    def test_shrinks_row_sections_under_tight_budgets(self) -> None:
+        """It halves the sampled sections until the digest fits."""
+        reducer = PromptDataReducer(token_budget=400)
+
+        digest = json.loads(reducer.reduce(self._build_rows(2000), row_count=90000))
+
+        self.assertEqual(digest["row_count"], 90000)
+        self.assertLess(len(digest.get("sample_rows", [])), 20)
+        self.assertIn("only the first 2000 of 90000 rows", digest["note"])
+
+    def test_ranks_decimal_metrics_and_skips_the_access_scope_column(self) -> None:
+        """It treats NUMERIC values as metrics and never ranks rows by company_id."""
+        reducer = PromptDataReducer(token_budget=1500)
+        rows = [
+            {
+                "company_id": 900 + index,
+                "category": f"category-{index % 4}",
+                "amount": Decimal(index) / 4,
+            }
+            for index in range(2000)
+        ]
+
+        digest = json.loads(reducer.reduce(rows))
+
+        self.assertNotIn("company_id", digest["column_stats"])
+        self.assertEqual(digest["group_aggregates"]["metric"], "amount")
+        self.assertEqual(float(digest["top_rows"][0]["amount"]), 499.75)
+        self.assertEqual(float(digest["bottom_rows"][0]["amount"]), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
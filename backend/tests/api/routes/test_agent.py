@@ -1,11 +1,15 @@
 import asyncio
 import unittest
+from unittest.mock import MagicMock
 from unittest.mock import Mock
 from unittest.mock import patch
 from fastapi import HTTPException
 from src.api.models import GraphRequest
 from src.api.models import ModelRequest
+from src.api.chat_store_schema import GraphCacheEntry
+from src.api.chat_store_schema import build_data_version
 from src.api.routes import agent as agent_routes
+from src.infra.column_profile import ColumnProfile
 
 
 class AgentRoutesTests(unittest.TestCase):
@@ -22,6 +26,12 @@ class AgentRoutesTests(unittest.TestCase):
             question_context="TRAVEL",
         )
 
+        column_profile = ColumnProfile(
+            row_count=1,
+            columns=("company_id",),
+            numeric_columns=("company_id",),
+            populated_columns=("company_id",),
+        )
         orchestrator = Mock()
         orchestrator.run_agent.return_value = {
             "status": "success",
@@ -32,6 +42,7 @@ class AgentRoutesTests(unittest.TestCase):
             "graph_suggestions": [],
             "graph_path": "",
             "selected_graph_pattern": "",
+            "column_profile": column_profile,
         }
 
         with patch(
@@ -50,7 +61,7 @@ class AgentRoutesTests(unittest.TestCase):
         ), patch.object(
             agent_routes.chat_store_manager,
             "upsert_mock_message",
-        ):
+        ) as upsert_mock_message:
             response = asyncio.run(agent_routes.ask_agent(request, "Bearer fixed-token"))
 
         self.assertEqual(response["status"], "success")
@@ -59,6 +70,227 @@ class AgentRoutesTests(unittest.TestCase):
             response["response"]["data_path"],
             "/v1/storage/data/chat-1/question-1",
         )
+        self.assertNotIn("column_profile", response["response"])
+        self.assertIs(
+            upsert_mock_message.call_args.kwargs["column_profile"],
+            column_profile,
+        )
+
+    def test_ask_agent_returns_debug_statistics_only_when_requested(self) -> None:
+        """It strips orchestrator debug data unless include_debug is set."""
+        orchestrator = Mock()
+        orchestrator.run_agent.return_value = {
+            "status": "success",
+            "response_data": [{"company_id": 1}],
+            "response_sql": "SELECT company_id FROM test",
+            "response_natural_language": "formatted answer",
+            "response_types": ["TEXT", "SQL"],
+            "graph_suggestions": [],
+            "graph_path": "",
+            "selected_graph_pattern": "",
+            "debug": {"query_statistics": [{"bytes_processed": 2048}]},
+        }
+
+        responses = {}
+        for include_debug in (False, True):
+            request = ModelRequest(
+                email="user@example.com",
+                question="How much did my travel expenses cost this month?",
+                chat_id="chat-1",
+                question_id="question-1",
+                question_context="TRAVEL",
+                include_debug=include_debug,
+            )
+            with patch(
+                "src.api.routes.agent.validate_token",
+                return_value={
+                    "email": "user@example.com",
+                    "can_view_runtime_logs": True,
+                },
+            ), patch(
+                "src.api.routes.agent.OrchestrateAgent",
+                return_value=orchestrator,
+            ), patch.object(
+                agent_routes.chat_store_manager,
+                "save_message_data",
+                return_value="/v1/storage/data/chat-1/question-1",
+            ), patch.object(
+                agent_routes.chat_store_manager,
+                "upsert_mock_message",
+            ):
+                responses[include_debug] = asyncio.run(
+                    agent_routes.ask_agent(request, "Bearer fixed-token")
+                )
+
+        self.assertNotIn("debug", responses[False]["response"])
+        self.assertEqual(
+            responses[True]["response"]["debug"]["query_statistics"],
+            [{"bytes_processed": 2048}],
+        )
+
+    def test_ask_agent_persists_and_releases_spilled_rows(self) -> None:
+        """It stores the full spilled rows, returns only the preview, and closes the spill."""
+        spilled_rows = MagicMock()
+        spilled_rows.__iter__.return_value = iter([{"company_id": 1}])
+        orchestrator = Mock()
+        orchestrator.run_agent.return_value = {
+            "status": "success",
+            "response_data": [{"company_id": 1}],
+            "response_row_count": 500000,
+            "response_data_truncated": True,
+            "response_data_spill": spilled_rows,
+            "response_sql": "SELECT company_id FROM test",
+            "response_natural_language": "formatted answer",
+            "response_types": ["TEXT", "SQL"],
+            "graph_suggestions": [],
+            "graph_path": "",
+            "selected_graph_pattern": "",
+        }
+        request = ModelRequest(
+            email="user@example.com",
+            question="List every ticket",
+            chat_id="chat-1",
+            question_id="question-1",
+            question_context="TRAVEL",
+        )
+
+        with patch(
+            "src.api.routes.agent.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch(
+            "src.api.routes.agent.OrchestrateAgent",
+            return_value=orchestrator,
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "save_message_data",
+            return_value="/v1/storage/data/chat-1/question-1",
+        ) as save_message_data, patch.object(
+            agent_routes.chat_store_manager,
+            "upsert_mock_message",
+        ):
+            response = asyncio.run(agent_routes.ask_agent(request, "Bearer fixed-token"))
+
+        self.assertIs(save_message_data.call_args.args[2], spilled_rows)
+        spilled_rows.close.assert_called_once_with()
+        self.assertNotIn("response_data_spill", response["response"])
+        self.assertEqual(response["response"]["response_data"], [{"company_id": 1}])
+        self.assertTrue(response["response"]["response_data_truncated"])
+
+    def test_ask_agent_queues_a_graph_prerender_for_saved_data(self) -> None:
+        """It hands the saved rows and suggestions to the background pre-renderer."""
+        suggestion = {
+            "id": "bar_vertical",
+            "label": "Bar",
+            "reason": "Compares categories.",
+            "x_field": "category",
+            "y_field": "amount",
+            "hue_field": "",
+        }
+        orchestrator = Mock()
+        orchestrator.run_agent.return_value = {
+            "status": "success",
+            "response_data": [{"category": "Hotel", "amount": 10}],
+            "response_sql": "SELECT category, amount FROM test",
+            "response_natural_language": "formatted answer",
+            "response_types": ["TEXT", "GRAPH"],
+            "graph_suggestions": [suggestion],
+            "graph_path": "",
+            "selected_graph_pattern": "",
+        }
+        request = ModelRequest(
+            email="user@example.com",
+            question="Show expenses by category",
+            chat_id="chat-1",
+            question_id="question-1",
+            response_types=["TEXT", "GRAPH"],
+            question_context="TRAVEL",
+        )
+
+        with patch(
+            "src.api.routes.agent.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch(
+            "src.api.routes.agent.OrchestrateAgent",
+            return_value=orchestrator,
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "save_message_data",
+            return_value="/v1/storage/data/chat-1/question-1",
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "upsert_mock_message",
+        ), patch.object(
+            agent_routes.graph_prerenderer,
+            "submit",
+        ) as submit:
+            asyncio.run(agent_routes.ask_agent(request, "Bearer fixed-token"))
+
+        job = submit.call_args.args[0]
+        self.assertEqual(job.graph_suggestions, (suggestion,))
+        self.assertEqual(job.response_data, [{"category": "Hotel", "amount": 10}])
+        self.assertEqual(
+            job.data_version,
+            build_data_version([{"category": "Hotel", "amount": 10}]),
+        )
+        self.assertEqual(job.user_email, "user@example.com")
+
+    def test_ask_agent_returns_a_preview_page_of_saved_rows(self) -> None:
+        """It keeps only the first page inline once the rows are saved for paging."""
+        rows = [{"category": f"Category {index}", "amount": index} for index in range(5)]
+        orchestrator = Mock()
+        orchestrator.run_agent.return_value = {
+            "status": "success",
+            "response_data": rows,
+            "response_row_count": len(rows),
+            "response_data_truncated": False,
+            "response_sql": "SELECT category, amount FROM test",
+            "response_natural_language": "formatted answer",
+            "response_types": ["TEXT"],
+        }
+        request = ModelRequest(
+            email="user@example.com",
+            question="Show expenses by category",
+            chat_id="chat-1",
+            question_id="question-1",
+            response_types=["TEXT"],
+            question_context="TRAVEL",
+        )
+
+        with patch(
+            "src.api.routes.agent.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch(
+            "src.api.routes.agent.OrchestrateAgent",
+            return_value=orchestrator,
+        ), patch(
+            "src.api.routes.agent.settings",
+        ) as settings_mock, patch.object(
+            agent_routes.chat_store_manager,
+            "save_message_data",
+            return_value="/v1/storage/data/chat-1/question-1",
+        ) as save_message_data, patch.object(
+            agent_routes.chat_store_manager,
+            "upsert_mock_message",
+        ), patch.object(
+            agent_routes.graph_prerenderer,
+            "submit",
+        ):
+            settings_mock.result_preview_rows = 2
+            response = asyncio.run(agent_routes.ask_agent(request, "Bearer fixed-token"))
+
+        self.assertEqual(save_message_data.call_args.args[2], rows)
+        self.assertEqual(response["response"]["response_data"], rows[:2])
+        self.assertEqual(response["response"]["response_row_count"], 5)
+        self.assertTrue(response["response"]["response_data_truncated"])
 
     def test_ask_agent_returns_http_400_for_invalid_input(self) -> None:
         """It raises HTTP 400 when the orchestrator rejects an invalid input."""
@@ -103,13 +335,36 @@ class AgentRoutesTests(unittest.TestCase):
         )
         save_message_data.assert_not_called()
 
+    def _build_graph_cache(self) -> GraphCacheEntry:
+        return GraphCacheEntry(
+            data_version="version-1",
+            column_profile=ColumnProfile(
+                row_count=1,
+                columns=("month", "total"),
+                numeric_columns=("total",),
+                datetime_columns=("month",),
+                populated_columns=("month", "total"),
+            ),
+            graph_suggestions=[
+                {
+                    "id": "bar_vertical",
+                    "label": "Bar",
+                    "reason": "Compares categories.",
+                    "x_field": "month",
+                    "y_field": "total",
+                    "hue_field": "",
+                }
+            ],
+        )
+
     def test_generate_graph_returns_graph_payload(self) -> None:
-        """It renders a graph from saved data and returns the graph path."""
+        """It renders a graph from the cached suggestions and column profile."""
         request = GraphRequest(
             chat_id="chat-1",
             question_id="question-1",
             graph_pattern_id="bar_vertical",
         )
+        graph_cache = self._build_graph_cache()
 
         with patch(
             "src.api.routes.agent.validate_token",
@@ -117,28 +372,26 @@ class AgentRoutesTests(unittest.TestCase):
                 "email": "user@example.com",
                 "can_view_runtime_logs": True,
             },
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_graph_cache",
+            return_value=graph_cache,
         ), patch.object(
             agent_routes.chat_store_manager,
             "load_message_data",
             return_value=[{"month": "2026-01", "total": 10}],
+        ) as load_message_data, patch.object(
+            agent_routes.graph_agent,
+            "find_rendered_graph",
+            return_value=None,
         ), patch.object(
             agent_routes.graph_agent,
             "suggest_graphs",
-            return_value=[
-                {
-                    "id": "bar_vertical",
-                    "label": "Bar",
-                    "reason": "Compares categories.",
-                    "x_field": "month",
-                    "y_field": "total",
-                    "hue_field": "",
-                }
-            ],
-        ), patch.object(
+        ) as suggest_graphs, patch.object(
             agent_routes.graph_agent,
             "render_graph",
             return_value="/v1/storage/graph/chat-1/question-1",
-        ), patch.object(
+        ) as render_graph, patch.object(
             agent_routes.chat_store_manager,
             "update_message_metadata",
             return_value=True,
@@ -148,10 +401,254 @@ class AgentRoutesTests(unittest.TestCase):
             )
 
         self.assertEqual(response["status"], "success")
+        suggest_graphs.assert_not_called()
+        self.assertEqual(load_message_data.call_args.kwargs["columns"], ["month", "total"])
+        self.assertIs(
+            render_graph.call_args.kwargs["column_profile"],
+            graph_cache.column_profile,
+        )
+        self.assertEqual(response["graph_suggestions"], graph_cache.graph_suggestions)
         self.assertEqual(
             response["graph_path"],
             "/v1/storage/graph/chat-1/question-1",
         )
+        self.assertEqual(
+            render_graph.call_args.kwargs["data_version"],
+            graph_cache.data_version,
+        )
+
+    def test_generate_graph_returns_a_spec_without_rendering(self) -> None:
+        """It answers format=spec with the aggregated series and stores no image."""
+        request = GraphRequest(
+            chat_id="chat-1",
+            question_id="question-1",
+            graph_pattern_id="bar_vertical",
+            format="spec",
+        )
+        graph_cache = self._build_graph_cache()
+
+        with patch(
+            "src.api.routes.agent.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_graph_cache",
+            return_value=graph_cache,
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_message_data",
+            return_value=[
+                {"month": "2026-01", "total": 10},
+                {"month": "2026-01", "total": 30},
+            ],
+        ), patch.object(
+            agent_routes.graph_agent,
+            "find_rendered_graph",
+        ) as find_rendered_graph, patch.object(
+            agent_routes.graph_agent,
+            "render_graph",
+        ) as render_graph, patch.object(
+            agent_routes.chat_store_manager,
+            "update_message_metadata",
+            return_value=True,
+        ) as update_message_metadata:
+            response = asyncio.run(
+                agent_routes.generate_graph(request, "Bearer fixed-token")
+            )
+
+        find_rendered_graph.assert_not_called()
+        render_graph.assert_not_called()
+        self.assertEqual(response["graph_path"], "")
+        self.assertEqual(response["graph_spec"]["mark"]["type"], "bar")
+        self.assertEqual(
+            response["graph_spec"]["data"]["values"],
+            [{"month": "2026-01-01T00:00:00", "total": 20.0}],
+        )
+        stored_metadata = update_message_metadata.call_args.kwargs
+        self.assertIsNone(stored_metadata["graph_path"])
+        self.assertEqual(stored_metadata["graph_spec"], response["graph_spec"])
+
+    def test_generate_graph_reuses_a_saved_render_without_loading_data(self) -> None:
+        """It returns the cached render path without downloading rows or rendering."""
+        request = GraphRequest(
+            chat_id="chat-1",
+            question_id="question-1",
+            graph_pattern_id="bar_vertical",
+        )
+        graph_cache = self._build_graph_cache()
+        cached_path = f"/v1/storage/graph/chat-1/question-1?render={'a' * 64}"
+
+        with patch(
+            "src.api.routes.agent.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_graph_cache",
+            return_value=graph_cache,
+        ), patch.object(
+            agent_routes.graph_agent,
+            "find_rendered_graph",
+            return_value=cached_path,
+        ) as find_rendered_graph, patch.object(
+            agent_routes.chat_store_manager,
+            "load_message_data",
+        ) as load_message_data, patch.object(
+            agent_routes.graph_agent,
+            "render_graph",
+        ) as render_graph, patch.object(
+            agent_routes.chat_store_manager,
+            "update_message_metadata",
+            return_value=True,
+        ) as update_message_metadata:
+            response = asyncio.run(
+                agent_routes.generate_graph(request, "Bearer fixed-token")
+            )
+
+        self.assertEqual(response["graph_path"], cached_path)
+        self.assertEqual(
+            find_rendered_graph.call_args.kwargs["data_version"],
+            graph_cache.data_version,
+        )
+        load_message_data.assert_not_called()
+        render_graph.assert_not_called()
+        self.assertEqual(
+            update_message_metadata.call_args.kwargs["graph_path"],
+            cached_path,
+        )
+
+    def test_generate_graph_waits_for_an_in_flight_prerender(self) -> None:
+        """It returns the background render instead of drawing the graph again."""
+        request = GraphRequest(
+            chat_id="chat-1",
+            question_id="question-1",
+            graph_pattern_id="bar_vertical",
+        )
+        graph_cache = self._build_graph_cache()
+        prerendered_path = f"/v1/storage/graph/chat-1/question-1?render={'b' * 64}"
+
+        with patch(
+            "src.api.routes.agent.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_graph_cache",
+            return_value=graph_cache,
+        ), patch.object(
+            agent_routes.graph_agent,
+            "find_rendered_graph",
+            return_value=None,
+        ), patch.object(
+            agent_routes.graph_prerenderer,
+            "wait_for_graph",
+            return_value=prerendered_path,
+        ) as wait_for_graph, patch.object(
+            agent_routes.chat_store_manager,
+            "load_message_data",
+        ) as load_message_data, patch.object(
+            agent_routes.graph_agent,
+            "render_graph",
+        ) as render_graph, patch.object(
+            agent_routes.chat_store_manager,
+            "update_message_metadata",
+            return_value=True,
+        ):
+            response = asyncio.run(
+                agent_routes.generate_graph(request, "Bearer fixed-token")
+            )
+
+        self.assertEqual(response["graph_path"], prerendered_path)
+        self.assertEqual(
+            wait_for_graph.call_args.kwargs["graph_pattern_id"],
+            "bar_vertical",
+        )
+        self.assertEqual(
+            wait_for_graph.call_args.kwargs["timeout"],
+            agent_routes.settings.graph_prerender_wait_seconds,
+        )
+        load_message_data.assert_not_called()
+        render_graph.assert_not_called()
+
+    def test_generate_graph_rejects_unknown_pattern_without_loading_data(self) -> None:
+        """It validates the pattern against the cached suggestions first."""
+        request = GraphRequest(
+            chat_id="chat-1",
+            question_id="question-1",
+            graph_pattern_id="scatter",
+        )
+
+        with patch(
+            "src.api.routes.agent.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_graph_cache",
+            return_value=self._build_graph_cache(),
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_message_data",
+        ) as load_message_data:
+            with self.assertRaises(HTTPException) as context:
+                asyncio.run(agent_routes.generate_graph(request, "Bearer fixed-token"))
+
+        self.assertEqual(context.exception.status_code, 400)
+        load_message_data.assert_not_called()
+
+    def test_generate_graph_builds_and_stores_missing_suggestions(self) -> None:
+        """It profiles the saved rows once when no versioned suggestions exist."""
+        request = GraphRequest(
+            chat_id="chat-1",
+            question_id="question-1",
+            graph_pattern_id="line",
+        )
+        response_data = [
+            {"month": "2026-01", "total": 10},
+            {"month": "2026-02", "total": 20},
+        ]
+
+        with patch(
+            "src.api.routes.agent.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_graph_cache",
+            return_value=None,
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_message_data",
+            return_value=response_data,
+        ), patch.object(
+            agent_routes.graph_agent,
+            "render_graph",
+            return_value="/v1/storage/graph/chat-1/question-1",
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "update_message_metadata",
+            return_value=True,
+        ) as update_message_metadata:
+            response = asyncio.run(
+                agent_routes.generate_graph(request, "Bearer fixed-token")
+            )
+
+        self.assertEqual(response["selected_graph_pattern"], "line")
+        cache_update = update_message_metadata.call_args_list[0].kwargs
+        self.assertEqual(cache_update["data_version"], build_data_version(response_data))
+        self.assertEqual(cache_update["column_profile"].datetime_columns, ("month",))
+        self.assertEqual(cache_update["graph_suggestions"][0]["id"], "line")
 
     def test_generate_graph_returns_http_400_when_saved_data_is_missing(self) -> None:
         """It rejects graph generation when the message data was not found."""
@@ -167,6 +664,10 @@ class AgentRoutesTests(unittest.TestCase):
                 "email": "user@example.com",
                 "can_view_runtime_logs": True,
             },
+        ), patch.object(
+            agent_routes.chat_store_manager,
+            "load_graph_cache",
+            return_value=None,
         ), patch.object(
             agent_routes.chat_store_manager,
             "load_message_data",
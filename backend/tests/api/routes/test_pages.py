@@ -5,6 +5,10 @@ from unittest.mock import Mock
 from unittest.mock import patch
 from fastapi import HTTPException
 from src.api.routes import pages as pages_routes
+from src.infra.config.config_google.storage_manager import SignedDownload
+from src.infra.config.config_google.storage_manager import StoredDataStream
+from src.infra.storage_codec import COMPRESSION_GZIP
+from src.infra.storage_codec import StorageCodec
 
 
 class PagesRoutesTests(unittest.TestCase):
@@ -73,6 +77,158 @@ class PagesRoutesTests(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(json.loads(response.body), [{"total": 10}])
 
+    def test_stored_data_route_passes_the_projection_to_storage(self) -> None:
+        """It forwards the requested columns and row range to the storage read."""
+        with patch(
+            "src.api.routes.pages.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch(
+            "src.api.routes.pages.storage_manager.load_json_data",
+            return_value=[{"total": 10}],
+        ) as load_json_data:
+            asyncio.run(
+                pages_routes.serve_stored_data(
+                    "chat-1",
+                    "question-1",
+                    "fixed-token",
+                    columns="total, month",
+                    offset=20,
+                    limit=10,
+                )
+            )
+
+        self.assertEqual(load_json_data.call_args.kwargs["columns"], ["total", "month"])
+        self.assertEqual(load_json_data.call_args.kwargs["offset"], 20)
+        self.assertEqual(load_json_data.call_args.kwargs["limit"], 10)
+
+    def test_stored_data_route_passes_stored_bytes_through(self) -> None:
+        """It streams unprojected rows as stored, decompressing only when needed."""
+        body = StorageCodec(compression=COMPRESSION_GZIP).encode_bytes([{"total": 10}])
+
+        def run_route(accept_encoding):
+            with patch(
+                "src.api.routes.pages.validate_token",
+                return_value={
+                    "email": "user@example.com",
+                    "can_view_runtime_logs": True,
+                },
+            ), patch(
+                "src.api.routes.pages.storage_manager.open_json_stream",
+                return_value=StoredDataStream(
+                    compression=COMPRESSION_GZIP,
+                    chunks=iter((body[:5], body[5:])),
+                ),
+            ), patch(
+                "src.api.routes.pages.storage_manager.load_json_data",
+            ) as load_json_data:
+                response = asyncio.run(
+                    pages_routes.serve_stored_data(
+                        "chat-1",
+                        "question-1",
+                        "fixed-token",
+                        accept_encoding=accept_encoding,
+                    )
+                )
+                load_json_data.assert_not_called()
+            async def read_body() -> bytes:
+                return b"".join([chunk async for chunk in response.body_iterator])
+
+            return response, asyncio.run(read_body())
+
+        response, streamed_body = run_route("br, gzip;q=0.8")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(streamed_body, body)
+
+        response, streamed_body = run_route("gzip;q=0, identity")
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(json.loads(streamed_body), [{"total": 10}])
+
+    def test_stored_data_route_redirects_to_a_signed_url(self) -> None:
+        """It redirects to the bucket unless the client cannot decode the stored data."""
+
+        def run_route(accept_encoding):
+            with patch(
+                "src.api.routes.pages.validate_token",
+                return_value={
+                    "email": "user@example.com",
+                    "can_view_runtime_logs": True,
+                },
+            ), patch(
+                "src.api.routes.pages.storage_manager.signed_urls_enabled",
+                True,
+            ), patch(
+                "src.api.routes.pages.storage_manager.sign_data_download",
+                return_value=SignedDownload(url="http://bucket/signed", content_encoding="zstd"),
+            ), patch(
+                "src.api.routes.pages.storage_manager.open_json_stream",
+                return_value=None,
+            ), patch(
+                "src.api.routes.pages.storage_manager.load_json_data",
+                return_value=[{"total": 10}],
+            ):
+                return asyncio.run(
+                    pages_routes.serve_stored_data(
+                        "chat-1",
+                        "question-1",
+                        "fixed-token",
+                        accept_encoding=accept_encoding,
+                    )
+                )
+
+        response = run_route("gzip, zstd")
+        self.assertEqual(response.status_code, 307)
+        self.assertEqual(response.headers["location"], "http://bucket/signed")
+
+        response = run_route("gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.body), [{"total": 10}])
+
+    def test_stored_data_route_streams_a_page_as_ndjson(self) -> None:
+        """It writes one JSON row per line and rejects unknown formats."""
+        with patch(
+            "src.api.routes.pages.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch(
+            "src.api.routes.pages.storage_manager.open_json_stream",
+        ) as open_json_stream, patch(
+            "src.api.routes.pages.storage_manager.load_json_data",
+            return_value=[{"total": 10}, {"total": 20}],
+        ) as load_json_data:
+            response = asyncio.run(
+                pages_routes.serve_stored_data(
+                    "chat-1",
+                    "question-1",
+                    "fixed-token",
+                    offset=200,
+                    limit=2,
+                    format="ndjson",
+                )
+            )
+            with self.assertRaises(HTTPException) as context:
+                asyncio.run(
+                    pages_routes.serve_stored_data(
+                        "chat-1",
+                        "question-1",
+                        "fixed-token",
+                        format="csv",
+                    )
+                )
+
+        async def read_body() -> bytes:
+            return b"".join([chunk async for chunk in response.body_iterator])
+
+        self.assertEqual(response.media_type, "application/x-ndjson")
+        self.assertEqual(asyncio.run(read_body()), b'{"total":10}\n{"total":20}\n')
+        self.assertEqual(load_json_data.call_args.kwargs["offset"], 200)
+        open_json_stream.assert_not_called()
+        self.assertEqual(context.exception.status_code, 400)
+
     def test_storage_route_requires_session_cookie(self) -> None:
         """It rejects storage reads when the session cookie is missing."""
         with self.assertRaises(HTTPException) as context:
@@ -101,3 +257,178 @@ class PagesRoutesTests(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.media_type, "image/png")
         self.assertEqual(response.body, b"png-binary")
+
+    def test_authenticated_user_can_read_a_content_addressed_render(self) -> None:
+        """It serves renders selected by key through the graph agent."""
+        with patch(
+            "src.api.routes.pages.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch.object(
+            pages_routes.graph_agent,
+            "load_rendered_graph",
+            return_value=b"png-render",
+        ) as load_rendered_graph, patch(
+            "src.api.routes.pages.storage_manager.load_graph_image",
+        ) as load_graph_image:
+            response = asyncio.run(
+                pages_routes.serve_stored_graph(
+                    "chat-1",
+                    "question-1",
+                    "fixed-token",
+                    render="a" * 64,
+                )
+            )
+
+        self.assertEqual(response.body, b"png-render")
+        self.assertEqual(load_rendered_graph.call_args.kwargs["render_key"], "a" * 64)
+        load_graph_image.assert_not_called()
+
+    def test_stored_graph_route_redirects_to_a_signed_url(self) -> None:
+        """It sends the browser to the bucket instead of proxying the image."""
+        with patch(
+            "src.api.routes.pages.validate_token",
+            return_value={
+                "email": "user@example.com",
+                "can_view_runtime_logs": True,
+            },
+        ), patch(
+            "src.api.routes.pages.storage_manager.signed_urls_enabled",
+            True,
+        ), patch(
+            "src.api.routes.pages.storage_manager.sign_graph_download",
+            return_value=SignedDownload(url="http://bucket/graph"),
+        ) as sign_graph_download, patch.object(
+            pages_routes.graph_agent,
+            "load_rendered_graph",
+        ) as load_rendered_graph:
+            response = asyncio.run(
+                pages_routes.serve_stored_graph(
+                    "chat-1",
+                    "question-1",
+                    "fixed-token",
+                    render="a" * 64,
+                )
+            )
+
+        self.assertEqual(response.status_code, 307)
+        self.assertEqual(response.headers["location"], "http://bucket/graph")
+        self.assertEqual(sign_graph_download.call_args.kwargs["render_key"], "a" * 64)
+        load_rendered_graph.assert_not_called()
+
+    def test_stored_data_route_revalidates_against_the_data_version(self) -> None:
+        """It tags pages with an ETag and answers a matching If-None-Match with 304."""
+
+        def run_route(if_none_match=None):
+            with patch(
+                "src.api.routes.pages.validate_token",
+                return_value={
+                    "email": "user@example.com",
+                    "can_view_runtime_logs": True,
+                },
+            ), patch(
+                "src.api.routes.pages.chat_store_manager.load_data_version",
+                return_value="version-1",
+            ) as load_data_version, patch(
+                "src.api.routes.pages.storage_manager.load_json_data",
+                return_value=[{"total": 10}],
+            ) as load_json_data:
+                response = asyncio.run(
+                    pages_routes.serve_stored_data(
+                        "chat-1",
+                        "question-1",
+                        "fixed-token",
+                        limit=200,
+                        if_none_match=if_none_match,
+                    )
+                )
+            return response, load_json_data, load_data_version
+
+        response, _, _ = run_route()
+        revalidated, load_json_data, load_data_version = run_route(
+            response.headers["etag"]
+        )
+
+        self.assertEqual(response.headers["cache-control"], "private, no-cache")
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers["etag"], response.headers["etag"])
+        load_json_data.assert_not_called()
+        load_data_version.assert_called_once_with(
+            "chat-1",
+            "question-1",
+            "user@example.com",
+        )
+
+    def test_stored_data_route_does_not_revalidate_another_users_etag(self) -> None:
+        """It looks up the data version by owner, so a foreign ETag gets no 304."""
+
+        def run_route(user_email, data_version, stored_rows, if_none_match=None):
+            with patch(
+                "src.api.routes.pages.validate_token",
+                return_value={
+                    "email": user_email,
+                    "can_view_runtime_logs": False,
+                },
+            ), patch(
+                "src.api.routes.pages.chat_store_manager.load_data_version",
+                return_value=data_version,
+            ), patch(
+                "src.api.routes.pages.storage_manager.load_json_data",
+                return_value=stored_rows,
+            ):
+                return asyncio.run(
+                    pages_routes.serve_stored_data(
+                        "chat-1",
+                        "question-1",
+                        "fixed-token",
+                        limit=200,
+                        if_none_match=if_none_match,
+                    )
+                )
+
+        owner_response = run_route("owner@example.com", "version-1", [{"total": 10}])
+        with self.assertRaises(HTTPException) as context:
+            run_route(
+                "intruder@example.com",
+                "",
+                None,
+                owner_response.headers["etag"],
+            )
+
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_stored_graph_route_caches_renders_by_key(self) -> None:
+        """It marks renders immutable and revalidates them without loading the image."""
+        render_key = "a" * 64
+
+        def run_route(if_none_match=None):
+            with patch(
+                "src.api.routes.pages.validate_token",
+                return_value={
+                    "email": "user@example.com",
+                    "can_view_runtime_logs": True,
+                },
+            ), patch.object(
+                pages_routes.graph_agent,
+                "load_rendered_graph",
+                return_value=b"png-render",
+            ) as load_rendered_graph:
+                response = asyncio.run(
+                    pages_routes.serve_stored_graph(
+                        "chat-1",
+                        "question-1",
+                        "fixed-token",
+                        render=render_key,
+                        if_none_match=if_none_match,
+                    )
+                )
+            return response, load_rendered_graph
+
+        response, _ = run_route()
+        revalidated, load_rendered_graph = run_route(response.headers["etag"])
+
+        self.assertIn("immutable", response.headers["cache-control"])
+        self.assertEqual(revalidated.status_code, 304)
+        load_rendered_graph.assert_not_called()
@@ -1,9 +1,12 @@
+import json
+import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import Mock
 
 from src.api.chat_store import ChatStoreManager
+from src.infra.column_profile import ColumnProfile
 
 
 class ChatStoreManagerTests(unittest.TestCase):
@@ -65,3 +68,268 @@ class ChatStoreManagerTests(unittest.TestCase):
         self.assertEqual(store["mensages"][0]["graph_path"], "/v1/storage/graph/chat-1/question-1")
         self.assertEqual(store["mensages"][0]["selected_graph_pattern"], "bar_vertical")
         self.assertEqual(store["mensages"][0]["response_types"], ["TEXT", "SQL"])
+
+    def test_new_data_version_replaces_cached_graph_metadata(self) -> None:
+        """It keeps graph metadata for the same data and drops it when the data changes."""
+        column_profile = ColumnProfile(
+            row_count=2,
+            columns=("month", "total"),
+            numeric_columns=("total",),
+            datetime_columns=("month",),
+            populated_columns=("month", "total"),
+        )
+        suggestion = {
+            "id": "line",
+            "label": "Line",
+            "reason": "Shows how the metric changes over time.",
+            "x_field": "month",
+            "y_field": "total",
+            "hue_field": "",
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = ChatStoreManager(Path(temp_dir), storage_manager=Mock())
+            manager.log_debug = Mock()
+            manager.log_info = Mock()
+            manager.log_warning = Mock()
+
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses by month",
+                graph_suggestions=[suggestion],
+                column_profile=column_profile,
+                data_version="version-1",
+            )
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses by month",
+                response="done",
+                data_version="version-1",
+            )
+            cached_entry = manager.load_graph_cache("chat-1", "question-1")
+
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses by month",
+                data_version="version-2",
+            )
+            refreshed_entry = manager.load_graph_cache("chat-1", "question-1")
+            missing_entry = manager.load_graph_cache("chat-1", "question-2")
+
+        self.assertEqual(cached_entry.column_profile, column_profile)
+        self.assertEqual(cached_entry.find_suggestion("line"), suggestion)
+        self.assertEqual(refreshed_entry.data_version, "version-2")
+        self.assertIsNone(refreshed_entry.column_profile)
+        self.assertEqual(refreshed_entry.graph_suggestions, [])
+        self.assertIsNone(missing_entry)
+
+    def test_records_prerendered_graph_only_for_an_untouched_message(self) -> None:
+        """It stores a background render unless the data changed or a graph was picked."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = ChatStoreManager(Path(temp_dir), storage_manager=Mock())
+            manager.log_debug = Mock()
+            manager.log_info = Mock()
+            manager.log_warning = Mock()
+
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses",
+                data_version="version-1",
+            )
+            stale_recorded = manager.record_prerendered_graph(
+                "chat-1",
+                "question-1",
+                graph_path="/v1/storage/graph/chat-1/question-1?render=old",
+                selected_graph_pattern="line",
+                data_version="version-0",
+            )
+            recorded = manager.record_prerendered_graph(
+                "chat-1",
+                "question-1",
+                graph_path="/v1/storage/graph/chat-1/question-1?render=top",
+                selected_graph_pattern="bar_vertical",
+                data_version="version-1",
+            )
+            overwritten = manager.record_prerendered_graph(
+                "chat-1",
+                "question-1",
+                graph_path="/v1/storage/graph/chat-1/question-1?render=other",
+                selected_graph_pattern="line",
+                data_version="version-1",
+            )
+            message = manager.load_chat_store()["mensages"][0]
+
+        self.assertFalse(stale_recorded)
+        self.assertTrue(recorded)
+        self.assertFalse(overwritten)
+        self.assertEqual(
+            message["graph_path"],
+            "/v1/storage/graph/chat-1/question-1?render=top",
+        )
+        self.assertEqual(message["selected_graph_pattern"], "bar_vertical")
+
+    def test_migrates_the_legacy_json_store_into_sqlite(self) -> None:
+        """It imports chat_messages.json once, sets it aside and keeps the rows across restarts."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base_dir = Path(temp_dir)
+            (base_dir / "chat_messages.json").write_text(
+                json.dumps(
+                    {
+                        "chat_id": "chat-1",
+                        "mensages": [
+                            {"mensage_id": "question-1", "question": "Show expenses"},
+                            {
+                                "mensage_id": "question-2",
+                                "question": "Show hotels",
+                                "data_version": "version-2",
+                            },
+                        ],
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+            manager = self._build_manager(base_dir)
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses",
+                response="done",
+            )
+            restarted_manager = self._build_manager(base_dir)
+            store = restarted_manager.load_chat_store()
+            data_version = restarted_manager.load_data_version(
+                "chat-1",
+                "question-2",
+                "user@example.com",
+            )
+            legacy_exists = (base_dir / "chat_messages.json").exists()
+            migrated_exists = (base_dir / "chat_messages.json.migrated").exists()
+
+        self.assertEqual(store["chat_id"], "chat-1")
+        self.assertEqual(
+            [message["mensage_id"] for message in store["mensages"]],
+            ["question-1", "question-2"],
+        )
+        self.assertEqual(store["mensages"][0]["response"], "done")
+        self.assertEqual(store["mensages"][1]["data_version"], "version-2")
+        # Legacy messages carry no owner, so no user can revalidate against them.
+        self.assertEqual(data_version, "")
+        self.assertFalse(legacy_exists)
+        self.assertTrue(migrated_exists)
+
+    def test_keeps_a_graph_spec_beside_the_rendered_graph_path(self) -> None:
+        """It stores a spec without erasing the PNG path and drops it with new data."""
+        graph_spec = {"mark": {"type": "bar"}, "data": {"values": [{"total": 10}]}}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = self._build_manager(Path(temp_dir))
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses",
+                graph_path="/v1/storage/graph/chat-1/question-1?render=top",
+                data_version="version-1",
+            )
+            manager.update_message_metadata(
+                "chat-1",
+                "question-1",
+                graph_spec=graph_spec,
+                selected_graph_pattern="bar_vertical",
+            )
+            spec_message = manager.load_chat_store()["mensages"][0]
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses",
+                data_version="version-2",
+            )
+            refreshed_message = manager.load_chat_store()["mensages"][0]
+
+        self.assertEqual(spec_message["graph_spec"], graph_spec)
+        self.assertEqual(
+            spec_message["graph_path"],
+            "/v1/storage/graph/chat-1/question-1?render=top",
+        )
+        self.assertEqual(refreshed_message["graph_spec"], {})
+
+    def test_scopes_data_versions_to_the_message_owner_and_chat(self) -> None:
+        """It only returns a data version to the user who owns the message in that chat."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = self._build_manager(Path(temp_dir))
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses",
+                user_email="Owner@Example.com ",
+                data_version="version-1",
+            )
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses",
+                user_email="intruder@example.com",
+            )
+
+            owner_version = manager.load_data_version(
+                "chat-1",
+                "question-1",
+                "owner@example.com",
+            )
+            intruder_version = manager.load_data_version(
+                "chat-1",
+                "question-1",
+                "intruder@example.com",
+            )
+            other_chat_version = manager.load_data_version(
+                "chat-2",
+                "question-1",
+                "owner@example.com",
+            )
+
+        self.assertEqual(owner_version, "version-1")
+        self.assertEqual(intruder_version, "")
+        self.assertEqual(other_chat_version, "")
+
+    def test_adds_the_owner_column_to_an_existing_store(self) -> None:
+        """It upgrades a store created before messages recorded their owner."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base_dir = Path(temp_dir)
+            with sqlite3.connect(base_dir / "chat_store.sqlite3") as connection:
+                connection.execute(
+                    """
+                    CREATE TABLE chat_messages (
+                        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                        message_id TEXT NOT NULL UNIQUE,
+                        chat_id TEXT NOT NULL,
+                        data_version TEXT NOT NULL DEFAULT '',
+                        message TEXT NOT NULL
+                    )
+                    """
+                )
+            connection.close()
+
+            manager = self._build_manager(base_dir)
+            manager.upsert_mock_message(
+                "chat-1",
+                "question-1",
+                "Show expenses",
+                user_email="owner@example.com",
+                data_version="version-1",
+            )
+            data_version = manager.load_data_version(
+                "chat-1",
+                "question-1",
+                "owner@example.com",
+            )
+
+        self.assertEqual(data_version, "version-1")
+
+    def _build_manager(self, base_dir: Path) -> ChatStoreManager:
+        manager = ChatStoreManager(base_dir, storage_manager=Mock())
+        manager.log_debug = Mock()
+        manager.log_info = Mock()
+        manager.log_warning = Mock()
+        return manager
@@ -0,0 +1,201 @@
+import threading
+import unittest
+from dataclasses import replace
+from unittest.mock import Mock
+
+from src.api.graph_prerender import GraphPrerenderJob
+from src.api.graph_prerender import GraphPrerenderer
+
+
+BAR_SUGGESTION = {
+    "id": "bar_vertical",
+    "label": "Bar",
+    "reason": "Compares categories.",
+    "x_field": "category",
+    "y_field": "amount",
+    "hue_field": "",
+}
+LINE_SUGGESTION = {
+    "id": "line",
+    "label": "Line",
+    "reason": "Shows how the metric changes over time.",
+    "x_field": "expense_date",
+    "y_field": "amount",
+    "hue_field": "",
+}
+RESPONSE_DATA = [{"category": "Hotel", "expense_date": "2025-01-01", "amount": 10}]
+
+
+class GraphPrerendererTests(unittest.TestCase):
+    """Tests for background graph pre-rendering after the ask endpoint."""
+
+    def _build_prerenderer(self, mode: str, **kwargs) -> GraphPrerenderer:
+        graph_agent = Mock()
+        graph_agent.find_rendered_graph.return_value = None
+        graph_agent.get_plotted_fields.side_effect = (
+            lambda graph_pattern: [graph_pattern["x_field"], graph_pattern["y_field"]]
+        )
+        graph_agent.render_graph.side_effect = (
+            lambda **render_kwargs: f"/graph/{render_kwargs['graph_pattern']['id']}"
+        )
+        prerenderer = GraphPrerenderer(graph_agent, Mock(), mode=mode, **kwargs)
+        prerenderer.log_info = Mock()
+        prerenderer.log_warning = Mock()
+        self.addCleanup(prerenderer.shutdown)
+        return prerenderer
+
+    def _build_job(self, response_data=RESPONSE_DATA) -> GraphPrerenderJob:
+        return GraphPrerenderJob(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            question_id="question-1",
+            data_version="version-1",
+            graph_suggestions=(BAR_SUGGESTION, LINE_SUGGESTION),
+            response_data=response_data,
+        )
+
+    def test_skips_jobs_when_disabled(self) -> None:
+        """It does nothing unless GRAPH_PRERENDER selects a mode."""
+        prerenderer = self._build_prerenderer("off")
+
+        self.assertIsNone(prerenderer.submit(self._build_job()))
+        prerenderer.graph_agent.render_graph.assert_not_called()
+
+    def test_renders_the_top_suggestion_and_records_it(self) -> None:
+        """It renders only the first suggestion and stores its path on the message."""
+        prerenderer = self._build_prerenderer("top")
+
+        graph_paths = prerenderer.submit(self._build_job()).result(timeout=5)
+
+        self.assertEqual(graph_paths, ["/graph/bar_vertical"])
+        render_kwargs = prerenderer.graph_agent.render_graph.call_args.kwargs
+        self.assertIs(render_kwargs["response_data"], RESPONSE_DATA)
+        self.assertEqual(render_kwargs["data_version"], "version-1")
+        prerenderer.chat_store_manager.record_prerendered_graph.assert_called_once_with(
+            "chat-1",
+            "question-1",
+            graph_path="/graph/bar_vertical",
+            selected_graph_pattern="bar_vertical",
+            data_version="version-1",
+            user_email="user@example.com",
+        )
+
+    def test_renders_every_suggestion_from_saved_rows(self) -> None:
+        """It reads the plotted columns of spilled results back and renders all suggestions."""
+        prerenderer = self._build_prerenderer("all")
+        prerenderer.chat_store_manager.load_message_data.return_value = RESPONSE_DATA
+
+        graph_paths = prerenderer.submit(self._build_job(response_data=None)).result(
+            timeout=5
+        )
+
+        self.assertEqual(graph_paths, ["/graph/bar_vertical", "/graph/line"])
+        prerenderer.chat_store_manager.load_message_data.assert_called_once_with(
+            "chat-1",
+            "question-1",
+            user_email="user@example.com",
+            columns=["category", "amount", "expense_date"],
+        )
+        prerenderer.chat_store_manager.record_prerendered_graph.assert_called_once()
+
+    def test_reuses_an_existing_render(self) -> None:
+        """It does not draw a pattern whose render is already saved."""
+        prerenderer = self._build_prerenderer("top")
+        prerenderer.graph_agent.find_rendered_graph.return_value = "/graph/cached"
+
+        graph_paths = prerenderer.submit(self._build_job()).result(timeout=5)
+
+        self.assertEqual(graph_paths, ["/graph/cached"])
+        prerenderer.graph_agent.render_graph.assert_not_called()
+
+    def test_drops_jobs_beyond_the_pending_limit_and_serves_waiters(self) -> None:
+        """It keeps the queue bounded and hands the in-flight render to a waiting request."""
+        prerenderer = self._build_prerenderer("top", max_pending=1)
+        render_started = threading.Event()
+        release_render = threading.Event()
+
+        def render_graph(**render_kwargs) -> str:
+            render_started.set()
+            release_render.wait(timeout=5)
+            return "/graph/bar_vertical"
+
+        prerenderer.graph_agent.render_graph.side_effect = render_graph
+        job_future = prerenderer.submit(self._build_job())
+        render_started.wait(timeout=5)
+
+        self.assertIsNone(prerenderer.submit(self._build_job()))
+        waited_path = []
+        waiter = threading.Thread(
+            target=lambda: waited_path.append(
+                prerenderer.wait_for_graph(
+                    user_email="USER@example.com",
+                    chat_id="chat-1",
+                    question_id="question-1",
+                    graph_pattern_id="bar_vertical",
+                    timeout=5,
+                )
+            )
+        )
+        waiter.start()
+        release_render.set()
+        waiter.join(timeout=5)
+        job_future.result(timeout=5)
+
+        self.assertEqual(waited_path, ["/graph/bar_vertical"])
+        prerenderer.log_warning.assert_called_once()
+        self.assertIsNotNone(prerenderer.submit(self._build_job()))
+
+    def test_failed_render_leaves_waiters_to_render_themselves(self) -> None:
+        """It logs the failure and tells waiting requests no render is coming."""
+        prerenderer = self._build_prerenderer("top")
+        prerenderer.graph_agent.render_graph.side_effect = ValueError("bad data")
+
+        graph_paths = prerenderer.submit(self._build_job()).result(timeout=5)
+
+        self.assertEqual(graph_paths, [])
+        prerenderer.log_warning.assert_called_once()
+        prerenderer.chat_store_manager.record_prerendered_graph.assert_not_called()
+        self.assertIsNone(
+            prerenderer.wait_for_graph(
+                user_email="user@example.com",
+                chat_id="chat-1",
+                question_id="question-1",
+                graph_pattern_id="bar_vertical",
+            )
+        )
+
+    def test_shutdown_cancels_queued_jobs_and_frees_their_slots(self) -> None:
+        """It wakes waiters at once and returns the slots of jobs that never started."""
+        prerenderer = self._build_prerenderer("top", max_workers=1, max_pending=2)
+        render_started = threading.Event()
+        release_render = threading.Event()
+
+        def render_graph(**render_kwargs) -> str:
+            render_started.set()
+            release_render.wait(timeout=5)
+            return "/graph/bar_vertical"
+
+        prerenderer.graph_agent.render_graph.side_effect = render_graph
+        running_job = prerenderer.submit(self._build_job())
+        render_started.wait(timeout=5)
+        queued_job = prerenderer.submit(replace(self._build_job(), question_id="question-2"))
+
+        prerenderer.shutdown()
+        waited_path = prerenderer.wait_for_graph(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            question_id="question-1",
+            graph_pattern_id="bar_vertical",
+            timeout=5,
+        )
+        release_render.set()
+
+        self.assertIsNone(waited_path)
+        self.assertTrue(queued_job.cancelled())
+        self.assertEqual(running_job.result(timeout=5), ["/graph/bar_vertical"])
+        prerenderer.log_warning.assert_not_called()
+        self.assertIsNotNone(prerenderer.submit(self._build_job()))
+        self.assertIsNotNone(
+            prerenderer.submit(replace(self._build_job(), question_id="question-2"))
+        )
+
@@ -0,0 +1,37 @@
+import unittest
+
+from src.api.http_cache import accepts_encoding
+from src.api.http_cache import build_etag
+from src.api.http_cache import etag_matches
+from src.api.http_cache import with_content_encoding
+
+
+class HttpCacheTests(unittest.TestCase):
+    """Tests for the ETag and content negotiation helpers."""
+
+    def test_etags_identify_a_representation(self) -> None:
+        """It derives stable strong ETags and separate ones for encoded bodies."""
+        etag = build_etag("version-1", "json", 0)
+
+        self.assertEqual(etag, build_etag("version-1", "json", 0))
+        self.assertNotEqual(etag, build_etag("version-1", "ndjson", 0))
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertEqual(with_content_encoding(etag, "gzip"), f'{etag[:-1]}-gzip"')
+
+    def test_if_none_match_accepts_lists_weak_tags_and_encoded_variants(self) -> None:
+        """It matches any listed tag, ignoring weakness and the encoding suffix."""
+        etag = build_etag("version-1")
+
+        self.assertTrue(etag_matches(f'"other", W/{etag}', etag))
+        self.assertTrue(etag_matches(with_content_encoding(etag, "zstd"), etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches('"other"', etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertFalse(etag_matches("*", ""))
+
+    def test_accept_encoding_honours_quality_values(self) -> None:
+        """It treats q=0 as a refusal and a wildcard as acceptance."""
+        self.assertTrue(accepts_encoding("br, gzip;q=0.8", "gzip"))
+        self.assertFalse(accepts_encoding("gzip;q=0, identity", "gzip"))
+        self.assertTrue(accepts_encoding("*", "zstd"))
+        self.assertFalse(accepts_encoding(None, "gzip"))
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from src.api.http_cache import PUBLIC_IMMUTABLE_CACHE_CONTROL
+from src.api.http_cache import REVALIDATE_CACHE_CONTROL
+from src.api.static_assets import FingerprintedStaticFiles
+from src.api.static_assets import StaticAssetBundle
+
+
+class StaticAssetBundleTests(unittest.TestCase):
+    """Tests for fingerprinted, precompressed frontend asset serving."""
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.assets_dir = Path(temp_dir.name)
+        (self.assets_dir / "vendor").mkdir()
+        (self.assets_dir / "vendor" / "lib.mjs").write_text(
+            "export const value = 1;\n" + "// padding\n" * 200,
+            encoding="utf-8",
+        )
+        (self.assets_dir / "main.js").write_text(
+            'import { value } from "./vendor/lib.mjs";\nconsole.log(value);\n',
+            encoding="utf-8",
+        )
+        self.bundle = StaticAssetBundle(self.assets_dir)
+        self.bundle.log_debug = lambda *args, **kwargs: None
+
+    def test_imports_and_pages_carry_content_fingerprints(self) -> None:
+        """It rewrites relative imports and HTML asset URLs with current fingerprints."""
+        library = self.bundle.get_asset("vendor/lib.mjs")
+        main = self.bundle.get_asset("main.js")
+        html_path = self.assets_dir / "index.html"
+        html_path.write_text('<script src="/assets/main.js?v=manual"></script>', encoding="utf-8")
+
+        self.assertIn(f'"./vendor/lib.mjs?v={library.fingerprint}"', main.body.decode())
+        self.assertEqual(
+            self.bundle.render_html(html_path),
+            f'<script src="/assets/main.js?v={main.fingerprint}"></script>',
+        )
+        self.assertIsNone(self.bundle.get_asset("../outside.js"))
+
+    def test_a_changed_import_changes_the_importer_fingerprint(self) -> None:
+        """It rebuilds a module when any file it imports changes on disk."""
+        first_fingerprint = self.bundle.get_asset("main.js").fingerprint
+        library_path = self.assets_dir / "vendor" / "lib.mjs"
+        library_path.write_text("export const value = 2;\n", encoding="utf-8")
+        stat = library_path.stat()
+        os.utime(library_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertNotEqual(self.bundle.get_asset("main.js").fingerprint, first_fingerprint)
+
+    def test_serves_long_cached_precompressed_assets_and_304s(self) -> None:
+        """It caches fingerprinted URLs for a year and answers revalidation with 304."""
+        client = TestClient(
+            Starlette(routes=[Mount("/assets", app=FingerprintedStaticFiles(self.bundle))])
+        )
+        library = self.bundle.get_asset("vendor/lib.mjs")
+
+        response = client.get(
+            f"/assets/vendor/lib.mjs?v={library.fingerprint}",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        plain_response = client.get(
+            "/assets/vendor/lib.mjs",
+            headers={"Accept-Encoding": "identity"},
+        )
+        revalidated = client.get(
+            "/assets/vendor/lib.mjs",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+
+        self.assertEqual(response.headers["cache-control"], PUBLIC_IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.content, library.body)
+        self.assertEqual(plain_response.headers["cache-control"], REVALIDATE_CACHE_CONTROL)
+        self.assertNotIn("content-encoding", plain_response.headers)
+        self.assertEqual(plain_response.headers["etag"], library.etag)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(client.get("/assets/missing.js").status_code, 404)
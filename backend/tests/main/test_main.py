@@ -3,6 +3,8 @@ from unittest.mock import call
 from unittest.mock import patch
 from src.agents.security_agent.tool_kit import SecurityCategory
 from src.agents.security_agent.tool_kit import SecurityDecision
+from src.infra.column_profile import ColumnProfile
+from src.infra.query_backend import QueryJobStatistics
 from src.main.main import OrchestrateAgent
 from src.main.main import QueryResultValidator
 
@@ -63,6 +65,30 @@ class QueryResultValidatorTests(unittest.TestCase):
 
         self.assertIsNone(issue)
 
+    def test_reuses_the_given_column_profile(self) -> None:
+        """It judges the result from the supplied profile without profiling again."""
+        validator = QueryResultValidator()
+        column_profile = ColumnProfile(
+            row_count=1,
+            columns=("company_id", "note"),
+            numeric_columns=("company_id",),
+            categorical_columns=("note",),
+            populated_columns=("company_id",),
+        )
+
+        with patch.object(validator._column_profiler, "profile") as profile:
+            issue = validator.validate(
+                question_text="How much did my travel expenses cost this month?",
+                response_data=[{"company_id": 1, "note": " "}],
+                column_profile=column_profile,
+            )
+
+        profile.assert_not_called()
+        self.assertEqual(
+            issue,
+            "Query returned only company_id without any analytical metric or dimension.",
+        )
+
 
 class OrchestrateAgentSecurityTests(unittest.TestCase):
     """Tests for orchestration behavior around the security gate."""
@@ -213,6 +239,42 @@ class OrchestrateAgentSecurityTests(unittest.TestCase):
         self.assertEqual(result["response_natural_language"], "")
         instances["response"].generate_natural_language.assert_not_called()
 
+    def test_collects_query_statistics_with_job_labels(self) -> None:
+        """It forwards context and attempt labels and returns job statistics as debug data."""
+        orchestrator, instances = self._build_orchestrator_with_mocks()
+        instances["security"].check_safety.return_value = SecurityDecision(
+            is_safe=True,
+            category=SecurityCategory.SAFE,
+            reason="General analytical question.",
+        )
+        instances["db"].get_schema.return_value = {"company_id": "INTEGER"}
+        instances["query"].generate_sql.return_value = (
+            "SELECT company_id, total FROM test_ia.air_tickets"
+        )
+        instances["db"].execute_query.return_value = [{"company_id": 1, "total": 125.0}]
+        instances["db"].last_query_statistics = QueryJobStatistics(
+            source="bigquery",
+            bytes_processed=2048,
+            row_count=1,
+        )
+
+        result = orchestrator.run_agent(
+            input_question="How much did my travel expenses cost this month?",
+            input_user="user@example.com",
+            input_chat_id="chat-1",
+            input_question_id="question-1",
+            input_response_types=["SQL"],
+            input_question_context="TRAVEL",
+        )
+
+        execute_kwargs = instances["db"].execute_query.call_args.kwargs
+        self.assertEqual(execute_kwargs["context"], "TRAVEL")
+        self.assertEqual(execute_kwargs["attempt"], 1)
+        self.assertEqual(
+            result["debug"]["query_statistics"][0]["bytes_processed"],
+            2048,
+        )
+
     def test_graph_mode_returns_suggestions_without_rendering_file(self) -> None:
         """It returns graph suggestions during /ask without rendering the final image."""
         orchestrator, instances = self._build_orchestrator_with_mocks()
@@ -260,6 +322,12 @@ class OrchestrateAgentSecurityTests(unittest.TestCase):
         self.assertEqual(result["graph_suggestions"][0]["id"], "bar_vertical")
         instances["response"].generate_natural_language.assert_not_called()
         instances["graph"].suggest_graphs.assert_called_once()
+        column_profile = instances["graph"].suggest_graphs.call_args.kwargs[
+            "column_profile"
+        ]
+        self.assertIs(result["column_profile"], column_profile)
+        self.assertEqual(column_profile.numeric_columns, ("company_id", "total"))
+        self.assertEqual(column_profile.datetime_columns, ("month",))
 
     def test_query_execution_failure_regenerates_sql_with_db_error(self) -> None:
         """It retries execution, then regenerates SQL using the DB error and previous SQL."""
@@ -4,6 +4,7 @@ from unittest.mock import Mock
 from unittest.mock import patch
 
 from src.infra.config.config_google.bigquery_maganger import BigQueryManager
+from src.infra.config.config_google.query_backend import BigQueryBackend
 
 
 class BigQueryManagerExecuteQueryTests(unittest.TestCase):
@@ -11,22 +12,25 @@ class BigQueryManagerExecuteQueryTests(unittest.TestCase):
 
     def test_uses_parameterized_email_filter(self) -> None:
         """It passes the login-derived email as a query parameter instead of interpolating it."""
-        manager = BigQueryManager.__new__(BigQueryManager)
+        bq_client = Mock()
+        manager = BigQueryManager(
+            backend=BigQueryBackend(bq_client),
+            result_cache=None,
+        )
         manager.project_id = "test-project"
-        manager.bq_client = Mock()
         manager.log_debug = Mock()
         manager.log_info = Mock()
         manager.log_error = Mock()
 
         query_job = Mock()
         query_job.result.return_value = [{"company_id": 1}]
-        manager.bq_client.query.return_value = query_job
+        bq_client.query.return_value = query_job
 
         with patch(
-            "src.infra.config.config_google.bigquery_maganger.bigquery.QueryJobConfig",
+            "src.infra.config.config_google.query_backend.bigquery.QueryJobConfig",
             return_value="job-config",
         ) as job_config_class, patch(
-            "src.infra.config.config_google.bigquery_maganger.bigquery.ScalarQueryParameter",
+            "src.infra.config.config_google.query_backend.bigquery.ScalarQueryParameter",
             return_value="email-param",
         ) as scalar_parameter:
             result = manager.execute_query(
@@ -36,7 +40,7 @@ class BigQueryManagerExecuteQueryTests(unittest.TestCase):
                 question_id="question-1",
             )
 
-        executed_sql = manager.bq_client.query.call_args.args[0]
+        executed_sql = bq_client.query.call_args.args[0]
         self.assertIn("@user_email", executed_sql)
         self.assertIn("test_ia.users", executed_sql)
         self.assertIn("WHERE company_id IN", executed_sql)
@@ -52,4 +56,54 @@ class BigQueryManagerExecuteQueryTests(unittest.TestCase):
             use_query_cache=True,
             priority=ANY,
             query_parameters=["email-param"],
+            labels=ANY,
+        )
+        labels = job_config_class.call_args.kwargs["labels"]
+        self.assertEqual(labels["app"], "analytical_agent")
+        self.assertRegex(labels["chat_id_hash"], r"^[a-f0-9]{16}$")
+        self.assertNotIn("chat-1", labels.values())
+
+
+class BigQueryBackendStatisticsTests(unittest.TestCase):
+    """Tests for QueryJob statistics capture."""
+
+    def test_collects_job_statistics_and_query_plan(self) -> None:
+        """It reads bytes, slots, cache state and plan stages from the finished job."""
+        from datetime import datetime
+        from datetime import timedelta
+
+        started = datetime(2026, 1, 1, 12, 0, 0)
+        stage = Mock()
+        stage.name = "S00: Input"
+        stage.status = "COMPLETE"
+        stage.slot_ms = 40
+        query_job = Mock()
+        query_job.job_id = "job-1"
+        query_job.started = started
+        query_job.ended = started + timedelta(milliseconds=250)
+        query_job.total_bytes_processed = 2048
+        query_job.total_bytes_billed = 10485760
+        query_job.slot_millis = 120
+        query_job.cache_hit = False
+        query_job.query_plan = [stage]
+        query_job.result.return_value = [{"company_id": 1}]
+        bq_client = Mock()
+        bq_client.query.return_value = query_job
+
+        rows, statistics = BigQueryBackend(bq_client).run_query_with_statistics(
+            "SELECT company_id FROM test",
+            user_email="user@example.com",
+            labels={"context": "travel", "attempt": "2"},
         )
+
+        self.assertEqual(rows, [{"company_id": 1}])
+        self.assertEqual(statistics.job_id, "job-1")
+        self.assertEqual(statistics.elapsed_ms, 250)
+        self.assertEqual(statistics.bytes_processed, 2048)
+        self.assertEqual(statistics.bytes_billed, 10485760)
+        self.assertEqual(statistics.slot_millis, 120)
+        self.assertFalse(statistics.cache_hit)
+        self.assertEqual(statistics.stages[0]["name"], "S00: Input")
+        self.assertEqual(statistics.labels["context"], "travel")
+        job_config = bq_client.query.call_args.kwargs["job_config"]
+        self.assertEqual(job_config.labels, {"context": "travel", "attempt": "2"})
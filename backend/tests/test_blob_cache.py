@@ -0,0 +1,228 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from src.infra.blob_cache import BlobCache
+from src.infra.config.config_google.storage_manager import DATA_FORMAT_PARQUET
+from src.infra.config.config_google.storage_manager import StorageManager
+from src.infra.storage_codec import COMPRESSION_NONE
+from src.infra.storage_codec import StorageCodec
+
+
+ROWS = [
+    {"category": "Hotel", "amount": 10.5},
+    {"category": "Flight", "amount": 20},
+]
+
+
+class FakeBlob:
+    """Blob double that records the GCS calls a read makes."""
+
+    def __init__(self, name: str, generation: int = 1) -> None:
+        self.name = name
+        self.generation = generation
+        self.size = None
+        self.content_encoding = None
+        self.remote_body = b""
+        self.download_as_bytes = Mock(side_effect=lambda **kwargs: self.remote_body)
+        self.reload = Mock(side_effect=self._reload)
+        self.exists = Mock(return_value=True)
+        self.delete = Mock()
+        self.open = Mock(side_effect=AssertionError("ranged read not expected"))
+
+    def upload_from_string(self, body: bytes, content_type: str) -> None:
+        self.remote_body = body
+        self.generation += 1
+
+    def upload_from_filename(self, path: str, content_type: str) -> None:
+        self.upload_from_string(Path(path).read_bytes(), content_type)
+
+    def _reload(self) -> None:
+        self.size = len(self.remote_body)
+
+
+class BlobCacheTests(unittest.TestCase):
+    """Tests for the generation-keyed storage read cache."""
+
+    def test_serves_the_latest_generation_and_drops_the_previous_one(self) -> None:
+        """It keys bodies by generation so an overwritten blob is never served stale."""
+        cache = BlobCache(max_bytes=100)
+        cache.set("chat/data/q.json", 1, b"old")
+        cache.set("chat/data/q.json", 2, b"new")
+
+        self.assertEqual(cache.get("chat/data/q.json"), b"new")
+        self.assertIsNone(cache.get("chat/data/q.json", 1))
+        self.assertEqual(cache.total_bytes, 3)
+        cache.forget("chat/data/q.json")
+        self.assertIsNone(cache.get("chat/data/q.json"))
+
+    def test_evicts_least_recently_used_bodies_over_byte_budget(self) -> None:
+        """It keeps the memory tier under its bound and skips oversized bodies."""
+        cache = BlobCache(max_bytes=10)
+        cache.set("first", 1, b"a" * 4)
+        cache.set("second", 1, b"b" * 4)
+        cache.get("first")
+        cache.set("third", 1, b"c" * 4)
+        cache.set("huge", 1, b"d" * 11)
+
+        self.assertIsNotNone(cache.get("first"))
+        self.assertIsNone(cache.get("second"))
+        self.assertIsNone(cache.get("huge"))
+        self.assertLessEqual(cache.total_bytes, 10)
+
+    def test_disk_tier_survives_a_restart_for_a_known_generation(self) -> None:
+        """It reads a body back from disk once the generation is looked up again."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            BlobCache(max_bytes=100, disk_dir=Path(temp_dir)).set("graph.png", 7, b"png")
+            restarted_cache = BlobCache(max_bytes=100, disk_dir=Path(temp_dir))
+
+            self.assertIsNone(restarted_cache.get("graph.png"))
+            self.assertEqual(restarted_cache.get("graph.png", 7), b"png")
+            self.assertEqual(restarted_cache.get("graph.png"), b"png")
+            self.assertIsNone(restarted_cache.get("graph.png", 8))
+
+    def test_prunes_the_disk_tier_to_its_size_cap(self) -> None:
+        """It deletes the oldest files once the directory grows past the cap."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = BlobCache(max_bytes=100, disk_dir=Path(temp_dir), disk_max_bytes=10)
+            for index in range(4):
+                cache.set(f"blob-{index}", 1, b"x" * 4)
+
+            disk_bytes = sum(path.stat().st_size for path in Path(temp_dir).iterdir())
+            self.assertLessEqual(disk_bytes, 10)
+
+
+class StorageManagerBlobCacheTests(unittest.TestCase):
+    """Tests for stored data and graphs read through the local cache."""
+
+    def _build_manager(self, blob_cache: BlobCache) -> tuple[StorageManager, dict]:
+        with patch.object(StorageManager, "log_warning"):
+            manager = StorageManager(codec=StorageCodec(compression=COMPRESSION_NONE))
+        manager.blob_cache = blob_cache
+        blobs = {}
+        manager._build_blob = Mock(
+            side_effect=lambda blob_name: blobs.setdefault(blob_name, FakeBlob(blob_name))
+        )
+        return manager, blobs
+
+    def _data_kwargs(self) -> dict:
+        return {"user_email": "user@example.com", "chat_id": "chat-1", "message_id": "q-1"}
+
+    def test_written_data_is_read_back_without_downloading(self) -> None:
+        """It populates the cache on write, so repeat reads only check the generation."""
+        manager, blobs = self._build_manager(BlobCache(max_bytes=1024 * 1024))
+
+        manager.save_json_data(payload=ROWS, **self._data_kwargs())
+        first_rows = manager.load_json_data(**self._data_kwargs())
+        second_rows = manager.load_json_data(columns=["amount"], **self._data_kwargs())
+
+        self.assertEqual(first_rows, ROWS)
+        self.assertEqual(second_rows, [{"amount": 10.5}, {"amount": 20}])
+        for blob in blobs.values():
+            blob.download_as_bytes.assert_not_called()
+            self.assertEqual(blob.reload.call_count, 2)
+
+    def test_data_overwritten_by_another_worker_is_downloaded_again(self) -> None:
+        """It never serves a cached body once the blob has a newer generation."""
+        manager, blobs = self._build_manager(BlobCache(max_bytes=1024 * 1024))
+        manager.save_json_data(payload=ROWS, **self._data_kwargs())
+        data_blob = next(iter(blobs.values()))
+        manager.load_json_data(**self._data_kwargs())
+
+        data_blob.remote_body = b'[{"category": "Taxi", "amount": 5}]'
+        data_blob.generation += 1
+
+        self.assertEqual(
+            manager.load_json_data(**self._data_kwargs()),
+            [{"category": "Taxi", "amount": 5}],
+        )
+        data_blob.download_as_bytes.assert_called_once_with(raw_download=True)
+
+    def test_blobs_deleted_elsewhere_are_not_reported_present(self) -> None:
+        """It asks GCS whether mutable blobs exist and trusts the cache only for renders."""
+        manager, blobs = self._build_manager(BlobCache(max_bytes=1024 * 1024))
+        manager.data_format = DATA_FORMAT_PARQUET
+        manager.save_json_data(payload=ROWS, **self._data_kwargs())
+        parquet_blob = next(iter(blobs.values()))
+        parquet_blob.exists.return_value = False
+
+        self.assertFalse(manager._blob_exists(parquet_blob))
+        parquet_blob.exists.assert_called_once_with()
+
+    def test_graphs_are_cached_on_write_and_on_first_download(self) -> None:
+        """It serves saved renders locally and downloads an unknown image once."""
+        manager, blobs = self._build_manager(BlobCache(max_bytes=1024 * 1024))
+        graph_kwargs = {**self._data_kwargs(), "render_key": "abc"}
+        manager.save_graph_render(image_bytes=b"render", **graph_kwargs)
+
+        self.assertTrue(manager.graph_render_exists(**graph_kwargs))
+        self.assertEqual(manager.load_graph_render(**graph_kwargs), b"render")
+        render_blob = next(iter(blobs.values()))
+        render_blob.exists.assert_not_called()
+        render_blob.download_as_bytes.assert_not_called()
+
+        image_name = manager._build_graph_blob_name(**self._data_kwargs())
+        blobs[image_name] = FakeBlob(image_name)
+        blobs[image_name].remote_body = b"legacy"
+        for _ in range(2):
+            self.assertEqual(manager.load_graph_image(**self._data_kwargs()), b"legacy")
+        blobs[image_name].download_as_bytes.assert_called_once_with(raw_download=False)
+
+    def test_disk_tier_needs_only_metadata_after_a_restart(self) -> None:
+        """It looks up the generation and reads the body from the disk tier."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager, blobs = self._build_manager(
+                BlobCache(max_bytes=1024 * 1024, disk_dir=Path(temp_dir))
+            )
+            manager.save_json_data(payload=ROWS, **self._data_kwargs())
+            manager.blob_cache = BlobCache(max_bytes=1024 * 1024, disk_dir=Path(temp_dir))
+
+            rows = manager.load_json_data(**self._data_kwargs())
+
+            data_blob = next(iter(blobs.values()))
+            self.assertEqual(rows, ROWS)
+            data_blob.reload.assert_called_once_with()
+            data_blob.download_as_bytes.assert_not_called()
+
+    def test_parquet_is_cached_whole_and_read_locally(self) -> None:
+        """It downloads a small Parquet blob once and projects it from memory."""
+        manager, blobs = self._build_manager(BlobCache(max_bytes=1024 * 1024))
+        manager.data_format = DATA_FORMAT_PARQUET
+        manager.save_json_data(payload=ROWS, **self._data_kwargs())
+        manager.blob_cache.clear()
+
+        for _ in range(2):
+            rows = manager.load_json_data(columns=["category"], limit=1, **self._data_kwargs())
+
+        parquet_blob = next(iter(blobs.values()))
+        self.assertEqual(rows, [{"category": "Hotel"}])
+        parquet_blob.download_as_bytes.assert_called_once_with()
+        parquet_blob.open.assert_not_called()
+
+    def test_deleted_blobs_are_forgotten(self) -> None:
+        """It stops serving a blob that was deleted through the manager."""
+        manager, blobs = self._build_manager(BlobCache(max_bytes=1024 * 1024))
+        manager.save_json_data(payload=ROWS, **self._data_kwargs())
+        data_blob = next(iter(blobs.values()))
+
+        manager._delete_blob(data_blob)
+
+        self.assertIsNone(manager.blob_cache.get(data_blob.name))
+
+    def test_passthrough_streams_cache_their_body(self) -> None:
+        """It caches a streamed blob once it was read to the end."""
+        manager, blobs = self._build_manager(BlobCache(max_bytes=1024 * 1024))
+        manager.save_json_data(payload=ROWS, **self._data_kwargs())
+        data_blob = next(iter(blobs.values()))
+        body = data_blob.remote_body
+        manager.blob_cache.clear()
+        data_blob.open = Mock(side_effect=lambda *args, **kwargs: io.BytesIO(body))
+
+        for _ in range(2):
+            stored_stream = manager.open_json_stream(**self._data_kwargs())
+            self.assertEqual(b"".join(stored_stream.chunks), body)
+
+        data_blob.open.assert_called_once()
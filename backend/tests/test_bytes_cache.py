@@ -0,0 +1,42 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.infra.bytes_cache import BytesCache
+
+
+class BytesCacheTests(unittest.TestCase):
+    """Tests for the shared byte-bounded LRU and its disk tier."""
+
+    def test_evicts_least_recently_used_bodies_beyond_the_byte_budget(self) -> None:
+        """It keeps the most recently read bodies within max_bytes."""
+        cache = BytesCache(max_bytes=10)
+        cache.set("first", b"12345")
+        cache.set("second", b"12345")
+        cache.get("first")
+        cache.set("third", b"12345")
+        cache.set("huge", b"x" * 11)
+
+        self.assertEqual(cache.get("first"), b"12345")
+        self.assertIsNone(cache.get("second"))
+        self.assertIsNone(cache.get("huge"))
+        self.assertEqual(cache.total_bytes, 10)
+
+    def test_reads_back_and_discards_bodies_in_the_disk_tier(self) -> None:
+        """It restores bodies written by another process and prunes to the disk cap."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            BytesCache(max_bytes=100, disk_dir=Path(temp_dir)).set("render", b"png")
+            cache = BytesCache(max_bytes=100, disk_dir=Path(temp_dir), disk_max_bytes=10)
+
+            self.assertEqual(cache.get("render"), b"png")
+            cache.discard("render")
+            self.assertIsNone(cache.get("render"))
+
+            for index in range(4):
+                cache.set(f"body-{index}", b"x" * 4)
+            disk_bytes = sum(path.stat().st_size for path in Path(temp_dir).iterdir())
+            self.assertLessEqual(disk_bytes, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
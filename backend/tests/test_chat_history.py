@@ -0,0 +1,124 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from langchain_core.messages import AIMessage
+from langchain_core.messages import HumanMessage
+
+from src.infra.chat_history import BoundedChatMessageHistory
+from src.infra.chat_history import InMemoryChatHistoryBackend
+from src.infra.chat_history import SQLiteChatHistoryBackend
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class InMemoryChatHistoryBackendTests(unittest.TestCase):
+    """Tests for the bounded in-process history backend."""
+
+    def test_caps_messages_per_chat(self) -> None:
+        """It keeps only the most recent messages of each chat."""
+        backend = InMemoryChatHistoryBackend(
+            max_sessions=10,
+            ttl_seconds=0,
+            max_messages_per_chat=3,
+        )
+        history = BoundedChatMessageHistory("chat-1", backend)
+
+        for index in range(3):
+            history.add_user_message(f"question {index}")
+            history.add_ai_message(f"answer {index}")
+
+        self.assertEqual(
+            [message.content for message in history.messages],
+            ["answer 1", "question 2", "answer 2"],
+        )
+        self.assertEqual(history.message_window()[0], 3)
+
+    def test_evicts_least_recently_used_chats(self) -> None:
+        """It drops the oldest chat once the chat limit is exceeded."""
+        backend = InMemoryChatHistoryBackend(
+            max_sessions=2,
+            ttl_seconds=0,
+            max_messages_per_chat=10,
+        )
+        backend.add_messages("chat-1", [HumanMessage("one")])
+        backend.add_messages("chat-2", [HumanMessage("two")])
+        backend.get_messages("chat-1")
+        backend.add_messages("chat-3", [HumanMessage("three")])
+
+        self.assertEqual(backend.session_count, 2)
+        self.assertEqual(backend.get_messages("chat-2"), [])
+        self.assertEqual(backend.get_messages("chat-1")[0].content, "one")
+
+    def test_expires_idle_chats(self) -> None:
+        """It forgets chats that were idle longer than the TTL."""
+        clock = FakeClock()
+        backend = InMemoryChatHistoryBackend(
+            max_sessions=10,
+            ttl_seconds=60,
+            max_messages_per_chat=10,
+            clock=clock,
+        )
+        backend.add_messages("chat-1", [HumanMessage("hello")])
+
+        clock.now += 61
+
+        self.assertEqual(backend.get_messages("chat-1"), [])
+
+
+class SQLiteChatHistoryBackendTests(unittest.TestCase):
+    """Tests for the history backend shared between worker processes."""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "history.sqlite3"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_shares_history_between_backend_instances(self) -> None:
+        """It exposes messages written by another instance of the same file."""
+        writer = SQLiteChatHistoryBackend(self.path, ttl_seconds=0, max_messages_per_chat=10)
+        reader = SQLiteChatHistoryBackend(self.path, ttl_seconds=0, max_messages_per_chat=10)
+
+        writer.add_messages("chat-1", [HumanMessage("question"), AIMessage("answer")])
+
+        messages = reader.get_messages("chat-1")
+        self.assertIsInstance(messages[0], HumanMessage)
+        self.assertIsInstance(messages[1], AIMessage)
+        self.assertEqual([message.content for message in messages], ["question", "answer"])
+
+    def test_applies_message_cap_and_ttl(self) -> None:
+        """It trims each chat to the cap and prunes expired messages."""
+        clock = FakeClock()
+        backend = SQLiteChatHistoryBackend(
+            self.path,
+            ttl_seconds=60,
+            max_messages_per_chat=2,
+            clock=clock,
+        )
+        backend.add_messages("old-chat", [HumanMessage("stale")])
+        clock.now += 61
+        backend.add_messages(
+            "chat-1",
+            [HumanMessage("one"), AIMessage("two"), HumanMessage("three")],
+        )
+
+        self.assertEqual(
+            backend.get_message_window("chat-1"),
+            (1, [AIMessage("two"), HumanMessage("three")]),
+        )
+        self.assertEqual(backend.get_messages("old-chat"), [])
+
+        backend.add_messages("old-chat", [HumanMessage("fresh")])
+        self.assertEqual(backend.get_message_window("old-chat")[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
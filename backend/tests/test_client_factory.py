@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from src.infra.config.config_google.client_factory import GoogleClientFactory
+
+
+class GoogleClientFactoryTests(unittest.TestCase):
+    """Tests for shared Google Cloud client creation."""
+
+    def _build_factory(self) -> GoogleClientFactory:
+        factory = GoogleClientFactory(
+            project_id="test-project",
+            project_sa="/tmp/service-account.json",
+            pool_size=8,
+        )
+        factory.log_debug = Mock()
+        return factory
+
+    def test_loads_credentials_once_and_reuses_clients(self) -> None:
+        """It reads the service account a single time and shares both clients."""
+        factory = self._build_factory()
+
+        with patch(
+            "src.infra.config.config_google.client_factory.service_account.Credentials"
+            ".from_service_account_file",
+            return_value="credentials",
+        ) as load_credentials, patch(
+            "src.infra.config.config_google.client_factory.AuthorizedSession",
+        ), patch(
+            "src.infra.config.config_google.client_factory.bigquery.Client",
+        ) as bigquery_client, patch(
+            "src.infra.config.config_google.client_factory.storage.Client",
+        ) as storage_client:
+            first_bigquery = factory.bigquery_client()
+            second_bigquery = factory.bigquery_client()
+            first_storage = factory.storage_client()
+            second_storage = factory.storage_client()
+
+        self.assertIs(first_bigquery, second_bigquery)
+        self.assertIs(first_storage, second_storage)
+        load_credentials.assert_called_once()
+        bigquery_client.assert_called_once()
+        storage_client.assert_called_once()
+        self.assertEqual(
+            bigquery_client.call_args.kwargs["credentials"],
+            "credentials",
+        )
+
+    def test_mounts_connection_pool_sized_for_concurrency(self) -> None:
+        """It mounts an HTTPS adapter whose pool matches the configured size."""
+        factory = self._build_factory()
+
+        with patch(
+            "src.infra.config.config_google.client_factory.AuthorizedSession",
+        ) as authorized_session, patch(
+            "src.infra.config.config_google.client_factory.HTTPAdapter",
+        ) as http_adapter:
+            session = factory._build_http_session("credentials")
+
+        http_adapter.assert_called_once_with(pool_connections=8, pool_maxsize=8)
+        authorized_session.return_value.mount.assert_called_once_with(
+            "https://",
+            http_adapter.return_value,
+        )
+        self.assertIs(session, authorized_session.return_value)
+
+    def test_requires_service_account_path(self) -> None:
+        """It refuses to build clients without a service-account file."""
+        factory = GoogleClientFactory(project_id="test-project", project_sa="")
+
+        with self.assertRaises(EnvironmentError):
+            factory.bigquery_client()
+
+    def test_builds_an_anonymous_client_for_the_storage_emulator(self) -> None:
+        """It points the storage client at the emulator without loading credentials."""
+        factory = self._build_factory()
+
+        with patch(
+            "src.infra.config.config_google.client_factory.settings"
+        ) as settings_mock, patch(
+            "src.infra.config.config_google.client_factory.service_account.Credentials"
+            ".from_service_account_file",
+        ) as load_credentials:
+            settings_mock.storage_emulator_host = "http://localhost:4443"
+            client = factory.storage_client()
+
+        self.assertEqual(client.api_endpoint, "http://localhost:4443")
+        self.assertEqual(client.project, "test-project")
+        load_credentials.assert_not_called()
+
+    def test_signs_emulator_urls_with_a_generated_key(self) -> None:
+        """It signs emulator URLs without PROJECT_SA and still requires it otherwise."""
+        factory = GoogleClientFactory(project_id="test-project", project_sa="")
+        factory.log_debug = Mock()
+
+        with patch(
+            "src.infra.config.config_google.client_factory.settings"
+        ) as settings_mock:
+            settings_mock.storage_emulator_host = "http://localhost:4443"
+            first_signer = factory.signing_credentials()
+            second_signer = factory.signing_credentials()
+            settings_mock.storage_emulator_host = ""
+            with self.assertRaises(EnvironmentError):
+                factory.signing_credentials()
+
+        self.assertIs(first_signer, second_signer)
+        self.assertTrue(first_signer.sign_bytes(b"payload"))
@@ -0,0 +1,125 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.infra import column_profile as column_profile_module
+from src.infra.column_profile import ColumnProfile
+from src.infra.column_profile import ColumnProfiler
+from src.infra.column_profile import parse_datetime_series
+
+
+class ColumnProfilerTests(unittest.TestCase):
+    """Tests for the shared one-pass column profiler."""
+
+    def test_classifies_columns_once_in_result_order(self) -> None:
+        """It splits numeric, datetime and categorical columns and skips empty ones."""
+        profile = ColumnProfiler().profile(
+            [
+                {
+                    "company_id": 1,
+                    "month": "2026-01",
+                    "day": date(2026, 1, 1),
+                    "amount": Decimal("10.5"),
+                    "is_refund": False,
+                    "note": " ",
+                    "unused": None,
+                },
+                {
+                    "company_id": 1,
+                    "month": "2026-02",
+                    "day": date(2026, 2, 1),
+                    "amount": 7,
+                    "is_refund": True,
+                    "note": "",
+                    "unused": None,
+                },
+            ]
+        )
+
+        self.assertEqual(profile.row_count, 2)
+        self.assertEqual(
+            profile.columns,
+            ("company_id", "month", "day", "amount", "is_refund", "note"),
+        )
+        self.assertEqual(profile.numeric_columns, ("company_id", "amount"))
+        self.assertEqual(profile.datetime_columns, ("month", "day"))
+        self.assertEqual(profile.categorical_columns, ("is_refund", "note"))
+        self.assertNotIn("note", profile.populated_columns)
+
+    def test_profiles_row_values_like_a_frame(self) -> None:
+        """It classifies values collected from row dicts with the frame rules."""
+        profiler = ColumnProfiler(sample_size=2)
+        rows = [
+            {"amount": 1, "code": 1, "month": "2026-01", "flag": True, "note": " "},
+            {"amount": float("nan"), "code": 2, "month": "bad", "flag": False},
+            {"amount": Decimal("2.5"), "code": "A3", "month": None, "extra": None},
+        ]
+
+        values_by_column = profiler.collect_values(rows)
+
+        self.assertEqual(values_by_column["amount"], [1, Decimal("2.5")])
+        self.assertEqual(values_by_column["extra"], [])
+        self.assertEqual(
+            profiler.profile_values(values_by_column, len(rows)),
+            profiler.profile(rows),
+        )
+
+    def test_skips_the_full_scan_when_the_sample_is_not_numeric(self) -> None:
+        """It classifies object columns from the sample before scanning every value."""
+        profiler = ColumnProfiler(sample_size=5)
+        rows = [{"category": "Hotel"} for _ in range(1000)]
+
+        with patch.object(profiler, "_all_numeric") as all_numeric:
+            profile = profiler.profile(rows)
+
+        all_numeric.assert_not_called()
+        self.assertEqual(profile.categorical_columns, ("category",))
+
+    def test_rejects_columns_with_non_numeric_values_after_the_sample(self) -> None:
+        """It confirms a numeric-looking sample against the whole column."""
+        rows = [{"code": index} for index in range(30)] + [{"code": "A-1"}]
+
+        profile = ColumnProfiler(sample_size=5).profile(rows)
+
+        self.assertEqual(profile.categorical_columns, ("code",))
+
+    def test_round_trips_through_a_plain_dict(self) -> None:
+        """It rebuilds stored profiles and rejects payloads that are not one."""
+        profile = ColumnProfile(
+            row_count=3,
+            columns=("month", "total"),
+            numeric_columns=("total",),
+            datetime_columns=("month",),
+            populated_columns=("month", "total"),
+        )
+
+        self.assertEqual(ColumnProfile.from_dict(profile.to_dict()), profile)
+        self.assertIsNone(ColumnProfile.from_dict({"columns": []}))
+        self.assertIsNone(ColumnProfile.from_dict("profile"))
+
+
+class ParseDatetimeSeriesTests(unittest.TestCase):
+    """Tests for cached date parsing."""
+
+    def test_parses_each_distinct_value_once(self) -> None:
+        """It maps repeated dates from one parse and leaves bad values empty."""
+        series = pd.Series(["2026-01-05", "2026-01-05", None, "not a date"] * 50)
+
+        with patch.object(
+            column_profile_module,
+            "parse_datetime_value",
+            wraps=column_profile_module.parse_datetime_value,
+        ) as parse_datetime_value:
+            parsed = parse_datetime_series(series)
+
+        self.assertEqual(parse_datetime_value.call_count, 2)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(parsed.dtype))
+        self.assertEqual(parsed.iloc[0], pd.Timestamp("2026-01-05"))
+        self.assertTrue(pd.isna(parsed.iloc[3]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import json
+import tempfile
+from datetime import date
+from decimal import Decimal
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from src.infra.config.config_google.bigquery_maganger import BigQueryManager
+from src.infra.query_backend import QueryJobStatistics
+from src.infra.query_result_cache import QueryResultCache
+from src.infra.query_result_cache import fingerprint_sql
+from src.infra.query_result_cache import normalize_sql
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class QueryResultCacheTests(unittest.TestCase):
+    """Tests for the process-local query result cache."""
+
+    def test_normalizes_whitespace_and_keyword_case_outside_literals(self) -> None:
+        """It treats formatting-only SQL changes as the same fingerprint."""
+        first_sql = "SELECT company_id, SUM(amount) AS total\nFROM test_ia.expenses WHERE category = 'Food'"
+        second_sql = "select company_id , sum( amount ) as total from test_ia.expenses where category='Food';"
+
+        self.assertEqual(normalize_sql(first_sql), normalize_sql(second_sql))
+        self.assertNotEqual(
+            normalize_sql(first_sql),
+            normalize_sql(first_sql.replace("'Food'", "'food'")),
+        )
+        self.assertNotEqual(
+            fingerprint_sql(first_sql, "project:1"),
+            fingerprint_sql(first_sql, "project:1001"),
+        )
+
+    def test_expires_entries_after_ttl(self) -> None:
+        """It stops returning rows once the TTL has elapsed."""
+        clock = FakeClock()
+        cache = QueryResultCache(ttl_seconds=10, clock=clock)
+        cache.set("key", [{"total": 10}])
+
+        self.assertEqual(cache.get("key"), [{"total": 10}])
+        clock.now += 11
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_evicts_least_recently_used_entries_over_byte_budget(self) -> None:
+        """It keeps the byte total under the configured bound."""
+        cache = QueryResultCache(max_bytes=60)
+        cache.set("first", [{"value": "a" * 10}])
+        cache.set("second", [{"value": "b" * 10}])
+        cache.get("first")
+        cache.set("third", [{"value": "c" * 10}])
+
+        self.assertIsNotNone(cache.get("first"))
+        self.assertIsNone(cache.get("second"))
+        self.assertLessEqual(cache.total_bytes, 60)
+
+    def test_stops_sizing_rows_once_past_the_byte_budget(self) -> None:
+        """It skips oversized results without serializing every row."""
+        cache = QueryResultCache(max_bytes=100)
+        rows = [{"value": "a" * 40} for _ in range(1000)]
+
+        with patch(
+            "src.infra.query_result_cache.json.dumps",
+            wraps=json.dumps,
+        ) as dumps:
+            cache.set("key", rows)
+
+        self.assertLess(dumps.call_count, 5)
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_reads_back_from_disk_tier(self) -> None:
+        """It serves rows from disk when the memory tier was cleared."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = QueryResultCache(disk_dir=Path(temp_dir))
+            writer.set("key", [{"total": 10}])
+            reader = QueryResultCache(disk_dir=Path(temp_dir))
+
+            self.assertEqual(reader.get("key"), [{"total": 10}])
+
+    def test_disk_tier_keeps_value_types_and_the_original_expiry(self) -> None:
+        """It restores typed rows from Arrow files and keeps their remaining TTL."""
+        rows = [{"day": date(2026, 1, 2), "total": Decimal("10.50")}]
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "src.infra.query_result_cache.time.time",
+        ) as wall_clock:
+            wall_clock.return_value = 5000.0
+            QueryResultCache(ttl_seconds=10, disk_dir=Path(temp_dir)).set("key", rows)
+            reader = QueryResultCache(ttl_seconds=1000, disk_dir=Path(temp_dir), clock=clock)
+
+            wall_clock.return_value = 5004.0
+            restored_rows = reader.get("key")
+            clock.now += 7
+            wall_clock.return_value = 5011.0
+
+            self.assertEqual(restored_rows, rows)
+            self.assertEqual([path.suffix for path in Path(temp_dir).iterdir()], [".arrow"])
+            self.assertIsNone(reader.get("key"))
+
+
+class BigQueryManagerResultCacheTests(unittest.TestCase):
+    """Tests for result caching inside BigQueryManager.execute_query."""
+
+    def test_repeated_sql_is_served_without_backend_call(self) -> None:
+        """It answers reformatted SQL for the same user from the cache without a scope lookup."""
+        backend = Mock()
+        backend.run_query_with_statistics.return_value = (
+            [{"company_id": 1, "total": 10}],
+            QueryJobStatistics(source="bigquery", row_count=1),
+        )
+        manager = BigQueryManager(backend=backend, result_cache=QueryResultCache())
+        manager.project_id = "test-project"
+        manager.log_debug = Mock()
+        manager.log_info = Mock()
+
+        first = manager.execute_query(
+            response_sql="SELECT company_id, SUM(amount) AS total FROM test_ia.expenses GROUP BY company_id",
+            user_email="user@example.com",
+            chat_id="chat-1",
+            question_id="question-1",
+        )
+        second = manager.execute_query(
+            response_sql="select company_id, sum(amount) as total\nfrom test_ia.expenses group by company_id",
+            user_email="USER@example.com",
+            chat_id="chat-1",
+            question_id="question-2",
+        )
+
+        self.assertEqual(first, [{"company_id": 1, "total": 10}])
+        self.assertEqual(second, first)
+        backend.run_query.assert_not_called()
+        backend.run_query_with_statistics.assert_called_once()
+        self.assertEqual(manager.last_query_statistics.source, "local_cache")
+
+    def test_same_sql_for_another_user_runs_again(self) -> None:
+        """It never serves one user's scoped rows to another user."""
+        backend = Mock()
+        backend.run_query_with_statistics.side_effect = [
+            ([{"company_id": 1, "total": 10}], QueryJobStatistics(source="bigquery")),
+            ([{"company_id": 2, "total": 20}], QueryJobStatistics(source="bigquery")),
+        ]
+        manager = BigQueryManager(backend=backend, result_cache=QueryResultCache())
+        manager.log_debug = Mock()
+        manager.log_info = Mock()
+        sql = "SELECT company_id, SUM(amount) AS total FROM test_ia.expenses GROUP BY company_id"
+
+        first = manager.execute_query(sql, "first@example.com", "chat-1", "question-1")
+        second = manager.execute_query(sql, "second@example.com", "chat-2", "question-2")
+
+        self.assertEqual(first, [{"company_id": 1, "total": 10}])
+        self.assertEqual(second, [{"company_id": 2, "total": 20}])
+        self.assertEqual(backend.run_query_with_statistics.call_count, 2)
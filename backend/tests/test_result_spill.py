@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from src.infra.result_spill import ResultSetCollector
+from src.infra.result_spill import SpilledResultSet
+from src.infra.result_spill import collect_rows
+from src.infra.result_spill import preview_rows
+
+
+class ResultSpillTests(unittest.TestCase):
+    """Tests for the disk-backed result sets used for very large queries."""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.spill_dir = Path(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _build_rows(self, count: int) -> list[dict]:
+        return [
+            {
+                "company_id": 1,
+                "category": f"category-{index % 3}",
+                "amount": Decimal(f"{index}.50"),
+                "note": None if index < 5 else f"note-{index}",
+            }
+            for index in range(count)
+        ]
+
+    def _collect(self, rows: list[dict], threshold_bytes: int, batch_rows: int = 4):
+        collector = ResultSetCollector(
+            threshold_bytes=threshold_bytes,
+            spill_dir=self.spill_dir,
+            batch_rows=batch_rows,
+        )
+        for row in rows:
+            collector.add(row)
+        return collector.finish()
+
+    def test_keeps_small_results_in_memory(self) -> None:
+        """It returns the original list when the threshold is never crossed."""
+        rows = self._build_rows(3)
+
+        result = self._collect(rows, threshold_bytes=1024 * 1024)
+
+        self.assertEqual(result, rows)
+        self.assertEqual(list(self.spill_dir.iterdir()), [])
+
+    def test_spills_large_results_to_a_mapped_arrow_file(self) -> None:
+        """It writes rows past the threshold and reads them back lazily."""
+        result = self._collect(self._build_rows(23), threshold_bytes=200)
+
+        self.assertIsInstance(result, SpilledResultSet)
+        self.assertTrue(result.path.exists())
+        self.assertEqual(len(result), 23)
+        self.assertEqual(result.columns, ["company_id", "category", "amount", "note"])
+        self.assertEqual(result[0]["amount"], 0.5)
+        self.assertIsNone(result[0]["note"])
+        self.assertEqual(result[-1]["note"], "note-22")
+        self.assertEqual([row["amount"] for row in result[20:]], [20.5, 21.5, 22.5])
+        self.assertEqual(len(list(result)), 23)
+        self.assertEqual(len(preview_rows(result, 5)), 5)
+        self.assertEqual(result.to_dataframe(["amount"]).shape, (23, 1))
+
+    def test_close_removes_the_spill_file(self) -> None:
+        """It deletes the backing file once the result set is released."""
+        result = self._collect(self._build_rows(10), threshold_bytes=100)
+
+        result.close()
+
+        self.assertFalse(result.path.exists())
+
+    def test_collect_rows_honors_disabled_threshold(self) -> None:
+        """It never spills when the configured threshold is zero."""
+        settings = Mock(result_spill_threshold_bytes=0, result_spill_dir=str(self.spill_dir))
+
+        with patch("src.infra.result_spill.settings", settings):
+            result = collect_rows(iter(self._build_rows(50)))
+
+        self.assertIsInstance(result, list)
+        self.assertEqual(len(result), 50)
+
+    def test_collect_rows_removes_partial_files_on_errors(self) -> None:
+        """It drops the spill file when the row source fails mid-stream."""
+        settings = Mock(result_spill_threshold_bytes=100, result_spill_dir=str(self.spill_dir))
+
+        def failing_rows():
+            yield from self._build_rows(10)
+            raise RuntimeError("stream interrupted")
+
+        with patch("src.infra.result_spill.settings", settings):
+            with self.assertRaises(RuntimeError):
+                collect_rows(failing_rows())
+
+        self.assertEqual(list(self.spill_dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
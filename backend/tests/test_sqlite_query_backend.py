@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import Mock
+
+from src.infra.config.config_google.bigquery_maganger import BigQueryManager
+from src.infra.config.config_local import SQLiteQueryBackend
+
+
+class SQLiteQueryBackendTests(unittest.TestCase):
+    """Tests for the offline stand-in used for load tests and benchmarks."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.backend = SQLiteQueryBackend(project_id="test-project")
+
+    def _build_manager(self) -> BigQueryManager:
+        manager = BigQueryManager(backend=self.backend, result_cache=None)
+        manager.project_id = "test-project"
+        manager.log_debug = Mock()
+        manager.log_info = Mock()
+        manager.log_error = Mock()
+        return manager
+
+    def test_returns_bigquery_schema_for_fixture_tables(self) -> None:
+        """It describes the mocked tables with BigQuery field types."""
+        manager = self._build_manager()
+
+        schema = manager.get_schema("test-project.test_ia.air_tickets")
+
+        self.assertEqual(schema["departure_amount"], "NUMERIC")
+        self.assertEqual(schema["departure_date"], "DATE")
+        self.assertIn("company_id", schema)
+
+    def test_scopes_rows_to_the_authenticated_company(self) -> None:
+        """It runs the secure wrapper with backtick names and @user_email."""
+        manager = self._build_manager()
+
+        rows = manager.execute_query(
+            response_sql=(
+                "SELECT company_id, category, SUM(amount) AS total "
+                "FROM `test-project.test_ia.expenses` "
+                "GROUP BY company_id, category"
+            ),
+            user_email="USER@example.com",
+            chat_id="chat-1",
+            question_id="question-1",
+        )
+
+        self.assertTrue(rows)
+        self.assertEqual({row["company_id"] for row in rows}, {1})
+
+    def test_rewrites_unquoted_project_qualified_names(self) -> None:
+        """It strips the project prefix from unquoted three-part table names."""
+        translated_sql = self.backend.to_sqlite_sql(
+            "SELECT id FROM test-project.test_ia.users JOIN `test_ia`.`expenses`"
+        )
+
+        self.assertEqual(
+            translated_sql,
+            'SELECT id FROM test_ia.users JOIN "test_ia"."expenses"',
+        )
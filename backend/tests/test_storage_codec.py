@@ -0,0 +1,337 @@
+import io
+import json
+import math
+import unittest
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from src.infra.config.config_google.storage_manager import DATA_FORMAT_PARQUET
+from src.infra.config.config_google.storage_manager import StorageManager
+from src.infra.storage_codec import COMPRESSION_GZIP
+from src.infra.storage_codec import COMPRESSION_NONE
+from src.infra.storage_codec import COMPRESSION_ZSTD
+from src.infra.storage_codec import LAYOUT_COLUMNS
+from src.infra.storage_codec import LAYOUT_RECORDS
+from src.infra.storage_codec import StorageCodec
+from src.infra.storage_codec import decode_rows
+from src.infra.storage_codec import iter_decompressed
+from src.infra.storage_codec import iter_ndjson
+from src.infra.storage_codec import project_rows
+from src.infra.storage_codec import read_parquet_rows
+from src.infra.storage_codec import starts_record_list
+from src.infra.storage_codec import write_parquet_rows
+
+
+ROWS = [
+    {"category": "Hotel", "amount": 10.5, "expense_date": "2025-01-01"},
+    {"category": "Flight", "amount": 20, "expense_date": "2025-01-02"},
+]
+
+
+class StorageCodecTests(unittest.TestCase):
+    """Tests for the compact and compressed stored-data codec."""
+
+    def test_round_trips_every_layout_and_compression(self) -> None:
+        """It decodes what it encodes, detecting the compression from the bytes."""
+        for compression in (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD):
+            for layout in (LAYOUT_RECORDS, LAYOUT_COLUMNS):
+                with self.subTest(compression=compression, layout=layout):
+                    codec = StorageCodec(compression=compression, layout=layout)
+
+                    self.assertEqual(decode_rows(codec.encode_bytes(ROWS)), ROWS)
+                    self.assertEqual(decode_rows(codec.encode_bytes(iter(ROWS))), ROWS)
+
+    def test_reads_legacy_pretty_printed_json(self) -> None:
+        """It keeps reading blobs written before the codec existed."""
+        legacy_body = json.dumps(ROWS + ["not a row"], indent=2).encode("utf-8")
+
+        self.assertEqual(decode_rows(legacy_body), ROWS)
+        self.assertIsNone(decode_rows(b'{"rows": []}'))
+
+    def test_streamed_columns_fill_missing_values_with_null(self) -> None:
+        """It keeps every column aligned when rows have different keys."""
+        codec = StorageCodec(compression=COMPRESSION_NONE, layout=LAYOUT_COLUMNS)
+        rows = iter([{"a": 1}, {"a": 2, "b": "x"}, {"b": "y"}])
+
+        payload = json.loads(codec.encode_bytes(rows, columns=["a"]))
+
+        self.assertEqual(payload["columns"], ["a", "b"])
+        self.assertEqual(payload["values"], [[1, 2, None], [None, "x", "y"]])
+        self.assertEqual(payload["row_count"], 3)
+
+    def test_serializes_values_the_json_module_rejects(self) -> None:
+        """It writes dates and decimals as strings, like the previous encoder."""
+        codec = StorageCodec(compression=COMPRESSION_NONE)
+        body = codec.encode_bytes([{"day": date(2025, 1, 1), "total": Decimal("1.50")}])
+
+        self.assertEqual(decode_rows(body), [{"day": "2025-01-01", "total": "1.50"}])
+
+    def test_decompresses_stored_bodies_chunk_by_chunk(self) -> None:
+        """It restores the stored JSON from arbitrarily split compressed chunks."""
+        for compression in (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD):
+            with self.subTest(compression=compression):
+                body = StorageCodec(compression=compression).encode_bytes(ROWS)
+                chunks = [body[index:index + 7] for index in range(0, len(body), 7)]
+
+                self.assertEqual(
+                    json.loads(b"".join(iter_decompressed(chunks, compression))),
+                    ROWS,
+                )
+
+    def test_recognizes_row_lists_that_can_be_passed_through(self) -> None:
+        """It accepts record and legacy lists and rejects column payloads."""
+        records = StorageCodec(compression=COMPRESSION_ZSTD).encode_bytes(ROWS)
+        legacy = json.dumps(ROWS, indent=2).encode("utf-8")
+        columns = StorageCodec(
+            compression=COMPRESSION_GZIP,
+            layout=LAYOUT_COLUMNS,
+        ).encode_bytes(ROWS)
+
+        self.assertTrue(starts_record_list(records))
+        self.assertTrue(starts_record_list(b"\n " + legacy))
+        self.assertFalse(starts_record_list(columns))
+
+    def test_writes_rows_as_ndjson_batches(self) -> None:
+        """It yields complete lines, a bounded batch of rows per chunk."""
+        chunks = list(iter_ndjson(iter(ROWS * 3), batch_rows=4))
+
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(all(chunk.endswith(b"\n") for chunk in chunks))
+        self.assertEqual(
+            [json.loads(line) for line in b"".join(chunks).splitlines()],
+            ROWS * 3,
+        )
+
+    def test_compressed_columns_are_much_smaller_than_pretty_json(self) -> None:
+        """It shrinks repetitive result rows by an order of magnitude."""
+        rows = [
+            {"category": f"Category {index % 20}", "amount": index % 97, "status": "approved"}
+            for index in range(20000)
+        ]
+        legacy_size = len(json.dumps(rows, indent=2).encode("utf-8"))
+        codec = StorageCodec(compression=COMPRESSION_ZSTD, layout=LAYOUT_COLUMNS)
+
+        self.assertLess(len(codec.encode_bytes(rows)) * 10, legacy_size)
+
+
+class ParquetCodecTests(unittest.TestCase):
+    """Tests for Parquet storage with column and row projection."""
+
+    def test_reads_only_the_requested_columns_and_rows(self) -> None:
+        """It returns the projected range across several row groups."""
+        rows = [
+            {"index": index, "label": f"row {index}", "amount": index / 2}
+            for index in range(25)
+        ]
+        buffer = io.BytesIO()
+        with patch("src.infra.storage_codec.PARQUET_ROW_GROUP_ROWS", 10):
+            write_parquet_rows(rows, buffer)
+
+        projected = read_parquet_rows(
+            io.BytesIO(buffer.getvalue()),
+            columns=["label", "missing"],
+            offset=8,
+            limit=5,
+        )
+
+        self.assertEqual(projected, [{"label": f"row {index}"} for index in range(8, 13)])
+        self.assertEqual(read_parquet_rows(io.BytesIO(buffer.getvalue())), rows)
+        self.assertEqual(read_parquet_rows(io.BytesIO(buffer.getvalue()), offset=30), [])
+
+    def test_returns_json_ready_values(self) -> None:
+        """It formats dates and non-finite floats like the JSON codec does."""
+        buffer = io.BytesIO()
+        write_parquet_rows(
+            [
+                {
+                    "day": date(2025, 1, 1),
+                    "at": datetime(2025, 1, 1, 8, 30),
+                    "ratio": math.nan,
+                },
+                {"day": None, "at": None, "ratio": 1.5},
+            ],
+            buffer,
+        )
+
+        rows = read_parquet_rows(io.BytesIO(buffer.getvalue()))
+
+        self.assertEqual(
+            rows,
+            [
+                {"day": "2025-01-01", "at": "2025-01-01T08:30:00", "ratio": None},
+                {"day": None, "at": None, "ratio": 1.5},
+            ],
+        )
+
+    def test_rejects_columns_with_mixed_types(self) -> None:
+        """It raises ValueError so the caller can store the rows as JSON."""
+        with self.assertRaises(ValueError):
+            write_parquet_rows([{"value": 1}, {"value": "one"}], io.BytesIO())
+
+    def test_projects_json_rows(self) -> None:
+        """It applies the same projection to rows decoded from JSON."""
+        self.assertEqual(
+            project_rows(ROWS, columns=["amount"], offset=1, limit=5),
+            [{"amount": 20}],
+        )
+
+
+class StorageManagerCodecTests(unittest.TestCase):
+    """Tests for stored response data going through the codec."""
+
+    def _build_manager(self, codec: StorageCodec) -> tuple[StorageManager, Mock]:
+        with patch.object(StorageManager, "log_warning"):
+            manager = StorageManager(codec=codec)
+        manager.blob_cache = None
+        blob = Mock()
+        manager._build_blob = Mock(return_value=blob)
+        return manager, blob
+
+    def test_saves_encoded_rows_with_the_content_encoding(self) -> None:
+        """It uploads the compressed body and tags the blob with its encoding."""
+        manager, blob = self._build_manager(StorageCodec(compression=COMPRESSION_GZIP))
+
+        manager.save_json_data(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            message_id="question-1",
+            payload=ROWS,
+        )
+
+        body = blob.upload_from_string.call_args.args[0]
+        self.assertEqual(blob.content_encoding, COMPRESSION_GZIP)
+        self.assertEqual(decode_rows(body), ROWS)
+
+    def test_streams_rows_through_the_codec(self) -> None:
+        """It encodes iterated rows into the uploaded temporary file."""
+        manager, blob = self._build_manager(
+            StorageCodec(compression=COMPRESSION_ZSTD, layout=LAYOUT_COLUMNS)
+        )
+        uploaded = {}
+        blob.upload_from_filename.side_effect = lambda path, **kwargs: uploaded.update(
+            body=Path(path).read_bytes()
+        )
+
+        manager.save_json_rows(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            message_id="question-1",
+            rows=iter(ROWS),
+        )
+
+        self.assertEqual(blob.content_encoding, COMPRESSION_ZSTD)
+        self.assertEqual(decode_rows(uploaded["body"]), ROWS)
+
+    def test_loads_raw_bytes_of_any_codec(self) -> None:
+        """It downloads without transcoding and decodes legacy and new blobs alike."""
+        manager, blob = self._build_manager(StorageCodec())
+        blob.download_as_bytes.return_value = StorageCodec(
+            compression=COMPRESSION_GZIP
+        ).encode_bytes(ROWS)
+
+        rows = manager.load_json_data(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            message_id="question-1",
+        )
+
+        self.assertEqual(rows, ROWS)
+        blob.download_as_bytes.assert_called_once_with(raw_download=True)
+
+    def test_saves_and_reads_parquet_with_projection(self) -> None:
+        """It uploads Parquet and reads a projection through the blob reader."""
+        manager, blob = self._build_manager(StorageCodec())
+        manager.data_format = DATA_FORMAT_PARQUET
+        uploaded = {}
+        blob.upload_from_filename.side_effect = lambda path, **kwargs: uploaded.update(
+            body=Path(path).read_bytes(),
+            content_type=kwargs["content_type"],
+        )
+
+        manager.save_json_data(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            message_id="question-1",
+            payload=ROWS,
+        )
+        blob.open.return_value = io.BytesIO(uploaded["body"])
+        rows = manager.load_json_data(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            message_id="question-1",
+            columns=["category"],
+            limit=1,
+        )
+
+        self.assertEqual(uploaded["content_type"], "application/vnd.apache.parquet")
+        self.assertTrue(
+            manager._build_blob.call_args_list[0].args[0].endswith("data/question-1.parquet")
+        )
+        self.assertEqual(rows, [{"category": "Hotel"}])
+        blob.download_as_bytes.assert_not_called()
+
+    def test_falls_back_to_json_for_rows_parquet_cannot_store(self) -> None:
+        """It stores mixed-type rows with the JSON codec and drops a stale Parquet blob."""
+        manager, blob = self._build_manager(StorageCodec(compression=COMPRESSION_NONE))
+        manager.data_format = DATA_FORMAT_PARQUET
+        manager.log_warning = Mock()
+
+        manager.save_json_data(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            message_id="question-1",
+            payload=[{"value": 1}, {"value": "one"}],
+        )
+
+        blob.delete.assert_called_once_with()
+        blob.upload_from_filename.assert_not_called()
+        self.assertEqual(
+            decode_rows(blob.upload_from_string.call_args.args[0]),
+            [{"value": 1}, {"value": "one"}],
+        )
+
+    def test_reads_json_when_no_parquet_blob_exists(self) -> None:
+        """It keeps loading JSON blobs after switching the data format to Parquet."""
+        manager, blob = self._build_manager(StorageCodec())
+        manager.data_format = DATA_FORMAT_PARQUET
+        blob.open.side_effect = FileNotFoundError("missing blob")
+        blob.download_as_bytes.return_value = json.dumps(ROWS).encode("utf-8")
+
+        rows = manager.load_json_data(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            message_id="question-1",
+            offset=1,
+        )
+
+        self.assertEqual(rows, ROWS[1:])
+
+    def test_opens_stored_rows_for_passthrough_in_chunks(self) -> None:
+        """It streams raw blob chunks for record lists and declines column payloads."""
+        manager, blob = self._build_manager(StorageCodec())
+        body = StorageCodec(compression=COMPRESSION_ZSTD).encode_bytes(ROWS)
+        blob.open.side_effect = lambda *args, **kwargs: io.BytesIO(body)
+
+        stored_stream = manager.open_json_stream(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            message_id="question-1",
+        )
+
+        self.assertEqual(stored_stream.compression, COMPRESSION_ZSTD)
+        self.assertEqual(b"".join(stored_stream.chunks), body)
+        self.assertTrue(blob.open.call_args.kwargs["raw_download"])
+        blob.download_as_bytes.assert_not_called()
+
+        body = StorageCodec(layout=LAYOUT_COLUMNS).encode_bytes(ROWS)
+        self.assertIsNone(
+            manager.open_json_stream(
+                user_email="user@example.com",
+                chat_id="chat-1",
+                message_id="question-1",
+            )
+        )
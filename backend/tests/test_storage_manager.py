@@ -0,0 +1,169 @@
+import os
+import unittest
+from unittest.mock import Mock
+from unittest.mock import patch
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import storage
+from google.oauth2 import service_account
+
+from src.infra.blob_cache import BlobCache
+from src.infra.config.config_google.client_factory import GoogleClientFactory
+from src.infra.config.config_google.storage_manager import StorageManager
+
+
+EMULATOR_HOST = "http://localhost:4443"
+
+
+def build_signing_credentials() -> service_account.Credentials:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return service_account.Credentials.from_service_account_info(
+        {
+            "type": "service_account",
+            "client_email": "signer@test-project.iam.gserviceaccount.com",
+            "private_key": private_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ).decode("utf-8"),
+            "private_key_id": "test-key",
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }
+    )
+
+
+class StorageManagerSignedUrlTests(unittest.TestCase):
+    """Tests for signed bucket URLs handed to the browser instead of proxying."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.signing_credentials = build_signing_credentials()
+
+    def _build_manager(self) -> StorageManager:
+        with patch.object(StorageManager, "log_warning"):
+            manager = StorageManager()
+        manager.blob_cache = BlobCache(max_bytes=1024)
+        manager.log_warning = Mock()
+        client = storage.Client(
+            project="test-project",
+            credentials=AnonymousCredentials(),
+            client_options={"api_endpoint": EMULATOR_HOST},
+        )
+        manager._bucket = client.bucket("agent_analytical")
+        return manager
+
+    def test_signs_v4_urls_against_the_emulator_endpoint(self) -> None:
+        """It signs a short-lived V4 URL on the storage client's endpoint."""
+        manager = self._build_manager()
+        blob_name = manager._build_graph_render_blob_name(
+            user_email="user@example.com",
+            chat_id="chat-1",
+            message_id="question-1",
+            render_key="abc",
+        )
+        manager.blob_cache.set(blob_name, 1, b"png")
+
+        with patch(
+            "src.infra.config.config_google.storage_manager.client_factory"
+            ".signing_credentials",
+            return_value=self.signing_credentials,
+        ):
+            signed_download = manager.sign_graph_download(
+                user_email="user@example.com",
+                chat_id="chat-1",
+                message_id="question-1",
+                render_key="abc",
+            )
+
+        signed_url = urlsplit(signed_download.url)
+        query = parse_qs(signed_url.query)
+        self.assertEqual(f"{signed_url.scheme}://{signed_url.netloc}", EMULATOR_HOST)
+        self.assertEqual(unquote(signed_url.path), f"/agent_analytical/{blob_name}")
+        self.assertEqual(query["X-Goog-Algorithm"], ["GOOG4-RSA-SHA256"])
+        self.assertEqual(query["X-Goog-Expires"], ["300"])
+
+    def test_signs_emulator_urls_without_a_service_account(self) -> None:
+        """It signs with a throwaway key when only STORAGE_EMULATOR_HOST is set."""
+        manager = self._build_manager()
+        factory = GoogleClientFactory(project_id="test-project", project_sa="")
+        factory.log_debug = Mock()
+        manager._blob_exists = Mock(return_value=True)
+
+        with patch.dict(os.environ, {"STORAGE_EMULATOR_HOST": EMULATOR_HOST}), patch(
+            "src.infra.config.config_google.storage_manager.client_factory",
+            factory,
+        ):
+            signed_download = manager.sign_graph_download(
+                user_email="user@example.com",
+                chat_id="chat-1",
+                message_id="question-1",
+            )
+            signer = factory.signing_credentials()
+
+        query = parse_qs(urlsplit(signed_download.url).query)
+        self.assertTrue(
+            query["X-Goog-Credential"][0].startswith(signer.service_account_email)
+        )
+        manager.log_warning.assert_not_called()
+
+    def test_proxies_when_the_url_cannot_be_signed_or_the_blob_is_missing(self) -> None:
+        """It returns None so the route falls back to proxying the bytes."""
+        manager = self._build_manager()
+
+        with patch(
+            "src.infra.config.config_google.storage_manager.client_factory"
+            ".signing_credentials",
+            side_effect=EnvironmentError("PROJECT_SA not set."),
+        ):
+            manager._blob_exists = Mock(return_value=False)
+            missing_graph = manager.sign_graph_download(
+                user_email="user@example.com",
+                chat_id="chat-1",
+                message_id="question-1",
+            )
+            manager._blob_exists = Mock(return_value=True)
+            unsigned_graph = manager.sign_graph_download(
+                user_email="user@example.com",
+                chat_id="chat-1",
+                message_id="question-1",
+            )
+
+        self.assertIsNone(missing_graph)
+        self.assertIsNone(unsigned_graph)
+        manager.log_warning.assert_called_once()
+
+    def test_signs_row_lists_but_not_column_payloads(self) -> None:
+        """It only hands out URLs for data the browser can read as a row list."""
+        manager = self._build_manager()
+        blob = Mock()
+        blob.content_encoding = "zstd"
+        blob.metadata = {"layout": "records"}
+        blob.generate_signed_url.return_value = "http://signed"
+        manager._build_blob = Mock(return_value=blob)
+
+        with patch(
+            "src.infra.config.config_google.storage_manager.client_factory"
+            ".signing_credentials",
+            return_value=self.signing_credentials,
+        ):
+            signed_download = manager.sign_data_download(
+                user_email="user@example.com",
+                chat_id="chat-1",
+                message_id="question-1",
+            )
+            blob.metadata = {"layout": "columns"}
+            column_download = manager.sign_data_download(
+                user_email="user@example.com",
+                chat_id="chat-1",
+                message_id="question-1",
+            )
+
+        self.assertEqual(signed_download.url, "http://signed")
+        self.assertEqual(signed_download.content_encoding, "zstd")
+        self.assertIsNone(column_download)
+        self.assertEqual(blob.generate_signed_url.call_args.kwargs["version"], "v4")
@@ -58,6 +58,7 @@ export function AppShell() {
               t=${controller.t}
               displayState=${displayState}
               onRequestGraph=${controller.requestGraph}
+              onLoadMoreRows=${controller.loadMoreRows}
             />
 
             <${ComposerPanel}
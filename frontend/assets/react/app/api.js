@@ -1,3 +1,4 @@
+import { DATA_PAGE_SIZE } from "../shared/constants.js";
 import {
   buildAuthHeaders,
   getErrorMessage,
@@ -40,23 +41,61 @@ export async function requestGraphRequest(token, body) {
   });
 }
 
-export async function loadMessageRowsRequest(dataPath, fallbackMessage) {
-  const response = await fetch(dataPath, {
-    cache: "no-store",
-  });
+function parseRowLines(lines) {
+  const rows = [];
+  for (const line of lines) {
+    if (!line.trim()) {
+      continue;
+    }
+
+    try {
+      const row = JSON.parse(line);
+      if (row && typeof row === "object" && !Array.isArray(row)) {
+        rows.push(row);
+      }
+    } catch {
+      // A malformed line is skipped instead of discarding the whole page.
+    }
+  }
+  return rows;
+}
+
+export async function loadMessageRowsRequest(
+  dataPath,
+  fallbackMessage,
+  { offset = 0, limit = DATA_PAGE_SIZE, onRows = null } = {},
+) {
+  const separator = dataPath.includes("?") ? "&" : "?";
+  const response = await fetch(
+    `${dataPath}${separator}format=ndjson&offset=${offset}&limit=${limit}`,
+    { cache: "no-cache" },
+  );
 
-  if (!response.ok) {
+  if (!response.ok || !response.body) {
     throw new Error(fallbackMessage);
   }
 
-  let payload = null;
-  try {
-    payload = await response.json();
-  } catch {
-    payload = null;
+  // NDJSON is parsed as it arrives so the first rows render before the page ends.
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  const rows = [];
+  let pendingLine = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) {
+      break;
+    }
+
+    const lines = `${pendingLine}${value}`.split("\n");
+    pendingLine = lines.pop();
+    const pageRows = parseRowLines(lines);
+    if (pageRows.length) {
+      rows.push(...pageRows);
+      onRows?.([...rows]);
+    }
   }
 
-  return Array.isArray(payload) ? payload : [];
+  rows.push(...parseRowLines([pendingLine]));
+  return rows;
 }
 
 export function resolveApiError(payload, fallbackMessage) {
@@ -1,12 +1,25 @@
-import { html } from "../../shared/cdn.js";
+import { React, html } from "../../shared/cdn.js";
 import { buildClassName } from "../../shared/utils.js";
 import { formatBoxLabel } from "../displayState.js";
+import { GraphChart, downloadChartSvg } from "./GraphChart.js";
 
 export function DisplayPanels({
   t,
   displayState,
   onRequestGraph,
+  onLoadMoreRows,
 }) {
+  const chartRef = React.useRef(null);
+
+  function handleGraphDownload(event) {
+    if (!displayState.graph.spec) {
+      return;
+    }
+
+    event.preventDefault();
+    downloadChartSvg(chartRef.current, `${displayState.graph.selectedPatternId || "graph"}.svg`);
+  }
+
   return html`
     <section className="display-stack">
       <article className="display-box question-box">
@@ -50,6 +63,22 @@ export function DisplayPanels({
         )}>
           ${displayState.data.content}
         </pre>
+
+        <div
+          className="data-pager"
+          hidden=${!displayState.data.showMore && !displayState.data.summary}
+        >
+          <p className="status-line">${displayState.data.summary}</p>
+          <button
+            type="button"
+            className="history-more"
+            hidden=${!displayState.data.showMore}
+            disabled=${displayState.data.loadingMore}
+            onClick=${onLoadMoreRows}
+          >
+            ${displayState.data.loadingMore ? t("loadingMoreRows") : t("dataShowMore")}
+          </button>
+        </div>
       </article>
 
       <article className="display-box graph-box">
@@ -82,6 +111,7 @@ export function DisplayPanels({
             href=${displayState.graph.downloadHref}
             download=${true}
             hidden=${!displayState.graph.showDownload}
+            onClick=${handleGraphDownload}
           >
             ${t("downloadGraph")}
           </a>
@@ -97,7 +127,15 @@ export function DisplayPanels({
           "graphic-content",
           displayState.graph.isPlaceholder && "box-placeholder",
         )}>
-          ${displayState.graph.imagePath
+          ${displayState.graph.spec
+            ? html`
+              <${GraphChart}
+                spec=${displayState.graph.spec}
+                svgRef=${chartRef}
+                title=${t("graphLabel")}
+              />
+            `
+            : displayState.graph.imagePath
             ? html`
               <img
                 className="graphic-image"
@@ -0,0 +1,324 @@
+import { html } from "../../shared/cdn.js";
+
+const CHART_WIDTH = 640;
+const CHART_HEIGHT = 320;
+const CHART_MARGIN = { top: 16, right: 20, bottom: 64, left: 72 };
+const TICK_COUNT = 5;
+const MAX_NOMINAL_LABELS = 12;
+const LINE_HOVER_POINT_LIMIT = 300;
+
+function toPosition(value, type) {
+  if (value === null || value === undefined) {
+    return Number.NaN;
+  }
+
+  return type === "temporal" ? Date.parse(value) : Number(value);
+}
+
+function buildLinearScale(values, rangeStart, rangeEnd, includeZero) {
+  const finiteValues = values.filter(Number.isFinite);
+  let minimum = finiteValues.length ? Math.min(...finiteValues) : 0;
+  let maximum = finiteValues.length ? Math.max(...finiteValues) : 1;
+
+  if (includeZero) {
+    minimum = Math.min(minimum, 0);
+    maximum = Math.max(maximum, 0);
+  }
+  if (minimum === maximum) {
+    minimum -= 1;
+    maximum += 1;
+  }
+
+  const scale = (value) => (
+    rangeStart + ((value - minimum) / (maximum - minimum)) * (rangeEnd - rangeStart)
+  );
+  scale.ticks = Array.from(
+    { length: TICK_COUNT },
+    (_, index) => minimum + ((maximum - minimum) * index) / (TICK_COUNT - 1),
+  );
+  return scale;
+}
+
+function buildBandScale(labels, rangeStart, rangeEnd) {
+  const step = (rangeEnd - rangeStart) / Math.max(labels.length, 1);
+  const positions = new Map(labels.map((label, index) => [label, rangeStart + index * step]));
+
+  const scale = (label) => positions.get(label) ?? rangeStart;
+  scale.labels = labels;
+  scale.step = step;
+  scale.bandwidth = step * 0.8;
+  scale.center = (label) => scale(label) + step / 2;
+  return scale;
+}
+
+function buildScale(channel, values, rangeStart, rangeEnd, includeZero) {
+  if (channel.type === "nominal") {
+    const labels = [...new Set(values.map((value) => String(value ?? "")))];
+    return buildBandScale(labels, rangeStart, rangeEnd);
+  }
+
+  return buildLinearScale(
+    values.map((value) => toPosition(value, channel.type)),
+    rangeStart,
+    rangeEnd,
+    includeZero,
+  );
+}
+
+function formatTick(value, type) {
+  if (type === "temporal") {
+    return new Date(value).toISOString().slice(0, 10);
+  }
+  if (Math.abs(value) >= 1000) {
+    return Math.round(value).toLocaleString();
+  }
+
+  return String(Number(value.toFixed(2)));
+}
+
+function formatTooltip(record, fields) {
+  return fields
+    .filter(Boolean)
+    .map((field) => `${field}: ${record[field] ?? ""}`)
+    .join("\n");
+}
+
+function groupBySeries(values, colorField) {
+  const series = new Map();
+  values.forEach((record) => {
+    const key = colorField ? String(record[colorField] ?? "") : "";
+    if (!series.has(key)) {
+      series.set(key, []);
+    }
+    series.get(key).push(record);
+  });
+  return series;
+}
+
+function renderAxes({ xChannel, yChannel, xScale, yScale, axisColor, plot }) {
+  const xTicks = xChannel.type === "nominal"
+    ? xScale.labels
+      .filter((_, index) => index % Math.ceil(xScale.labels.length / MAX_NOMINAL_LABELS) === 0)
+      .map((label) => ({ position: xScale.center(label), text: label }))
+    : xScale.ticks.map((tick) => ({
+      position: xScale(tick),
+      text: formatTick(tick, xChannel.type),
+    }));
+  const yTicks = yChannel.type === "nominal"
+    ? yScale.labels
+      .filter((_, index) => index % Math.ceil(yScale.labels.length / MAX_NOMINAL_LABELS) === 0)
+      .map((label) => ({ position: yScale.center(label), text: label }))
+    : yScale.ticks.map((tick) => ({
+      position: yScale(tick),
+      text: formatTick(tick, yChannel.type),
+    }));
+
+  return html`
+    <g className="graphic-chart-axes" fill=${axisColor} fontSize="11">
+      <line x1=${plot.left} x2=${plot.right} y1=${plot.bottom} y2=${plot.bottom} stroke=${axisColor} />
+      <line x1=${plot.left} x2=${plot.left} y1=${plot.top} y2=${plot.bottom} stroke=${axisColor} />
+      ${xTicks.map((tick) => html`
+        <text
+          key=${`x-${tick.text}-${tick.position}`}
+          x=${tick.position}
+          y=${plot.bottom + 14}
+          textAnchor="end"
+          transform=${`rotate(-30 ${tick.position} ${plot.bottom + 14})`}
+        >${tick.text}</text>
+      `)}
+      ${yTicks.map((tick) => html`
+        <text
+          key=${`y-${tick.text}-${tick.position}`}
+          x=${plot.left - 8}
+          y=${tick.position + 4}
+          textAnchor="end"
+        >${tick.text}</text>
+      `)}
+      <text x=${(plot.left + plot.right) / 2} y=${CHART_HEIGHT - 6} textAnchor="middle">
+        ${xChannel.title || xChannel.field}
+      </text>
+      <text
+        x=${14}
+        y=${(plot.top + plot.bottom) / 2}
+        textAnchor="middle"
+        transform=${`rotate(-90 14 ${(plot.top + plot.bottom) / 2})`}
+      >
+        ${yChannel.title || yChannel.field}
+      </text>
+    </g>
+  `;
+}
+
+function renderBars({ values, xChannel, yChannel, x2Field, xScale, yScale, colorFor }) {
+  return values.map((record, index) => {
+    const tooltip = formatTooltip(record, [xChannel.field, x2Field, yChannel.field]);
+    let geometry;
+
+    if (yChannel.type === "nominal") {
+      const value = toPosition(record[xChannel.field], xChannel.type);
+      geometry = {
+        x: Math.min(xScale(0), xScale(value)),
+        y: yScale(String(record[yChannel.field] ?? "")) + yScale.step * 0.1,
+        width: Math.abs(xScale(value) - xScale(0)),
+        height: yScale.bandwidth,
+      };
+    } else {
+      const value = toPosition(record[yChannel.field], yChannel.type);
+      const left = x2Field
+        ? xScale(toPosition(record[xChannel.field], xChannel.type))
+        : xScale(String(record[xChannel.field] ?? "")) + xScale.step * 0.1;
+      const width = x2Field
+        ? xScale(toPosition(record[x2Field], xChannel.type)) - left
+        : xScale.bandwidth;
+      geometry = {
+        x: left,
+        y: Math.min(yScale(0), yScale(value)),
+        width: Math.max(width, 1),
+        height: Math.abs(yScale(value) - yScale(0)),
+      };
+    }
+
+    return html`
+      <rect key=${`bar-${index}`} ...${geometry} fill=${colorFor(record)}>
+        <title>${tooltip}</title>
+      </rect>
+    `;
+  });
+}
+
+function renderLines({ values, xChannel, yChannel, colorField, xScale, yScale, colorFor }) {
+  const xPosition = (record) => (
+    xChannel.type === "nominal"
+      ? xScale.center(String(record[xChannel.field] ?? ""))
+      : xScale(toPosition(record[xChannel.field], xChannel.type))
+  );
+  const showHoverPoints = values.length <= LINE_HOVER_POINT_LIMIT;
+
+  return [...groupBySeries(values, colorField).entries()].map(([seriesKey, records]) => {
+    const points = records
+      .map((record) => [xPosition(record), yScale(toPosition(record[yChannel.field], yChannel.type))])
+      .filter(([x, y]) => Number.isFinite(x) && Number.isFinite(y));
+    const path = points.map(([x, y], index) => `${index ? "L" : "M"}${x},${y}`).join(" ");
+    const stroke = colorFor(records[0]);
+
+    return html`
+      <g key=${`series-${seriesKey}`}>
+        <path d=${path} fill="none" stroke=${stroke} strokeWidth="2" />
+        ${showHoverPoints && records.map((record, index) => html`
+          <circle
+            key=${`point-${index}`}
+            cx=${xPosition(record)}
+            cy=${yScale(toPosition(record[yChannel.field], yChannel.type))}
+            r="3"
+            fill=${stroke}
+          >
+            <title>${formatTooltip(record, [xChannel.field, yChannel.field, colorField])}</title>
+          </circle>
+        `)}
+      </g>
+    `;
+  });
+}
+
+function renderPoints({ values, xChannel, yChannel, colorField, xScale, yScale, colorFor }) {
+  return values.map((record, index) => html`
+    <circle
+      key=${`point-${index}`}
+      cx=${xScale(toPosition(record[xChannel.field], xChannel.type))}
+      cy=${yScale(toPosition(record[yChannel.field], yChannel.type))}
+      r="3"
+      fill=${colorFor(record)}
+      fillOpacity="0.7"
+    >
+      <title>${formatTooltip(record, [xChannel.field, yChannel.field, colorField])}</title>
+    </circle>
+  `);
+}
+
+export function GraphChart({ spec, svgRef, title }) {
+  const values = Array.isArray(spec?.data?.values) ? spec.data.values : [];
+  const encoding = spec?.encoding || {};
+  const xChannel = encoding.x || {};
+  const yChannel = encoding.y || {};
+  const x2Field = encoding.x2?.field || "";
+  const colorField = encoding.color?.field || "";
+  const markType = spec?.mark?.type || "bar";
+  const markColor = spec?.mark?.color || "#009EFB";
+  const palette = spec?.config?.range?.category || [markColor];
+  const axisColor = spec?.config?.axis?.labelColor || "#006B99";
+  const background = spec?.config?.background || "#ffffff";
+
+  const plot = {
+    left: CHART_MARGIN.left,
+    right: CHART_WIDTH - CHART_MARGIN.right,
+    top: CHART_MARGIN.top,
+    bottom: CHART_HEIGHT - CHART_MARGIN.bottom,
+  };
+  const isBar = markType === "bar";
+  const xValues = values.flatMap((record) => (
+    x2Field ? [record[xChannel.field], record[x2Field]] : [record[xChannel.field]]
+  ));
+  const xScale = buildScale(xChannel, xValues, plot.left, plot.right, isBar && !x2Field);
+  const yScale = buildScale(
+    yChannel,
+    values.map((record) => record[yChannel.field]),
+    yChannel.type === "nominal" ? plot.top : plot.bottom,
+    yChannel.type === "nominal" ? plot.bottom : plot.top,
+    isBar,
+  );
+
+  const seriesKeys = colorField
+    ? [...new Set(values.map((record) => String(record[colorField] ?? "")))]
+    : [];
+  const colorFor = (record) => (
+    colorField
+      ? palette[seriesKeys.indexOf(String(record[colorField] ?? "")) % palette.length]
+      : markColor
+  );
+  const markProps = {
+    values,
+    xChannel,
+    yChannel,
+    x2Field,
+    colorField,
+    xScale,
+    yScale,
+    colorFor,
+  };
+
+  let marks = renderPoints(markProps);
+  if (isBar) {
+    marks = renderBars(markProps);
+  } else if (markType === "line") {
+    marks = renderLines(markProps);
+  }
+
+  return html`
+    <svg
+      ref=${svgRef}
+      className="graphic-chart"
+      xmlns="http://www.w3.org/2000/svg"
+      viewBox=${`0 0 ${CHART_WIDTH} ${CHART_HEIGHT}`}
+      role="img"
+      aria-label=${title || spec?.description || ""}
+    >
+      <rect width=${CHART_WIDTH} height=${CHART_HEIGHT} fill=${background} />
+      ${renderAxes({ xChannel, yChannel, xScale, yScale, axisColor, plot })}
+      <g className="graphic-chart-marks">${marks}</g>
+    </svg>
+  `;
+}
+
+export function downloadChartSvg(svgElement, fileName) {
+  if (!svgElement) {
+    return;
+  }
+
+  const markup = new XMLSerializer().serializeToString(svgElement);
+  const url = URL.createObjectURL(new Blob([markup], { type: "image/svg+xml" }));
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = fileName;
+  link.click();
+  URL.revokeObjectURL(url);
+}
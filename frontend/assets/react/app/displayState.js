@@ -22,11 +22,17 @@ export function buildDisplayState({
     question: createPanelState(t("questionPlaceholder"), true),
     response: createPanelState(t("responsePlaceholder"), true),
     sql: createPanelState(t("sqlPlaceholder"), true),
-    data: createPanelState(t("dataPlaceholder"), true),
+    data: {
+      ...createPanelState(t("dataPlaceholder"), true),
+      summary: "",
+      showMore: false,
+      loadingMore: false,
+    },
     graph: {
       content: t("graphPlaceholder"),
       isPlaceholder: true,
       imagePath: "",
+      spec: null,
       status: "",
       statusType: "",
       suggestions: [],
@@ -69,26 +75,39 @@ export function buildDisplayState({
   }
 
   if (selectedMessage.is_pending) {
-    initialState.data = createPanelState(t("waitingSavedData"), true);
+    Object.assign(initialState.data, createPanelState(t("waitingSavedData"), true));
   } else if (selectedMessage.data_loading) {
-    initialState.data = createPanelState(t("loadingSavedData"), true);
+    Object.assign(initialState.data, createPanelState(t("loadingSavedData"), true));
   } else if (selectedMessage.data_error) {
-    initialState.data = createPanelState(selectedMessage.data_error, true);
+    Object.assign(initialState.data, createPanelState(selectedMessage.data_error, true));
   } else {
     const rows = Array.isArray(selectedMessage.data_rows) ? selectedMessage.data_rows : [];
-    initialState.data = rows.length
-      ? createPanelState(formatRows(rows), false)
-      : createPanelState(t("noRows"), true);
+    Object.assign(
+      initialState.data,
+      rows.length
+        ? createPanelState(formatRows(rows), false)
+        : createPanelState(t("noRows"), true),
+    );
+    initialState.data.showMore = selectedMessage.data_has_more;
+    initialState.data.loadingMore = selectedMessage.data_loading_more;
+    if (rows.length && selectedMessage.data_row_count > rows.length) {
+      initialState.data.summary = t("dataRowsShown")
+        .replace("{shown}", String(rows.length))
+        .replace("{total}", String(selectedMessage.data_row_count));
+    }
   }
 
   const graphEnabled = selectedMessage.response_types.includes("GRAPH");
+  const graphSpec = graphEnabled ? selectedMessage.graph_spec : null;
   const hasGraphImage = Boolean(selectedMessage.graph_path);
+  const hasGraph = Boolean(graphSpec) || hasGraphImage;
   const hasSuggestions = graphEnabled && selectedMessage.graph_suggestions.length > 0;
 
   initialState.graph = {
     content: graphEnabled ? t("graphPlaceholder") : t("graphDisabled"),
-    isPlaceholder: !hasGraphImage,
+    isPlaceholder: !hasGraph,
     imagePath: hasGraphImage ? selectedMessage.graph_path : "",
+    spec: graphSpec,
     status: "",
     statusType: "",
     suggestions: graphEnabled ? selectedMessage.graph_suggestions : [],
@@ -96,7 +115,7 @@ export function buildDisplayState({
     disableSuggestions: graphBusyId === selectedMessage.mensage_id,
     showSuggestions: hasSuggestions,
     downloadHref: selectedMessage.graph_path || "#",
-    showDownload: hasGraphImage,
+    showDownload: hasGraph,
   };
 
   if (graphBusyId === selectedMessage.mensage_id) {
@@ -106,7 +125,7 @@ export function buildDisplayState({
     initialState.graph.statusType = "error";
   } else if (
     graphEnabled
-    && !hasGraphImage
+    && !hasGraph
     && !selectedMessage.is_pending
     && !hasSuggestions
   ) {
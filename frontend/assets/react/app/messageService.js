@@ -14,6 +14,14 @@ function normalizeGraphSuggestions(value) {
     .filter((item) => item.id);
 }
 
+function normalizeGraphSpec(value) {
+  if (!value || typeof value !== "object" || !Array.isArray(value.data?.values)) {
+    return null;
+  }
+
+  return value;
+}
+
 export function normalizeMessage(entry) {
   if (!entry || typeof entry !== "object") {
     return null;
@@ -48,11 +56,15 @@ export function normalizeMessage(entry) {
     query: String(entry.query || ""),
     data_path: String(entry.data_path || ""),
     graph_path: String(entry.graph_path || ""),
+    graph_spec: normalizeGraphSpec(entry.graph_spec),
     selected_graph_pattern: String(entry.selected_graph_pattern || ""),
     response_types: responseTypes,
     graph_suggestions: normalizeGraphSuggestions(entry.graph_suggestions),
     data_rows: Array.isArray(entry.data_rows) ? entry.data_rows : null,
+    data_row_count: Number(entry.data_row_count) || 0,
+    data_has_more: Boolean(entry.data_has_more),
     data_loading: Boolean(entry.data_loading),
+    data_loading_more: Boolean(entry.data_loading_more),
     data_error: String(entry.data_error || ""),
     graph_error: String(entry.graph_error || ""),
     is_pending: Boolean(entry.is_pending),
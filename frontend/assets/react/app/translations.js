@@ -45,6 +45,9 @@ export const APP_TRANSLATIONS = {
     noSql: "Nenhum SQL retornado.",
     noRows: "Nenhum dado retornado.",
     loadingSavedData: "Carregando dados salvos...",
+    dataShowMore: "MOSTRAR MAIS LINHAS",
+    loadingMoreRows: "CARREGANDO LINHAS...",
+    dataRowsShown: "{shown} de {total} linhas",
     sqlUnavailable: "SQL indisponivel porque a solicitacao falhou.",
     textDisabled: "Saida TEXT desativada para esta solicitacao.",
     sqlDisabled: "Saida SQL desativada para esta solicitacao.",
@@ -102,6 +105,9 @@ export const APP_TRANSLATIONS = {
     noSql: "No SQL returned.",
     noRows: "No data returned.",
     loadingSavedData: "Loading saved data...",
+    dataShowMore: "SHOW MORE ROWS",
+    loadingMoreRows: "LOADING ROWS...",
+    dataRowsShown: "{shown} of {total} rows",
     sqlUnavailable: "SQL unavailable because the request failed.",
     textDisabled: "TEXT output disabled for this request.",
     sqlDisabled: "SQL output disabled for this request.",
@@ -159,6 +165,9 @@ export const APP_TRANSLATIONS = {
     noSql: "No se devolvio SQL.",
     noRows: "No se devolvieron datos.",
     loadingSavedData: "Cargando datos guardados...",
+    dataShowMore: "MOSTRAR MAS FILAS",
+    loadingMoreRows: "CARGANDO FILAS...",
+    dataRowsShown: "{shown} de {total} filas",
     sqlUnavailable: "SQL no disponible porque la solicitud fallo.",
     textDisabled: "La salida TEXT esta desactivada para esta solicitud.",
     sqlDisabled: "La salida SQL esta desactivada para esta solicitud.",
@@ -9,7 +9,9 @@ import {
 } from "../shared/browserStore.js";
 import {
   CONTEXT_OPTIONS,
+  DATA_PAGE_SIZE,
   DEFAULT_RESPONSE_TYPES,
+  GRAPH_FORMAT,
   HISTORY_PAGE_SIZE,
   RESPONSE_OPTIONS,
   RUNTIME_LOG_PAGE_SIZE,
@@ -295,10 +297,18 @@ export function useAnalyticalAgentController() {
       const rows = await loadMessageRowsRequest(
         targetMessage.data_path,
         t("unableLoadSavedData"),
+        {
+          onRows: (partialRows) => setMessages((currentMessages) => patchMessageCollection(
+            currentMessages,
+            messageId,
+            { data_rows: partialRows, data_loading: false },
+          )),
+        },
       );
 
       setMessages((currentMessages) => patchMessageCollection(currentMessages, messageId, {
         data_rows: rows,
+        data_has_more: rows.length === DATA_PAGE_SIZE,
         data_loading: false,
         data_error: "",
       }));
@@ -311,6 +321,43 @@ export function useAnalyticalAgentController() {
     }
   }
 
+  async function loadMoreRows() {
+    const targetMessage = messages.find((entry) => entry.mensage_id === selectedMessageId);
+    if (
+      !targetMessage
+      || !targetMessage.data_path
+      || !targetMessage.data_has_more
+      || targetMessage.data_loading_more
+    ) {
+      return;
+    }
+
+    const messageId = targetMessage.mensage_id;
+    const loadedRows = Array.isArray(targetMessage.data_rows) ? targetMessage.data_rows : [];
+    setMessages((currentMessages) => patchMessageCollection(currentMessages, messageId, {
+      data_loading_more: true,
+    }));
+
+    try {
+      const pageRows = await loadMessageRowsRequest(
+        targetMessage.data_path,
+        t("unableLoadSavedData"),
+        { offset: loadedRows.length },
+      );
+
+      setMessages((currentMessages) => patchMessageCollection(currentMessages, messageId, {
+        data_rows: [...loadedRows, ...pageRows],
+        data_has_more: pageRows.length === DATA_PAGE_SIZE,
+        data_loading_more: false,
+      }));
+    } catch (error) {
+      setMessages((currentMessages) => patchMessageCollection(currentMessages, messageId, {
+        data_loading_more: false,
+        data_error: error.message || t("unableLoadSavedData"),
+      }));
+    }
+  }
+
   async function submitQuestion(event) {
     event.preventDefault();
 
@@ -380,6 +427,8 @@ export function useAnalyticalAgentController() {
           ? result.graph_suggestions
           : [],
         data_rows: Array.isArray(result.response_data) ? result.response_data : [],
+        data_row_count: Number(result.response_row_count) || 0,
+        data_has_more: Boolean(result.response_data_truncated && result.data_path),
         data_loading: false,
         data_error: "",
         graph_error: "",
@@ -407,6 +456,7 @@ export function useAnalyticalAgentController() {
         selected_graph_pattern: "",
         graph_suggestions: [],
         data_rows: [],
+        data_has_more: false,
         data_loading: false,
         data_error: "",
         graph_error: "",
@@ -441,6 +491,7 @@ export function useAnalyticalAgentController() {
         chat_id: chatId,
         question_id: selectedMessageId,
         graph_pattern_id: graphPatternId,
+        format: GRAPH_FORMAT,
       });
 
       if (response.status === 401) {
@@ -454,6 +505,7 @@ export function useAnalyticalAgentController() {
 
       setMessages((currentMessages) => patchMessageCollection(currentMessages, selectedMessageId, {
         graph_path: String(payload?.graph_path || ""),
+        graph_spec: payload?.graph_spec || null,
         selected_graph_pattern: String(payload?.selected_graph_pattern || ""),
         graph_suggestions: Array.isArray(payload?.graph_suggestions)
           ? payload.graph_suggestions
@@ -519,5 +571,6 @@ export function useAnalyticalAgentController() {
     showMoreRuntimeLogs,
     logout,
     selectMessage,
+    loadMoreRows,
   };
 }
@@ -10,7 +10,9 @@ export const AUTH_COOKIE_KEY = "ia_agent_auth_token";
 export const DEFAULT_LANGUAGE = "pt";
 export const DEFAULT_THEME = "dark";
 export const DEFAULT_RESPONSE_TYPES = ["TEXT", "SQL"];
+export const GRAPH_FORMAT = "spec";
 export const HISTORY_PAGE_SIZE = 5;
+export const DATA_PAGE_SIZE = 200;
 export const RUNTIME_LOG_PAGE_SIZE = 60;
 
 export const CONTEXT_OPTIONS = [